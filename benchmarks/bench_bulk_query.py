@@ -0,0 +1,50 @@
+'''
+Large extraction through the REST query endpoint vs. a Bulk API 2.0 query job,
+both against the local stand-in. Also checks that every path returns every record.
+
+    PYTHONPATH=src python -m benchmarks.bench_bulk_query --records 100000 --latency 0.02
+'''
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.fake_salesforce import FakeSalesforceServer, LocalSalesforceSession
+from salesforce_mcp.utils.bulk import BulkQueryModule
+from salesforce_mcp.utils.soql import SoqlModule
+
+QUERY = "SELECT Id, LastName, Company FROM Lead"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--latency", type=float, default=0.02, help="server-side latency per request (seconds)")
+    parser.add_argument("--page-size", type=int, default=50000, help="bulk maxRecords per result chunk")
+    args = parser.parse_args()
+
+    with FakeSalesforceServer(latency=args.latency, records=args.records) as server:
+        sf_session = LocalSalesforceSession(domain=server.domain, client_id="id", client_secret="secret",
+                                            username="user", password="pass")
+        sf_session.warm()
+        bulk = BulkQueryModule(sf_session, page_size=args.page_size, poll_interval=0.05)
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "leads.csv")
+            runs = (
+                ("rest", lambda: sum(1 for _ in SoqlModule(sf_session).iter_soql(QUERY))),
+                ("bulk rows", lambda: sum(1 for _ in bulk.iter_rows(QUERY))),
+                ("bulk file", lambda: bulk.download(QUERY, csv_path)),
+            )
+            print(f"{'mode':<12}{'records':>10}{'requests':>10}{'seconds':>10}{'records/s':>12}")
+            for name, run in runs:
+                server.reset_counters()
+                start = time.perf_counter()
+                count = run()
+                elapsed = time.perf_counter() - start
+                assert count == args.records, f"{name} returned {count} of {args.records} records"
+                print(f"{name:<12}{count:>10}{server.counters['requests']:>10}{elapsed:>10.3f}{count / elapsed:>12.0f}")
+        sf_session.close()
+
+
+if __name__ == "__main__":
+    main()
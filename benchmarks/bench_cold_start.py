@@ -0,0 +1,123 @@
+'''
+Cold start of the MCP server as an MCP host sees it when it spawns one server per agent session:
+main.py is started over stdio against the local Salesforce stand-in, and the benchmark times the
+spawn up to the initialize handshake, the first tool call and a second (warm) call, with and
+without SF_PREWARM. It also reports how long `import main` takes (python -X importtime), and
+which top-level imports cost the most, so cold-start regressions can be tracked.
+
+--latency adds a round trip to every stand-in request, standing in for the network and TLS
+costs the first call pays against a real org; --pause waits between the handshake and the first
+call, as a client does while the model composes its first request.
+
+    PYTHONPATH=src python -m benchmarks.bench_cold_start --runs 5 --latency 0.05
+    PYTHONPATH=src python -m benchmarks.bench_cold_start --runs 5 --latency 0.05 --pause 0.2
+'''
+import argparse
+import asyncio
+import logging
+import os
+import pathlib
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks.fake_salesforce import LocalAsyncSalesforceSession, LocalSalesforceSession, serve_in_subprocess
+
+LEAD_QUERY = "SELECT Id, LastName, Company FROM Lead"
+# import time:  self [us] | cumulative | imported package (indented by nesting depth)
+IMPORT_TIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$", re.MULTILINE)
+
+
+def server_env(domain: str) -> Dict[str, str]:
+    return {"URL": domain, "CLIENT_ID": "id", "CLIENT_SECRET": "secret", "USERNAME": "user", "PASSWORD": "pass",
+            "SF_DESCRIBE_CACHE_DIR": tempfile.mkdtemp(), "SF_LIMITS_SAMPLE_INTERVAL": "0",
+            "PYTHONPATH": os.pathsep.join(filter(None, ["src", os.getcwd(), os.environ.get("PYTHONPATH")]))}
+
+
+def serve() -> None:
+    '''
+        Child process: main.py on stdio, talking plain HTTP to the stand-in.
+    '''
+    import main
+    logging.disable(logging.WARNING)
+    main.session_registry.session_cls = LocalAsyncSalesforceSession
+    main.bulk_session_registry.session_cls = LocalSalesforceSession
+    main.run_server()
+
+
+def import_times(env: Dict[str, str], runs: int) -> Tuple[List[float], Dict[str, float]]:
+    '''
+        Milliseconds `import main` took in each of *runs* fresh interpreters, and the mean
+        cumulative milliseconds of each module main imports directly.
+    '''
+    totals: List[float] = []
+    modules: Dict[str, List[float]] = {}
+    for _ in range(runs):
+        stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], env=os.environ | env,
+                                capture_output=True, text=True, check=True).stderr
+        lines = IMPORT_TIME_RE.findall(stderr)
+        end = next(index for index, (_, _, indent, name) in enumerate(lines) if name == "main" and len(indent) == 1)
+        totals.append(int(lines[end][1]) / 1000)
+        # main's imports are listed just before it, nested one level deeper or more
+        start = end
+        while start > 0 and len(lines[start - 1][2]) > 1:
+            start -= 1
+        for _, cumulative, indent, name in lines[start:end]:
+            if len(indent) == 3:
+                modules.setdefault(name, []).append(int(cumulative) / 1000)
+    return totals, {name: statistics.mean(values) for name, values in modules.items()}
+
+
+async def cold_start(env: Dict[str, str], pause: float) -> Tuple[float, float, float]:
+    '''
+        Spawn one server and time (handshake and tools/list, first call, second call) in milliseconds.
+    '''
+    from fastmcp import Client
+    from fastmcp.client.transports import StdioTransport
+
+    transport = StdioTransport(sys.executable, ["-m", "benchmarks.bench_cold_start", "--serve"], env=env,
+                               keep_alive=False, log_file=pathlib.Path(os.devnull))
+    begin = time.perf_counter()
+    async with Client(transport) as client:
+        # hosts list the tools right after connecting
+        await client.list_tools()
+        handshake = time.perf_counter() - begin
+        await asyncio.sleep(pause)
+        timings = []
+        for _ in range(2):
+            begin = time.perf_counter()
+            await client.call_tool("run_soql", {"query": LEAD_QUERY, "cache": False})
+            timings.append(time.perf_counter() - begin)
+    return handshake * 1000, timings[0] * 1000, timings[1] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="server spawns per mode")
+    parser.add_argument("--latency", type=float, default=0.05, help="stand-in latency per request (seconds)")
+    parser.add_argument("--pause", type=float, default=0.0, help="seconds between the handshake and the first call")
+    parser.add_argument("--top", type=int, default=8, help="heaviest direct imports of main to list")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        return serve()
+
+    with serve_in_subprocess(records=200, latency=args.latency) as domain:
+        env = server_env(domain)
+        totals, modules = import_times(env, args.runs)
+        print(f"import main: median {statistics.median(totals):.1f} ms, min {min(totals):.1f} ms")
+        for name, millis in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"  {name:<44}{millis:>8.1f} ms")
+        print(f"{'mode':<12}{'handshake ms':>14}{'first call ms':>15}{'second call ms':>16}")
+        for mode, prewarm in (("cold", "false"), ("prewarm", "true")):
+            runs = [asyncio.run(cold_start(env | {"SF_PREWARM": prewarm}, args.pause)) for _ in range(args.runs)]
+            handshake, first, second = (statistics.median(values) for values in zip(*runs))
+            print(f"{mode:<12}{handshake:>14.1f}{first:>15.1f}{second:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+'''
+Benchmark for coalescing concurrent calls into /composite requests.
+
+Fires --calls concurrent record gets in waves of --concurrency, once with batching off and once
+with a --window-ms coalescing window, and reports wall time and HTTP requests sent.
+
+    PYTHONPATH=src python -m benchmarks.bench_composite_batching --calls 500 --concurrency 50 --latency 0.02
+'''
+import argparse
+import asyncio
+import time
+
+from benchmarks.fake_salesforce import FakeSalesforceServer, LocalAsyncSalesforceSession
+from salesforce_mcp.objects.LeadObject import AsyncLeadObject
+
+
+async def run(server: FakeSalesforceServer, calls: int, concurrency: int, batch_window) -> float:
+    sf_session = LocalAsyncSalesforceSession(domain=server.domain, client_id="id", client_secret="secret",
+                                             username="user", password="pass", batch_window=batch_window,
+                                             max_connections=concurrency, max_keepalive_connections=concurrency)
+    await sf_session.warm()
+    server.reset_counters()
+    lead_object = AsyncLeadObject(sf_session)
+    start = time.perf_counter()
+    for offset in range(0, calls, concurrency):
+        wave = range(offset, min(offset + concurrency, calls))
+        await asyncio.gather(*(sf_session.get(f"{lead_object.lead_endpoint}00Q{index:015d}") for index in wave))
+    elapsed = time.perf_counter() - start
+    await sf_session.aclose()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--window-ms", type=float, default=10.0)
+    parser.add_argument("--latency", type=float, default=0.02, help="server-side latency per request (seconds)")
+    args = parser.parse_args()
+
+    with FakeSalesforceServer(latency=args.latency) as server:
+        print(f"{'mode':<10}{'calls':>8}{'seconds':>10}{'calls/s':>10}{'requests':>10}")
+        for name, window in (("direct", None), ("composite", args.window_ms / 1000)):
+            elapsed = asyncio.run(run(server, args.calls, args.concurrency, window))
+            print(f"{name:<10}{args.calls:>8}{elapsed:>10.3f}{args.calls / elapsed:>10.1f}"
+                  f"{server.counters['requests']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+'''
+End-to-end benchmark suite: SoqlModule, LeadObject, OpportunityObject and the main.py MCP tools
+driven against the local Salesforce stand-in, reporting throughput, p50/p95/p99 latency and peak
+client memory per scenario.
+
+The fake server runs in a child process (see fake_salesforce.serve_in_subprocess) with optional
+latency, jitter and injected failures. Save a run with --save and compare later runs against it
+with --baseline; the exit status is 1 when a scenario regressed by more than --tolerance.
+
+    PYTHONPATH=src python -m benchmarks.bench_end_to_end --iterations 200 --records 10000
+    PYTHONPATH=src python -m benchmarks.bench_end_to_end --save baseline.json
+    PYTHONPATH=src python -m benchmarks.bench_end_to_end --baseline baseline.json --tolerance 0.25
+    PYTHONPATH=src python -m benchmarks.bench_end_to_end --latency 0.02 --jitter 0.03 --error-rate 0.05
+'''
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, List
+
+from benchmarks.fake_salesforce import LocalAsyncSalesforceSession, LocalSalesforceSession, serve_in_subprocess
+from benchmarks.harness import Summary, load, peak_memory, regressions, run_async, run_sync, save
+from salesforce_mcp.objects.LeadObject import LeadObject
+from salesforce_mcp.objects.OpportunityObject import OpportunityObject
+from salesforce_mcp.types.LeadRecord import LeadRecord
+from salesforce_mcp.types.OpportunityRecord import OpportunityRecord
+from salesforce_mcp.utils.soql import SoqlModule
+
+LEAD_QUERY = "SELECT Id, LastName, Company FROM Lead"
+OPPORTUNITY_QUERY = "SELECT Id, Name, StageName, CloseDate, Amount, Probability FROM Opportunity"
+
+
+def measure(name: str, call: Callable[[int], Any], args: argparse.Namespace) -> Summary:
+    '''
+        Timing pass of args.iterations calls, then an untimed pass of args.memory_iterations calls
+        under tracemalloc for the peak memory.
+    '''
+    summary = run_sync(name, call, args.iterations)
+    summary.peak_mib = peak_memory(lambda: run_sync(name, call, args.memory_iterations))
+    return summary
+
+
+async def ameasure(name: str, call: Callable[[int], Any], args: argparse.Namespace) -> Summary:
+    summary = await run_async(name, call, args.iterations, args.concurrency)
+    tracemalloc.start()
+    try:
+        await run_async(name, call, args.memory_iterations, args.concurrency)
+        summary.peak_mib = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+    return summary
+
+
+def client_scenarios(sf_session: LocalSalesforceSession, args: argparse.Namespace) -> List[Summary]:
+    soql = SoqlModule(sf_session)
+    summaries = [
+        measure("soql first page", lambda _: soql.execute_soql(LEAD_QUERY), args),
+        measure("soql fetch_all", lambda _: soql.execute_soql(OPPORTUNITY_QUERY, OpportunityRecord, fetch_all=True), args),
+    ]
+    for sobject, make in ((LeadObject(sf_session), lambda i: LeadRecord(LastName=f"Bench {i}", Company="Bench Co")),
+                          (OpportunityObject(sf_session),
+                           lambda i: OpportunityRecord(Name=f"Bench {i}", StageName="Prospecting", CloseDate="2026-06-30"))):
+        name = sobject.object_name.lower()
+        ids: List[str] = []
+        update = (lambda i: sobject.update(ids[i % len(ids)], make(i))) if name == "lead" else \
+            (lambda i: sobject.update(make(i), ids[i % len(ids)]))
+        summaries += [
+            measure(f"{name} create", lambda i: ids.append(sobject.create(make(i))["id"]), args),
+            measure(f"{name} get", lambda i: sobject.get(ids[i % len(ids)]), args),
+            measure(f"{name} update", update, args),
+            measure(f"{name} delete", lambda _: sobject.delete(ids.pop()), args),
+        ]
+    return summaries
+
+
+async def tool_scenarios(domain: str, args: argparse.Namespace) -> List[Summary]:
+    os.environ.update(URL=domain, CLIENT_ID="id", CLIENT_SECRET="secret", USERNAME="user", PASSWORD="pass",
+                      SF_DESCRIBE_CACHE_DIR=tempfile.mkdtemp(), SF_LIMITS_SAMPLE_INTERVAL="0")
+    import main
+    from fastmcp import Client
+    main.session_registry.session_cls = LocalAsyncSalesforceSession
+    main.bulk_session_registry.session_cls = LocalSalesforceSession
+
+    async with Client(main.mcp) as client:
+        return [
+            await ameasure("tool run_soql", lambda _: client.call_tool(
+                "run_soql", {"query": LEAD_QUERY, "cache": False}), args),
+            await ameasure("tool run_soql tabular", lambda _: client.call_tool(
+                "run_soql", {"query": OPPORTUNITY_QUERY, "cache": False, "tabular": True}), args),
+            await ameasure("tool lead create", lambda i: client.call_tool(
+                "run_lead_operation", {"operation": "create", "last_name": f"Bench {i}", "company": "Bench Co"}), args),
+            await ameasure("tool lead get", lambda i: client.call_tool(
+                "run_lead_operation", {"operation": "get", "lead_id": f"00Q{i:015d}"}), args),
+            await ameasure("tool opportunity get", lambda i: client.call_tool(
+                "run_opportunity_operation", {"operation": "get", "opportunity_id": f"006{i:015d}"}), args),
+        ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200, help="timed calls per scenario")
+    parser.add_argument("--memory-iterations", type=int, default=20, help="calls per scenario traced for peak memory")
+    parser.add_argument("--concurrency", type=int, default=8, help="tool calls in flight at once")
+    parser.add_argument("--records", type=int, default=10000, help="size of the generated query dataset")
+    parser.add_argument("--batch-size", type=int, default=2000, help="records per query page")
+    parser.add_argument("--latency", type=float, default=0.0, help="server-side latency per request (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency per request, up to (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed regression against the baseline")
+    args = parser.parse_args()
+
+    # failed calls are counted per scenario; the sessions' error logs would only drown the report
+    logging.disable(logging.ERROR)
+    server_options = dict(records=args.records, batch_size=args.batch_size, latency=args.latency, jitter=args.jitter,
+                          error_rate=args.error_rate, error_status=args.error_status, seed=args.seed)
+    with serve_in_subprocess(**server_options) as domain:
+        sf_session = LocalSalesforceSession(domain=domain, client_id="id", client_secret="secret",
+                                            username="user", password="pass")
+        sf_session.warm()
+        start = time.perf_counter()
+        summaries = client_scenarios(sf_session, args)
+        sf_session.close()
+        summaries += asyncio.run(tool_scenarios(domain, args))
+        elapsed = time.perf_counter() - start
+
+    print(Summary.HEADER)
+    for summary in summaries:
+        print(summary.row())
+    print(f"total {elapsed:.1f}s")
+    if args.save:
+        save(args.save, summaries, vars(args) | {"save": None, "baseline": None})
+    if args.baseline:
+        saved = load(args.baseline)
+        differing = sorted(name for name, value in server_options.items() if saved["options"].get(name) != value)
+        if differing:
+            print(f"note: the baseline ran with different {', '.join(differing)}")
+        found = regressions(summaries, saved, args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+'''
+HTTP/1.1 connection pool vs. one multiplexed HTTP/2 connection for AsyncSalesforceSession under
+parallel load: a mix of SOQL queries and record gets (as concurrent run_soql and get_lead tool
+calls produce) is kept at each --concurrency level, over TLS against the local stand-ins of
+fake_salesforce_h2.
+
+With HTTP/1.1 every request in flight needs a connection of its own, so a burst opens up to
+max_connections connections, each paying --connect-latency (the TCP and TLS round trips to the
+org); with HTTP/2 the burst shares one connection, and the repeated request headers (Authorization,
+Accept, User-Agent, ...) are sent HPACK-compressed. The first burst of a fresh session, the steady
+state, and the connections opened are reported for both.
+
+    PYTHONPATH=src python -m benchmarks.bench_http2 --concurrency 1 10 50 --latency 0.02 --connect-latency 0.03
+'''
+import argparse
+import asyncio
+import logging
+import time
+
+from benchmarks.fake_salesforce_h2 import TlsAsyncSalesforceSession, TlsStandIn, serve_tls_in_subprocess
+from benchmarks.harness import Summary, run_async
+from salesforce_mcp.objects.LeadObject import LeadObject
+from salesforce_mcp.utils.soql import AsyncSoqlModule
+
+LEAD_QUERY = "SELECT Id, LastName, Company FROM Lead LIMIT 20"
+
+
+async def scenario(stand_in: TlsStandIn, http2: bool, concurrency: int, iterations: int) -> str:
+    domain = stand_in.h2_domain if http2 else stand_in.h1_domain
+    sf_session = TlsAsyncSalesforceSession(domain=domain, client_id="id", client_secret="secret",
+                                           username="user", password="pass", cafile=stand_in.cafile, http2=http2,
+                                           max_connections=concurrency, max_keepalive_connections=concurrency)
+    soql = AsyncSoqlModule(sf_session)
+    lead_endpoint = LeadObject(sf_session).lead_endpoint
+    await sf_session.get_token()
+
+    async def call(index: int) -> None:
+        if index % 2:
+            await sf_session.get(f"{lead_endpoint}00Q{index:015d}")
+        else:
+            await soql.execute_soql(LEAD_QUERY, cache=False)
+
+    protocol = "HTTP/2" if http2 else "HTTP/1.1"
+    try:
+        before = stand_in.counters()["connections"]
+        begin = time.perf_counter()
+        await run_async("first burst", call, concurrency, concurrency)
+        burst = (time.perf_counter() - begin) * 1000
+        summary: Summary = await run_async(f"{protocol} x{concurrency}", call, iterations, concurrency)
+        connections = stand_in.counters()["connections"] - before
+    finally:
+        await sf_session.aclose()
+    return (f"{summary.name:<18}{summary.calls:>7}{summary.errors:>8}{summary.throughput:>10.1f}"
+            f"{summary.p50:>9.2f}{summary.p95:>9.2f}{burst:>13.1f}{connections:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50], help="calls in flight")
+    parser.add_argument("--iterations", type=int, default=400, help="calls per scenario, after the first burst")
+    parser.add_argument("--latency", type=float, default=0.02, help="stand-in latency per request (seconds)")
+    parser.add_argument("--connect-latency", type=float, default=0.03,
+                        help="stand-in latency per new connection (seconds)")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with serve_tls_in_subprocess(records=200, latency=args.latency, connect_latency=args.connect_latency) as stand_in:
+        print(f"{'scenario':<18}{'calls':>7}{'errors':>8}{'calls/s':>10}{'p50 ms':>9}{'p95 ms':>9}"
+              f"{'burst ms':>13}{'conns':>8}")
+        for concurrency in args.concurrency:
+            for http2 in (False, True):
+                print(asyncio.run(scenario(stand_in, http2, concurrency, args.iterations)))
+
+
+if __name__ == "__main__":
+    main()
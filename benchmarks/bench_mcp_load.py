@@ -0,0 +1,231 @@
+'''
+Load test of the MCP server itself: main.py is served on the streamable-HTTP transport in a child
+process, backed by the local Salesforce stand-in, and driven by N concurrent MCP clients (one
+session each) issuing a weighted mix of run_soql, run_lead_operation and run_opportunity_operation
+calls for a fixed time at each concurrency level.
+
+Per level it reports throughput, p50/p95/p99 latency as seen by the clients, error rate and
+queueing delay: the mean client latency minus the mean time the server spent inside the tools
+(salesforce_mcp_tool_duration_seconds, scraped from the server's metrics endpoint), i.e. the time
+a call spends in transport, in the MCP session layer and waiting for the event loop.
+
+With --workers N the server runs SF_MCP_WORKERS=N processes sharing one port and one
+SF_SHARED_STATE_PATH; tool time is then summed over the workers' metrics endpoints.
+
+    PYTHONPATH=src python -m benchmarks.bench_mcp_load --concurrency 1,4,16,64 --duration 10
+    PYTHONPATH=src python -m benchmarks.bench_mcp_load --mix soql=1,lead_get=1 --latency 0.05 --error-rate 0.02
+    PYTHONPATH=src python -m benchmarks.bench_mcp_load --concurrency 16,64 --workers 4
+'''
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import random
+import re
+import socket
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.fake_salesforce import LocalAsyncSalesforceSession, LocalSalesforceSession, serve_in_subprocess
+from benchmarks.harness import Summary, load, regressions, save
+
+LEAD_QUERY = "SELECT Id, LastName, Company FROM Lead"
+# operation -> (tool, arguments of call number i)
+OPERATIONS: Dict[str, Tuple[str, Callable[[int], Dict[str, Any]]]] = {
+    "soql": ("run_soql", lambda i: {"query": LEAD_QUERY, "cache": False}),
+    "lead_get": ("run_lead_operation", lambda i: {"operation": "get", "lead_id": f"00Q{i % 1000:015d}"}),
+    "lead_create": ("run_lead_operation", lambda i: {"operation": "create", "last_name": f"Load {i}",
+                                                     "company": "Load Co"}),
+    "opportunity_get": ("run_opportunity_operation", lambda i: {"operation": "get",
+                                                                "opportunity_id": f"006{i % 1000:015d}"}),
+    "opportunity_create": ("run_opportunity_operation", lambda i: {"operation": "create", "name": f"Load {i}",
+                                                                   "stage_name": "Prospecting",
+                                                                   "close_date": "2026-06-30"}),
+}
+DEFAULT_MIX = "soql=4,lead_get=2,lead_create=1,opportunity_get=2,opportunity_create=1"
+TOOL_SUM_RE = re.compile(r'^salesforce_mcp_tool_duration_seconds_(sum|count)\{tool="[^"]*"\} (\S+)$', re.MULTILINE)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def free_ports(count: int) -> int:
+    '''
+        First of *count* consecutive free ports.
+    '''
+    while True:
+        first = free_port()
+        try:
+            for port in range(first, first + count):
+                with socket.socket() as sock:
+                    sock.bind(("127.0.0.1", port))
+            return first
+        except OSError:
+            continue
+
+
+def serve_mcp(domain: str, port: int, metrics_port: int, workers: int = 1) -> None:
+    '''
+        Child process: main.py on streamable HTTP, talking plain HTTP to the stand-in at *domain*.
+        Worker i serves its metrics on metrics_port + i.
+    '''
+    state_dir = tempfile.mkdtemp()
+    os.environ.update(URL=domain, CLIENT_ID="id", CLIENT_SECRET="secret", USERNAME="user", PASSWORD="pass",
+                      SF_DESCRIBE_CACHE_DIR=state_dir, SF_LIMITS_SAMPLE_INTERVAL="0",
+                      SF_MCP_TRANSPORT="http", SF_MCP_PORT=str(port), SF_METRICS_PORT=str(metrics_port),
+                      SF_MCP_WORKERS=str(workers), SF_SHARED_STATE_PATH=os.path.join(state_dir, "state.sqlite"))
+    import main
+    logging.disable(logging.ERROR)
+    main.session_registry.session_cls = LocalAsyncSalesforceSession
+    main.bulk_session_registry.session_cls = LocalSalesforceSession
+    main.run_server(log_level="warning", show_banner=False)
+
+
+def wait_for_port(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def tool_seconds(metrics_port: int, workers: int = 1) -> Tuple[float, float]:
+    '''
+        (total seconds, calls) of every tool so far, from the metrics of every worker.
+    '''
+    totals = {"sum": 0.0, "count": 0.0}
+    for worker in range(workers):
+        with urllib.request.urlopen(f"http://127.0.0.1:{metrics_port + worker}/metrics") as response:
+            text = response.read().decode()
+        for kind, value in TOOL_SUM_RE.findall(text):
+            totals[kind] += float(value)
+    return totals["sum"], totals["count"]
+
+
+def parse_mix(mix: str) -> Tuple[List[str], List[float]]:
+    weights = dict(item.split("=") for item in mix.split(","))
+    unknown = set(weights) - set(OPERATIONS)
+    if unknown:
+        raise SystemExit(f"unknown operations {sorted(unknown)}; choose from {sorted(OPERATIONS)}")
+    return list(weights), [float(weight) for weight in weights.values()]
+
+
+async def run_level(url: str, clients: int, duration: float, mix: Tuple[List[str], List[float]],
+                    seed: int) -> Tuple[List[float], Dict[str, int], float]:
+    '''
+        *clients* concurrent MCP sessions calling tools back to back for *duration* seconds.
+        :return: latencies of the successful calls, error counts by type, elapsed seconds
+    '''
+    from fastmcp import Client
+
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    counter = iter(range(sys.maxsize))
+    ready = asyncio.Barrier(clients + 1)
+    started = asyncio.Event()
+    deadline = 0.0
+
+    async def client_loop(number: int) -> None:
+        chooser = random.Random(seed + number)
+        async with Client(url) as client:
+            await ready.wait()
+            await started.wait()
+            while time.perf_counter() < deadline:
+                operation = chooser.choices(*mix)[0]
+                tool, arguments = OPERATIONS[operation]
+                begin = time.perf_counter()
+                try:
+                    await client.call_tool(tool, arguments(next(counter)))
+                except Exception as err:
+                    errors[type(err).__name__] = errors.get(type(err).__name__, 0) + 1
+                    continue
+                latencies.append(time.perf_counter() - begin)
+
+    tasks = [asyncio.create_task(client_loop(number)) for number in range(clients)]
+    # every session is initialized before the clock starts
+    await ready.wait()
+    start = time.perf_counter()
+    deadline = start + duration
+    started.set()
+    await asyncio.gather(*tasks)
+    return latencies, errors, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,4,16,64", help="comma-separated numbers of concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"operation=weight list, from {', '.join(OPERATIONS)}")
+    parser.add_argument("--records", type=int, default=200, help="records returned by run_soql")
+    parser.add_argument("--latency", type=float, default=0.0, help="Salesforce stand-in latency per request (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random stand-in latency, up to (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of stand-in requests that fail")
+    parser.add_argument("--workers", type=int, default=1, help="server worker processes (SF_MCP_WORKERS)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed regression against the baseline")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    levels = [int(level) for level in args.concurrency.split(",")]
+    metrics_port = free_ports(args.workers)
+    port = free_port()
+    while metrics_port <= port < metrics_port + args.workers:
+        port = free_port()
+    server_options = dict(records=args.records, latency=args.latency, jitter=args.jitter,
+                          error_rate=args.error_rate, seed=args.seed)
+    with serve_in_subprocess(**server_options) as domain:
+        # not a daemon: with --workers it starts the worker processes itself
+        server = multiprocessing.Process(target=serve_mcp, args=(domain, port, metrics_port, args.workers))
+        server.start()
+        try:
+            wait_for_port(port)
+            for worker in range(args.workers):
+                wait_for_port(metrics_port + worker)
+            url = f"http://127.0.0.1:{port}/mcp"
+            # first call authenticates and warms the server's Salesforce session
+            asyncio.run(run_level(url, 1, 0.5, mix, args.seed))
+            summaries: List[Summary] = []
+            print(f"{'clients':>8}{'calls':>8}{'calls/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+                  f"{'tool ms':>9}{'queue ms':>10}{'errors':>8}")
+            for clients in levels:
+                tool_sum, tool_count = tool_seconds(metrics_port, args.workers)
+                latencies, errors, elapsed = asyncio.run(run_level(url, clients, args.duration, mix, args.seed))
+                tool_sum, tool_count = (value - before for value, before in zip(tool_seconds(metrics_port, args.workers),
+                                                                                (tool_sum, tool_count)))
+                summary = Summary.from_latencies(f"{clients} clients", latencies, errors, elapsed)
+                summaries.append(summary)
+                mean_latency = sum(latencies) / len(latencies) * 1000 if latencies else 0.0
+                mean_tool = tool_sum / tool_count * 1000 if tool_count else 0.0
+                attempted = summary.calls + summary.errors
+                print(f"{clients:>8}{summary.calls:>8}{summary.throughput:>10.1f}{summary.p50:>9.2f}{summary.p95:>9.2f}"
+                      f"{summary.p99:>9.2f}{mean_tool:>9.2f}{mean_latency - mean_tool:>10.2f}"
+                      f"{summary.errors / attempted if attempted else 0.0:>8.1%}")
+        finally:
+            server.terminate()
+            server.join()
+
+    if args.save:
+        save(args.save, summaries, vars(args) | {"save": None, "baseline": None})
+    if args.baseline:
+        found = regressions(summaries, load(args.baseline), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+'''
+Memory, scan and serialisation cost of a large Opportunity result in each record layout:
+plain dicts, OpportunityRecord dataclasses, SlottedOpportunityRecord and ColumnarSoqlResult.
+
+    PYTHONPATH=src python -m benchmarks.bench_record_layouts --records 100000
+'''
+import argparse
+import gc
+import json
+import math
+import time
+import tracemalloc
+
+from salesforce_mcp.types.OpportunityRecord import OpportunityRecord, SlottedOpportunityRecord
+from salesforce_mcp.utils.columnar import ColumnarSoqlResult
+from salesforce_mcp.utils.dataClassMapper import dict_to_dataclass, dataclass_to_dict
+
+
+def make_rows(count: int) -> list:
+    return [{
+        "attributes": {"type": "Opportunity", "url": f"/services/data/v61.0/sobjects/Opportunity/006{index:015d}"},
+        "Id": f"006{index:015d}",
+        "Name": f"Opportunity {index}",
+        "StageName": ("Prospecting", "Negotiation", "Closed Won")[index % 3],
+        "CloseDate": "2026-06-30",
+        "AccountId": f"001{index % 500:015d}",
+        "Amount": float(index % 10000) * 12.5,
+        "Probability": float(index % 100),
+        "ExpectedRevenue": float(index % 10000) * 12.5 * (index % 100) / 100,
+        "IsClosed": index % 3 == 2,
+        "IsWon": index % 3 == 2,
+        "FiscalYear": 2026,
+        "FiscalQuarter": 2,
+        "OwnerId": f"005{index % 40:015d}",
+    } for index in range(count)]
+
+
+def retained(build, body: str):
+    '''
+        Decode *body*, build the layout from the rows and return it with the bytes it keeps alive
+        once the decoded rows are dropped.
+    '''
+    gc.collect()
+    tracemalloc.start()
+    result = build(json.loads(body))
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def timed(action) -> float:
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args()
+
+    body = json.dumps(make_rows(args.records))
+    layouts = (
+        ("dict", lambda rows: rows,
+         lambda result: sum(row["Amount"] for row in result),
+         lambda result: json.dumps(result)),
+        ("dataclass", lambda rows: [dict_to_dataclass(row, OpportunityRecord) for row in rows],
+         lambda result: sum(record.Amount for record in result),
+         lambda result: json.dumps([dataclass_to_dict(record) for record in result])),
+        ("slotted", lambda rows: [dict_to_dataclass(row, SlottedOpportunityRecord) for row in rows],
+         lambda result: sum(record.Amount for record in result),
+         lambda result: json.dumps([dataclass_to_dict(record) for record in result])),
+        ("columnar", lambda rows: ColumnarSoqlResult.from_records(rows),
+         lambda result: math.fsum(result.column("Amount")),
+         lambda result: json.dumps(result.to_dict())),
+    )
+    print(f"{'layout':<12}{'MiB':>8}{'build s':>10}{'scan ms':>10}{'json s':>10}")
+    for name, build, scan, serialise in layouts:
+        result, size = retained(build, body)
+        rows = json.loads(body)
+        build_seconds = timed(lambda: build(rows))
+        print(f"{name:<12}{size / 2 ** 20:>8.1f}{build_seconds:>10.3f}{timed(lambda: scan(result)) * 1000:>10.1f}"
+              f"{timed(lambda: serialise(result)):>10.3f}")
+        del result, rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+'''
+Per-row cost of mapping query rows to record dataclasses and back: the field-reflection
+dict_to_dataclass / payload code this client used before, against the compiled RecordMapper.
+Decoding is measured on REST rows (typed JSON values) and on Bulk API rows (every value a string).
+
+    PYTHONPATH=src python -m benchmarks.bench_record_mapping --records 50000
+'''
+import argparse
+import time
+from dataclasses import fields
+
+from salesforce_mcp.types.LeadRecord import LeadRecord
+from salesforce_mcp.types.OpportunityRecord import OpportunityRecord
+from salesforce_mcp.utils.dataClassMapper import mapper_for
+
+
+def reflect_decode(row: dict, cls):
+    allowed = {f.name for f in fields(cls)}
+    return cls(**{k: v for k, v in row.items() if k in allowed})
+
+
+def reflect_encode(record) -> dict:
+    data = {
+        f.name: getattr(record, f.name) for f in fields(record)
+        if f.name != "custom_fields" and getattr(record, f.name) is not None
+    }
+    if record.custom_fields:
+        data.update(record.custom_fields)
+    return data
+
+
+def lead_row(index: int) -> dict:
+    return {
+        "attributes": {"type": "Lead", "url": f"/services/data/v61.0/sobjects/Lead/00Q{index:015d}"},
+        "Id": f"00Q{index:015d}",
+        "FirstName": "Ada",
+        "LastName": f"Lovelace {index}",
+        "Company": "Analytical Engines",
+        "Email": f"ada{index}@example.com",
+        "Status": "Open - Not Contacted",
+        "AnnualRevenue": float(index % 1000) * 1000,
+        "NumberOfEmployees": index % 500,
+        "IsConverted": False,
+        "OwnerId": f"005{index % 40:015d}",
+    }
+
+
+def opportunity_row(index: int) -> dict:
+    return {
+        "attributes": {"type": "Opportunity", "url": f"/services/data/v61.0/sobjects/Opportunity/006{index:015d}"},
+        "Id": f"006{index:015d}",
+        "Name": f"Opportunity {index}",
+        "StageName": ("Prospecting", "Negotiation", "Closed Won")[index % 3],
+        "CloseDate": "2026-06-30",
+        "Amount": float(index % 10000) * 12.5,
+        "Probability": float(index % 100),
+        "IsClosed": index % 3 == 2,
+        "FiscalYear": 2026,
+        "FiscalQuarter": 2,
+        "OwnerId": f"005{index % 40:015d}",
+    }
+
+
+def as_bulk_row(row: dict) -> dict:
+    # CSV rows from the Bulk API: strings only, no attributes
+    return {key: ("true" if value is True else "false" if value is False else str(value))
+            for key, value in row.items() if key != "attributes"}
+
+
+def per_row_ns(action, items: list) -> float:
+    start = time.perf_counter_ns()
+    for item in items:
+        action(item)
+    return (time.perf_counter_ns() - start) / len(items)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=50000)
+    args = parser.parse_args()
+
+    print(f"{'case':<34}{'reflection ns':>15}{'compiled ns':>13}{'speedup':>9}")
+    for cls, make_row in ((LeadRecord, lead_row), (OpportunityRecord, opportunity_row)):
+        rest_rows = [make_row(index) for index in range(args.records)]
+        bulk_rows = [as_bulk_row(row) for row in rest_rows]
+        mapper = mapper_for(cls)
+        records = [mapper.decode(row) for row in rest_rows]
+        cases = (
+            ("decode REST", rest_rows, lambda row: reflect_decode(row, cls), mapper.decode),
+            # reflection leaves Bulk values as strings; the mapper also converts them
+            ("decode Bulk", bulk_rows, lambda row: reflect_decode(row, cls), mapper.decode),
+            ("encode payload", records, reflect_encode, mapper.encode),
+        )
+        for name, items, reflected, compiled in cases:
+            before, after = per_row_ns(reflected, items), per_row_ns(compiled, items)
+            print(f"{cls.__name__ + ' ' + name:<34}{before:>15.0f}{after:>13.0f}{before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
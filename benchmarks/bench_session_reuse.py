@@ -0,0 +1,60 @@
+'''
+Before/after benchmark for sharing one SalesforceSession across tool calls.
+
+"before" builds a new session per call, as the tools in main.py used to;
+"after" takes the session from a SessionRegistry.
+
+    PYTHONPATH=src python -m benchmarks.bench_session_reuse --calls 200 --latency 0.002
+'''
+import argparse
+import time
+
+from benchmarks.fake_salesforce import FakeSalesforceServer, LocalSalesforceSession
+from salesforce_mcp.services.SessionRegistry import SessionRegistry
+from salesforce_mcp.utils.credentials import Credentials
+from salesforce_mcp.utils.soql import SoqlModule
+
+QUERY = "SELECT Id, LastName, Company FROM Lead LIMIT 1"
+
+
+def run_before(credentials: Credentials, calls: int) -> None:
+    for _ in range(calls):
+        sf_session = LocalSalesforceSession(
+            domain=credentials.url,
+            username=credentials.username,
+            password=credentials.password,
+            client_id=credentials.client_id,
+            client_secret=credentials.client_secret
+        )
+        SoqlModule(sf_session).execute_soql(QUERY)
+        sf_session.session.close()
+
+
+def run_after(credentials: Credentials, calls: int) -> None:
+    registry = SessionRegistry(session_cls=LocalSalesforceSession)
+    for _ in range(calls):
+        SoqlModule(registry.get(credentials)).execute_soql(QUERY)
+    registry.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="server-side latency per request (seconds)")
+    args = parser.parse_args()
+
+    with FakeSalesforceServer(latency=args.latency) as server:
+        credentials = Credentials(url=server.domain, client_id="id", client_secret="secret",
+                                  username="user", password="pass")
+        print(f"{'mode':<8}{'calls':>8}{'seconds':>10}{'calls/s':>10}{'tokens':>8}{'conns':>8}")
+        for name, runner in (("before", run_before), ("after", run_after)):
+            server.reset_counters()
+            start = time.perf_counter()
+            runner(credentials, args.calls)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<8}{args.calls:>8}{elapsed:>10.3f}{args.calls / elapsed:>10.1f}"
+                  f"{server.counters['tokens']:>8}{server.counters['connections']:>8}")
+
+
+if __name__ == "__main__":
+    main()
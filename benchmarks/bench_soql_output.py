@@ -0,0 +1,67 @@
+'''
+Size (compact JSON) and serialisation time of a run_soql response for each output control: the raw page,
+attributes stripped, nulls elided, projected to a few fields, the tabular encoding and a byte budget.
+
+    PYTHONPATH=src python -m benchmarks.bench_soql_output --records 2000
+'''
+import argparse
+import json
+import time
+
+from salesforce_mcp.utils.soql import SoqlResult
+
+FIELDS = ["Id", "Name", "StageName", "Amount", "Account.Name"]
+
+
+def make_rows(count: int) -> list:
+    return [{
+        "attributes": {"type": "Opportunity", "url": f"/services/data/v61.0/sobjects/Opportunity/006{index:015d}"},
+        "Id": f"006{index:015d}",
+        "Name": f"Opportunity {index}",
+        "StageName": ("Prospecting", "Negotiation", "Closed Won")[index % 3],
+        "CloseDate": "2026-06-30",
+        "Amount": float(index % 10000) * 12.5,
+        "Probability": float(index % 100),
+        "NextStep": None if index % 4 else "Follow up",
+        "Description": None,
+        "LeadSource": None if index % 2 else "Web",
+        "Type": None,
+        "ForecastCategoryName": "Pipeline",
+        "OwnerId": f"005{index % 40:015d}",
+        "Account": {
+            "attributes": {"type": "Account", "url": f"/services/data/v61.0/sobjects/Account/001{index % 500:015d}"},
+            "Name": f"Account {index % 500}",
+        },
+    } for index in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--max-bytes", type=int, default=64 * 1024)
+    args = parser.parse_args()
+
+    result = SoqlResult(totalSize=args.records, records=make_rows(args.records))
+    variants = (
+        ("raw", lambda: {"totalSize": result.totalSize, "done": result.done, "size": len(result.records),
+                          "records": result.records}),
+        ("strip attributes", lambda: result.to_output()),
+        ("+ omit nulls", lambda: result.to_output(omit_nulls=True)),
+        ("+ 5 fields", lambda: result.to_output(FIELDS, omit_nulls=True)),
+        ("+ tabular", lambda: result.to_output(FIELDS, tabular=True)),
+        (f"+ max_bytes {args.max_bytes}", lambda: result.to_output(FIELDS, tabular=True, max_bytes=args.max_bytes)),
+    )
+    print(f"{'output':<24}{'KiB':>10}{'records':>9}{'shape ms':>10}{'json ms':>9}")
+    for name, build in variants:
+        start = time.perf_counter()
+        output = build()
+        shaped = time.perf_counter() - start
+        start = time.perf_counter()
+        body = json.dumps(output, separators=(",", ":"))
+        serialised = time.perf_counter() - start
+        print(f"{name:<24}{len(body.encode()) / 1024:>10.1f}{output['size']:>9}"
+              f"{shaped * 1000:>10.1f}{serialised * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+'''
+Multi-page SOQL extraction: sequential nextRecordsUrl walk vs. background prefetch
+vs. concurrent locator-offset fetches.
+
+Each page is mapped through dict_to_dataclass, so prefetch has consumer work to overlap with.
+
+    PYTHONPATH=src python -m benchmarks.bench_soql_pagination --records 20000 --batch-size 2000 --latency 0.05
+'''
+import argparse
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from benchmarks.fake_salesforce import FakeSalesforceServer, LocalSalesforceSession
+from salesforce_mcp.utils.soql import SoqlModule
+
+QUERY = "SELECT Id, LastName, Company FROM Lead"
+
+
+@dataclass
+class Lead:
+    Id: str
+    LastName: Optional[str] = None
+    Company: Optional[str] = None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.05, help="server-side latency per request (seconds)")
+    args = parser.parse_args()
+
+    modes = (
+        ("sequential", {}),
+        ("prefetch=2", {"prefetch": 2}),
+        ("parallel=4", {"parallel_pages": 4}),
+    )
+    with FakeSalesforceServer(latency=args.latency, records=args.records, batch_size=args.batch_size) as server:
+        sf_session = LocalSalesforceSession(domain=server.domain, client_id="id", client_secret="secret",
+                                            username="user", password="pass")
+        sf_session.warm()
+        print(f"{'mode':<12}{'records':>10}{'pages':>8}{'seconds':>10}{'records/s':>12}")
+        for name, options in modes:
+            server.reset_counters()
+            soql = SoqlModule(sf_session, **options)
+            start = time.perf_counter()
+            count = sum(1 for _ in soql.iter_soql(QUERY, Lead))
+            elapsed = time.perf_counter() - start
+            print(f"{name:<12}{count:>10}{server.counters['requests']:>8}{elapsed:>10.3f}{count / elapsed:>12.0f}")
+        sf_session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+'''
+Peak client memory of a multi-page SOQL walk: response.json() per page vs. streamed,
+incrementally decoded pages (SoqlModule(stream=True)).
+
+The fake server runs in a child process so tracemalloc only sees the client's allocations.
+
+    PYTHONPATH=src python -m benchmarks.bench_streaming_query --records 10000 --batch-size 2000 --extra-fields 100
+'''
+import argparse
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+from benchmarks.fake_salesforce import LocalSalesforceSession, serve_in_subprocess
+from salesforce_mcp.utils.soql import SoqlModule
+
+QUERY = "SELECT Id, LastName, Company FROM Lead"
+
+
+@dataclass
+class Lead:
+    Id: str
+    LastName: Optional[str] = None
+    Company: Optional[str] = None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--extra-fields", type=int, default=100, help="custom fields per record (row width)")
+    args = parser.parse_args()
+
+    with serve_in_subprocess(records=args.records, batch_size=args.batch_size, extra_fields=args.extra_fields) as domain:
+        sf_session = LocalSalesforceSession(domain=domain, client_id="id", client_secret="secret",
+                                            username="user", password="pass")
+        sf_session.warm()
+        print(f"{'mode':<10}{'records':>10}{'seconds':>10}{'peak MiB':>10}")
+        for name, stream in (("json()", False), ("stream", True)):
+            soql = SoqlModule(sf_session, stream=stream)
+            tracemalloc.start()
+            start = time.perf_counter()
+            count = sum(1 for _ in soql.iter_soql(QUERY, Lead))
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{name:<10}{count:>10}{elapsed:>10.3f}{peak / 2 ** 20:>10.1f}")
+        sf_session.close()
+
+
+if __name__ == "__main__":
+    main()
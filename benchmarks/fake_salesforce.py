@@ -0,0 +1,519 @@
+'''
+Local stand-in for the Salesforce REST API used by the benchmarks.
+
+Serves the OAuth token endpoint, /query (paginated through nextRecordsUrl over a generated
+Lead or Opportunity dataset of any size), Bulk API 2.0 query and ingest jobs, /composite,
+sobjects/<Object>/describe and create / get / update / delete of sobjects/<Object>/<Id> over
+HTTP/1.1 with keep-alive, plain or over TLS (fake_salesforce_h2 serves the same API over
+HTTP/2). Latency (with optional jitter), failures (a share of requests answered with an error
+status) and connection setup round trips can be injected. Tokens issued, TCP connections
+accepted, requests and injected errors are counted so benchmarks can report how much work
+each client configuration costs.
+'''
+import csv
+import io
+import itertools
+import json
+import multiprocessing
+import random
+import re
+import ssl
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, Iterator, Tuple
+import typing
+import zlib
+from contextlib import contextmanager
+from urllib.parse import urlsplit, parse_qs
+
+from salesforce_mcp.services.SalesforceSession import SalesforceSession
+from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+from salesforce_mcp.types.LeadRecord import LeadRecord
+from salesforce_mcp.types.OpportunityRecord import OpportunityRecord
+
+
+class FakeSalesforceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "FakeSalesforceServer"
+
+    def setup(self):
+        # TCP and TLS handshake round trips of a new connection
+        if self.server.connect_latency:
+            time.sleep(self.server.connect_latency)
+        if isinstance(self.request, ssl.SSLSocket):
+            self.request.do_handshake()
+        super().setup()
+        self.server.count("connections")
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body, headers: Optional[Dict[str, str]] = None) -> None:
+        # 204 / 304 answers carry no body
+        payload = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        if payload:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_csv(self, body: str, headers: Dict[str, str]) -> None:
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _inject_error(self) -> bool:
+        '''
+            Answer with the server's error status instead, for the configured share of requests.
+        '''
+        status = self.server.injected_error()
+        if status is None:
+            return False
+        self._send_json(status, [{"message": "Injected failure", "errorCode": ERROR_CODES.get(status, "UNKNOWN_EXCEPTION")}])
+        return True
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def do_POST(self):
+        body = self._read_body()
+        self.server.simulate_latency()
+        path = urlsplit(self.path).path
+        if path == "/services/oauth2/token":
+            self.server.count("tokens")
+            return self._send_json(200, {"access_token": "fake-token", "instance_url": "http://localhost"})
+        self.server.count("requests")
+        if self._inject_error():
+            return
+        if path.endswith("/jobs/query") or path.endswith("/jobs/ingest"):
+            return self._send_json(200, self.server.create_job(json.loads(body)))
+        if path.endswith("/composite"):
+            return self._send_json(200, self.server.composite(json.loads(body)))
+        return self._send_json(*self.server.sobject_request("POST", path, json.loads(body or b"{}")))
+
+    def do_PUT(self):
+        body = self._read_body()
+        self.server.simulate_latency()
+        self.server.count("requests")
+        if self._inject_error():
+            return
+        job = BULK_JOB_RE.search(urlsplit(self.path).path)
+        self.server.upload_ingest_data(job.group("id"), body.decode())
+        self.send_response(201)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_PATCH(self):
+        body = self._read_body()
+        self.server.simulate_latency()
+        self.server.count("requests")
+        if self._inject_error():
+            return
+        path = urlsplit(self.path).path
+        job = BULK_JOB_RE.search(path)
+        if job:
+            return self._send_json(200, self.server.set_job_state(job.group("id"), json.loads(body)["state"]))
+        self._send_json(*self.server.sobject_request("PATCH", path, json.loads(body or b"{}")))
+
+    def do_DELETE(self):
+        self.server.simulate_latency()
+        self.server.count("requests")
+        if self._inject_error():
+            return
+        self._send_json(*self.server.sobject_request("DELETE", urlsplit(self.path).path))
+
+    def do_GET(self):
+        self.server.simulate_latency()
+        self.server.count("requests")
+        url = urlsplit(self.path)
+        path, params = url.path, parse_qs(url.query)
+        if not path.endswith("/limits") and self._inject_error():
+            return
+        if path.endswith("/query"):
+            query = params.get("q", [""])[0]
+            if "COUNT()" in query.upper():
+                return self._send_json(200, {"totalSize": self.server.records, "done": True, "records": []})
+            return self._send_json(200, self.server.query_page(path[:-len("/query")], 0, query_object(query)))
+        locator = QUERY_LOCATOR_RE.search(path)
+        if locator:
+            return self._send_json(200, self.server.query_page(path[:locator.start()], int(locator.group("offset")),
+                                                               locator.group("object") or "Lead"))
+        job = BULK_JOB_RE.search(path)
+        if job and job.group("results") == "results":
+            offset = int(params.get("locator", ["0"])[0])
+            max_records = int(params.get("maxRecords", [str(self.server.records)])[0])
+            return self._send_csv(*self.server.bulk_results(offset, max_records))
+        if job and job.group("results"):
+            return self._send_csv(self.server.ingest_results(job.group("id"), job.group("results")), {})
+        if job:
+            return self._send_json(200, self.server.poll_job(job.group("id")))
+        if path.endswith("/limits"):
+            used = self.server.counters["requests"]
+            return self._send_json(200, {"DailyApiRequests": {"Max": self.server.api_allocation,
+                                                              "Remaining": self.server.api_allocation - used}})
+        describe = DESCRIBE_RE.search(path)
+        if describe:
+            if self.headers.get("If-Modified-Since") == DESCRIBE_LAST_MODIFIED:
+                self.send_response(304)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            return self._send_json(200, self.server.describe(describe.group(1)))
+        status, record = self.server.sobject_request("GET", path)
+        if status != 200:
+            return self._send_json(status, record)
+        etag = f'"{zlib.crc32(json.dumps(record).encode()):08x}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        return self._send_json(200, record, {"ETag": etag})
+
+    def end_headers(self):
+        self.send_header("Sforce-Limit-Info", f"api-usage={self.server.counters['requests']}/{self.server.api_allocation}")
+        if DESCRIBE_RE.search(urlsplit(self.path).path):
+            self.send_header("Last-Modified", DESCRIBE_LAST_MODIFIED)
+        super().end_headers()
+
+
+QUERY_LOCATOR_RE = re.compile(r"/query/01gFAKE(?P<object>[A-Za-z]*)-(?P<offset>\d+)$")
+QUERY_FROM_RE = re.compile(r"\bFROM\s+(\w+)", re.IGNORECASE)
+SOBJECT_RE = re.compile(r"/sobjects/(?P<object>\w+)(/(?P<id>\w+))?$")
+# 3-character key prefix of generated record ids
+ID_PREFIXES = {"Lead": "00Q", "Opportunity": "006"}
+ERROR_CODES = {400: "MALFORMED_QUERY", 403: "REQUEST_LIMIT_EXCEEDED", 404: "NOT_FOUND",
+               500: "UNKNOWN_EXCEPTION", 503: "SERVER_UNAVAILABLE"}
+DESCRIBE_RE = re.compile(r"/sobjects/(\w+)/describe$")
+DESCRIBE_LAST_MODIFIED = "Mon, 01 Jan 2024 00:00:00 GMT"
+DESCRIBE_RECORDS = {"Lead": (LeadRecord, {"LastName", "Company"}),
+                    "Opportunity": (OpportunityRecord, {"Name", "StageName", "CloseDate"})}
+DESCRIBE_TYPES = {bool: "boolean", int: "int", float: "double"}
+BULK_JOB_RE = re.compile(r"/jobs/(query|ingest)/(?P<id>750[^/]+)(/(?P<results>\w+))?$")
+
+
+def query_object(query: str) -> str:
+    '''
+    Object a query reads from; the generated dataset follows it (Lead unless it is Opportunity).
+    '''
+    match = QUERY_FROM_RE.search(query)
+    return match.group(1) if match and match.group(1) in ID_PREFIXES else "Lead"
+
+
+class FakeSalesforceServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0, records: int = 1, batch_size: int = 2000, extra_fields: int = 0,
+                 jitter: float = 0.0, error_rate: float = 0.0, error_status: int = 503, seed: Optional[int] = None,
+                 connect_latency: float = 0.0, certfile: Optional[str] = None):
+        '''
+        :param latency: seconds slept before answering each request
+        :param records: size of the generated dataset returned by /query
+        :param batch_size: records per query page
+        :param extra_fields: custom text fields added to every /query record, to simulate wide objects
+        :param jitter: up to this many extra seconds of latency, drawn uniformly per request
+        :param error_rate: share of API requests (token and /limits calls excepted) answered with error_status
+        :param error_status: status of injected failures (503 and 429 are retried by the client, 500 is not)
+        :param seed: seed of the jitter and error draws, for repeatable runs
+        :param connect_latency: seconds slept before accepting each new connection (its handshake round trips)
+        :param certfile: PEM file with the certificate and key to serve HTTPS with
+        '''
+        super().__init__(("127.0.0.1", 0), FakeSalesforceHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.connect_latency = connect_latency
+        self.tls: Optional[ssl.SSLContext] = None
+        if certfile:
+            self.tls = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            self.tls.load_cert_chain(certfile)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self.records = records
+        self.batch_size = batch_size
+        self.padding = {f"Field_{number}__c": f"value {number} " * 4 for number in range(extra_fields)}
+        # daily API allocation reported in Sforce-Limit-Info (usage is the request counter)
+        self.api_allocation = 1_000_000
+        # polls a bulk job answers InProgress before JobComplete
+        self.bulk_polls = 1
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._job_ids = itertools.count(1)
+        # records written through sobjects/<Object>: id -> row, None once deleted
+        self._store: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._record_ids = itertools.count(1)
+        self.counters = {"connections": 0, "tokens": 0, "requests": 0, "errors": 0}
+        self._counter_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def domain(self) -> str:
+        host, port = self.server_address[:2]
+        return f"{host}:{port}"
+
+    def get_request(self):
+        sock, address = super().get_request()
+        if self.tls is not None:
+            # the handshake runs on the connection's own thread (FakeSalesforceHandler.setup)
+            sock = self.tls.wrap_socket(sock, server_side=True, do_handshake_on_connect=False)
+        return sock, address
+
+    def handle_error(self, request, client_address):
+        # clients that stop reading early (capped or cancelled prefetch) drop their connection
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def count(self, name: str) -> None:
+        with self._counter_lock:
+            self.counters[name] += 1
+
+    def reset_counters(self) -> None:
+        with self._counter_lock:
+            self.counters = {name: 0 for name in self.counters}
+
+    def simulate_latency(self) -> None:
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+
+    def injected_error(self) -> Optional[int]:
+        '''
+            Status to fail the current request with, or None to answer it normally.
+        '''
+        if not self.error_rate or self._random.random() >= self.error_rate:
+            return None
+        self.count("errors")
+        return self.error_status
+
+    def query_page(self, base_path: str, offset: int, object_name: str = "Lead") -> dict:
+        end = min(offset + self.batch_size, self.records)
+        page = {
+            "totalSize": self.records,
+            "done": end >= self.records,
+            "records": [self.make_record(index, object_name) | self.padding for index in range(offset, end)],
+        }
+        if not page["done"]:
+            locator = "" if object_name == "Lead" else object_name
+            page["nextRecordsUrl"] = f"{base_path}/query/01gFAKE{locator}-{end}"
+        return page
+
+    def sobject_request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Tuple[int, Any]:
+        '''
+            (status, body) of a create / get / update / delete on sobjects/<Object>[/<Id>]. Created and
+            updated rows are kept; ids never written to are answered from the generated dataset.
+        '''
+        match = SOBJECT_RE.search(path)
+        object_name = match.group("object") if match else "Lead"
+        record_id = match.group("id") if match else None
+        with self._counter_lock:
+            if method == "POST":
+                record_id = f"{ID_PREFIXES.get(object_name, '001')}{next(self._record_ids):012d}AAA"
+                self._store[record_id] = {"attributes": {"type": object_name}, **(body or {}), "Id": record_id}
+                return 201, {"id": record_id, "success": True, "errors": []}
+            stored = self._store.get(record_id, ...)
+            if stored is None:
+                return 404, [{"message": "The requested resource does not exist", "errorCode": "NOT_FOUND"}]
+            if method == "DELETE":
+                self._store[record_id] = None
+                return 204, None
+            record = self._generated(object_name, record_id) if stored is ... else stored
+            if method == "PATCH":
+                self._store[record_id] = record | (body or {})
+                return 204, None
+            return 200, record
+
+    def _generated(self, object_name: str, record_id: Optional[str]) -> Dict[str, Any]:
+        digits = (record_id or "")[3:]
+        record = self.make_record(int(digits) if digits.isdigit() else 0, object_name)
+        if record_id:
+            record["Id"] = record_id
+        return record
+
+    def composite(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        '''
+            Answer every subrequest of a /composite request (sObject rows and queries only).
+        '''
+        responses = []
+        for sub in body["compositeRequest"]:
+            url = urlsplit(sub["url"])
+            status, result = {"POST": (201, {"id": "00Q000000000001AAA", "success": True, "errors": []}),
+                              "PATCH": (204, None), "DELETE": (204, None)}.get(sub["method"], (200, None))
+            if sub["method"] == "GET":
+                locator = QUERY_LOCATOR_RE.search(url.path)
+                if url.path.endswith("/query"):
+                    query = parse_qs(url.query).get("q", [""])[0]
+                    result = self.query_page(url.path[:-len("/query")], 0, query_object(query))
+                elif locator:
+                    result = self.query_page(url.path[:locator.start()], int(locator.group("offset")),
+                                             locator.group("object") or "Lead")
+                else:
+                    status, result = self.sobject_request("GET", url.path)
+            responses.append({"body": result, "httpHeaders": {}, "httpStatusCode": status,
+                              "referenceId": sub["referenceId"]})
+        return {"compositeResponse": responses}
+
+    def create_job(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        job_id = f"750FAKE{next(self._job_ids):011d}"
+        # query jobs start straight away, ingest jobs wait for their upload
+        state = "UploadComplete" if "query" in body else "Open"
+        with self._counter_lock:
+            self._jobs[job_id] = {"id": job_id, "operation": body.get("operation"), "object": body.get("object"),
+                                  "query": body.get("query"), "state": state, "polls": 0, "data": ""}
+        return {"id": job_id, "operation": body.get("operation"), "state": state}
+
+    def upload_ingest_data(self, job_id: str, data: str) -> None:
+        with self._counter_lock:
+            self._jobs[job_id]["data"] += data
+
+    def set_job_state(self, job_id: str, state: str) -> Dict[str, Any]:
+        with self._counter_lock:
+            self._jobs[job_id]["state"] = state
+            return self._job_info(self._jobs[job_id])
+
+    def poll_job(self, job_id: str) -> Dict[str, Any]:
+        with self._counter_lock:
+            job = self._jobs[job_id]
+            job["polls"] += 1
+            if job["state"] in ("UploadComplete", "InProgress"):
+                job["state"] = "JobComplete" if job["polls"] > self.bulk_polls else "InProgress"
+            return self._job_info(job)
+
+    @staticmethod
+    def _job_info(job: Dict[str, Any]) -> Dict[str, Any]:
+        info = {key: value for key, value in job.items() if key not in ("polls", "data")}
+        if job["data"]:
+            info["numberRecordsProcessed"] = len(job["data"].splitlines()) - 1
+            info["numberRecordsFailed"] = 0
+        return info
+
+    def ingest_results(self, job_id: str, kind: str) -> str:
+        with self._counter_lock:
+            rows = list(csv.reader(io.StringIO(self._jobs[job_id]["data"])))
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        header = rows[0] if rows else []
+        if kind == "successfulResults":
+            writer.writerow(["sf__Id", "sf__Created"] + header)
+            for index, row in enumerate(rows[1:]):
+                writer.writerow([f"00Q{index:015d}", "true"] + row)
+        elif kind == "failedResults":
+            writer.writerow(["sf__Id", "sf__Error"] + header)
+        else:
+            writer.writerow(header)
+        return out.getvalue()
+
+    def bulk_results(self, offset: int, max_records: int) -> tuple[str, Dict[str, str]]:
+        end = min(offset + max_records, self.records)
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(["Id", "LastName", "Company"])
+        for index in range(offset, end):
+            record = self.make_record(index)
+            writer.writerow([record["Id"], record["LastName"], record["Company"]])
+        headers = {
+            "Sforce-NumberOfRecords": str(end - offset),
+            "Sforce-Locator": str(end) if end < self.records else "null",
+        }
+        return out.getvalue(), headers
+
+    @staticmethod
+    def describe(object_name: str) -> dict:
+        '''
+            Describe metadata derived from the record dataclass: every field createable and updateable,
+            the Salesforce-required ones not nillable.
+        '''
+        record_cls, required = DESCRIBE_RECORDS.get(object_name, (LeadRecord, set()))
+        fields = [{"name": "Id", "type": "id", "length": 18, "createable": False, "updateable": False, "nillable": False}]
+        for name, hint in typing.get_type_hints(record_cls).items():
+            if name in ("Id", "custom_fields"):
+                continue
+            base = next((arg for arg in typing.get_args(hint) if arg is not type(None)), hint)
+            fields.append({"name": name, "type": DESCRIBE_TYPES.get(base, "string"), "length": 255,
+                           "createable": True, "updateable": True, "nillable": name not in required,
+                           "defaultedOnCreate": False, "picklistValues": [], "restrictedPicklist": False})
+        return {"name": object_name, "fields": fields}
+
+    @staticmethod
+    def make_record(index: int, object_name: str = "Lead") -> dict:
+        record_id = f"{ID_PREFIXES.get(object_name, '00Q')}{index:015d}"
+        record = {"attributes": {"type": object_name, "url": f"/services/data/v61.0/sobjects/{object_name}/{record_id}"},
+                  "Id": record_id}
+        if object_name == "Opportunity":
+            return record | {
+                "Name": f"Opportunity {index}",
+                "StageName": ("Prospecting", "Negotiation", "Closed Won")[index % 3],
+                "CloseDate": "2026-06-30",
+                "Amount": float(index % 10000) * 12.5,
+                "Probability": float(index % 100),
+            }
+        return record | {"LastName": f"Lead {index}", "Company": "Fake Co"}
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+def _serve(connection, options: Dict[str, Any]) -> None:
+    with FakeSalesforceServer(**options) as server:
+        connection.send(server.domain)
+        connection.recv()
+
+
+@contextmanager
+def serve_in_subprocess(**options: Any) -> Iterator[str]:
+    '''
+    Run a FakeSalesforceServer(**options) in a child process, so the server's own allocations and
+    CPU time stay out of the client measurements.
+    :return: the server's host:port domain
+    '''
+    connection, child_connection = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=_serve, args=(child_connection, options), daemon=True)
+    server.start()
+    try:
+        yield connection.recv()
+    finally:
+        connection.send("stop")
+        server.join()
+
+
+class LocalSalesforceSession(SalesforceSession):
+    '''
+        SalesforceSession pointed at a plain-HTTP local server (``host:port`` domain).
+    '''
+
+    @staticmethod
+    def _validate_domain(domain) -> None:
+        pass
+
+    def _build_endpoint(self, domain):
+        return f"http://{domain}/"
+
+
+class LocalAsyncSalesforceSession(AsyncSalesforceSession):
+    '''
+        AsyncSalesforceSession pointed at a plain-HTTP local server (``host:port`` domain).
+    '''
+
+    @staticmethod
+    def _validate_domain(domain) -> None:
+        pass
+
+    def _build_endpoint(self, domain):
+        return f"http://{domain}/"
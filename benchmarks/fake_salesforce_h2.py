@@ -0,0 +1,247 @@
+'''
+HTTPS stand-ins for the Salesforce REST API: the FakeSalesforceServer API served over HTTP/1.1
+with TLS and over HTTP/2 (TLS with ALPN "h2"), from one child process and one dataset, with a
+throwaway self-signed certificate. Each HTTP/2 request is answered by the same
+FakeSalesforceHandler code as over HTTP/1.1, so both protocols see identical responses and
+latency; only the connection handling differs.
+
+Needs the h2 package (pip install "httpx[http2]").
+'''
+import asyncio
+import datetime
+import email.message
+import io
+import ipaddress
+import multiprocessing
+import os
+import ssl
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.fake_salesforce import FakeSalesforceHandler, FakeSalesforceServer, LocalAsyncSalesforceSession
+
+# hop-by-hop and framing headers that HTTP/2 does not carry
+H1_ONLY_HEADERS = {"connection", "keep-alive", "transfer-encoding", "content-length"}
+
+
+def write_self_signed_cert(directory: str) -> str:
+    '''
+    Write a certificate for localhost / 127.0.0.1 and its key to one PEM file.
+    :return: path of the PEM file, usable as certfile and as the clients' cafile
+    '''
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=1)).not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName("localhost"),
+                                                    x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+    path = os.path.join(directory, "localhost.pem")
+    with open(path, "wb") as file:
+        file.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                     serialization.NoEncryption()))
+        file.write(certificate.public_bytes(serialization.Encoding.PEM))
+    return path
+
+
+def handle_request(server: FakeSalesforceServer, method: str, path: str, headers: List[Tuple[str, str]],
+                   body: bytes) -> Tuple[int, List[Tuple[str, str]], bytes]:
+    '''
+    Answer one request with FakeSalesforceHandler, outside of any HTTP/1.1 connection.
+    :return: status, response headers, response body
+    '''
+    handler = FakeSalesforceHandler.__new__(FakeSalesforceHandler)
+    handler.server = server
+    handler.command, handler.path, handler.request_version = method, path, "HTTP/1.1"
+    handler.requestline = f"{method} {path} HTTP/1.1"
+    handler.client_address = ("127.0.0.1", 0)
+    handler.headers = email.message.Message()
+    for name, value in headers:
+        if not name.startswith(":"):
+            handler.headers[name] = value
+    if body and "content-length" not in handler.headers:
+        handler.headers["Content-Length"] = str(len(body))
+    handler.rfile = io.BytesIO(body)
+    handler.wfile = io.BytesIO()
+    getattr(handler, f"do_{method}")()
+    head, _, payload = handler.wfile.getvalue().partition(b"\r\n\r\n")
+    status_line, *lines = head.decode("latin-1").split("\r\n")
+    response_headers = [(name.lower(), value) for name, value in (line.split(": ", 1) for line in lines)
+                        if name.lower() not in H1_ONLY_HEADERS]
+    return int(status_line.split()[1]), response_headers, payload
+
+
+class H2Protocol(asyncio.Protocol):
+    '''
+        One HTTP/2 connection. Every stream is answered on the executor, so slow (latency-injected)
+        requests overlap like the threads of the HTTP/1.1 server.
+    '''
+
+    def __init__(self, server: FakeSalesforceServer, executor: ThreadPoolExecutor):
+        import h2.config
+        import h2.connection
+
+        self.server = server
+        self.executor = executor
+        self.h2 = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False, header_encoding="utf-8"))
+        self.transport: Optional[asyncio.Transport] = None
+        self.requests: Dict[int, Tuple[List[Tuple[str, str]], bytearray]] = {}
+        self.window_open: Dict[int, asyncio.Event] = {}
+        self.ready = asyncio.Event()
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+        asyncio.ensure_future(self._handshake())
+
+    async def _handshake(self) -> None:
+        # TCP and TLS round trips of the new connection, before any stream is served
+        if self.server.connect_latency:
+            await asyncio.sleep(self.server.connect_latency)
+        self.server.count("connections")
+        self.h2.initiate_connection()
+        self._flush()
+        self.ready.set()
+
+    def _flush(self) -> None:
+        data = self.h2.data_to_send()
+        if data and not self.transport.is_closing():
+            self.transport.write(data)
+
+    def data_received(self, data: bytes) -> None:
+        import h2.events
+
+        for event in self.h2.receive_data(data):
+            if isinstance(event, h2.events.RequestReceived):
+                self.requests[event.stream_id] = (event.headers, bytearray())
+            elif isinstance(event, h2.events.DataReceived):
+                self.requests[event.stream_id][1].extend(event.data)
+                self.h2.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+            elif isinstance(event, h2.events.StreamEnded):
+                headers, body = self.requests.pop(event.stream_id)
+                asyncio.ensure_future(self._respond(event.stream_id, headers, bytes(body)))
+            elif isinstance(event, h2.events.WindowUpdated):
+                for stream_id, window_open in self.window_open.items():
+                    if event.stream_id in (0, stream_id):
+                        window_open.set()
+            elif isinstance(event, h2.events.StreamReset):
+                self.requests.pop(event.stream_id, None)
+            elif isinstance(event, h2.events.ConnectionTerminated):
+                self.transport.close()
+        self._flush()
+
+    async def _respond(self, stream_id: int, headers: List[Tuple[str, str]], body: bytes) -> None:
+        await self.ready.wait()
+        request = dict(headers)
+        status, response_headers, payload = await asyncio.get_running_loop().run_in_executor(
+            self.executor, handle_request, self.server, request[":method"], request[":path"], headers, body)
+        self.h2.send_headers(stream_id, [(":status", str(status)), ("content-length", str(len(payload))),
+                                         *response_headers], end_stream=not payload)
+        self._flush()
+        view = memoryview(payload)
+        while view:
+            window = min(self.h2.local_flow_control_window(stream_id), self.h2.max_outbound_frame_size)
+            if window <= 0:
+                window_open = self.window_open[stream_id] = asyncio.Event()
+                await window_open.wait()
+                del self.window_open[stream_id]
+                continue
+            chunk, view = view[:window], view[window:]
+            self.h2.send_data(stream_id, bytes(chunk), end_stream=not view)
+            self._flush()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        for window_open in self.window_open.values():
+            window_open.set()
+
+
+@dataclass
+class TlsStandIn:
+    '''
+        Addresses of the running stand-ins and the CA file clients must trust.
+    '''
+    h1_domain: str
+    h2_domain: str
+    cafile: str
+    _connection: Any
+
+    def counters(self) -> Dict[str, int]:
+        '''
+            Connections, tokens, requests and errors counted so far (both protocols together).
+        '''
+        self._connection.send("counters")
+        return self._connection.recv()
+
+
+def _serve(connection, certfile: str, options: Dict[str, Any]) -> None:
+    with FakeSalesforceServer(certfile=certfile, **options) as server:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile)
+        context.set_alpn_protocols(["h2"])
+        loop = asyncio.new_event_loop()
+        executor = ThreadPoolExecutor(max_workers=512)
+        h2_server = loop.run_until_complete(
+            loop.create_server(lambda: H2Protocol(server, executor), "127.0.0.1", 0, ssl=context))
+        host, port = h2_server.sockets[0].getsockname()[:2]
+        connection.send((server.domain, f"{host}:{port}"))
+
+        def commands() -> None:
+            while connection.recv() == "counters":
+                connection.send(dict(server.counters))
+            loop.call_soon_threadsafe(loop.stop)
+
+        threading.Thread(target=commands, daemon=True).start()
+        loop.run_forever()
+        h2_server.close()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+@contextmanager
+def serve_tls_in_subprocess(**options: Any) -> Iterator[TlsStandIn]:
+    '''
+    Run the HTTP/1.1 and HTTP/2 stand-ins, sharing one FakeSalesforceServer(**options), in a child process.
+    '''
+    directory = tempfile.mkdtemp()
+    certfile = write_self_signed_cert(directory)
+    connection, child_connection = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=_serve, args=(child_connection, certfile, options), daemon=True)
+    server.start()
+    try:
+        h1_domain, h2_domain = connection.recv()
+        yield TlsStandIn(h1_domain, h2_domain, certfile, connection)
+    finally:
+        connection.send("stop")
+        server.join()
+
+
+class TlsAsyncSalesforceSession(LocalAsyncSalesforceSession):
+    '''
+        AsyncSalesforceSession pointed at a local HTTPS stand-in (``host:port`` domain), trusting *cafile*.
+    '''
+
+    def __init__(self, *args: Any, cafile: Optional[str] = None, **kwargs: Any):
+        self.cafile = cafile
+        super().__init__(*args, **kwargs)
+
+    def _build_endpoint(self, domain):
+        return f"https://{domain}/"
+
+    def _build_instance(self, *, timeout: Optional[float], limits: httpx.Limits,
+                        http2: bool = False) -> httpx.AsyncClient:
+        return httpx.AsyncClient(timeout=timeout, limits=limits, http2=http2,
+                                 verify=ssl.create_default_context(cafile=self.cafile))
@@ -0,0 +1,150 @@
+'''
+Measurement helpers shared by the end-to-end benchmarks: per-call latencies, throughput,
+percentiles, peak traced memory, and comparison against a saved baseline.
+'''
+import asyncio
+import gc
+import json
+import math
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+
+def percentile(ordered: Sequence[float], q: float) -> float:
+    '''
+    Nearest-rank percentile of already sorted values (0 when there are none).
+    :param q: percentile in [0, 100]
+    '''
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+@dataclass
+class Summary:
+    '''
+        Outcome of one benchmark scenario. Latencies are in milliseconds, peak memory in MiB of
+        Python allocations traced during a separate, shorter pass.
+    '''
+    name: str
+    calls: int
+    errors: int
+    seconds: float
+    throughput: float
+    p50: float
+    p95: float
+    p99: float
+    peak_mib: float = 0.0
+    error_types: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_latencies(cls, name: str, latencies: List[float], errors: Dict[str, int], seconds: float) -> "Summary":
+        ordered = sorted(latencies)
+        calls = len(ordered)
+        return cls(name=name, calls=calls, errors=sum(errors.values()), seconds=seconds,
+                   throughput=calls / seconds if seconds else 0.0,
+                   p50=percentile(ordered, 50) * 1000, p95=percentile(ordered, 95) * 1000,
+                   p99=percentile(ordered, 99) * 1000, error_types=dict(errors))
+
+    HEADER = f"{'scenario':<26}{'calls':>7}{'errors':>8}{'calls/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'peak MiB':>10}"
+
+    def row(self) -> str:
+        return (f"{self.name:<26}{self.calls:>7}{self.errors:>8}{self.throughput:>10.1f}"
+                f"{self.p50:>9.2f}{self.p95:>9.2f}{self.p99:>9.2f}{self.peak_mib:>10.2f}")
+
+
+def _count_error(errors: Dict[str, int], err: BaseException) -> None:
+    name = type(err).__name__
+    errors[name] = errors.get(name, 0) + 1
+
+
+def run_sync(name: str, call: Callable[[int], Any], iterations: int) -> Summary:
+    '''
+    Time *iterations* sequential calls of call(i). Failing calls count as errors, not latencies.
+    '''
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    start = time.perf_counter()
+    for index in range(iterations):
+        begin = time.perf_counter()
+        try:
+            call(index)
+        except Exception as err:
+            _count_error(errors, err)
+            continue
+        latencies.append(time.perf_counter() - begin)
+    return Summary.from_latencies(name, latencies, errors, time.perf_counter() - start)
+
+
+async def run_async(name: str, call: Callable[[int], Awaitable[Any]], iterations: int, concurrency: int = 1) -> Summary:
+    '''
+    Time *iterations* calls of await call(i), at most *concurrency* in flight at once.
+    '''
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            begin = time.perf_counter()
+            try:
+                await call(index)
+            except Exception as err:
+                _count_error(errors, err)
+                return
+            latencies.append(time.perf_counter() - begin)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(iterations)))
+    return Summary.from_latencies(name, latencies, errors, time.perf_counter() - start)
+
+
+def peak_memory(action: Callable[[], Any]) -> float:
+    '''
+    Peak MiB of Python allocations made while running action().
+    '''
+    gc.collect()
+    tracemalloc.start()
+    try:
+        action()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def save(path: str, summaries: Sequence[Summary], options: Dict[str, Any]) -> None:
+    with open(path, "w") as file:
+        json.dump({"options": options, "scenarios": [asdict(summary) for summary in summaries]}, file, indent=2)
+
+
+def load(path: str) -> Dict[str, Any]:
+    '''
+    Results written by save(): {"options": {...}, "scenarios": [...]}.
+    '''
+    with open(path) as file:
+        return json.load(file)
+
+
+def regressions(summaries: Sequence[Summary], saved: Dict[str, Any], tolerance: float) -> List[str]:
+    '''
+    Scenarios worse than the saved baseline by more than *tolerance* (0.2 = 20%): lower throughput,
+    higher p95 latency or peak memory, or failed calls where the baseline had none.
+    '''
+    baseline = {scenario["name"]: scenario for scenario in saved["scenarios"]}
+    found: List[str] = []
+    for summary in summaries:
+        before: Optional[Dict[str, Any]] = baseline.get(summary.name)
+        if before is None:
+            continue
+        if summary.throughput < before["throughput"] * (1 - tolerance):
+            found.append(f"{summary.name}: throughput {before['throughput']:.1f} -> {summary.throughput:.1f} calls/s")
+        if summary.p95 > before["p95"] * (1 + tolerance):
+            found.append(f"{summary.name}: p95 {before['p95']:.2f} -> {summary.p95:.2f} ms")
+        if summary.peak_mib > before["peak_mib"] * (1 + tolerance) and summary.peak_mib - before["peak_mib"] > 0.1:
+            found.append(f"{summary.name}: peak memory {before['peak_mib']:.2f} -> {summary.peak_mib:.2f} MiB")
+        if summary.errors and not before["errors"]:
+            found.append(f"{summary.name}: {summary.errors} failed calls {summary.error_types}")
+    return found
@@ -1,15 +1,25 @@
 # entry point for the actual mcp server
-from salesforce_mcp.utils.soql import SoqlModule
-from salesforce_mcp.objects.LeadObject import LeadObject
-from salesforce_mcp.types.LeadRecord import LeadRecord
-from salesforce_mcp.objects.OpportunityObject import OpportunityObject
-from salesforce_mcp.types.OpportunityRecord import OpportunityRecord
-from salesforce_mcp.services.SalesforceSession import SalesforceSession
+import time
+# start of the server's imports, for the startup report
+STARTED = time.perf_counter()
+# the sessions (httpx / requests), the query, bulk and object modules and shared_state are imported
+# by the factories and tools that use them, on the first call, not here: only FastMCP, which the
+# tools register with, and the small utils the module level needs are loaded at startup
+from salesforce_mcp.services.SessionRegistry import SessionRegistry
+from salesforce_mcp.utils.retry import RetryPolicy
+from salesforce_mcp.utils.metrics import MetricsRegistry, TOOL_DURATION, TOOL_ERRORS, TOOL_IN_PROGRESS
+from salesforce_mcp.utils.telemetry import ApiTelemetry, tool_context
+from salesforce_mcp.utils.startup import StartupReport
 from dotenv import load_dotenv
 from fastmcp import FastMCP
-import logging, sys
-from salesforce_mcp.utils.credentials import get_credentials
-from typing import Optional, Dict, Any
+import asyncio, contextlib, functools, logging, multiprocessing, signal, socket, sys, os
+from salesforce_mcp.utils.credentials import load_credentials
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
+
+if TYPE_CHECKING:
+    from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+    from salesforce_mcp.services.SalesforceSession import SalesforceSession
+    from salesforce_mcp.utils.soql import SoqlResult
 
 logging.basicConfig(
     level=logging.INFO,
@@ -18,11 +28,204 @@ logging.basicConfig(
         logging.StreamHandler(sys.stderr)
     ],
 )
+# httpx logs every request at INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
 
 load_dotenv()
 
+# one warmed session (token + keep-alive pool) per credential set, shared by every tool call
+# transient failures are retried; concurrency is throttled as the org nears its daily API allocation
+RETRY_POLICY = RetryPolicy(max_attempts=int(os.environ.get("SF_MAX_ATTEMPTS", 4)))
+API_USAGE_SOFT_LIMIT = float(os.environ.get("SF_API_USAGE_SOFT_LIMIT", 0.8))
+API_USAGE_HARD_LIMIT = float(os.environ.get("SF_API_USAGE_HARD_LIMIT", 0.95))
+
+# API consumption of both registries, exposed through the api_usage tool and resource
+telemetry = ApiTelemetry(window=float(os.environ.get("SF_TELEMETRY_WINDOW", 3600)))
+# seconds between /limits samples (0 disables)
+LIMITS_SAMPLE_INTERVAL = float(os.environ.get("SF_LIMITS_SAMPLE_INTERVAL", 300))
+
+# latency histograms, error counts, bytes and concurrency of the tools, session methods and HTTP calls,
+# in Prometheus text format on http://127.0.0.1:SF_METRICS_PORT/metrics and/or in SF_METRICS_FILE
+metrics = MetricsRegistry()
+METRICS_PORT = int(os.environ.get("SF_METRICS_PORT", 0))
+METRICS_FILE = os.environ.get("SF_METRICS_FILE")
+METRICS_FILE_INTERVAL = float(os.environ.get("SF_METRICS_FILE_INTERVAL", 15))
+
+# time to imports done, server ready, session warm and first tool call, logged and in the metrics
+startup = StartupReport(STARTED, metrics)
+# authenticate and open the pooled connection in the background as soon as the server is up,
+# instead of on the first tool call (for hosts that spawn a server per agent session)
+PREWARM = os.environ.get("SF_PREWARM", "false").lower() in ("1", "true", "yes")
+
+# stdio for a single local client; "http" (streamable HTTP) to serve many agent sessions at once
+MCP_TRANSPORT = os.environ.get("SF_MCP_TRANSPORT", "stdio")
+MCP_HOST = os.environ.get("SF_MCP_HOST", "127.0.0.1")
+MCP_PORT = int(os.environ.get("SF_MCP_PORT", 8000))
+# HTTP transports only: worker processes accepting on the one port, each with its own event loop
+MCP_WORKERS = int(os.environ.get("SF_MCP_WORKERS", 1))
+
+# token, describe metadata and query results shared by the workers so they refresh and fetch once, not N times
+SHARED_STATE_PATH = os.environ.get("SF_SHARED_STATE_PATH") or (
+    os.path.join(os.path.expanduser("~"), ".cache", "salesforce-mcp", "state.sqlite") if MCP_WORKERS > 1 else None)
+shared_state = None
+if SHARED_STATE_PATH:
+    from salesforce_mcp.utils.shared_state import SharedStateStore
+    shared_state = SharedStateStore(SHARED_STATE_PATH)
+
+session_registry = SessionRegistry(
+    session_cls="salesforce_mcp.services.AsyncSalesforceSession:AsyncSalesforceSession",
+    max_connections=int(os.environ.get("SF_POOL_MAXSIZE", 10)),
+    max_keepalive_connections=int(os.environ.get("SF_POOL_MAXSIZE", 10)),
+    # opt-in: multiplex concurrent calls over one HTTP/2 connection (requires httpx[http2])
+    http2=os.environ.get("SF_HTTP2", "false").lower() in ("1", "true", "yes"),
+    # opt-in: coalesce concurrent record/query calls arriving within this window into one /composite request
+    batch_window=float(os.environ.get("SF_BATCH_WINDOW_MS", 0)) / 1000 or None,
+    batch_max_size=int(os.environ.get("SF_BATCH_MAX_SIZE", 25)),
+    # repeated run_soql queries are served from memory until they expire or a Lead/Opportunity write touches them
+    query_cache_ttl=float(os.environ.get("SF_QUERY_CACHE_TTL", 60)),
+    query_cache_max_entries=int(os.environ.get("SF_QUERY_CACHE_MAX_ENTRIES", 256)),
+    query_cache_max_bytes=int(os.environ.get("SF_QUERY_CACHE_MAX_BYTES", 16 * 1024 * 1024)),
+    # lead/opportunity writes are checked against cached describe metadata before they are sent
+    describe_cache_dir=os.environ.get("SF_DESCRIBE_CACHE_DIR",
+                                      os.path.join(os.path.expanduser("~"), ".cache", "salesforce-mcp", "describe")),
+    validate_writes=os.environ.get("SF_VALIDATE_WRITES", "true").lower() not in ("0", "false", "no"),
+    retry_policy=RETRY_POLICY,
+    api_usage_soft_limit=API_USAGE_SOFT_LIMIT,
+    api_usage_hard_limit=API_USAGE_HARD_LIMIT,
+    telemetry=telemetry,
+    metrics=metrics,
+    shared_state=shared_state,
+)
+
+
+# bulk jobs are long-running polls and streamed downloads; they run on a worker thread with a sync session
+bulk_session_registry = SessionRegistry(
+    pool_connections=int(os.environ.get("SF_POOL_CONNECTIONS", 10)),
+    pool_maxsize=int(os.environ.get("SF_POOL_MAXSIZE", 10)),
+    retry_policy=RETRY_POLICY,
+    api_usage_soft_limit=API_USAGE_SOFT_LIMIT,
+    api_usage_hard_limit=API_USAGE_HARD_LIMIT,
+    telemetry=telemetry,
+    metrics=metrics,
+    shared_state=shared_state,
+)
+
+# run_soql with fetch_all switches to a Bulk API 2.0 job when COUNT() reaches this many records (0 disables)
+BULK_THRESHOLD = int(os.environ.get("SF_BULK_THRESHOLD", 50000))
+# default byte budget of a run_soql response, past which records are left out (0 = unlimited)
+QUERY_OUTPUT_MAX_BYTES = int(os.environ.get("SF_QUERY_OUTPUT_MAX_BYTES", 0))
+# opt-in: check run_soql queries against their explain plan and warn about, limit or refuse costly table scans
+SELECTIVITY_GUARD = os.environ.get("SF_SELECTIVITY_GUARD", "off").lower()
+selectivity_guard = None
+if SELECTIVITY_GUARD not in ("", "0", "off", "false", "no"):
+    from salesforce_mcp.utils.query_plan import SelectivityGuard
+    selectivity_guard = SelectivityGuard(
+        action=SELECTIVITY_GUARD,
+        max_cost=float(os.environ.get("SF_SELECTIVITY_MAX_COST", 1.0)),
+        limit=int(os.environ.get("SF_SELECTIVITY_LIMIT", 2000)),
+        plan_ttl=float(os.environ.get("SF_QUERY_PLAN_TTL", 3600)),
+    )
+
+
+# Lead/Opportunity objects are kept per session so their record caches outlive a single tool call
+RECORD_CACHE_SIZE = int(os.environ.get("SF_RECORD_CACHE_SIZE", 1024))
+_sf_objects: Dict[tuple, Any] = {}
+
+
+_limits_sampler: Optional[asyncio.Task] = None
+
+
+async def sample_limits_periodically(sf_session: "AsyncSalesforceSession") -> None:
+    while True:
+        try:
+            with tool_context("limits_sampler"):
+                await sf_session.sample_limits()
+        except Exception as err:
+            logging.warning(f"Could not sample org limits: {err}")
+        await asyncio.sleep(LIMITS_SAMPLE_INTERVAL)
+
+
+async def get_session() -> "AsyncSalesforceSession":
+    global _limits_sampler
+    sf_session = await session_registry.aget(load_credentials())
+    if LIMITS_SAMPLE_INTERVAL > 0 and (_limits_sampler is None or _limits_sampler.done()):
+        _limits_sampler = asyncio.create_task(sample_limits_periodically(sf_session))
+    return sf_session
+
+
+def tracked(tool):
+    '''
+        Attribute the Salesforce calls a tool makes to the tool in the API telemetry,
+        and time the tool in the metrics.
+    '''
+    @functools.wraps(tool)
+    async def wrapper(*args, **kwargs):
+        try:
+            with tool_context(tool.__name__), metrics.timed(TOOL_DURATION, TOOL_ERRORS, TOOL_IN_PROGRESS, tool=tool.__name__):
+                return await tool(*args, **kwargs)
+        finally:
+            startup.mark("first_tool_call")
+    return wrapper
+
+
+def start_metrics_export(worker: int = 0) -> None:
+    '''
+    :param worker: index of this worker process; worker i serves SF_METRICS_PORT + i and writes SF_METRICS_FILE.i
+    '''
+    if METRICS_PORT:
+        metrics.serve(METRICS_PORT + worker)
+        logging.info(f"Serving metrics on http://127.0.0.1:{METRICS_PORT + worker}/metrics")
+    if METRICS_FILE:
+        metrics.write_periodically(METRICS_FILE if MCP_WORKERS <= 1 else f"{METRICS_FILE}.{worker}",
+                                   METRICS_FILE_INTERVAL)
+
+
+def get_bulk_session() -> "SalesforceSession":
+    return bulk_session_registry.get(load_credentials())
+
+
+def get_sf_object(object_cls, sf_session):
+    key = (object_cls, sf_session)
+    sf_object = _sf_objects.get(key)
+    if sf_object is None:
+        sf_object = _sf_objects[key] = object_cls(sf_session, record_cache_size=RECORD_CACHE_SIZE)
+    return sf_object
+
+
+def bulk_query_rows(query: str, max_records: Optional[int] = None, include_deleted: bool = False) -> list:
+    from salesforce_mcp.utils.bulk import BulkQueryModule
+    bulk = BulkQueryModule(get_bulk_session())
+    return list(bulk.iter_rows(query, max_records=max_records, include_deleted=include_deleted))
+
+
+async def prewarm() -> None:
+    try:
+        sf_session = await get_session()
+        await sf_session.warm()
+        startup.mark("warm")
+    except Exception as err:
+        logging.warning(f"Could not pre-warm the Salesforce session: {err}")
+
+
+@contextlib.asynccontextmanager
+async def lifespan(server: FastMCP):
+    global _limits_sampler
+    startup.mark("ready")
+    prewarm_task = asyncio.create_task(prewarm()) if PREWARM else None
+    try:
+        yield
+    finally:
+        for task in (prewarm_task, _limits_sampler):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        _limits_sampler = None
+
+
 mcp: FastMCP = FastMCP(
     name="Salesforce MCP",
+    lifespan=lifespan,
     instructions="""
         This server queues salesforce REST API to fetch data from the CRM.
         ...
@@ -30,31 +233,172 @@ mcp: FastMCP = FastMCP(
 )
 
 
+def soql_output(results: "SoqlResult", columnar: bool, fields: Optional[List[str]], strip_attributes: bool,
+                omit_nulls: bool, max_bytes: Optional[int], tabular: bool) -> Dict[str, Any]:
+    '''
+        run_soql response: the columnar layout, or records / tabular rows trimmed to the output budget.
+    '''
+    if max_bytes is None and QUERY_OUTPUT_MAX_BYTES > 0:
+        max_bytes = QUERY_OUTPUT_MAX_BYTES
+    return results.to_output(fields, strip_attributes, omit_nulls, max_bytes=max_bytes, tabular=tabular,
+                             columnar=columnar)
+
+
+def with_selectivity(output: Dict[str, Any], selectivity: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    '''
+        run_soql response with the selectivity guard's report, when it flagged the query.
+    '''
+    if selectivity is not None:
+        output["selectivity"] = selectivity
+    return output
+
+
 @mcp.tool(
     name="run_soql",
     description="""Queries Salesforce for data using soql.
         Any object or field that is not salesforce defined ends with __c
+
+        By default only the first page of results (up to 2000 records) is returned and
+        done is false when more remain. Set fetch_all to follow every page, optionally
+        capped with max_records. Very large fetch_all results are extracted with a
+        Bulk API job, in which case every value is returned as a string.
+
+        Results are cached briefly; set cache to false to force a fresh read.
+
+        Output controls: fields keeps only the listed fields (dotted paths such as Account.Name
+        reach into related records), attributes blocks are dropped unless strip_attributes is
+        false, omit_nulls drops null fields, and max_bytes caps the size of the returned records.
+        truncated is the number of fetched records left out to fit the budget; totalSize is the
+        number of records the query matched.
+        Set tabular to get {"fields": [...], "rows": [[...], ...]} (one header, then one list of
+        values per record), or columnar to get {"columns": {field: [values...]}} instead of one
+        object per record; both are much smaller for wide or long results.
+
+        Queries that would scan a whole large object (no filter on an indexed field, leading-wildcard
+        LIKE, negative filters) may come back with a selectivity warning, with a LIMIT added, or be
+        refused, depending on the server configuration. Filter on indexed fields such as Id, Name,
+        lookups, CreatedDate or SystemModstamp to keep queries selective.
     """,
 )
-def run_soql(query: str):
+@tracked
+async def run_soql(query: str, fetch_all: bool = False, max_records: Optional[int] = None, cache: bool = True,
+                   columnar: bool = False, fields: Optional[List[str]] = None, strip_attributes: bool = True,
+                   omit_nulls: bool = False, max_bytes: Optional[int] = None, tabular: bool = False):
+    from salesforce_mcp.utils.soql import AsyncSoqlModule, SoqlResult
     try:
-        credentials = get_credentials()
-        sf_session = SalesforceSession(
-            domain=credentials.url,
-            username=credentials.username,
-            password=credentials.password,
-            client_id=credentials.client_id,
-            client_secret=credentials.client_secret
+        sf_session = await get_session()
+        soql = AsyncSoqlModule(
+            sf_session,
+            prefetch=int(os.environ.get("SF_QUERY_PREFETCH", 2)),
+            parallel_pages=int(os.environ.get("SF_QUERY_PARALLEL_PAGES", 0)),
+            stream=os.environ.get("SF_QUERY_STREAM", "false").lower() in ("1", "true", "yes"),
         )
-        soql = SoqlModule(sf_session)
-        results = soql.execute_soql(query)
-        return results
+        selectivity = None
+        if selectivity_guard is not None:
+            query, selectivity = await soql.guard_query(query, selectivity_guard)
+        if fetch_all and BULK_THRESHOLD > 0 and (max_records is None or max_records >= BULK_THRESHOLD):
+            size = await soql.count_records(query, cache=cache)
+            if size is not None and size >= BULK_THRESHOLD:
+                logging.info(f"Query matches {size} records, using Bulk API")
+                records = await asyncio.to_thread(bulk_query_rows, query, max_records)
+                results = SoqlResult(totalSize=size, records=records, done=len(records) >= size)
+                return with_selectivity(
+                    soql_output(results, columnar, fields, strip_attributes, omit_nulls, max_bytes, tabular), selectivity)
+        results = await soql.execute_soql(query, fetch_all=fetch_all, max_records=max_records, cache=cache)
+        return with_selectivity(
+            soql_output(results, columnar, fields, strip_attributes, omit_nulls, max_bytes, tabular), selectivity)
     except Exception as e:
         logging.error("Error occured while executing query")
         logging.error(e)
         raise e
 
 
+@mcp.tool(
+    name="query_cache_stats",
+    description="""Reports the run_soql result cache: entries, approximate bytes, hits, misses,
+        hit ratio, evictions and write invalidations.
+    """,
+)
+@tracked
+async def query_cache_stats():
+    sf_session = await get_session()
+    if sf_session.query_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **await asyncio.to_thread(sf_session.query_cache.stats)}
+
+
+@mcp.tool(
+    name="record_cache_stats",
+    description="""Reports the Lead and Opportunity record caches used by the get operations: cached rows,
+        hits (answered 304 Not Modified), misses, hit ratio, evictions and invalidations.
+    """,
+)
+@tracked
+async def record_cache_stats():
+    from salesforce_mcp.objects.LeadObject import AsyncLeadObject
+    from salesforce_mcp.objects.OpportunityObject import AsyncOpportunityObject
+    sf_session = await get_session()
+    return {
+        object_cls.object_name: get_sf_object(object_cls, sf_session).record_cache.stats()
+        if RECORD_CACHE_SIZE > 0 else {"enabled": False}
+        for object_cls in (AsyncLeadObject, AsyncOpportunityObject)
+    }
+
+
+@mcp.tool(
+    name="api_usage",
+    description="""Reports Salesforce API consumption: daily requests used and remaining (from the
+        Sforce-Limit-Info header and periodic /limits samples), burn rate per hour and projected
+        hours to exhaustion, and call counts per tool, endpoint and status over the rolling window
+        and since the server started.
+    """,
+)
+@tracked
+async def api_usage():
+    return telemetry.snapshot()
+
+
+@mcp.resource("salesforce://api-usage", name="api_usage", mime_type="application/json",
+              description="Salesforce API consumption, headroom and per-tool / per-endpoint call counts.")
+async def api_usage_resource() -> Dict[str, Any]:
+    return telemetry.snapshot()
+
+
+@mcp.tool(
+    name="run_bulk_query",
+    description="""Runs a SOQL query as a Salesforce Bulk API 2.0 job, for extractions of many
+        thousands of records. Values are returned as strings (empty values as null).
+
+        Set output_path to stream the CSV result straight to a file on the server instead of
+        returning the rows. include_deleted also returns deleted and archived records.
+    """,
+)
+@tracked
+async def run_bulk_query(query: str,
+                         output_path: Optional[str] = None,
+                         max_records: Optional[int] = None,
+                         include_deleted: bool = False):
+    from salesforce_mcp.utils.bulk import BulkQueryModule
+    from salesforce_mcp.utils.soql import SoqlResult
+    try:
+        if output_path:
+            bulk = BulkQueryModule(get_bulk_session())
+            written = await asyncio.to_thread(bulk.download, query, output_path,
+                                              max_records=max_records, include_deleted=include_deleted)
+            return {"success": True, "output_path": output_path, "records_written": written}
+        # one record past max_records tells whether the job had more
+        records = await asyncio.to_thread(bulk_query_rows, query,
+                                          None if max_records is None else max_records + 1, include_deleted)
+        truncated = max_records is not None and len(records) > max_records
+        if truncated:
+            records = records[:max_records]
+        return SoqlResult(totalSize=len(records), records=records, done=not truncated)
+    except Exception as e:
+        logging.error("Error occured while executing bulk query")
+        logging.error(e)
+        raise e
+
+
 @mcp.tool(
     name="run_lead_operation",
     description="""Runs CRUD operations for creating, updating, deleting, and fetching a Lead from Salesforce.
@@ -65,10 +409,14 @@ def run_soql(query: str):
     - delete: Deletes a Lead (requires lead_id)
     - get: Fetches a Lead by ID (requires lead_id)
     
+    For batches, pass records (create/update, each update record with its Id) or lead_ids
+    (delete/get) instead; they are sent 200 per request through sObject Collections.
+    
     All Salesforce custom fields must end with __c.
     """,
 )
-def run_lead_operation(
+@tracked
+async def run_lead_operation(
         operation: str,
         lead_id: Optional[str] = None,
         # Required fields
@@ -99,6 +447,10 @@ def run_lead_operation(
         is_converted: Optional[bool] = None,
         # Custom fields
         custom_fields: Optional[Dict[str, Any]] = None,
+        # Batch operations
+        records: Optional[List[Dict[str, Any]]] = None,
+        lead_ids: Optional[List[str]] = None,
+        all_or_none: bool = False,
 ):
     """
     Perform CRUD operations on Salesforce Leads.
@@ -131,20 +483,31 @@ def run_lead_operation(
         owner_id: Salesforce User ID of the lead owner
         is_converted: Whether the lead has been converted
         custom_fields: Dictionary of custom Salesforce fields (e.g., {"My_Field__c": "value"})
+        records: Records for batch create/update, keyed by Salesforce API field names (update records need Id)
+        lead_ids: Ids for batch delete/get
+        all_or_none: Roll back the whole batch if any record fails
     """
+    from salesforce_mcp.objects.LeadObject import AsyncLeadObject
+    from salesforce_mcp.types.LeadRecord import LeadRecord
     try:
-        credentials = get_credentials()
-        sf_session = SalesforceSession(
-            domain=credentials.url,
-            username=credentials.username,
-            password=credentials.password,
-            client_id=credentials.client_id,
-            client_secret=credentials.client_secret
-        )
-        lead_object = LeadObject(sf_session)
+        sf_session = await get_session()
+        lead_object = get_sf_object(AsyncLeadObject, sf_session)
 
         operation = operation.lower()
 
+        if records and operation == "create":
+            result = await lead_object.create_many(records, all_or_none=all_or_none)
+            return {"success": all(item.success for item in result), "operation": "create", "result": result}
+        if records and operation == "update":
+            result = await lead_object.update_many(records, all_or_none=all_or_none)
+            return {"success": all(item.success for item in result), "operation": "update", "result": result}
+        if lead_ids and operation == "delete":
+            result = await lead_object.delete_many(lead_ids, all_or_none=all_or_none)
+            return {"success": all(item.success for item in result), "operation": "delete", "result": result}
+        if lead_ids and operation == "get":
+            result = await lead_object.get_many(lead_ids)
+            return {"success": True, "operation": "get", "result": result}
+
         if operation == "create":
             if not last_name or not company:
                 raise ValueError("LastName and Company are required for creating a Lead")
@@ -176,7 +539,7 @@ def run_lead_operation(
                 IsConverted=is_converted,
                 custom_fields=custom_fields or {}
             )
-            result = lead_object.create(lead_data)
+            result = await lead_object.create(lead_data)
             return {"success": True, "operation": "create", "result": result}
 
         elif operation == "update":
@@ -210,20 +573,20 @@ def run_lead_operation(
                 IsConverted=is_converted,
                 custom_fields=custom_fields or {}
             )
-            result = lead_object.update(lead_id, lead_data)
+            result = await lead_object.update(lead_id, lead_data)
             return {"success": True, "operation": "update", "lead_id": lead_id, "result": result}
 
         elif operation == "delete":
             if not lead_id:
                 raise ValueError("lead_id is required for delete operation")
 
-            result = lead_object.delete(lead_id)
+            result = await lead_object.delete(lead_id)
             return {"success": True, "operation": "delete", "lead_id": lead_id, "deleted": result}
 
         elif operation == "get":
             if not lead_id:
                 raise ValueError("lead_id is required for delete operation")
-            result = lead_object.get(lead_id)
+            result = await lead_object.get(lead_id)
             return {"success": True, "operation": "delete", "lead_id": lead_id, "result": result}
     except Exception as err:
         raise err
@@ -239,10 +602,14 @@ def run_lead_operation(
     - delete: Deletes an Opportunity (requires opportunity_id)
     - get: Fetches an Opportunity by ID (requires opportunity_id)
 
+    For batches, pass records (create/update, each update record with its Id) or opportunity_ids
+    (delete/get) instead; they are sent 200 per request through sObject Collections.
+
     All Salesforce custom fields must end with __c.
     """,
 )
-def run_opportunity_operation(
+@tracked
+async def run_opportunity_operation(
         operation: str,
         opportunity_id: Optional[str] = None,
         # Required fields
@@ -272,6 +639,10 @@ def run_opportunity_operation(
         synced_quote_id: Optional[str] = None,
         # Custom fields
         custom_fields: Optional[Dict[str, Any]] = None,
+        # Batch operations
+        records: Optional[List[Dict[str, Any]]] = None,
+        opportunity_ids: Optional[List[str]] = None,
+        all_or_none: bool = False,
 ):
     """
     Perform CRUD operations on Salesforce Opportunities.
@@ -303,20 +674,31 @@ def run_opportunity_operation(
         contract_id: Associated Contract ID
         synced_quote_id: Synced Quote ID
         custom_fields: Dictionary of custom Salesforce fields (e.g., {"My_Field__c": "value"})
+        records: Records for batch create/update, keyed by Salesforce API field names (update records need Id)
+        opportunity_ids: Ids for batch delete/get
+        all_or_none: Roll back the whole batch if any record fails
     """
+    from salesforce_mcp.objects.OpportunityObject import AsyncOpportunityObject
+    from salesforce_mcp.types.OpportunityRecord import OpportunityRecord
     try:
-        credentials = get_credentials()
-        sf_session = SalesforceSession(
-            domain=credentials.url,
-            username=credentials.username,
-            password=credentials.password,
-            client_id=credentials.client_id,
-            client_secret=credentials.client_secret
-        )
-        opportunity_object = OpportunityObject(sf_session)
+        sf_session = await get_session()
+        opportunity_object = get_sf_object(AsyncOpportunityObject, sf_session)
 
         operation = operation.lower()
 
+        if records and operation == "create":
+            result = await opportunity_object.create_many(records, all_or_none=all_or_none)
+            return {"success": all(item.success for item in result), "operation": "create", "result": result}
+        if records and operation == "update":
+            result = await opportunity_object.update_many(records, all_or_none=all_or_none)
+            return {"success": all(item.success for item in result), "operation": "update", "result": result}
+        if opportunity_ids and operation == "delete":
+            result = await opportunity_object.delete_many(opportunity_ids, all_or_none=all_or_none)
+            return {"success": all(item.success for item in result), "operation": "delete", "result": result}
+        if opportunity_ids and operation == "get":
+            result = await opportunity_object.get_many(opportunity_ids)
+            return {"success": True, "operation": "get", "result": result}
+
         if operation == "create":
             if not name or not stage_name or not close_date:
                 raise ValueError("Name, StageName, and CloseDate are required for creating an Opportunity")
@@ -347,7 +729,7 @@ def run_opportunity_operation(
                 SyncedQuoteId=synced_quote_id,
                 custom_fields=custom_fields or {}
             )
-            result = opportunity_object.create(opportunity_data)
+            result = await opportunity_object.create(opportunity_data)
             return {"success": True, "operation": "create", "result": result}
 
         elif operation == "update":
@@ -380,20 +762,20 @@ def run_opportunity_operation(
                 SyncedQuoteId=synced_quote_id,
                 custom_fields=custom_fields or {}
             )
-            result = opportunity_object.update(opportunity_data, opportunity_id)
+            result = await opportunity_object.update(opportunity_data, opportunity_id)
             return {"success": True, "operation": "update", "opportunity_id": opportunity_id, "result": result}
 
         elif operation == "delete":
             if not opportunity_id:
                 raise ValueError("opportunity_id is required for delete operation")
 
-            result = opportunity_object.delete(opportunity_id)
+            result = await opportunity_object.delete(opportunity_id)
             return {"success": True, "operation": "delete", "opportunity_id": opportunity_id, "deleted": result}
 
         elif operation == "get":
             if not opportunity_id:
                 raise ValueError("opportunity_id is required for get operation")
-            result = opportunity_object.get(opportunity_id)
+            result = await opportunity_object.get(opportunity_id)
             return {"success": True, "operation": "get", "opportunity_id": opportunity_id, "result": result}
 
         else:
@@ -402,10 +784,140 @@ def run_opportunity_operation(
     except Exception as err:
         raise err
 
+
+@mcp.tool(
+    name="run_bulk_operation",
+    description="""Runs a Salesforce Bulk API 2.0 ingest job to write many Leads or Opportunities at once.
+
+    Operations:
+    - insert: Creates the records
+    - update: Updates the records (each record requires Id)
+    - upsert: Inserts or updates by external id (requires external_id_field)
+    - delete: Deletes by Id (pass record_ids)
+    - hardDelete: Deletes by Id bypassing the recycle bin (pass record_ids)
+
+    Records are dictionaries keyed by Salesforce API field names, e.g. {"LastName": "Doe", "Company": "Acme"}.
+    All Salesforce custom fields must end with __c.
+    """,
+)
+@tracked
+async def run_bulk_operation(
+        object_name: str,
+        operation: str,
+        records: Optional[List[Dict[str, Any]]] = None,
+        record_ids: Optional[List[str]] = None,
+        external_id_field: Optional[str] = None,
+):
+    """
+    Perform bulk writes on Salesforce Leads or Opportunities.
+
+    Args:
+        object_name: 'Lead' or 'Opportunity'
+        operation: One of 'insert', 'update', 'upsert', 'delete' or 'hardDelete'
+        records: Records to write, keyed by Salesforce API field names
+        record_ids: Ids to delete (delete and hardDelete)
+        external_id_field: External id field used to match records (required for upsert)
+    """
+    from salesforce_mcp.objects.LeadObject import LeadObject
+    from salesforce_mcp.objects.OpportunityObject import OpportunityObject
+    try:
+        object_cls = {"lead": LeadObject, "opportunity": OpportunityObject}.get(object_name.lower())
+        if object_cls is None:
+            raise ValueError(f"Invalid object: {object_name}. Must be one of: Lead, Opportunity")
+        sf_object = object_cls(get_bulk_session())
+        if operation in ("delete", "hardDelete") and record_ids:
+            results = await asyncio.to_thread(sf_object.bulk_delete, record_ids, operation == "hardDelete")
+        elif records:
+            results = await asyncio.to_thread(sf_object.bulk_operation, operation, records, external_id_field)
+        else:
+            raise ValueError("records (or record_ids for delete/hardDelete) are required")
+        # the job ran on the bulk session; drop the query results cached by the tool session
+        query_cache = (await get_session()).query_cache
+        if query_cache is not None:
+            await asyncio.to_thread(query_cache.invalidate_object, object_cls.object_name)
+        jobs = [result.job for result in results]
+        return {
+            "success": all(job.get("state") == "JobComplete" for job in jobs),
+            "operation": operation,
+            "jobs": [
+                {key: job.get(key) for key in ("id", "state", "numberRecordsProcessed", "numberRecordsFailed", "errorMessage")}
+                for job in jobs
+            ],
+            "successful": sum(len(result.successful_results) for result in results),
+            "failed_results": [row for result in results for row in result.failed_results],
+            "unprocessed_records": [row for result in results for row in result.unprocessed_records],
+        }
+    except Exception as err:
+        logging.error("Error occured while running bulk operation")
+        logging.error(err)
+        raise err
+
+
+def run_server(**transport_kwargs) -> None:
+    '''
+        Start the metrics export and serve the tools on SF_MCP_TRANSPORT.
+        :param transport_kwargs: passed on to FastMCP.run for HTTP transports (log_level, show_banner, ...)
+    '''
+    if MCP_TRANSPORT != "stdio" and MCP_WORKERS > 1:
+        run_workers(**transport_kwargs)
+        return
+    start_metrics_export()
+    if MCP_TRANSPORT == "stdio":
+        mcp.run()
+    else:
+        mcp.run(transport=MCP_TRANSPORT, host=MCP_HOST, port=MCP_PORT, **transport_kwargs)
+
+
+def _run_worker(worker: int, sock: socket.socket, transport_kwargs: Dict[str, Any], session_classes: tuple) -> None:
+    # under forkserver / spawn this is a fresh import of main: keep the parent's (e.g. test) session classes
+    session_registry.session_cls, bulk_session_registry.session_cls = session_classes
+    start_metrics_export(worker)
+    # any worker may receive any request, so no MCP session state is kept between them
+    mcp.run(transport=MCP_TRANSPORT, host=MCP_HOST, port=MCP_PORT, sockets=[sock], stateless_http=True,
+            **transport_kwargs)
+
+
+def run_workers(**transport_kwargs) -> None:
+    '''
+        Bind SF_MCP_HOST:SF_MCP_PORT once and serve it from SF_MCP_WORKERS processes, which share
+        tokens and caches through shared_state. Returns when every worker has exited; the workers
+        are stopped when this process is interrupted or terminated.
+    '''
+    family, kind, proto, _, address = socket.getaddrinfo(MCP_HOST, MCP_PORT, type=socket.SOCK_STREAM,
+                                                         proto=socket.IPPROTO_TCP)[0]
+    # an explicit IPPROTO_TCP (socket.create_server leaves 0) lets asyncio set TCP_NODELAY on accepted connections
+    sock = socket.socket(family, kind, proto)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(address)
+    sock.listen(socket.SOMAXCONN)
+    session_classes = (session_registry.session_cls, bulk_session_registry.session_cls)
+    workers = [multiprocessing.Process(target=_run_worker, args=(worker, sock, transport_kwargs, session_classes),
+                                       daemon=True)
+               for worker in range(MCP_WORKERS)]
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        for process in workers:
+            process.start()
+        logging.info(f"Serving on http://{MCP_HOST}:{MCP_PORT} with {MCP_WORKERS} workers")
+        for process in workers:
+            process.join()
+    finally:
+        for process in workers:
+            if process.is_alive():
+                process.terminate()
+            if process.pid is not None:
+                process.join()
+        sock.close()
+
+
+# every tool is registered
+startup.mark("imports")
+
+
 if __name__ == '__main__':
     try:
         logging.info("Starting MCP Server")
-        mcp.run()
+        run_server()
 
     except Exception as err:
         logging.error("Error initializing MCP server", exc_info=True)
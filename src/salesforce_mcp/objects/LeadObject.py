@@ -1,33 +1,76 @@
-from salesforce_mcp.objects.SFObject import SfObject, RecordResult
+from salesforce_mcp.objects.SFObject import SfObject, AsyncSfObject, RecordResult, invalidates_queries
 from salesforce_mcp.services.SalesforceSession import SalesforceSession
+from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
 from salesforce_mcp.types.LeadRecord import LeadRecord
+from salesforce_mcp.utils.dataClassMapper import dict_to_dataclass
 
 
 class LeadObject(SfObject):
-    def __init__(self, sf_session: SalesforceSession, api_version: str= "61.0"):
-        super().__init__(sf_session)
+    object_name = "Lead"
+    record_cls = LeadRecord
+
+    def __init__(self, sf_session: SalesforceSession, api_version: str= "61.0", record_cache_size: int = 0):
+        super().__init__(sf_session, api_version, record_cache_size)
         self.lead_endpoint = f"services/data/v{api_version}/sobjects/Lead/"
 
+    @invalidates_queries
     def create(self, data: LeadRecord) -> RecordResult:
         """Create a new Lead record"""
-        mapped_fields = data.to_salesforce_payload()
+        mapped_fields = data.to_salesforce_payload(self._write_describe(), "create")
         # For create, don't include the trailing slash with ID
         response = self.sf_session.create(self.lead_endpoint.rstrip('/'), mapped_fields)
         return response
 
+    @invalidates_queries
     def update(self, record_id: str, data: LeadRecord) -> bool:
         """Update an existing Lead record"""
-        mapped_fields = data.to_salesforce_payload()
+        mapped_fields = data.to_salesforce_payload(self._write_describe(), "update")
         self.sf_session.update(self.lead_endpoint, id=record_id, body=mapped_fields)
+        self._forget_records([record_id])
         return True
 
+    @invalidates_queries
     def delete(self, record_id: str) -> bool:
         """Delete a Lead record"""
         self.sf_session.delete(self.lead_endpoint + record_id)
+        self._forget_records([record_id])
         return True
 
     def get(self, record_id: str) -> LeadRecord:
         """Get a Lead record by ID"""
-        response = self.sf_session.get(self.lead_endpoint + record_id)
-        return LeadRecord(**response)
+        response = self._get_record(self.lead_endpoint + record_id, record_id)
+        return dict_to_dataclass(response, LeadRecord)
+
+
+class AsyncLeadObject(AsyncSfObject, LeadObject):
+    '''
+        LeadObject running on an AsyncSalesforceSession.
+    '''
+    def __init__(self, sf_session: AsyncSalesforceSession, api_version: str= "61.0", record_cache_size: int = 0):
+        super().__init__(sf_session, api_version, record_cache_size)
+
+    @invalidates_queries
+    async def create(self, data: LeadRecord) -> RecordResult:
+        """Create a new Lead record"""
+        mapped_fields = data.to_salesforce_payload(await self._write_describe(), "create")
+        return await self.sf_session.create(self.lead_endpoint.rstrip('/'), mapped_fields)
+
+    @invalidates_queries
+    async def update(self, record_id: str, data: LeadRecord) -> bool:
+        """Update an existing Lead record"""
+        mapped_fields = data.to_salesforce_payload(await self._write_describe(), "update")
+        await self.sf_session.update(self.lead_endpoint, id=record_id, body=mapped_fields)
+        self._forget_records([record_id])
+        return True
+
+    @invalidates_queries
+    async def delete(self, record_id: str) -> bool:
+        """Delete a Lead record"""
+        await self.sf_session.delete(self.lead_endpoint + record_id)
+        self._forget_records([record_id])
+        return True
 
+    async def get(self, record_id: str) -> LeadRecord:
+        """Get a Lead record by ID"""
+        response = await self._get_record(self.lead_endpoint + record_id, record_id)
+        return dict_to_dataclass(response, LeadRecord)
@@ -1,31 +1,72 @@
-from salesforce_mcp.objects.SFObject import SfObject, RecordResult
+from salesforce_mcp.objects.SFObject import SfObject, AsyncSfObject, RecordResult, invalidates_queries
 from salesforce_mcp.services.SalesforceSession import SalesforceSession
+from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
 from salesforce_mcp.types.OpportunityRecord import OpportunityRecord
+from salesforce_mcp.utils.dataClassMapper import dict_to_dataclass
 
 class OpportunityObject(SfObject):
-    def __init__(self, sf_session: SalesforceSession, api_version: str = '61.0'):
-        super().__init__(sf_session)
+    object_name = "Opportunity"
+    record_cls = OpportunityRecord
+
+    def __init__(self, sf_session: SalesforceSession, api_version: str = '61.0', record_cache_size: int = 0):
+        super().__init__(sf_session, api_version, record_cache_size)
         self.opportunity_endpoint = f"services/data/v{api_version}/sobjects/Opportunity/"
 
+    @invalidates_queries
     def create(self, data: OpportunityRecord) -> RecordResult:
         """Create a new Opportunity Field"""
-        mapped_fields = data.to_salesforce_payload()
+        mapped_fields = data.to_salesforce_payload(self._write_describe(), "create")
         response = self.sf_session.create(self.opportunity_endpoint.rstrip('/'), mapped_fields)
         return response
 
+    @invalidates_queries
     def update(self, data: OpportunityRecord, record_id: str) -> bool:
         """Update an existing Opportunity record"""
-        mapped_fields = data.to_salesforce_payload()
+        mapped_fields = data.to_salesforce_payload(self._write_describe(), "update")
         self.sf_session.update(self.opportunity_endpoint, id=record_id, body=mapped_fields)
+        self._forget_records([record_id])
         return True
 
+    @invalidates_queries
     def delete(self, record_id: str) -> bool:
         """Delete a Opportunity record"""
         self.sf_session.delete(self.opportunity_endpoint + record_id)
+        self._forget_records([record_id])
         return True
 
     def get(self, record_id: str) -> OpportunityRecord:
-        response = self.sf_session.get(self.opportunity_endpoint + record_id)
-        return OpportunityRecord(**response)
+        response = self._get_record(self.opportunity_endpoint + record_id, record_id)
+        return dict_to_dataclass(response, OpportunityRecord)
+
+
+class AsyncOpportunityObject(AsyncSfObject, OpportunityObject):
+    '''
+        OpportunityObject running on an AsyncSalesforceSession.
+    '''
+    def __init__(self, sf_session: AsyncSalesforceSession, api_version: str = '61.0', record_cache_size: int = 0):
+        super().__init__(sf_session, api_version, record_cache_size)
+
+    @invalidates_queries
+    async def create(self, data: OpportunityRecord) -> RecordResult:
+        """Create a new Opportunity Field"""
+        mapped_fields = data.to_salesforce_payload(await self._write_describe(), "create")
+        return await self.sf_session.create(self.opportunity_endpoint.rstrip('/'), mapped_fields)
 
+    @invalidates_queries
+    async def update(self, data: OpportunityRecord, record_id: str) -> bool:
+        """Update an existing Opportunity record"""
+        mapped_fields = data.to_salesforce_payload(await self._write_describe(), "update")
+        await self.sf_session.update(self.opportunity_endpoint, id=record_id, body=mapped_fields)
+        self._forget_records([record_id])
+        return True
+
+    @invalidates_queries
+    async def delete(self, record_id: str) -> bool:
+        """Delete a Opportunity record"""
+        await self.sf_session.delete(self.opportunity_endpoint + record_id)
+        self._forget_records([record_id])
+        return True
 
+    async def get(self, record_id: str) -> OpportunityRecord:
+        response = await self._get_record(self.opportunity_endpoint + record_id, record_id)
+        return dict_to_dataclass(response, OpportunityRecord)
@@ -1,19 +1,74 @@
-from dataclasses import dataclass
-from typing import TypeVar
+import asyncio
+import functools
+import inspect
+from dataclasses import dataclass, field
+from typing import TypeVar, Optional, Iterable, Any, Sequence, Iterator
 from abc import ABC, abstractmethod
 from salesforce_mcp.services.SalesforceSession import SalesforceSession
 from salesforce_mcp.types.SFRecord import SFRecord
+from salesforce_mcp.utils.bulk import BulkIngestModule, BulkIngestResult
+from salesforce_mcp.utils.dataClassMapper import dict_to_dataclass
+from salesforce_mcp.utils.describe import validate_payload
+from salesforce_mcp.utils.record_cache import RecordCache
 
 T = TypeVar('T')
 
+# sObject Collections accept at most 200 records per request
+COLLECTION_CHUNK_SIZE = 200
+
 @dataclass
 class RecordResult:
     Id: str
+    success: bool = True
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+
+def invalidates_queries(method):
+    '''
+        Decorator for SfObject write methods (sync or async): once the write finishes, drop the
+        session's cached query results that read from the object.
+    '''
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            try:
+                return await method(self, *args, **kwargs)
+            finally:
+                query_cache = getattr(self.sf_session, "query_cache", None)
+                if query_cache is not None and query_cache.blocking:
+                    await asyncio.to_thread(self._invalidate_cached_queries)
+                else:
+                    self._invalidate_cached_queries()
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._invalidate_cached_queries()
+    return wrapper
+
+
+def _chunks[T](items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
 
 class SfObject[T](ABC):
+    # Salesforce API name of the object, e.g. "Lead", and the record dataclass it maps to
+    object_name: str
+    record_cls: type[SFRecord]
 
-    def __init__(self, sf_session: SalesforceSession):
+    def __init__(self, sf_session: SalesforceSession, api_version: str = "61.0", record_cache_size: int = 0):
+        '''
+        :param record_cache_size: when positive, keep up to this many fetched rows with their ETag /
+                                  Last-Modified so repeated gets are conditional requests (see RecordCache)
+        '''
         self.sf_session = sf_session
+        self.api_version = api_version
+        self.collections_endpoint = f"services/data/v{api_version}/composite/sobjects"
+        self.record_cache: Optional[RecordCache] = RecordCache(record_cache_size) if record_cache_size > 0 else None
 
 
     @abstractmethod
@@ -30,4 +85,198 @@ class SfObject[T](ABC):
 
     @abstractmethod
     def get(self, id: str) -> SFRecord:
-        pass
\ No newline at end of file
+        pass
+
+    def _get_record(self, path: str, record_id: str) -> dict[str, Any]:
+        '''
+            GET a row, as a conditional request answered from the record cache on 304 when caching is on.
+        '''
+        if self.record_cache is None:
+            return self.sf_session.get(path)
+        entry = self.record_cache.lookup(record_id)
+        response = self.sf_session.request("get", path, headers=self.record_cache.conditional_headers(entry))
+        return self.record_cache.apply(record_id, entry, response)
+
+    def _forget_records(self, record_ids: Iterable[Optional[str]]) -> None:
+        if self.record_cache is not None:
+            for record_id in record_ids:
+                if record_id is not None:
+                    self.record_cache.invalidate(record_id)
+
+    @staticmethod
+    def _record_id(record: T | dict[str, Any]) -> Optional[str]:
+        return getattr(record, "Id", None) if isinstance(record, SFRecord) else record.get("Id")
+
+    def _invalidate_cached_queries(self) -> None:
+        query_cache = getattr(self.sf_session, "query_cache", None)
+        if query_cache is not None:
+            query_cache.invalidate_object(self.object_name)
+
+    def _write_describe(self) -> Optional[dict[str, Any]]:
+        '''
+            Describe metadata to validate writes against, or None when the session does not validate writes.
+        '''
+        if not getattr(self.sf_session, "validate_writes", False):
+            return None
+        return self.sf_session.describe_cache.describe(self.object_name)
+
+    @staticmethod
+    def _to_payload(record: T | dict[str, Any], describe: Optional[dict[str, Any]] = None,
+                    operation: str = "create") -> dict[str, Any]:
+        if isinstance(record, SFRecord):
+            return record.to_salesforce_payload(describe, operation)
+        payload = dict(record)
+        if describe is not None:
+            validate_payload(payload, describe, operation)
+        return payload
+
+    def _collection_bodies(self, records: Sequence[T | dict[str, Any]], all_or_none: bool,
+                           describe: Optional[dict[str, Any]], operation: str) -> list[dict[str, Any]]:
+        '''
+            Request bodies for every 200-record chunk, built (and validated) before anything is sent.
+        '''
+        return [
+            {
+                "allOrNone": all_or_none,
+                "records": [{"attributes": {"type": self.object_name}, **self._to_payload(record, describe, operation)}
+                            for record in chunk],
+            }
+            for chunk in _chunks(records, COLLECTION_CHUNK_SIZE)
+        ]
+
+    def _get_many_params(self, record_ids: Sequence[str], fields: Optional[Sequence[str]]) -> dict[str, str]:
+        if fields is None:
+            fields = [name for name in self.record_cls.__dataclass_fields__ if name != "custom_fields"]
+        return {"ids": ",".join(record_ids), "fields": ",".join(fields)}
+
+    @staticmethod
+    def _to_record_results(response: list[dict[str, Any]]) -> list[RecordResult]:
+        return [
+            RecordResult(Id=item.get("id"), success=item.get("success", False), errors=item.get("errors") or [])
+            for item in response
+        ]
+
+    def _to_records(self, response: list[Optional[dict[str, Any]]]) -> list[Optional[SFRecord]]:
+        return [dict_to_dataclass(item, self.record_cls) if item is not None else None for item in response]
+
+    @invalidates_queries
+    def create_many(self, records: Sequence[T | dict[str, Any]], all_or_none: bool = False) -> list[RecordResult]:
+        '''
+            Create records through sObject Collections, 200 per request.
+            :param all_or_none: roll back every record of a request if any of them fails
+            :return: one RecordResult per record, in input order
+        '''
+        results: list[RecordResult] = []
+        for body in self._collection_bodies(records, all_or_none, self._write_describe(), "create"):
+            response = self.sf_session.request("post", self.collections_endpoint, json=body)
+            results.extend(self._to_record_results(response.json()))
+        return results
+
+    @invalidates_queries
+    def update_many(self, records: Sequence[T | dict[str, Any]], all_or_none: bool = False) -> list[RecordResult]:
+        '''
+            Update records (each must carry its Id) through sObject Collections, 200 per request.
+        '''
+        results: list[RecordResult] = []
+        for body in self._collection_bodies(records, all_or_none, self._write_describe(), "update"):
+            response = self.sf_session.request("patch", self.collections_endpoint, json=body)
+            results.extend(self._to_record_results(response.json()))
+        self._forget_records(self._record_id(record) for record in records)
+        return results
+
+    @invalidates_queries
+    def delete_many(self, record_ids: Sequence[str], all_or_none: bool = False) -> list[RecordResult]:
+        '''
+            Delete records by Id through sObject Collections, 200 per request.
+        '''
+        results: list[RecordResult] = []
+        for chunk in _chunks(record_ids, COLLECTION_CHUNK_SIZE):
+            response = self.sf_session.request("delete", self.collections_endpoint,
+                                               params={"ids": ",".join(chunk), "allOrNone": str(all_or_none).lower()})
+            results.extend(self._to_record_results(response.json()))
+        self._forget_records(record_ids)
+        return results
+
+    def get_many(self, record_ids: Sequence[str], fields: Optional[Sequence[str]] = None) -> list[Optional[SFRecord]]:
+        '''
+            Fetch records by Id through sObject Collections, 200 per request.
+            :param fields: fields to retrieve (defaults to every field of the record dataclass)
+            :return: one record per Id, None where the Id was not found
+        '''
+        records: list[Optional[SFRecord]] = []
+        for chunk in _chunks(record_ids, COLLECTION_CHUNK_SIZE):
+            response = self.sf_session.request("get", f"{self.collections_endpoint}/{self.object_name}",
+                                               params=self._get_many_params(chunk, fields))
+            records.extend(self._to_records(response.json()))
+        return records
+
+    @invalidates_queries
+    def bulk_operation(self, operation: str, records: Iterable[T | dict[str, Any]],
+                       external_id_field: Optional[str] = None) -> list[BulkIngestResult]:
+        '''
+            Run a Bulk API 2.0 ingest job (insert, update, upsert, delete or hardDelete) for this object.
+            Records may be record dataclasses or dicts keyed by Salesforce API field names;
+            update, delete and hardDelete need the Id. Requires a synchronous SalesforceSession.
+            :return: one BulkIngestResult per uploaded chunk
+        '''
+        rows = (self._to_payload(record) for record in records)
+        return BulkIngestModule(self.sf_session, self.api_version).run(self.object_name, operation, rows, external_id_field)
+
+    def bulk_delete(self, record_ids: Iterable[str], hard: bool = False) -> list[BulkIngestResult]:
+        '''
+            Delete records by Id through a bulk job; hard deletes bypass the recycle bin.
+        '''
+        return self.bulk_operation("hardDelete" if hard else "delete", ({"Id": record_id} for record_id in record_ids))
+
+
+class AsyncSfObject(SfObject):
+    '''
+        Async overrides of the SfObject collection methods, mixed into the Async*Object classes.
+    '''
+
+    async def _write_describe(self) -> Optional[dict[str, Any]]:
+        if not getattr(self.sf_session, "validate_writes", False):
+            return None
+        return await self.sf_session.describe_cache.describe(self.object_name)
+
+    async def _get_record(self, path: str, record_id: str) -> dict[str, Any]:
+        if self.record_cache is None:
+            return await self.sf_session.get(path)
+        entry = self.record_cache.lookup(record_id)
+        response = await self.sf_session.request("get", path, headers=self.record_cache.conditional_headers(entry))
+        return self.record_cache.apply(record_id, entry, response)
+
+    @invalidates_queries
+    async def create_many(self, records: Sequence[T | dict[str, Any]], all_or_none: bool = False) -> list[RecordResult]:
+        results: list[RecordResult] = []
+        for body in self._collection_bodies(records, all_or_none, await self._write_describe(), "create"):
+            response = await self.sf_session.request("post", self.collections_endpoint, json=body)
+            results.extend(self._to_record_results(response.json()))
+        return results
+
+    @invalidates_queries
+    async def update_many(self, records: Sequence[T | dict[str, Any]], all_or_none: bool = False) -> list[RecordResult]:
+        results: list[RecordResult] = []
+        for body in self._collection_bodies(records, all_or_none, await self._write_describe(), "update"):
+            response = await self.sf_session.request("patch", self.collections_endpoint, json=body)
+            results.extend(self._to_record_results(response.json()))
+        self._forget_records(self._record_id(record) for record in records)
+        return results
+
+    @invalidates_queries
+    async def delete_many(self, record_ids: Sequence[str], all_or_none: bool = False) -> list[RecordResult]:
+        results: list[RecordResult] = []
+        for chunk in _chunks(record_ids, COLLECTION_CHUNK_SIZE):
+            response = await self.sf_session.request("delete", self.collections_endpoint,
+                                                     params={"ids": ",".join(chunk), "allOrNone": str(all_or_none).lower()})
+            results.extend(self._to_record_results(response.json()))
+        self._forget_records(record_ids)
+        return results
+
+    async def get_many(self, record_ids: Sequence[str], fields: Optional[Sequence[str]] = None) -> list[Optional[SFRecord]]:
+        records: list[Optional[SFRecord]] = []
+        for chunk in _chunks(record_ids, COLLECTION_CHUNK_SIZE):
+            response = await self.sf_session.request("get", f"{self.collections_endpoint}/{self.object_name}",
+                                                     params=self._get_many_params(chunk, fields))
+            records.extend(self._to_records(response.json()))
+        return records
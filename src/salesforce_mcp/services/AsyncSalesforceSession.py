@@ -0,0 +1,363 @@
+import asyncio
+import logging
+import time
+from typing import Optional, Dict, Any
+from urllib.parse import urljoin
+
+import httpx
+
+from salesforce_mcp.services.SalesforceSession import SalesforceSession
+from salesforce_mcp.services.CompositeBatcher import AsyncCompositeBatcher
+from salesforce_mcp.utils.query_cache import QueryCache
+from salesforce_mcp.utils.shared_state import TOKEN_WAIT_INTERVAL, SharedQueryCache, SharedStateStore, credentials_key
+from salesforce_mcp.utils.describe import AsyncDescribeCache
+from salesforce_mcp.utils.limits import AsyncApiUsageLimiter
+from salesforce_mcp.utils.retry import RetryPolicy
+from salesforce_mcp.utils.metrics import MetricsRegistry, instrumented
+from salesforce_mcp.utils.telemetry import ApiTelemetry
+
+
+class AsyncSalesforceSession:
+    '''
+        asyncio counterpart of SalesforceSession built on a pooled httpx.AsyncClient,
+        so concurrent tool calls overlap their network waits instead of blocking the event loop.
+    '''
+
+    def __init__(self, domain: str,
+                 client_id: str,
+                 client_secret: str,
+                 username: str,
+                 password: str,
+                 timeout = None,
+                 token_ttl: float = 900.0,
+                 refresh_margin: float = 60.0,
+                 max_connections: int = 10,
+                 max_keepalive_connections: int = 10,
+                 http2: bool = False,
+                 batch_window: Optional[float] = None,
+                 batch_max_size: int = 25,
+                 query_cache_ttl: float = 0.0,
+                 query_cache_max_entries: int = 256,
+                 query_cache_max_bytes: int = 16 * 1024 * 1024,
+                 describe_cache_dir: Optional[str] = None,
+                 validate_writes: bool = False,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 api_usage_soft_limit: float = 0.8,
+                 api_usage_hard_limit: float = 0.95,
+                 telemetry: Optional[ApiTelemetry] = None,
+                 metrics: Optional[MetricsRegistry] = None,
+                 shared_state: Optional[SharedStateStore] = None):
+        '''
+        :param token_ttl: seconds an access token is trusted when the token response carries no expiry
+        :param refresh_margin: refresh the token this many seconds before it expires
+        :param max_connections: maximum number of concurrent connections in the pool
+        :param max_keepalive_connections: maximum number of idle keep-alive connections kept open
+        :param http2: negotiate HTTP/2, so concurrent requests share one connection (and one TLS handshake)
+                      as multiplexed streams with compressed headers; needs the h2 package (httpx[http2])
+        :param batch_window: when set, coalesce create/update/delete/get calls arriving within this many
+                             seconds into one /composite request (off by default)
+        :param batch_max_size: send a coalesced batch as soon as it holds this many calls (at most 25)
+        :param query_cache_ttl: when positive, cache query results for this many seconds (see QueryCache);
+                                writes through the Lead/Opportunity objects invalidate affected entries
+        :param query_cache_max_entries: LRU bound on cached query results
+        :param query_cache_max_bytes: LRU bound on the approximate JSON size of cached results
+        :param describe_cache_dir: directory where sObject describe metadata is persisted between runs
+        :param validate_writes: check record payloads against the cached describe metadata before
+                                create/update calls are sent
+        :param retry_policy: when to retry failed requests (defaults to RetryPolicy())
+        :param api_usage_soft_limit: fraction of the daily API allocation (Sforce-Limit-Info) at which
+                                     fewer than max_connections requests are allowed to run at once
+        :param api_usage_hard_limit: fraction at which requests are serialised and paced
+        :param telemetry: where API consumption is recorded; pass one instance to several sessions to pool their counts
+        :param metrics: where latency, error, byte and concurrency metrics are recorded (shared like telemetry)
+        :param shared_state: store through which the worker processes of one server share the access token,
+                             describe metadata and cached query results (see SharedStateStore)
+        '''
+        self.domain = domain
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.username = username
+        self.password = password
+        self._validate_domain(domain)
+        self.url = self._build_endpoint(domain)
+        self.client = self._build_instance(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_keepalive_connections),
+            http2=http2,
+        )
+        self.token_ttl = token_ttl
+        self.refresh_margin = refresh_margin
+        self._token: Optional[str] = None
+        self._token_expires_at: float = 0.0
+        self._token_lock = asyncio.Lock()
+        self.shared_state = shared_state
+        self.query_cache: Optional[QueryCache] = None
+        if query_cache_ttl > 0 and shared_state is not None:
+            self.query_cache = SharedQueryCache(shared_state, credentials_key(self), query_cache_ttl,
+                                                query_cache_max_entries, query_cache_max_bytes)
+        elif query_cache_ttl > 0:
+            self.query_cache = QueryCache(query_cache_ttl, query_cache_max_entries, query_cache_max_bytes)
+        self.describe_cache = AsyncDescribeCache(self, describe_cache_dir, shared_state=shared_state)
+        self.validate_writes = validate_writes
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.telemetry = telemetry or ApiTelemetry()
+        self.metrics = metrics or MetricsRegistry()
+        self.limiter = AsyncApiUsageLimiter(max_connections, api_usage_soft_limit, api_usage_hard_limit)
+        self.batcher: Optional[AsyncCompositeBatcher] = (
+            AsyncCompositeBatcher(self, batch_window, batch_max_size) if batch_window is not None else None)
+
+    _validate_domain = staticmethod(SalesforceSession._validate_domain)
+    _build_endpoint = SalesforceSession._build_endpoint
+
+    def _build_instance(self, *, timeout: Optional[float], limits: httpx.Limits,
+                        http2: bool = False) -> httpx.AsyncClient:
+        '''
+        Create the pooled async HTTP client shared by every request of this session.
+        '''
+        return httpx.AsyncClient(timeout=timeout, limits=limits, http2=http2)
+
+    @instrumented
+    async def authenticate(self) -> str:
+        '''
+           Authenticate with Salesforce using oauth and cache the token.
+           :return sf token
+        '''
+        auth_endpoint = "/services/oauth2/token"
+        url = urljoin(self.url + "/", auth_endpoint.lstrip("/"))
+        form_data: Dict[str,str] = {
+            "grant_type": "password",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "username": self.username,
+            "password": self.password
+        }
+        response = await self.client.post(url, data=form_data)
+        response.raise_for_status()
+        token_data = response.json()
+        ttl = float(token_data["expires_in"]) if "expires_in" in token_data else self.token_ttl
+        self._token = token_data["access_token"]
+        self._token_expires_at = time.monotonic() + ttl
+        return self._token
+
+    async def warm(self) -> None:
+        '''
+            Authenticate ahead of the first call so the token is cached
+            and a keep-alive connection is already open in the pool.
+        '''
+        await self.get_token()
+
+    def _token_is_fresh(self) -> bool:
+        return self._token is not None and time.monotonic() < self._token_expires_at - self.refresh_margin
+
+    async def get_token(self) -> str:
+        '''
+            Return the cached access token, refreshing it when it is missing or about to expire.
+            Only one task refreshes at a time; concurrent tasks wait for that refresh.
+        '''
+        if self._token_is_fresh():
+            return self._token
+        async with self._token_lock:
+            if self._token_is_fresh():
+                return self._token
+            return await self._refresh_token()
+
+    _adopt_token = SalesforceSession._adopt_token
+
+    async def _refresh_token(self) -> str:
+        '''
+            Authenticate, or with shared_state take the token another worker fetched.
+        '''
+        if self.shared_state is None:
+            return await self.authenticate()
+        key = credentials_key(self)
+        # the store is SQLite, whose writes may wait on another worker's lock: kept off the event loop
+        while True:
+            stored = await asyncio.to_thread(self.shared_state.load_token, key)
+            if stored and self._adopt_token(*stored):
+                return self._token
+            if await asyncio.to_thread(self.shared_state.claim_token_refresh, key):
+                try:
+                    token = await self.authenticate()
+                    await asyncio.to_thread(self.shared_state.store_token, key, token,
+                                            time.time() + self._token_expires_at - time.monotonic())
+                    return token
+                finally:
+                    await asyncio.to_thread(self.shared_state.release_token_refresh, key)
+            await asyncio.sleep(TOKEN_WAIT_INTERVAL)
+
+    def invalidate_token(self, stale_token: Optional[str] = None) -> None:
+        '''
+            Drop the cached token so the next call re-authenticates.
+        '''
+        if stale_token is None or self._token == stale_token:
+            if self.shared_state is not None and self._token is not None:
+                self.shared_state.drop_token(credentials_key(self), self._token)
+            self._token = None
+            self._token_expires_at = 0.0
+
+    async def ainvalidate_token(self, stale_token: Optional[str] = None) -> None:
+        '''
+            invalidate_token for the event loop: the shared store is updated on a worker thread, under
+            the token lock so no refresh adopts the rejected token before it is dropped.
+        '''
+        async with self._token_lock:
+            if stale_token is not None and self._token != stale_token:
+                return
+            if self.shared_state is not None and self._token is not None:
+                await asyncio.to_thread(self.shared_state.drop_token, credentials_key(self), self._token)
+            self._token = None
+            self._token_expires_at = 0.0
+
+    _is_invalid_session = staticmethod(SalesforceSession._is_invalid_session)
+
+    async def _send(self, method: str, url: str, token: str,
+                    headers: Optional[Dict[str, str]] = None, stream: bool = False, **kwargs) -> httpx.Response:
+        request_headers: Dict[str, str] = {
+            "Authorization": f"Bearer {token}"
+        }
+        if headers:
+            request_headers.update(headers)
+        with self.metrics.http_request(method, url) as observation:
+            if stream:
+                # the caller reads the body (aiter_bytes) and closes the response
+                request = self.client.build_request(method.upper(), url, headers=request_headers, **kwargs)
+                response = await self.client.send(request, stream=True)
+                if response.is_error:
+                    # error handling (INVALID_SESSION_ID, REQUEST_LIMIT_EXCEEDED) inspects the body
+                    await response.aread()
+            else:
+                response = await getattr(self.client, method)(url, headers=request_headers, **kwargs)
+            observation.finish(response, body_read=not stream)
+        return response
+
+    async def _send_authenticated(self, method: str, url: str, **kwargs) -> httpx.Response:
+        '''
+            Send a request with the cached token, re-authenticating and resending once
+            if Salesforce rejects the token with INVALID_SESSION_ID.
+        '''
+        token = await self.get_token()
+        response = await self._send(method, url, token, **kwargs)
+        if self._is_invalid_session(response):
+            logging.info("Salesforce session expired, re-authenticating")
+            await self.ainvalidate_token(token)
+            response = await self._send(method, url, await self.get_token(), **kwargs)
+        return response
+
+    async def _request(self, method: str, url: str, *, idempotent: bool = False, **kwargs) -> httpx.Response:
+        '''
+            Send an authenticated request within the API usage limiter, retrying transient
+            failures according to the session's RetryPolicy.
+            :param idempotent: retry like a GET even if *method* is POST (a /composite request of reads)
+        '''
+        retry_method = "get" if idempotent else method
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with self.limiter.slot():
+                    response = await self._send_authenticated(method, url, **kwargs)
+            except httpx.TransportError as err:
+                self.telemetry.record(method, url, type(err).__name__)
+                not_sent = isinstance(err, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+                if not self.retry_policy.retry_error(retry_method, attempt, not_sent):
+                    raise
+                delay = self.retry_policy.delay(attempt)
+                logging.warning(f"{method.upper()} {url} failed ({err!r}), retrying in {delay:.2f}s")
+            else:
+                self.limiter.observe(response.headers)
+                self.telemetry.record(method, url, response.status_code, response.headers)
+                if not self.retry_policy.retry_response(retry_method, response, attempt):
+                    # 304 answers a conditional request; httpx would treat it as a redirect error
+                    if response.status_code != 304:
+                        response.raise_for_status()
+                    return response
+                delay = self.retry_policy.delay(attempt, response.headers.get("Retry-After"))
+                logging.warning(f"{method.upper()} {url} returned {response.status_code}, retrying in {delay:.2f}s")
+                await response.aclose()
+            await asyncio.sleep(delay)
+
+    @instrumented
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        '''
+            Send an authenticated request and return the raw response, for endpoints that need
+            custom headers, non-JSON bodies or streamed reads (stream=True; the caller closes the response).
+        '''
+        try:
+            return await self._request(method.lower(), self.url + path, **kwargs)
+        except Exception as err:
+            logging.error("error")
+            logging.error(err)
+            raise err
+
+    @instrumented
+    async def sample_limits(self, api_version: str = "61.0") -> Dict[str, Any]:
+        '''
+            Fetch the org limits (daily API requests, bulk jobs, storage, ...) and record them in telemetry.
+        '''
+        limits = (await self.request("get", f"services/data/v{api_version}/limits")).json()
+        self.telemetry.record_limits(limits)
+        return limits
+
+    @instrumented
+    async def create(self, path: str, body):
+        '''
+            create a record
+        '''
+        try:
+            if self.batcher is not None and self.batcher.accepts(path):
+                return await self.batcher.submit("post", path, body)
+            response = await self._request("post", self.url + path, json=body)
+            return response.json()
+        except Exception as err:
+            logging.error("error")
+            logging.error(err)
+            raise err
+
+    @instrumented
+    async def update(self, path: str, id: str, body):
+        '''
+            update a record
+        '''
+        try:
+            if self.batcher is not None and self.batcher.accepts(path + id):
+                return await self.batcher.submit("patch", path + id, body)
+            response = await self._request("patch", self.url + path + id, json=body)
+            return {"success": True } if response.status_code == 204 else response.json()
+        except Exception as err:
+            logging.error("error")
+            logging.error(err)
+            raise err
+
+    @instrumented
+    async def delete(self, path):
+        '''
+           delete a record
+        '''
+        try:
+            if self.batcher is not None and self.batcher.accepts(path):
+                return await self.batcher.submit("delete", path)
+            response = await self._request("delete", self.url + path)
+            return {"success": True } if response.status_code == 204 else response.json()
+        except Exception as err:
+            logging.error("error")
+            logging.error(err)
+            raise err
+
+    @instrumented
+    async def get(self, path):
+        try:
+            if self.batcher is not None and self.batcher.accepts(path):
+                return await self.batcher.submit("get", path)
+            response = await self._request("get", self.url + path)
+            return response.json()
+        except Exception as err:
+            logging.error("error")
+            logging.error(err)
+            raise err
+
+    async def aclose(self) -> None:
+        '''
+            Close the pooled connections.
+        '''
+        await self.client.aclose()
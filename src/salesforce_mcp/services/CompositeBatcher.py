@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import re
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+from salesforce_mcp.utils.retry import IDEMPOTENT_METHODS
+
+# REST resources the Composite API accepts as subrequests (sObject rows and SOQL queries)
+BATCHABLE_RE: Pattern[str] = re.compile(r"^services/data/v(?P<version>[\d.]+)/(sobjects|query|queryAll)(/|\?|$)")
+QUERY_RE: Pattern[str] = re.compile(r"^services/data/v[\d.]+/(query|queryAll)(/|\?|$)")
+
+# a /composite request takes at most 25 subrequests, of which at most 5 may be queries
+MAX_SUBREQUESTS = 25
+MAX_QUERY_SUBREQUESTS = 5
+
+Outcome = Tuple[int, Any]
+
+
+class CompositeSubrequestError(Exception):
+    '''
+        Raised to the caller whose subrequest failed inside a coalesced /composite request.
+    '''
+    def __init__(self, status_code: int, errors: Any):
+        self.status_code = status_code
+        self.errors = errors
+        super().__init__(f"Subrequest failed with HTTP {status_code}: {errors}")
+
+
+@dataclass
+class Subrequest:
+    method: str
+    path: str
+    body: Optional[Dict[str, Any]] = None
+
+    def is_query(self) -> bool:
+        return QUERY_RE.match(self.path) is not None
+
+
+def to_result(status_code: int, body: Any) -> Any:
+    '''
+        Turn a (status, body) outcome into what the session method would have returned,
+        raising CompositeSubrequestError for failed subrequests.
+    '''
+    if status_code >= 400:
+        raise CompositeSubrequestError(status_code, body)
+    if status_code == 204 or body is None:
+        return {"success": True}
+    return body
+
+
+class CompositeBatcher:
+    '''
+        Coalesces session calls arriving within a short window into one /composite request
+        and hands every caller its own result or error. Used by SalesforceSession when
+        batch_window is set; callers block until their batch has been sent.
+    '''
+
+    def __init__(self, sf_session, window: float = 0.01,
+                 max_subrequests: int = MAX_SUBREQUESTS, api_version: str = "61.0"):
+        '''
+        :param window: seconds to wait for more calls after the first one of a batch arrives
+        :param max_subrequests: send the batch as soon as it holds this many calls (at most 25)
+        '''
+        if not 0 < max_subrequests <= MAX_SUBREQUESTS:
+            raise ValueError(f"max_subrequests must be between 1 and {MAX_SUBREQUESTS}")
+        self.sf_session = sf_session
+        self.window = window
+        self.max_subrequests = max_subrequests
+        self.api_version = api_version
+        self.composite_path = f"services/data/v{api_version}/composite"
+        self.requests_sent = 0
+        self.calls_batched = 0
+        self._pending: List[Tuple[Subrequest, Future]] = []
+        self._pending_queries = 0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def accepts(self, path: str) -> bool:
+        match = BATCHABLE_RE.match(path)
+        return match is not None and match.group("version") == self.api_version
+
+    def _composite_body(self, batch: List[Subrequest]) -> Dict[str, Any]:
+        subrequests = []
+        for index, sub in enumerate(batch):
+            subrequest = {"method": sub.method.upper(), "url": "/" + sub.path, "referenceId": f"r{index}"}
+            if sub.body is not None:
+                subrequest["body"] = sub.body
+            subrequests.append(subrequest)
+        return {"allOrNone": False, "compositeRequest": subrequests}
+
+    @staticmethod
+    def _idempotent(batch: List[Subrequest]) -> bool:
+        '''
+            True when resending the whole batch is safe (no creates), so the /composite POST is
+            retried on transient failures like the individual calls would have been.
+        '''
+        return all(sub.method.lower() in IDEMPOTENT_METHODS for sub in batch)
+
+    @staticmethod
+    def _outcomes(response: Dict[str, Any], size: int) -> List[Outcome]:
+        by_reference = {item["referenceId"]: item for item in response.get("compositeResponse", [])}
+        outcomes = []
+        for index in range(size):
+            item = by_reference.get(f"r{index}")
+            if item is None:
+                outcomes.append((500, [{"errorCode": "MISSING_SUBRESPONSE", "message": "No response for subrequest"}]))
+            else:
+                outcomes.append((item["httpStatusCode"], item.get("body")))
+        return outcomes
+
+    @staticmethod
+    def _single_outcome(response) -> Outcome:
+        return response.status_code, response.json() if response.status_code != 204 and response.content else None
+
+    def _send(self, batch: List[Subrequest]) -> List[Outcome]:
+        '''
+            Send a batch; a batch of one goes out as the plain request to skip the composite envelope.
+        '''
+        self.requests_sent += 1
+        if len(batch) == 1:
+            sub = batch[0]
+            kwargs = {} if sub.body is None else {"json": sub.body}
+            return [self._single_outcome(self.sf_session._request(sub.method, self.sf_session.url + sub.path, **kwargs))]
+        response = self.sf_session._request("post", self.sf_session.url + self.composite_path,
+                                            json=self._composite_body(batch), idempotent=self._idempotent(batch))
+        return self._outcomes(response.json(), len(batch))
+
+    def _take_batch(self) -> List[Tuple[Subrequest, Future]]:
+        # caller holds self._lock
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_queries = self._pending, [], 0
+        return batch
+
+    def _dispatch(self, batch: List[Tuple[Subrequest, Future]]) -> None:
+        if not batch:
+            return
+        try:
+            outcomes = self._send([sub for sub, _ in batch])
+        except Exception as err:
+            logging.error("error")
+            logging.error(err)
+            for _, future in batch:
+                future.set_exception(err)
+            return
+        for (_, future), outcome in zip(batch, outcomes):
+            future.set_result(outcome)
+
+    def _flush(self) -> None:
+        with self._lock:
+            batch = self._take_batch()
+        self._dispatch(batch)
+
+    def submit(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Any:
+        '''
+            Queue one call and wait for its result.
+            :return: the decoded response body ({"success": True} for 204 responses)
+        '''
+        sub = Subrequest(method, path, body)
+        future: Future = Future()
+        ready: List[List[Tuple[Subrequest, Future]]] = []
+        with self._lock:
+            if sub.is_query() and self._pending_queries == MAX_QUERY_SUBREQUESTS:
+                ready.append(self._take_batch())
+            self._pending.append((sub, future))
+            self._pending_queries += sub.is_query()
+            self.calls_batched += 1
+            if len(self._pending) >= self.max_subrequests:
+                ready.append(self._take_batch())
+            elif len(self._pending) == 1:
+                self._timer = threading.Timer(self.window, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+        for batch in ready:
+            self._dispatch(batch)
+        return to_result(*future.result())
+
+
+class AsyncCompositeBatcher(CompositeBatcher):
+    '''
+        CompositeBatcher for AsyncSalesforceSession: batches are flushed by an event-loop timer
+        and sent from a background task while the callers await their futures.
+    '''
+
+    def __init__(self, sf_session, window: float = 0.01,
+                 max_subrequests: int = MAX_SUBREQUESTS, api_version: str = "61.0"):
+        super().__init__(sf_session, window, max_subrequests, api_version)
+        self._async_pending: List[Tuple[Subrequest, asyncio.Future]] = []
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def _send(self, batch: List[Subrequest]) -> List[Outcome]:
+        self.requests_sent += 1
+        if len(batch) == 1:
+            sub = batch[0]
+            kwargs = {} if sub.body is None else {"json": sub.body}
+            response = await self.sf_session._request(sub.method, self.sf_session.url + sub.path, **kwargs)
+            return [self._single_outcome(response)]
+        response = await self.sf_session._request("post", self.sf_session.url + self.composite_path,
+                                                  json=self._composite_body(batch),
+                                                  idempotent=self._idempotent(batch))
+        return self._outcomes(response.json(), len(batch))
+
+    async def _dispatch(self, batch: List[Tuple[Subrequest, asyncio.Future]]) -> None:
+        try:
+            outcomes = await self._send([sub for sub, _ in batch])
+        except Exception as err:
+            logging.error("error")
+            logging.error(err)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(err)
+            return
+        for (_, future), outcome in zip(batch, outcomes):
+            if not future.done():
+                future.set_result(outcome)
+
+    def _flush(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        batch, self._async_pending, self._pending_queries = self._async_pending, [], 0
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def submit(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Any:
+        sub = Subrequest(method, path, body)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if sub.is_query() and self._pending_queries == MAX_QUERY_SUBREQUESTS:
+            self._flush()
+        self._async_pending.append((sub, future))
+        self._pending_queries += sub.is_query()
+        self.calls_batched += 1
+        if len(self._async_pending) >= self.max_subrequests:
+            self._flush()
+        elif len(self._async_pending) == 1:
+            self._handle = loop.call_later(self.window, self._flush)
+        return to_result(*await future)
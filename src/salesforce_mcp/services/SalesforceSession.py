@@ -1,20 +1,83 @@
+from __future__ import annotations
 import json
 from urllib.parse import urljoin
-import requests
 import re
-from typing import Optional, Dict, Pattern, TypeVar
+import threading
+import time
+from typing import Optional, Dict, Any, Pattern, TypeVar
 import logging
+from salesforce_mcp.services.CompositeBatcher import CompositeBatcher
+from salesforce_mcp.utils.query_cache import QueryCache
+from salesforce_mcp.utils.shared_state import TOKEN_WAIT_INTERVAL, SharedQueryCache, SharedStateStore, credentials_key
+from salesforce_mcp.utils.describe import DescribeCache
+from salesforce_mcp.utils.limits import ApiUsageLimiter
+from salesforce_mcp.utils.retry import RetryPolicy
+from salesforce_mcp.utils.metrics import MetricsRegistry, instrumented
+from salesforce_mcp.utils.telemetry import ApiTelemetry
+from salesforce_mcp.utils.lazy import lazy_import
+
+# loaded when the first sync session is built; the MCP tools run on AsyncSalesforceSession (httpx)
+requests = lazy_import("requests")
+urllib3 = lazy_import("urllib3")
 
 
 T = TypeVar('T')
 
+DOMAIN_RE: Pattern[str] = re.compile(
+    r"^(?!-)[A-Za-z0-9-]{1,63}(?<!-)"
+    r"(\.(?!-)[A-Za-z0-9-]{1,63}(?<!-))*"
+    r"\.[A-Za-z]{2,63}$"
+)
+
 class SalesforceSession:
     def __init__(self, domain: str,
                  client_id: str,
                  client_secret: str,
                  username: str,
                  password: str,
-                 timeout = None):
+                 timeout = None,
+                 token_ttl: float = 900.0,
+                 refresh_margin: float = 60.0,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 batch_window: Optional[float] = None,
+                 batch_max_size: int = 25,
+                 query_cache_ttl: float = 0.0,
+                 query_cache_max_entries: int = 256,
+                 query_cache_max_bytes: int = 16 * 1024 * 1024,
+                 describe_cache_dir: Optional[str] = None,
+                 validate_writes: bool = False,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 api_usage_soft_limit: float = 0.8,
+                 api_usage_hard_limit: float = 0.95,
+                 telemetry: Optional[ApiTelemetry] = None,
+                 metrics: Optional[MetricsRegistry] = None,
+                 shared_state: Optional[SharedStateStore] = None):
+        '''
+        :param token_ttl: seconds an access token is trusted when the token response carries no expiry
+                          (defaults to the shortest session timeout an org can configure)
+        :param refresh_margin: refresh the token this many seconds before it expires
+        :param pool_connections: number of host connection pools kept by the HTTP adapter
+        :param pool_maxsize: maximum number of keep-alive connections kept per host
+        :param batch_window: when set, coalesce create/update/delete/get calls arriving within this many
+                             seconds into one /composite request (off by default)
+        :param batch_max_size: send a coalesced batch as soon as it holds this many calls (at most 25)
+        :param query_cache_ttl: when positive, cache query results for this many seconds (see QueryCache);
+                                writes through the Lead/Opportunity objects invalidate affected entries
+        :param query_cache_max_entries: LRU bound on cached query results
+        :param query_cache_max_bytes: LRU bound on the approximate JSON size of cached results
+        :param describe_cache_dir: directory where sObject describe metadata is persisted between runs
+        :param validate_writes: check record payloads against the cached describe metadata before
+                                create/update calls are sent
+        :param retry_policy: when to retry failed requests (defaults to RetryPolicy())
+        :param api_usage_soft_limit: fraction of the daily API allocation (Sforce-Limit-Info) at which
+                                     fewer than pool_maxsize requests are allowed to run at once
+        :param api_usage_hard_limit: fraction at which requests are serialised and paced
+        :param telemetry: where API consumption is recorded; pass one instance to several sessions to pool their counts
+        :param metrics: where latency, error, byte and concurrency metrics are recorded (shared like telemetry)
+        :param shared_state: store through which the worker processes of one server share the access token,
+                             describe metadata and cached query results (see SharedStateStore)
+        '''
         self.domain = domain
         self.client_id = client_id
         self.client_secret = client_secret
@@ -22,7 +85,28 @@ class SalesforceSession:
         self.password = password
         self._validate_domain(domain)
         self.url = self._build_endpoint(domain)
-        self.session = self._build_instance(base_url=self.url,timeout = timeout)
+        self.session = self._build_instance(base_url=self.url,timeout = timeout,
+                                            pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.token_ttl = token_ttl
+        self.refresh_margin = refresh_margin
+        self._token: Optional[str] = None
+        self._token_expires_at: float = 0.0
+        self._token_lock = threading.Lock()
+        self.shared_state = shared_state
+        self.query_cache: Optional[QueryCache] = None
+        if query_cache_ttl > 0 and shared_state is not None:
+            self.query_cache = SharedQueryCache(shared_state, credentials_key(self), query_cache_ttl,
+                                                query_cache_max_entries, query_cache_max_bytes)
+        elif query_cache_ttl > 0:
+            self.query_cache = QueryCache(query_cache_ttl, query_cache_max_entries, query_cache_max_bytes)
+        self.describe_cache = DescribeCache(self, describe_cache_dir, shared_state=shared_state)
+        self.validate_writes = validate_writes
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.telemetry = telemetry or ApiTelemetry()
+        self.metrics = metrics or MetricsRegistry()
+        self.limiter = ApiUsageLimiter(pool_maxsize, api_usage_soft_limit, api_usage_hard_limit)
+        self.batcher: Optional[CompositeBatcher] = (
+            CompositeBatcher(self, batch_window, batch_max_size) if batch_window is not None else None)
 
     @staticmethod
     def _validate_domain(domain) -> None:
@@ -39,12 +123,7 @@ class SalesforceSession:
         ValueError
             If the string does not satisfy the regular expression.
         """
-        domain_re: Pattern[str] = re.compile(
-            r"^(?!-)[A-Za-z0-9-]{1,63}(?<!-)"
-            r"(\.(?!-)[A-Za-z0-9-]{1,63}(?<!-))*"
-            r"\.[A-Za-z]{2,63}$"
-        )
-        if not domain_re.fullmatch(domain):
+        if not DOMAIN_RE.fullmatch(domain):
             raise ValueError(f"Invalid domain name: {domain!r}")
 
     def _build_instance(
@@ -53,6 +132,8 @@ class SalesforceSession:
             *,
             headers: Optional[Dict[str, str]] = None,
             timeout: Optional[float] = None,
+            pool_connections: int = 10,
+            pool_maxsize: int = 10,
     ) -> requests.Session:
         """
         Create a reusable requests.Session with optional defaults.
@@ -65,6 +146,10 @@ class SalesforceSession:
             Default headers to include in every request.
         timeout : float, optional
             Default timeout (seconds) for all requests.
+        pool_connections : int
+            Number of host connection pools to cache.
+        pool_maxsize : int
+            Maximum number of keep-alive connections to keep per host.
 
         Returns
         -------
@@ -73,6 +158,9 @@ class SalesforceSession:
         """
         session = requests.Session()
         session.base_url = base_url.rstrip("/")  # handy attribute
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
 
         if headers:
             session.headers.update(headers)
@@ -89,9 +177,12 @@ class SalesforceSession:
         '''
         return f"https://{domain}/"
 
+
+    @instrumented
     def authenticate(self) -> str:
         '''
            Authenticate with Salesforce using oauth.
+           The token is cached on the session until it expires.
            :return sf token
         '''
         # invoke self.post
@@ -107,21 +198,185 @@ class SalesforceSession:
         response =  self.session.post(url, data=form_data)
         response.raise_for_status()
         token_data = response.json()
-        return token_data["access_token"]
+        ttl = float(token_data["expires_in"]) if "expires_in" in token_data else self.token_ttl
+        self._token = token_data["access_token"]
+        self._token_expires_at = time.monotonic() + ttl
+        return self._token
+
+    def warm(self) -> None:
+        '''
+            Authenticate ahead of the first call so the token is cached
+            and a keep-alive connection is already open in the pool.
+        '''
+        self.get_token()
+
+    def _token_is_fresh(self) -> bool:
+        return self._token is not None and time.monotonic() < self._token_expires_at - self.refresh_margin
+
+    def get_token(self) -> str:
+        '''
+            Return the cached access token, refreshing it when it is missing or about to expire.
+            Only one caller refreshes at a time; concurrent callers wait for that refresh.
+            :return sf token
+        '''
+        if self._token_is_fresh():
+            return self._token
+        with self._token_lock:
+            if self._token_is_fresh():
+                return self._token
+            return self._refresh_token()
+
+    def _adopt_token(self, token: str, expires_at: float) -> bool:
+        '''
+            Use a token another worker stored (wall-clock *expires_at*); False when it is too old.
+        '''
+        self._token = token
+        self._token_expires_at = time.monotonic() + (expires_at - time.time())
+        return self._token_is_fresh()
+
+    def _refresh_token(self) -> str:
+        '''
+            Authenticate, or with shared_state take the token another worker fetched,
+            letting only one worker at a time ask Salesforce for a new one.
+        '''
+        if self.shared_state is None:
+            return self.authenticate()
+        key = credentials_key(self)
+        while True:
+            stored = self.shared_state.load_token(key)
+            if stored and self._adopt_token(*stored):
+                return self._token
+            if self.shared_state.claim_token_refresh(key):
+                try:
+                    token = self.authenticate()
+                    self.shared_state.store_token(key, token,
+                                                  time.time() + self._token_expires_at - time.monotonic())
+                    return token
+                finally:
+                    self.shared_state.release_token_refresh(key)
+            time.sleep(TOKEN_WAIT_INTERVAL)
+
+    def invalidate_token(self, stale_token: Optional[str] = None) -> None:
+        '''
+            Drop the cached token so the next call re-authenticates.
+            When *stale_token* is given the cache is only cleared if it still holds that token,
+            so a token already refreshed by another caller is kept.
+        '''
+        with self._token_lock:
+            if stale_token is None or self._token == stale_token:
+                if self.shared_state is not None and self._token is not None:
+                    self.shared_state.drop_token(credentials_key(self), self._token)
+                self._token = None
+                self._token_expires_at = 0.0
+
+    @staticmethod
+    def _is_invalid_session(response: requests.Response) -> bool:
+        if response.status_code != 401:
+            return False
+        try:
+            errors = response.json()
+        except ValueError:
+            return True
+        if isinstance(errors, dict):
+            errors = [errors]
+        return any(isinstance(err, dict) and err.get("errorCode") == "INVALID_SESSION_ID" for err in errors)
+
+    def _send(self, method: str, url: str, token: str,
+              headers: Optional[Dict[str, str]] = None, **kwargs) -> requests.Response:
+        request_headers: Dict[str, str] = {
+            "Authorization": f"Bearer {token}"
+        }
+        if headers:
+            request_headers.update(headers)
+        with self.metrics.http_request(method, url) as observation:
+            response = getattr(self.session, method)(url, headers=request_headers, **kwargs)
+            observation.finish(response, body_read=not kwargs.get("stream", False))
+        return response
 
+    def _send_authenticated(self, method: str, url: str, **kwargs) -> requests.Response:
+        '''
+            Send a request with the cached token, re-authenticating and resending once
+            if Salesforce rejects the token with INVALID_SESSION_ID.
+        '''
+        token = self.get_token()
+        response = self._send(method, url, token, **kwargs)
+        if self._is_invalid_session(response):
+            logging.info("Salesforce session expired, re-authenticating")
+            self.invalidate_token(token)
+            response = self._send(method, url, self.get_token(), **kwargs)
+        return response
+
+    @staticmethod
+    def _request_not_sent(err: Exception) -> bool:
+        '''
+            True when the connection failed before the request could reach Salesforce.
+        '''
+        reason = getattr(err.args[0], "reason", None) if err.args else None
+        return isinstance(err, requests.exceptions.ConnectTimeout) or \
+            isinstance(reason, urllib3.exceptions.NewConnectionError)
+
+    def _request(self, method: str, url: str, *, idempotent: bool = False, **kwargs) -> requests.Response:
+        '''
+            Send an authenticated request within the API usage limiter, retrying transient
+            failures according to the session's RetryPolicy.
+            :param idempotent: retry like a GET even if *method* is POST (a /composite request of reads)
+        '''
+        retry_method = "get" if idempotent else method
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                with self.limiter.slot():
+                    response = self._send_authenticated(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as err:
+                self.telemetry.record(method, url, type(err).__name__)
+                if not self.retry_policy.retry_error(retry_method, attempt, self._request_not_sent(err)):
+                    raise
+                delay = self.retry_policy.delay(attempt)
+                logging.warning(f"{method.upper()} {url} failed ({err}), retrying in {delay:.2f}s")
+            else:
+                self.limiter.observe(response.headers)
+                self.telemetry.record(method, url, response.status_code, response.headers)
+                if not self.retry_policy.retry_response(retry_method, response, attempt):
+                    response.raise_for_status()
+                    return response
+                delay = self.retry_policy.delay(attempt, response.headers.get("Retry-After"))
+                logging.warning(f"{method.upper()} {url} returned {response.status_code}, retrying in {delay:.2f}s")
+                response.close()
+            time.sleep(delay)
+
+    @instrumented
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        '''
+            Send an authenticated request and return the raw response, for endpoints that need
+            custom headers, non-JSON bodies or streamed downloads (e.g. Bulk API 2.0).
+        '''
+        try:
+            return self._request(method.lower(), self.url + path, **kwargs)
+        except Exception as err:
+            logging.error("error")
+            logging.error(err)
+            raise err
+
+    @instrumented
+    def sample_limits(self, api_version: str = "61.0") -> Dict[str, Any]:
+        '''
+            Fetch the org limits (daily API requests, bulk jobs, storage, ...) and record them in telemetry.
+        '''
+        limits = self.request("get", f"services/data/v{api_version}/limits").json()
+        self.telemetry.record_limits(limits)
+        return limits
+
+    @instrumented
     def create(self, path: str, body):
         '''
             create a record
         '''
         try:
-
+            if self.batcher is not None and self.batcher.accepts(path):
+                return self.batcher.submit("post", path, body)
             full_url = self.url + path
-            token = self.authenticate()
-            headers: Dict[str,str] = {
-                "Authorization": f"Bearer {token}"
-            }
-            response = self.session.post(full_url, json=body, headers=headers)
-            response.raise_for_status()
+            response = self._request("post", full_url, json=body)
             response_data = response.json()
             return response_data
         except Exception as err:
@@ -131,6 +386,7 @@ class SalesforceSession:
 
 
 
+    @instrumented
     def update(self, path: str, id: str, body):
 
         '''
@@ -138,14 +394,10 @@ class SalesforceSession:
         '''
         full_url = self.url + path
         try:
-
-            token = self.authenticate()
-            headers: Dict[str,str] = {
-                "Authorization": f"Bearer {token}"
-            }
+            if self.batcher is not None and self.batcher.accepts(path + id):
+                return self.batcher.submit("patch", path + id, body)
             full_url+= id
-            response = self.session.patch(full_url, json=body, headers=headers)
-            response.raise_for_status()
+            response = self._request("patch", full_url, json=body)
             response_data = {"success": True } if response.status_code == 204 else response.json()
             return response_data
         except Exception as err:
@@ -154,19 +406,16 @@ class SalesforceSession:
             raise
 
 
+    @instrumented
     def delete(self, path):
         '''
            delete a record
         '''
         try:
+            if self.batcher is not None and self.batcher.accepts(path):
+                return self.batcher.submit("delete", path)
             full_url = self.url + path
-            token = self.authenticate()
-            headers: Dict[str,str] = {
-                "Authorization": f"Bearer {token}"
-            }
-
-            response = self.session.delete(full_url, headers=headers)
-            response.raise_for_status()
+            response = self._request("delete", full_url)
             response_data = {"success": True } if response.status_code == 204 else response.json()
             return response_data
         except Exception as  err:
@@ -175,15 +424,13 @@ class SalesforceSession:
             raise err
 
 
+    @instrumented
     def get(self, path):
         full_url = self.url + path
         try:
-            token = self.authenticate()
-            headers: Dict[str,str] = {
-                "Authorization": f"Bearer {token}"
-            }
-            response =  self.session.get(full_url, headers=headers)
-            response.raise_for_status()
+            if self.batcher is not None and self.batcher.accepts(path):
+                return self.batcher.submit("get", path)
+            response = self._request("get", full_url)
             response_data = response.json()
             return response_data
         except Exception as err:
@@ -191,4 +438,9 @@ class SalesforceSession:
             logging.error(err)
             raise err
 
+    def close(self) -> None:
+        '''
+            Close the pooled connections.
+        '''
+        self.session.close()
 
@@ -0,0 +1,91 @@
+from __future__ import annotations
+import importlib
+import threading
+from typing import TYPE_CHECKING, Dict, Type, Any
+from salesforce_mcp.utils.credentials import Credentials
+
+if TYPE_CHECKING:
+    from salesforce_mcp.services.SalesforceSession import SalesforceSession
+    from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+
+    Session = SalesforceSession | AsyncSalesforceSession
+
+
+class SessionRegistry:
+    '''
+        Process-wide registry handing out one long-lived session per credential set,
+        so repeated tool calls share the cached token and the pooled keep-alive connections.
+        Works with both SalesforceSession and AsyncSalesforceSession.
+    '''
+
+    def __init__(self, session_cls: Type[Session] | str = "salesforce_mcp.services.SalesforceSession:SalesforceSession",
+                 **session_kwargs: Any):
+        '''
+        :param session_cls: session class to instantiate, or its "module:Class" path to import it (and
+                            its HTTP client) only when the first session is created
+        :param session_kwargs: extra keyword arguments for every session (e.g. pool_connections, pool_maxsize)
+        '''
+        self.session_cls = session_cls
+        self.session_kwargs = session_kwargs
+        self._sessions: Dict[Credentials, Session] = {}
+        self._lock = threading.Lock()
+
+    def _session_class(self) -> Type[Session]:
+        if isinstance(self.session_cls, str):
+            module_name, _, class_name = self.session_cls.partition(":")
+            self.session_cls = getattr(importlib.import_module(module_name), class_name)
+        return self.session_cls
+
+    def _get_or_create(self, credentials: Credentials) -> Session:
+        with self._lock:
+            session = self._sessions.get(credentials)
+            if session is None:
+                session = self._session_class()(
+                    domain=credentials.url,
+                    username=credentials.username,
+                    password=credentials.password,
+                    client_id=credentials.client_id,
+                    client_secret=credentials.client_secret,
+                    **self.session_kwargs,
+                )
+                self._sessions[credentials] = session
+        return session
+
+    def get(self, credentials: Credentials, warm: bool = False) -> SalesforceSession:
+        '''
+            Return the shared session for *credentials*, creating it on first use.
+            :param warm: authenticate immediately so the first real call skips the token round trip
+        '''
+        session = self._get_or_create(credentials)
+        if warm:
+            session.warm()
+        return session
+
+    async def aget(self, credentials: Credentials, warm: bool = False) -> AsyncSalesforceSession:
+        '''
+            Async variant of get() for registries holding AsyncSalesforceSession instances.
+        '''
+        session = self._get_or_create(credentials)
+        if warm:
+            await session.warm()
+        return session
+
+    def _drain(self) -> list[Session]:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        return sessions
+
+    def close(self) -> None:
+        '''
+            Close every pooled connection and forget the registered sessions.
+        '''
+        for session in self._drain():
+            session.close()
+
+    async def aclose(self) -> None:
+        '''
+            Async variant of close() for registries holding AsyncSalesforceSession instances.
+        '''
+        for session in self._drain():
+            await session.aclose()
@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from typing import Optional, Dict, Any
 
-from salesforce_mcp.types.SFRecord import SFRecord
+from salesforce_mcp.types.SFRecord import SFRecord, slotted_record
 
 
 @dataclass
@@ -34,3 +34,7 @@ class LeadRecord(SFRecord):
     IsConverted: Optional[bool] = None
     # Redefine Id to ensure proper field order
     Id: Optional[str] = None
+
+
+# __slots__ variant for large result sets (e.g. SoqlModule.execute_soql(query, SlottedLeadRecord))
+SlottedLeadRecord = slotted_record(LeadRecord)
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from typing import Optional
-from salesforce_mcp.types.SFRecord import SFRecord
+from salesforce_mcp.types.SFRecord import SFRecord, slotted_record
 
 @dataclass
 class OpportunityRecord(SFRecord):
@@ -53,3 +53,7 @@ class OpportunityRecord(SFRecord):
     LastStageChangeInDays: Optional[int] = None
     IsPriorityRecord: Optional[bool] = None
     Id: Optional[str] = None
+
+
+# __slots__ variant for large result sets (e.g. SoqlModule.execute_soql(query, SlottedOpportunityRecord))
+SlottedOpportunityRecord = slotted_record(OpportunityRecord)
@@ -1,22 +1,52 @@
-from dataclasses import dataclass, field
-from typing import Dict, Any
+from dataclasses import MISSING, dataclass, field, fields
+from typing import Dict, Any, Optional, Type, TypeVar
 
-@dataclass
+from salesforce_mcp.utils.dataClassMapper import mapper_for
+from salesforce_mcp.utils.describe import validate_payload
+
+R = TypeVar('R', bound="SFRecord")
+
+# slots=True so that slotted_record() variants carry no per-instance __dict__
+@dataclass(slots=True)
 class SFRecord:
     custom_fields: Dict[str, Any] = field(default_factory=dict, repr=False)
 
-    def to_salesforce_payload(self) -> Dict[str, Any]:
+    def to_salesforce_payload(self, describe: Optional[Dict[str, Any]] = None,
+                              operation: str = "create") -> Dict[str, Any]:
         """
         Converts the record into a Salesforce-ready payload.
         - Removes None values
         - Merges custom fields
+        - Validates the payload against the object's describe metadata, when given
+          (raises RecordValidationError before anything is sent)
         """
-        data = {
-            k: v for k, v in vars(self).items()
-            if v is not None and k != "custom_fields"
-        }
-
-        # Merge custom fields (expects Salesforce API names, e.g. My_Field__c)
-        if self.custom_fields:
-            data.update(self.custom_fields)
+        # Custom fields are merged in (expects Salesforce API names, e.g. My_Field__c)
+        data = mapper_for(type(self)).encode(self)
+        if describe is not None:
+            validate_payload(data, describe, operation)
         return data
+
+
+def slotted_record(record_cls: Type[R]) -> Type[R]:
+    '''
+    Build a ``__slots__`` variant of a record dataclass, e.g. SlottedLeadRecord from LeadRecord:
+    the same fields and defaults without a per-instance __dict__, and custom_fields left as None
+    instead of an empty dict per row. Meant for large read-only result sets.
+    :param record_cls: SFRecord subclass
+    :return: dataclass(slots=True) subclass of SFRecord named "Slotted<record_cls>"
+    '''
+    namespace: Dict[str, Any] = {
+        "__module__": record_cls.__module__,
+        "__qualname__": f"Slotted{record_cls.__qualname__}",
+        "__doc__": f"__slots__ variant of {record_cls.__name__}.",
+        "__annotations__": {"custom_fields": Optional[Dict[str, Any]]},
+        "custom_fields": field(default=None, repr=False),
+    }
+    for record_field in fields(record_cls):
+        if record_field.name == "custom_fields":
+            continue
+        namespace["__annotations__"][record_field.name] = record_field.type
+        namespace[record_field.name] = (
+            field(default_factory=record_field.default_factory, repr=record_field.repr)
+            if record_field.default is MISSING else field(default=record_field.default, repr=record_field.repr))
+    return dataclass(slots=True)(type(f"Slotted{record_cls.__name__}", (SFRecord,), namespace))
@@ -0,0 +1,333 @@
+import csv
+import io
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TypeVar, Type, Optional, Dict, Any, Iterator, Iterable
+from salesforce_mcp.services.SalesforceSession import SalesforceSession
+from salesforce_mcp.utils.dataClassMapper import dict_to_dataclass
+
+T = TypeVar('T')
+
+TERMINAL_STATES = {"JobComplete", "Failed", "Aborted"}
+
+
+class BulkJobError(Exception):
+    '''
+        Raised when a Bulk API 2.0 job ends in the Failed or Aborted state.
+    '''
+    def __init__(self, job: Dict[str, Any]):
+        self.job = job
+        super().__init__(f"Bulk job {job.get('id')} ended in state {job.get('state')}: {job.get('errorMessage')}")
+
+
+def poll_job(sf_session: SalesforceSession, job_path: str,
+             poll_interval: float = 1.0,
+             max_poll_interval: float = 30.0,
+             timeout: Optional[float] = 600.0) -> Dict[str, Any]:
+    '''
+    Poll a bulk job until it reaches a terminal state, doubling the wait between polls.
+    :param job_path: path of the job resource, e.g. services/data/v61.0/jobs/query/750...
+    :param poll_interval: first wait between polls (seconds)
+    :param max_poll_interval: upper bound for the wait between polls (seconds)
+    :param timeout: give up after this many seconds (None waits forever)
+    :return: final job info
+    '''
+    deadline = None if timeout is None else time.monotonic() + timeout
+    wait = poll_interval
+    while True:
+        job = sf_session.get(job_path)
+        state = job.get("state")
+        if state == "JobComplete":
+            return job
+        if state in TERMINAL_STATES:
+            raise BulkJobError(job)
+        if deadline is not None and time.monotonic() + wait > deadline:
+            raise TimeoutError(f"Bulk job {job.get('id')} still {state} after {timeout} seconds")
+        time.sleep(wait)
+        wait = min(wait * 2, max_poll_interval)
+
+
+class BulkQueryModule:
+    '''
+        Bulk API 2.0 query engine for large extractions: creates a query job, polls it with
+        backoff and streams the CSV result chunks (Sforce-Locator / maxRecords) to typed rows or to disk.
+    '''
+    def __init__(self, sf_session: SalesforceSession, api_version = 61.0,
+                 page_size: int = 50000,
+                 poll_interval: float = 1.0,
+                 max_poll_interval: float = 30.0,
+                 timeout: Optional[float] = 600.0):
+        '''
+        :param page_size: maxRecords requested per result chunk
+        :param poll_interval: first wait between job status polls (seconds)
+        :param max_poll_interval: upper bound for the wait between polls (seconds)
+        :param timeout: give up waiting for the job after this many seconds
+        '''
+        self.sf_session = sf_session
+        self.jobs_endpoint = f"services/data/v{api_version}/jobs/query"
+        self.page_size = page_size
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.timeout = timeout
+
+    def create_job(self, query: str, include_deleted: bool = False) -> Dict[str, Any]:
+        '''
+            Submit a query job.
+            :param include_deleted: use the queryAll operation (includes deleted and archived records)
+        '''
+        body = {
+            "operation": "queryAll" if include_deleted else "query",
+            "query": query,
+            "contentType": "CSV",
+            "columnDelimiter": "COMMA",
+            "lineEnding": "LF",
+        }
+        return self.sf_session.create(self.jobs_endpoint, body)
+
+    def wait_for_job(self, job_id: str) -> Dict[str, Any]:
+        return poll_job(self.sf_session, f"{self.jobs_endpoint}/{job_id}",
+                        poll_interval=self.poll_interval,
+                        max_poll_interval=self.max_poll_interval,
+                        timeout=self.timeout)
+
+    def abort_job(self, job_id: str) -> Dict[str, Any]:
+        return self.sf_session.update(f"{self.jobs_endpoint}/", id=job_id, body={"state": "Aborted"})
+
+    def iter_result_pages(self, job_id: str, max_records: Optional[int] = None):
+        '''
+            Yield the streamed HTTP response of each result chunk, following Sforce-Locator.
+            Each response must be consumed before the next one is requested.
+        '''
+        locator: Optional[str] = None
+        remaining = max_records
+        while True:
+            page_size = self.page_size if remaining is None else min(self.page_size, remaining)
+            params: Dict[str, Any] = {"maxRecords": page_size}
+            if locator:
+                params["locator"] = locator
+            response = self.sf_session.request("get", f"{self.jobs_endpoint}/{job_id}/results",
+                                               params=params, stream=True)
+            try:
+                yield response
+            finally:
+                response.close()
+            if remaining is not None:
+                remaining -= int(response.headers.get("Sforce-NumberOfRecords") or page_size)
+                if remaining <= 0:
+                    return
+            locator = response.headers.get("Sforce-Locator")
+            if not locator or locator == "null":
+                return
+
+    @staticmethod
+    def _iter_csv_rows(response) -> Iterator[Dict[str, Optional[str]]]:
+        response.raw.decode_content = True
+        # keep the raw stream readable at EOF so TextIOWrapper can finish cleanly
+        response.raw.auto_close = False
+        text = io.TextIOWrapper(response.raw, encoding="utf-8", newline="")
+        # Bulk CSV has no null marker; empty cells are nulls
+        for row in csv.DictReader(text):
+            yield {key: (value if value != "" else None) for key, value in row.items()}
+
+    def iter_rows[T](self, query: str, t: Optional[Type[T]] = None,
+                     max_records: Optional[int] = None,
+                     include_deleted: bool = False) -> Iterator[T]:
+        '''
+            Run *query* as a bulk job and stream its rows, one result chunk in memory at a time.
+            Values arrive as strings (or None); pass *t* to map each row to a dataclass.
+        '''
+        job = self.create_job(query, include_deleted=include_deleted)
+        self.wait_for_job(job["id"])
+        yielded = 0
+        for response in self.iter_result_pages(job["id"], max_records=max_records):
+            for row in self._iter_csv_rows(response):
+                yield dict_to_dataclass(row, t) if t is not None else row
+                yielded += 1
+                if max_records is not None and yielded >= max_records:
+                    return
+
+    def download(self, query: str, path: str,
+                 max_records: Optional[int] = None,
+                 include_deleted: bool = False,
+                 chunk_size: int = 1024 * 1024) -> int:
+        '''
+            Run *query* as a bulk job and stream its CSV result straight to *path*
+            (one header row, then every chunk), without parsing it.
+            :return: number of records written
+        '''
+        job = self.create_job(query, include_deleted=include_deleted)
+        self.wait_for_job(job["id"])
+        written = 0
+        with open(path, "wb") as out:
+            for index, response in enumerate(self.iter_result_pages(job["id"], max_records=max_records)):
+                skip_header = index > 0
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if skip_header:
+                        newline = chunk.find(b"\n")
+                        if newline == -1:
+                            continue
+                        chunk = chunk[newline + 1:]
+                        skip_header = False
+                    out.write(chunk)
+                written += int(response.headers.get("Sforce-NumberOfRecords") or 0)
+        logging.info(f"Bulk job {job['id']} wrote {written} records to {path}")
+        return written
+
+
+INGEST_OPERATIONS = {"insert", "update", "upsert", "delete", "hardDelete"}
+
+
+@dataclass
+class BulkIngestResult:
+    job: Dict[str, Any]
+    successful_results: list[Dict[str, Optional[str]]] = field(default_factory=list)
+    failed_results: list[Dict[str, Optional[str]]] = field(default_factory=list)
+    unprocessed_records: list[Dict[str, Optional[str]]] = field(default_factory=list)
+
+
+def _csv_value(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def records_to_csv_chunks(records: Iterable[Dict[str, Any]], max_chunk_bytes: int) -> Iterator[bytes]:
+    '''
+    Encode *records* as CSV, split into chunks of at most *max_chunk_bytes*, each with its own header row.
+    Columns are the union of the record keys in order of first appearance.
+    '''
+    records = list(records)
+    columns: list[str] = []
+    seen = set()
+    for record in records:
+        for key in record:
+            if key not in seen:
+                seen.add(key)
+                columns.append(key)
+    header = _encode_csv_row(columns)
+    chunk = [header]
+    size = len(header)
+    for record in records:
+        row = _encode_csv_row([_csv_value(record.get(column)) for column in columns])
+        if size + len(row) > max_chunk_bytes and len(chunk) > 1:
+            yield b"".join(chunk)
+            chunk, size = [header], len(header)
+        chunk.append(row)
+        size += len(row)
+    if len(chunk) > 1:
+        yield b"".join(chunk)
+
+
+def _encode_csv_row(values: list[str]) -> bytes:
+    out = io.StringIO()
+    csv.writer(out, lineterminator="\n").writerow(values)
+    return out.getvalue().encode("utf-8")
+
+
+class BulkIngestModule:
+    '''
+        Bulk API 2.0 ingest: insert/update/upsert/delete/hardDelete jobs fed with CSV uploads.
+        Large inputs are split into size-bounded chunks, one job per chunk.
+    '''
+    def __init__(self, sf_session: SalesforceSession, api_version = 61.0,
+                 max_chunk_bytes: int = 100 * 1024 * 1024,
+                 poll_interval: float = 1.0,
+                 max_poll_interval: float = 30.0,
+                 timeout: Optional[float] = 1800.0):
+        '''
+        :param max_chunk_bytes: maximum CSV bytes uploaded to a single job
+                                (Salesforce accepts up to 150 MB base64-encoded, ~100 MB raw)
+        :param poll_interval: first wait between job status polls (seconds)
+        :param max_poll_interval: upper bound for the wait between polls (seconds)
+        :param timeout: give up waiting for a job after this many seconds
+        '''
+        self.sf_session = sf_session
+        self.jobs_endpoint = f"services/data/v{api_version}/jobs/ingest"
+        self.max_chunk_bytes = max_chunk_bytes
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.timeout = timeout
+
+    def create_job(self, object_name: str, operation: str, external_id_field: Optional[str] = None) -> Dict[str, Any]:
+        if operation not in INGEST_OPERATIONS:
+            raise ValueError(f"Invalid bulk operation: {operation}. Must be one of: {', '.join(sorted(INGEST_OPERATIONS))}")
+        if operation == "upsert" and not external_id_field:
+            raise ValueError("external_id_field is required for upsert")
+        body: Dict[str, Any] = {
+            "object": object_name,
+            "operation": operation,
+            "contentType": "CSV",
+            "columnDelimiter": "COMMA",
+            "lineEnding": "LF",
+        }
+        if external_id_field:
+            body["externalIdFieldName"] = external_id_field
+        return self.sf_session.create(self.jobs_endpoint, body)
+
+    def upload(self, job_id: str, data: bytes) -> None:
+        self.sf_session.request("put", f"{self.jobs_endpoint}/{job_id}/batches",
+                                data=data, headers={"Content-Type": "text/csv"})
+
+    def close_job(self, job_id: str) -> Dict[str, Any]:
+        '''
+            Mark the upload complete so Salesforce starts processing the job.
+        '''
+        return self.sf_session.update(f"{self.jobs_endpoint}/", id=job_id, body={"state": "UploadComplete"})
+
+    def abort_job(self, job_id: str) -> Dict[str, Any]:
+        return self.sf_session.update(f"{self.jobs_endpoint}/", id=job_id, body={"state": "Aborted"})
+
+    def wait_for_job(self, job_id: str) -> Dict[str, Any]:
+        return poll_job(self.sf_session, f"{self.jobs_endpoint}/{job_id}",
+                        poll_interval=self.poll_interval,
+                        max_poll_interval=self.max_poll_interval,
+                        timeout=self.timeout)
+
+    def get_results(self, job_id: str, kind: str) -> list[Dict[str, Optional[str]]]:
+        '''
+            :param kind: successfulResults, failedResults or unprocessedrecords
+        '''
+        response = self.sf_session.request("get", f"{self.jobs_endpoint}/{job_id}/{kind}")
+        return [
+            {key: (value if value != "" else None) for key, value in row.items()}
+            for row in csv.DictReader(io.StringIO(response.text, newline=""))
+        ]
+
+    def run_job(self, object_name: str, operation: str, data: bytes,
+                external_id_field: Optional[str] = None) -> BulkIngestResult:
+        '''
+            Create a job, upload one CSV chunk, close it, wait for it and fetch its results.
+            A job that fails as a whole still returns its results; individual record errors are in failed_results.
+        '''
+        job = self.create_job(object_name, operation, external_id_field)
+        try:
+            self.upload(job["id"], data)
+        except Exception:
+            self.abort_job(job["id"])
+            raise
+        self.close_job(job["id"])
+        try:
+            job = self.wait_for_job(job["id"])
+        except BulkJobError as err:
+            logging.error(err)
+            job = err.job
+        return BulkIngestResult(
+            job=job,
+            successful_results=self.get_results(job["id"], "successfulResults"),
+            failed_results=self.get_results(job["id"], "failedResults"),
+            unprocessed_records=self.get_results(job["id"], "unprocessedrecords"),
+        )
+
+    def run(self, object_name: str, operation: str, records: Iterable[Dict[str, Any]],
+            external_id_field: Optional[str] = None) -> list[BulkIngestResult]:
+        '''
+            Push *records* (dicts keyed by Salesforce API field names) through one or more ingest jobs.
+            :return: one BulkIngestResult per job
+        '''
+        return [
+            self.run_job(object_name, operation, chunk, external_id_field)
+            for chunk in records_to_csv_chunks(records, self.max_chunk_bytes)
+        ]
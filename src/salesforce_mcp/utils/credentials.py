@@ -1,7 +1,8 @@
 from dataclasses import dataclass
+import functools
 import os
 
-@dataclass
+@dataclass(frozen=True)
 class Credentials:
     url: str
     client_id: str
@@ -24,3 +25,12 @@ def get_credentials() -> Credentials:
         username=os.environ["USERNAME"],
         password=os.environ["PASSWORD"],
     )
+
+
+@functools.cache
+def load_credentials() -> Credentials:
+    '''
+        get_credentials() read once per process, for callers on the hot path (every tool call).
+    :return: Credential object
+    '''
+    return get_credentials()
@@ -1,8 +1,155 @@
-from typing import Type, TypeVar
-from dataclasses import  fields
+import threading
+import types
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar, Union, get_args, get_origin, get_type_hints
+from dataclasses import fields
 
 T = TypeVar('T')
 
+# unknown keys with this suffix are custom fields, kept in custom_fields; other unknown keys
+# ("attributes", system fields such as CreatedDate) are dropped
+CUSTOM_FIELD_SUFFIX = "__c"
+
+
+def _to_float(value: Any) -> Any:
+    if type(value) is float:
+        return value
+    if type(value) is int:
+        return float(value)
+    if isinstance(value, str):
+        return float(value) if value else None
+    return value
+
+
+def _to_int(value: Any) -> Any:
+    if type(value) is int:
+        return value
+    if type(value) is float and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        if not value:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            return int(float(value))
+    return value
+
+
+def _to_bool(value: Any) -> Any:
+    if isinstance(value, str):
+        lowered = value.lower()
+        if lowered in ("true", "false"):
+            return lowered == "true"
+        return value or None
+    return value
+
+
+def _to_date(value: Any) -> Any:
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10]) if value else None
+    return value
+
+
+def _to_datetime(value: Any) -> Any:
+    if isinstance(value, str):
+        # Salesforce writes 2026-01-31T09:30:00.000+0000
+        return datetime.fromisoformat(value) if value else None
+    return value
+
+
+# field type -> converter applied to non-null values (Bulk API rows carry every value as a string)
+CONVERTERS: Dict[type, Callable[[Any], Any]] = {
+    float: _to_float,
+    int: _to_int,
+    bool: _to_bool,
+    datetime: _to_datetime,
+    date: _to_date,
+}
+
+
+def _converter(annotation: Any) -> Optional[Callable[[Any], Any]]:
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        annotation = args[0] if len(args) == 1 else None
+    return CONVERTERS.get(annotation) if isinstance(annotation, type) else None
+
+
+class RecordMapper:
+    '''
+        Row <-> dataclass mapper compiled once per class: the field table, the Salesforce name of
+        each field (dataclass field metadata "sf_name", default the field name), type converters
+        and whether custom fields (``__c``) without a field of their own go to custom_fields are
+        worked out up front, so mapping a row is one pass over its keys.
+    '''
+
+    def __init__(self, cls: Type[T]):
+        self.cls = cls
+        hints = get_type_hints(cls)
+        self.has_custom_fields = "custom_fields" in cls.__dataclass_fields__
+        # (field name, Salesforce name) of every field written to a payload
+        self.encoded: Tuple[Tuple[str, str], ...] = tuple(
+            (f.name, f.metadata.get("sf_name", f.name)) for f in fields(cls) if f.name != "custom_fields")
+        # Salesforce name -> (field name, converter or None)
+        self.decoded: Dict[str, Tuple[str, Optional[Callable[[Any], Any]]]] = {
+            sf_name: (name, _converter(hints.get(name))) for name, sf_name in self.encoded}
+
+    def decode(self, row: Dict[str, Any]) -> T:
+        '''
+            Build an instance from a REST/Bulk row: values converted to the field types, custom
+            fields (``__c``) without a field collected in custom_fields, every other key dropped
+            ("attributes", and the read-only system fields of a full GET such as CreatedDate or
+            SystemModstamp, which an update of the record must not send back).
+        '''
+        values: Dict[str, Any] = {}
+        extra: Optional[Dict[str, Any]] = None
+        decoded = self.decoded
+        for key, value in row.items():
+            target = decoded.get(key)
+            if target is None:
+                if self.has_custom_fields and key.endswith(CUSTOM_FIELD_SUFFIX):
+                    if extra is None:
+                        extra = {}
+                    extra[key] = value
+                continue
+            name, convert = target
+            if convert is not None and value is not None:
+                try:
+                    value = convert(value)
+                except ValueError:
+                    pass
+            values[name] = value
+        if extra is not None:
+            values["custom_fields"] = extra
+        return self.cls(**values)
+
+    def encode(self, record: T) -> Dict[str, Any]:
+        '''
+            Salesforce payload of *record*: non-null fields under their Salesforce names, plus custom_fields.
+        '''
+        payload = {sf_name: value for name, sf_name in self.encoded if (value := getattr(record, name)) is not None}
+        if self.has_custom_fields and record.custom_fields:
+            payload.update(record.custom_fields)
+        return payload
+
+
+_mappers: Dict[type, RecordMapper] = {}
+_mappers_lock = threading.Lock()
+
+
+def mapper_for(cls: Type[T]) -> RecordMapper:
+    '''
+    Compiled RecordMapper of *cls*, built on first use and cached.
+    '''
+    mapper = _mappers.get(cls)
+    if mapper is None:
+        with _mappers_lock:
+            mapper = _mappers.get(cls)
+            if mapper is None:
+                mapper = _mappers[cls] = RecordMapper(cls)
+    return mapper
+
+
 def dict_to_dataclass(d: dict, cls: Type[T]) -> T:
     '''
     Helper function for mapping dictionaries to dataclasses
@@ -10,9 +157,7 @@ def dict_to_dataclass(d: dict, cls: Type[T]) -> T:
     :param cls:
     :return: T -> dataclass mapped from dictionary
     '''
-    allowed = {f.name for f in fields(cls)}
-    filtered = {k: v for k, v in d.items() if k in allowed}
-    return cls(**filtered)
+    return mapper_for(cls).decode(d)
 
 def dataclass_to_dict(obj: T) -> dict:
     '''
@@ -20,4 +165,4 @@ def dataclass_to_dict(obj: T) -> dict:
     :param obj: dataclass instance
     :return: dict -> dictionary mapped from dataclass
     '''
-    return {f.name: getattr(obj, f.name) for f in fields(obj) if getattr(obj, f.name) is not None}
\ No newline at end of file
+    return {f.name: getattr(obj, f.name) for f in fields(obj) if getattr(obj, f.name) is not None}
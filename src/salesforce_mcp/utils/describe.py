@@ -0,0 +1,240 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Pattern
+
+from salesforce_mcp.utils.shared_state import SharedStateStore, credentials_key
+
+STRING_TYPES = {"string", "textarea", "picklist", "multipicklist", "email", "phone", "url",
+                "id", "reference", "combobox", "encryptedstring", "date", "datetime", "time"}
+NUMBER_TYPES = {"double", "currency", "percent"}
+UNSAFE_PATH_RE: Pattern[str] = re.compile(r"[^\w.-]")
+
+
+class RecordValidationError(ValueError):
+    '''
+        Raised before a write is sent when the payload does not match the object's describe metadata.
+    '''
+    def __init__(self, object_name: str, errors: List[str]):
+        self.object_name = object_name
+        self.errors = errors
+        super().__init__(f"Invalid {object_name} record: " + "; ".join(errors))
+
+
+def _type_error(value: Any, field: Dict[str, Any]) -> Optional[str]:
+    field_type = field.get("type")
+    if field_type == "boolean":
+        ok = isinstance(value, bool)
+    elif field_type == "int":
+        ok = isinstance(value, int) and not isinstance(value, bool)
+    elif field_type in NUMBER_TYPES:
+        ok = isinstance(value, (int, float)) and not isinstance(value, bool)
+    elif field_type in STRING_TYPES:
+        ok = isinstance(value, str)
+    else:
+        return None
+    return None if ok else f"{field['name']} expects {field_type}, got {type(value).__name__}"
+
+
+def _value_errors(value: Any, field: Dict[str, Any]) -> List[str]:
+    errors = []
+    length = field.get("length") or 0
+    if isinstance(value, str) and length and len(value) > length:
+        errors.append(f"{field['name']} is {len(value)} characters long, maximum is {length}")
+    if isinstance(value, str) and field.get("restrictedPicklist"):
+        allowed = {item["value"] for item in field.get("picklistValues", []) if item.get("active", True)}
+        values = value.split(";") if field.get("type") == "multipicklist" else [value]
+        errors.extend(f"{field['name']} does not allow the value {item!r}" for item in values if item not in allowed)
+    return errors
+
+
+def validate_payload(payload: Dict[str, Any], describe: Dict[str, Any], operation: str = "create") -> None:
+    '''
+    Check a write payload against ``sobjects/<Object>/describe`` metadata: field existence,
+    createable/updateable flags, value types, string lengths, restricted picklist values and,
+    for creates, required fields.
+    :param operation: "create" or "update"
+    :raises RecordValidationError: listing every problem found
+    '''
+    fields = {field["name"].lower(): field for field in describe.get("fields", [])}
+    flag = "createable" if operation == "create" else "updateable"
+    errors = []
+    for name, value in payload.items():
+        if name in ("Id", "attributes"):
+            continue
+        field = fields.get(name.lower())
+        if field is None:
+            errors.append(f"No such field {name}")
+            continue
+        if not field.get(flag, False):
+            errors.append(f"{field['name']} is not {flag}")
+        if value is None:
+            if not field.get("nillable", True):
+                errors.append(f"{field['name']} cannot be null")
+            continue
+        type_error = _type_error(value, field)
+        if type_error:
+            errors.append(type_error)
+        else:
+            errors.extend(_value_errors(value, field))
+    if operation == "create":
+        present = {name.lower() for name, value in payload.items() if value is not None}
+        errors.extend(
+            f"Missing required field {field['name']}" for key, field in fields.items()
+            if field.get("createable") and not field.get("nillable", True)
+            and not field.get("defaultedOnCreate") and field.get("type") != "boolean" and key not in present
+        )
+    if errors:
+        raise RecordValidationError(describe.get("name", "sObject"), errors)
+
+
+@dataclass
+class DescribeEntry:
+    describe: Dict[str, Any]
+    last_modified: Optional[str]
+    # None until revalidated by this process (entries read from disk)
+    checked_at: Optional[float] = None
+
+
+class DescribeCache:
+    '''
+        Cache of ``sobjects/<Object>/describe`` results for one session, kept in memory and
+        optionally on disk (one JSON file per org, API version and object). Entries older than
+        revalidate_after, and entries loaded from disk, are revalidated with If-Modified-Since,
+        which Salesforce answers with a body-less 304 while the metadata is unchanged.
+        With shared_state the entries, and when they were last revalidated, are shared by every
+        worker process, so a describe is fetched and revalidated once per server, not per worker.
+    '''
+
+    def __init__(self, sf_session, cache_dir: Optional[str] = None,
+                 api_version: str = "61.0", revalidate_after: float = 3600.0,
+                 shared_state: Optional[SharedStateStore] = None):
+        '''
+        :param cache_dir: directory for the on-disk copy (None keeps the cache in memory only)
+        :param revalidate_after: seconds a describe is used before it is revalidated
+        :param shared_state: store shared with the other worker processes, consulted before cache_dir
+        '''
+        self.sf_session = sf_session
+        self.cache_dir = cache_dir
+        self.api_version = api_version
+        self.revalidate_after = revalidate_after
+        self.shared_state = shared_state
+        self._entries: Dict[str, DescribeEntry] = {}
+        self._lock = threading.Lock()
+        self.fetches = 0
+        self.not_modified = 0
+
+    def _describe_path(self, object_name: str) -> str:
+        return f"services/data/v{self.api_version}/sobjects/{object_name}/describe"
+
+    def _file_path(self, object_name: str) -> str:
+        org = UNSAFE_PATH_RE.sub("_", self.sf_session.domain)
+        return os.path.join(self.cache_dir, org, f"v{self.api_version}", f"{UNSAFE_PATH_RE.sub('_', object_name)}.json")
+
+    def _shared_key(self, object_name: str) -> str:
+        return f"{credentials_key(self.sf_session)}/v{self.api_version}/{object_name}"
+
+    def _load_shared(self, object_name: str) -> Optional[DescribeEntry]:
+        row = self.shared_state.load_describe(self._shared_key(object_name))
+        if row is None:
+            return None
+        describe, last_modified, checked_at = row
+        entry = DescribeEntry(json.loads(describe), last_modified, time.monotonic() - (time.time() - checked_at))
+        with self._lock:
+            self._entries[object_name] = entry
+        return entry
+
+    def _share(self, object_name: str, entry: DescribeEntry) -> None:
+        if self.shared_state is not None:
+            self.shared_state.store_describe(self._shared_key(object_name), json.dumps(entry.describe),
+                                             entry.last_modified, time.time())
+
+    def _load(self, object_name: str) -> Optional[DescribeEntry]:
+        with self._lock:
+            entry = self._entries.get(object_name)
+        if self.shared_state is not None and not self._is_fresh(entry):
+            # another worker may have fetched or revalidated it since
+            entry = self._load_shared(object_name) or entry
+        if entry is not None or self.cache_dir is None:
+            return entry
+        try:
+            with open(self._file_path(object_name), encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None
+        return DescribeEntry(data["describe"], data.get("last_modified"))
+
+    def _save(self, object_name: str, entry: DescribeEntry) -> None:
+        with self._lock:
+            self._entries[object_name] = entry
+        self._share(object_name, entry)
+        if self.cache_dir is None:
+            return
+        path = self._file_path(object_name)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump({"last_modified": entry.last_modified, "describe": entry.describe}, file)
+            os.replace(temp_path, path)
+        except OSError as err:
+            logging.warning(f"Could not write describe cache {path}: {err}")
+
+    def _is_fresh(self, entry: Optional[DescribeEntry]) -> bool:
+        return entry is not None and entry.checked_at is not None and time.monotonic() - entry.checked_at < self.revalidate_after
+
+    @staticmethod
+    def _conditional_headers(entry: Optional[DescribeEntry]) -> Dict[str, str]:
+        return {"If-Modified-Since": entry.last_modified} if entry is not None and entry.last_modified else {}
+
+    def _apply(self, object_name: str, entry: Optional[DescribeEntry], response) -> Dict[str, Any]:
+        if response.status_code == 304 and entry is not None:
+            self.not_modified += 1
+            entry.checked_at = time.monotonic()
+            with self._lock:
+                self._entries[object_name] = entry
+            self._share(object_name, entry)
+        else:
+            self.fetches += 1
+            entry = DescribeEntry(response.json(), response.headers.get("Last-Modified"), time.monotonic())
+            self._save(object_name, entry)
+        return entry.describe
+
+    def describe(self, object_name: str) -> Dict[str, Any]:
+        '''
+            Return the describe metadata of *object_name*, fetching or revalidating it when needed.
+        '''
+        entry = self._load(object_name)
+        if self._is_fresh(entry):
+            return entry.describe
+        response = self.sf_session.request("get", self._describe_path(object_name),
+                                           headers=self._conditional_headers(entry))
+        return self._apply(object_name, entry, response)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class AsyncDescribeCache(DescribeCache):
+    '''
+        DescribeCache for AsyncSalesforceSession.
+    '''
+
+    async def describe(self, object_name: str) -> Dict[str, Any]:
+        with self._lock:
+            entry = self._entries.get(object_name)
+        if self._is_fresh(entry):
+            return entry.describe
+        # shared_state and cache_dir are read and written on a worker thread, not on the event loop
+        entry = await asyncio.to_thread(self._load, object_name)
+        if self._is_fresh(entry):
+            return entry.describe
+        response = await self.sf_session.request("get", self._describe_path(object_name),
+                                                 headers=self._conditional_headers(entry))
+        return await asyncio.to_thread(self._apply, object_name, entry, response)
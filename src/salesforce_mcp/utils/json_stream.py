@@ -0,0 +1,194 @@
+import codecs
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Pattern, Union
+
+WHITESPACE_RE: Pattern[str] = re.compile(r"[ \t\n\r]*")
+NUMBER_START = frozenset("-0123456789")
+# a complete string, or (captured) a string still open at the end of the buffer
+STRING_RE: Pattern[str] = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|("[^"\\]*(?:\\.[^"\\]*)*\\?\Z)')
+BRACKET_RE: Pattern[str] = re.compile(r"[{}\[\]]")
+SCAN_WINDOW = 4096
+
+# parser states
+_START, _KEY_OR_END, _KEY, _COLON, _VALUE, _AFTER_MEMBER, _ITEM_OR_END, _ITEM, _AFTER_ITEM, _END = range(10)
+
+
+class QueryPageDecoder:
+    '''
+        Incremental decoder for one query result page, e.g.
+        {"totalSize": 4100, "done": false, "nextRecordsUrl": "...", "records": [{...}, ...]}.
+
+        The body is fed chunk by chunk. Each record is returned as soon as its closing brace
+        arrives, so only one record and one undecoded chunk are held at a time. Every other
+        top-level member is collected in fields.
+    '''
+
+    def __init__(self, array_key: str = "records"):
+        '''
+        :param array_key: top-level member whose array items are returned one by one
+        '''
+        self.array_key = array_key
+        self.fields: Dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = _START
+        self._key: Optional[str] = None
+        # an object or array still arriving: whether decoding it failed once, and the scan of it
+        # as (characters scanned, nesting depth) once it failed again
+        self._partial = False
+        self._scan: Optional[tuple] = None
+
+    def feed(self, chunk: Union[bytes, str]) -> List[Any]:
+        '''
+            Add the next piece of the body.
+            :return: the records completed by it
+        '''
+        self._buffer += self._text.decode(chunk) if isinstance(chunk, bytes) else chunk
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        '''
+            Mark the end of the body.
+            :return: any records still buffered
+            :raises json.JSONDecodeError: if the body was not a complete JSON object
+        '''
+        self._buffer += self._text.decode(b"", final=True)
+        records = self._parse(final=True)
+        if self._state != _END:
+            raise json.JSONDecodeError("Truncated query response", self._buffer, len(self._buffer))
+        return records
+
+    def _complete(self, buffer: str, pos: int) -> bool:
+        # whether the object or array starting at pos has fully arrived. Strings are cut out and only
+        # the brackets outside them counted, resuming where the previous chunk's scan ended, so a
+        # record spanning many chunks is scanned once; growing windows stop the scan soon after
+        # the record's end rather than at the end of a large chunk
+        scanned, depth = self._scan or (0, 0)
+        start, window = pos + scanned, SCAN_WINDOW
+        while True:
+            stop = min(start + window, len(buffer))
+            outside = STRING_RE.sub(r"\1", buffer[start:stop])
+            open_string = outside.find('"')
+            if open_string >= 0:
+                # a string running past the window is kept as is: scanned again from its opening quote
+                start = stop - (len(outside) - open_string)
+                outside = outside[:open_string]
+            else:
+                start = stop
+            for bracket in BRACKET_RE.findall(outside):
+                depth += 1 if bracket in "{[" else -1
+                if depth == 0:
+                    self._scan = None
+                    return True
+            if stop == len(buffer):
+                break
+            window *= 2
+        self._scan = (start - pos, depth)
+        return False
+
+    def _decode(self, buffer: str, pos: int, final: bool) -> Optional[tuple]:
+        # (value, end), or None while the value may still be incomplete
+        if self._scan is not None and not final and not self._complete(buffer, pos):
+            return None
+        try:
+            value, end = self._decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            if buffer[pos] in "{[":
+                # a record split over two chunks is simply decoded again with the next one; a larger
+                # one is only decoded again once _complete finds its closing bracket
+                if not self._partial:
+                    self._partial = True
+                elif self._complete(buffer, pos):
+                    # fully arrived and still failing: invalid
+                    raise
+            return None
+        self._partial = False
+        # a number at the end of the buffer may continue in the next chunk
+        if end == len(buffer) and not final and buffer[pos] in NUMBER_START:
+            return None
+        return value, end
+
+    @staticmethod
+    def _expect(buffer: str, pos: int, expected: str) -> None:
+        raise json.JSONDecodeError(f"Expecting {expected}", buffer, pos)
+
+    def _parse(self, final: bool) -> List[Any]:
+        records: List[Any] = []
+        buffer, pos = self._buffer, 0
+        while True:
+            pos = WHITESPACE_RE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            char, state = buffer[pos], self._state
+            if state == _START:
+                if char != "{":
+                    self._expect(buffer, pos, "'{'")
+                self._state, pos = _KEY_OR_END, pos + 1
+            elif state == _KEY_OR_END and char == "}":
+                self._state, pos = _END, pos + 1
+            elif state in (_KEY, _KEY_OR_END):
+                if char != '"':
+                    self._expect(buffer, pos, "property name enclosed in double quotes")
+                decoded = self._decode(buffer, pos, final)
+                if decoded is None:
+                    break
+                self._key, pos = decoded
+                self._state = _COLON
+            elif state == _COLON:
+                if char != ":":
+                    self._expect(buffer, pos, "':' delimiter")
+                self._state, pos = _VALUE, pos + 1
+            elif state == _VALUE:
+                if self._key == self.array_key and char == "[":
+                    self._state, pos = _ITEM_OR_END, pos + 1
+                    continue
+                decoded = self._decode(buffer, pos, final)
+                if decoded is None:
+                    break
+                self.fields[self._key], pos = decoded
+                self._state = _AFTER_MEMBER
+            elif state == _AFTER_MEMBER:
+                if char not in ",}":
+                    self._expect(buffer, pos, "',' delimiter")
+                self._state, pos = (_KEY if char == "," else _END), pos + 1
+            elif state == _ITEM_OR_END and char == "]":
+                self._state, pos = _AFTER_MEMBER, pos + 1
+            elif state in (_ITEM, _ITEM_OR_END):
+                decoded = self._decode(buffer, pos, final)
+                if decoded is None:
+                    break
+                record, pos = decoded
+                records.append(record)
+                self._state = _AFTER_ITEM
+            elif state == _AFTER_ITEM:
+                if char not in ",]":
+                    self._expect(buffer, pos, "',' delimiter")
+                self._state, pos = (_ITEM if char == "," else _AFTER_MEMBER), pos + 1
+            else:
+                raise json.JSONDecodeError("Extra data", buffer, pos)
+        self._buffer = buffer[pos:]
+        return records
+
+
+def iter_page_records(chunks: Iterable[Union[bytes, str]], decoder: QueryPageDecoder) -> Iterator[Any]:
+    '''
+    Feed *chunks* to *decoder* and yield each record as soon as it is complete.
+    '''
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
+
+
+async def aiter_page_records(chunks: AsyncIterable[Union[bytes, str]], decoder: QueryPageDecoder) -> AsyncIterator[Any]:
+    '''
+    Async counterpart of iter_page_records.
+    '''
+    async for chunk in chunks:
+        for record in decoder.feed(chunk):
+            yield record
+    for record in decoder.close():
+        yield record
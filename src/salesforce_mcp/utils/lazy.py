@@ -0,0 +1,24 @@
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    '''
+    Module *name* whose code runs on first attribute access instead of now, so a dependency only
+    some code paths need (e.g. requests, used by the sync session for bulk jobs) does not slow
+    down every server start. Returns the real module when it is already imported.
+    :param name: top-level module name
+    '''
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,142 @@
+import asyncio
+import contextlib
+import re
+import threading
+import time
+from typing import Any, AsyncIterator, Iterator, Mapping, Optional, Pattern, Tuple
+
+# Sforce-Limit-Info: api-usage=18/5000
+API_USAGE_RE: Pattern[str] = re.compile(r"(?<![\w-])api-usage=(\d+)/(\d+)")
+
+
+def parse_limit_info(value: Any) -> Optional[Tuple[int, int]]:
+    '''
+    Parse a Sforce-Limit-Info header.
+    :return: (requests used, daily allocation), or None if the header is missing or malformed
+    '''
+    if not isinstance(value, str):
+        return None
+    match = API_USAGE_RE.search(value)
+    if match is None or int(match.group(2)) == 0:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+class ApiUsageLimiter:
+    '''
+        Concurrency limiter that follows the org's daily API usage reported in Sforce-Limit-Info.
+
+        Below soft_limit (fraction of the daily allocation) up to max_concurrency requests run at
+        once; between soft_limit and hard_limit the allowance shrinks linearly to one request at a
+        time; from hard_limit on, requests are also spaced at least hard_interval seconds apart.
+    '''
+
+    def __init__(self, max_concurrency: int = 10, soft_limit: float = 0.8,
+                 hard_limit: float = 0.95, hard_interval: float = 1.0):
+        '''
+        :param max_concurrency: requests in flight while usage is below soft_limit
+        :param soft_limit: usage fraction at which throttling starts
+        :param hard_limit: usage fraction at which requests are serialised and paced
+        :param hard_interval: minimum seconds between requests past hard_limit
+        '''
+        self.max_concurrency = max(1, max_concurrency)
+        self.soft_limit = soft_limit
+        self.hard_limit = hard_limit
+        self.hard_interval = hard_interval
+        self.api_used: Optional[int] = None
+        self.api_allowed: Optional[int] = None
+        self.concurrency = self.max_concurrency
+        self.in_flight = 0
+        self._next_start = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def usage(self) -> Optional[float]:
+        '''
+            Fraction of the daily API allocation used, as last reported by Salesforce.
+        '''
+        if self.api_used is None or not self.api_allowed:
+            return None
+        return self.api_used / self.api_allowed
+
+    def _concurrency_for(self, usage: float) -> int:
+        if usage < self.soft_limit:
+            return self.max_concurrency
+        if usage >= self.hard_limit:
+            return 1
+        remaining = (self.hard_limit - usage) / (self.hard_limit - self.soft_limit)
+        return max(1, round(1 + (self.max_concurrency - 1) * remaining))
+
+    def _update(self, headers: Mapping[str, Any]) -> bool:
+        limit_info = parse_limit_info(headers.get("Sforce-Limit-Info"))
+        if limit_info is None:
+            return False
+        self.api_used, self.api_allowed = limit_info
+        self.concurrency = self._concurrency_for(self.usage)
+        return True
+
+    def _pacing_delay(self) -> float:
+        # caller holds the condition; reserves the next start slot past hard_limit
+        usage = self.usage
+        if usage is None or usage < self.hard_limit:
+            return 0.0
+        now = time.monotonic()
+        start = max(now, self._next_start)
+        self._next_start = start + self.hard_interval
+        return start - now
+
+    def observe(self, headers: Mapping[str, Any]) -> None:
+        '''
+            Record the API usage reported by a response.
+        '''
+        with self._condition:
+            if self._update(headers):
+                self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def slot(self) -> Iterator[None]:
+        '''
+            Hold one of the currently allowed concurrent request slots.
+        '''
+        with self._condition:
+            self._condition.wait_for(lambda: self.in_flight < self.concurrency)
+            self.in_flight += 1
+            delay = self._pacing_delay()
+        try:
+            if delay:
+                time.sleep(delay)
+            yield
+        finally:
+            with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+
+class AsyncApiUsageLimiter(ApiUsageLimiter):
+    '''
+        ApiUsageLimiter for AsyncSalesforceSession.
+    '''
+
+    def __init__(self, max_concurrency: int = 10, soft_limit: float = 0.8,
+                 hard_limit: float = 0.95, hard_interval: float = 1.0):
+        super().__init__(max_concurrency, soft_limit, hard_limit, hard_interval)
+        self._async_condition = asyncio.Condition()
+
+    def observe(self, headers: Mapping[str, Any]) -> None:
+        # waiting tasks re-check the allowance whenever a slot is released
+        self._update(headers)
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._async_condition:
+            await self._async_condition.wait_for(lambda: self.in_flight < self.concurrency)
+            self.in_flight += 1
+            delay = self._pacing_delay()
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+            yield
+        finally:
+            async with self._async_condition:
+                self.in_flight -= 1
+                self._async_condition.notify_all()
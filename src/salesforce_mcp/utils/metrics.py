@@ -0,0 +1,322 @@
+import asyncio
+import bisect
+import contextlib
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from salesforce_mcp.utils.telemetry import current_tool, endpoint_template
+
+# latency buckets in seconds, from a cached token lookup to a slow bulk poll
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+TOOL_DURATION = "salesforce_mcp_tool_duration_seconds"
+TOOL_ERRORS = "salesforce_mcp_tool_errors_total"
+TOOL_IN_PROGRESS = "salesforce_mcp_tool_calls_in_progress"
+SESSION_DURATION = "salesforce_mcp_session_call_duration_seconds"
+SESSION_ERRORS = "salesforce_mcp_session_call_errors_total"
+SESSION_IN_PROGRESS = "salesforce_mcp_session_calls_in_progress"
+HTTP_DURATION = "salesforce_mcp_http_request_duration_seconds"
+HTTP_REQUESTS = "salesforce_mcp_http_requests_total"
+HTTP_REQUEST_BYTES = "salesforce_mcp_http_request_bytes_total"
+HTTP_RESPONSE_BYTES = "salesforce_mcp_http_response_bytes_total"
+HTTP_IN_FLIGHT = "salesforce_mcp_http_requests_in_flight"
+STARTUP_SECONDS = "salesforce_mcp_startup_seconds"
+
+# name -> (type, help) of every metric the server records
+METRICS: Dict[str, Tuple[str, str]] = {
+    TOOL_DURATION: ("histogram", "MCP tool call latency."),
+    TOOL_ERRORS: ("counter", "MCP tool calls that raised, by exception type."),
+    TOOL_IN_PROGRESS: ("gauge", "MCP tool calls currently running."),
+    SESSION_DURATION: ("histogram", "Salesforce session method latency; method=\"authenticate\" is the OAuth token exchange."),
+    SESSION_ERRORS: ("counter", "Salesforce session method calls that raised, by exception type."),
+    SESSION_IN_PROGRESS: ("gauge", "Salesforce session method calls currently running."),
+    HTTP_DURATION: ("histogram", "Latency of single authenticated HTTP calls to Salesforce, excluding token refreshes and retry waits."),
+    HTTP_REQUESTS: ("counter", "HTTP calls to Salesforce by status code, or exception type for calls that failed."),
+    HTTP_REQUEST_BYTES: ("counter", "Request body bytes sent to Salesforce."),
+    HTTP_RESPONSE_BYTES: ("counter", "Response body bytes received from Salesforce (Content-Length, or the body read)."),
+    HTTP_IN_FLIGHT: ("gauge", "HTTP calls to Salesforce currently waiting for a response."),
+    STARTUP_SECONDS: ("gauge", "Seconds from the start of the server's imports to each startup phase."),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def _body_size(headers: Any, body: Any = None) -> Optional[int]:
+    length = headers.get("Content-Length") if headers is not None else None
+    if isinstance(length, str) and length.isdigit():
+        return int(length)
+    if isinstance(body, (bytes, bytearray, str)):
+        return len(body)
+    return None
+
+
+class Histogram:
+    '''
+        Cumulative-bucket latency histogram in the Prometheus data model.
+    '''
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterator[Tuple[float, int]]:
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            yield bound, total
+
+
+class HttpObservation:
+    '''
+        Handle given to the code sending one HTTP call, to report the response it got.
+    '''
+
+    def __init__(self):
+        self.response = None
+        self.body_read = True
+
+    def finish(self, response, body_read: bool = True) -> None:
+        '''
+        :param body_read: False for streamed responses, whose size is only known from Content-Length
+        '''
+        self.response = response
+        self.body_read = body_read
+
+
+class MetricsRegistry:
+    '''
+        Process-wide latency histograms, counters and gauges for the MCP tools, the session methods
+        and the HTTP calls behind them, exported in the Prometheus text format
+        (served over HTTP with serve() or written to a file with write()).
+    '''
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        '''
+        :param buckets: upper bounds, in seconds, of the latency histogram buckets
+        '''
+        self.buckets = tuple(sorted(buckets))
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Dict[Labels, float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def add(self, name: str, amount: float, **labels: Any) -> None:
+        '''
+            Move a gauge up or down by *amount*.
+        '''
+        key = _labels(labels)
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        '''
+            Set a gauge to *value*.
+        '''
+        key = _labels(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def value(self, name: str, **labels: Any) -> Optional[float]:
+        '''
+            Current value of a counter or gauge, or the observation count of a histogram.
+        '''
+        key = _labels(labels)
+        with self._lock:
+            if name in self._histograms:
+                histogram = self._histograms[name].get(key)
+                return None if histogram is None else histogram.count
+            return self._counters.get(name, self._gauges.get(name, {})).get(key)
+
+    @contextlib.contextmanager
+    def timed(self, duration: str, errors: str, in_progress: str, **labels: Any) -> Iterator[None]:
+        '''
+            Time the block into the *duration* histogram, tracking it in the *in_progress* gauge and
+            counting exceptions in *errors* by type. Cancellation (a client that went away) is not an error.
+        '''
+        self.add(in_progress, 1, **labels)
+        started = time.perf_counter()
+        try:
+            yield
+        except asyncio.CancelledError:
+            raise
+        except BaseException as err:
+            self.inc(errors, error=type(err).__name__, **labels)
+            raise
+        finally:
+            self.observe(duration, time.perf_counter() - started, **labels)
+            self.add(in_progress, -1, **labels)
+
+    @contextlib.contextmanager
+    def http_request(self, method: str, url: str) -> Iterator[HttpObservation]:
+        '''
+            Record one HTTP call: latency, status (or exception type), bytes each way, in-flight gauge.
+            The block reports its response through the yielded HttpObservation.
+        '''
+        labels = {"method": method.upper(), "endpoint": endpoint_template(url), "tool": current_tool.get() or "-"}
+        observation = HttpObservation()
+        self.add(HTTP_IN_FLIGHT, 1)
+        started = time.perf_counter()
+        try:
+            yield observation
+        except BaseException as err:
+            self.inc(HTTP_REQUESTS, status=type(err).__name__, **labels)
+            raise
+        else:
+            response = observation.response
+            if response is not None:
+                self.inc(HTTP_REQUESTS, status=response.status_code, **labels)
+                request = getattr(response, "request", None)
+                sent = _body_size(getattr(request, "headers", None))
+                if sent:
+                    self.inc(HTTP_REQUEST_BYTES, sent, **labels)
+                received = _body_size(response.headers, response.content if observation.body_read else None)
+                if received:
+                    self.inc(HTTP_RESPONSE_BYTES, received, **labels)
+        finally:
+            self.observe(HTTP_DURATION, time.perf_counter() - started,
+                         method=labels["method"], endpoint=labels["endpoint"])
+            self.add(HTTP_IN_FLIGHT, -1)
+
+    def render(self) -> str:
+        '''
+            All series in the Prometheus text exposition format (version 0.0.4).
+        '''
+        with self._lock:
+            histograms = {name: {key: (list(hist.cumulative()), hist.sum, hist.count) for key, hist in series.items()}
+                          for name, series in self._histograms.items()}
+            scalars = {name: dict(series) for name, series in {**self._counters, **self._gauges}.items()}
+        lines = []
+        for name in sorted(set(histograms) | set(scalars)):
+            metric_type, help_text = METRICS.get(name, ("histogram" if name in histograms else "untyped", name))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            if name in histograms:
+                for key, (buckets, total, count) in sorted(histograms[name].items()):
+                    for bound, cumulative in buckets:
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {total!r}")
+                    lines.append(f"{name}_count{_format_labels(key)} {count}")
+            else:
+                for key, value in sorted(scalars[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        '''
+            Write the current metrics to *path* atomically (e.g. for node_exporter's textfile collector).
+        '''
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(self.render())
+        os.replace(temp_path, path)
+
+    def write_periodically(self, path: str, interval: float) -> threading.Thread:
+        '''
+            Rewrite *path* every *interval* seconds from a daemon thread.
+        '''
+        def loop():
+            while True:
+                try:
+                    self.write(path)
+                except OSError as err:
+                    logging.warning(f"Could not write metrics to {path}: {err}")
+                time.sleep(interval)
+
+        thread = threading.Thread(target=loop, name="metrics-writer", daemon=True)
+        thread.start()
+        return thread
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        '''
+            Serve the metrics at http://<host>:<port>/metrics from a daemon thread.
+        '''
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        return server
+
+
+def instrumented(method):
+    '''
+        Decorator for session methods (sync or async): time each call into
+        salesforce_mcp_session_call_duration_seconds{method="<name>"} of the session's metrics.
+    '''
+    name = method.__name__
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            with self.metrics.timed(SESSION_DURATION, SESSION_ERRORS, SESSION_IN_PROGRESS, method=name):
+                return await method(self, *args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.metrics.timed(SESSION_DURATION, SESSION_ERRORS, SESSION_IN_PROGRESS, method=name):
+            return method(self, *args, **kwargs)
+    return wrapper
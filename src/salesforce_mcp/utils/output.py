@@ -0,0 +1,94 @@
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from salesforce_mcp.utils.columnar import record_as_dict
+
+# Salesforce metadata added to every row, relationship object and subquery result
+ATTRIBUTES_KEY = "attributes"
+
+
+def _clean(value: Any, strip_attributes: bool, omit_nulls: bool) -> Any:
+    # relationship fields are nested rows and subqueries nested results; both carry attributes blocks
+    if isinstance(value, dict):
+        return {
+            key: _clean(item, strip_attributes, omit_nulls) for key, item in value.items()
+            if not (strip_attributes and key == ATTRIBUTES_KEY) and not (omit_nulls and item is None)
+        }
+    if isinstance(value, list):
+        return [_clean(item, strip_attributes, omit_nulls) for item in value]
+    return value
+
+
+def _lookup(row: Dict[str, Any], path: str) -> Any:
+    # "Account.Owner.Name" walks relationship objects; a null relationship yields None
+    value: Any = row
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def shape_row(record: Any, fields: Optional[Sequence[str]] = None, strip_attributes: bool = True,
+              omit_nulls: bool = False) -> Dict[str, Any]:
+    '''
+    One query row as a plain dict trimmed for output.
+    :param record: row dict or record dataclass
+    :param fields: keep only these fields, in this order; dotted paths ("Account.Name") reach into
+                   relationship objects and are returned under the dotted key
+    :param strip_attributes: drop the "attributes" blocks, nested ones included
+    :param omit_nulls: drop null fields
+    '''
+    row = record_as_dict(record)
+    if fields is not None:
+        row = {name: row.get(name) if "." not in name else _lookup(row, name) for name in fields}
+    return _clean(row, strip_attributes, omit_nulls)
+
+
+def _size(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str).encode())
+
+
+def shape_records(records: Iterable[Any], fields: Optional[Sequence[str]] = None, strip_attributes: bool = True,
+                  omit_nulls: bool = False, max_records: Optional[int] = None, max_bytes: Optional[int] = None,
+                  tabular: bool = False) -> Dict[str, Any]:
+    '''
+    Trim query rows to an output budget.
+
+    Rows are shaped with shape_row and kept until max_records rows or max_bytes of compact JSON
+    would be exceeded. The result is {"size", "truncated", "records"}, or {"size", "truncated",
+    "fields", "rows"} when tabular: one header row of field names, then one list of values per
+    record (fields missing from a record are null). truncated counts the rows left out.
+    :param max_records: keep at most this many rows
+    :param max_bytes: keep rows while their compact JSON encoding fits in about this many bytes
+    :param tabular: return the header + value rows encoding instead of one object per record
+    '''
+    kept: List[Dict[str, Any]] = []
+    header: Dict[str, None] = dict.fromkeys(fields or ())
+    used = 0
+    omitted = 0
+    for record in records:
+        if omitted or (max_records is not None and len(kept) >= max_records):
+            omitted += 1
+            continue
+        row = shape_row(record, fields, strip_attributes, omit_nulls)
+        if max_bytes is not None:
+            # tabular rows cost their values plus the header entries they add
+            new_keys = [key for key in row if key not in header] if tabular else ()
+            cost = _size(list(row.values()) if tabular else row) + sum(_size(key) + 1 for key in new_keys) + 1
+            if used + cost > max_bytes:
+                omitted += 1
+                continue
+            used += cost
+        if tabular and fields is None:
+            header.update(dict.fromkeys(row))
+        kept.append(row)
+
+    output: Dict[str, Any] = {"size": len(kept), "truncated": omitted}
+    if tabular:
+        names = list(header)
+        output["fields"] = names
+        output["rows"] = [[row.get(name) for name in names] for row in kept]
+    else:
+        output["records"] = kept
+    return output
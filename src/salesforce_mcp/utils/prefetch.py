@@ -0,0 +1,88 @@
+import asyncio
+import queue
+import threading
+from typing import TypeVar, Iterator, AsyncIterator, Optional, Tuple
+
+T = TypeVar('T')
+
+_DONE = object()
+
+
+def _put(buffer: queue.Queue, item, stop: threading.Event) -> bool:
+    '''
+    Block until *item* fits in the buffer or the consumer went away.
+    :return: False if the consumer stopped
+    '''
+    while not stop.is_set():
+        try:
+            buffer.put(item, timeout=0.05)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def prefetch_iter(source: Iterator[T], depth: int) -> Iterator[T]:
+    '''
+    Drive *source* on a background thread, keeping up to *depth* items buffered ahead of the consumer.
+    Exceptions raised by the source are re-raised in the consumer; closing the returned
+    iterator early stops the background thread.
+    :param source: iterator to read ahead (e.g. pages fetched over the network)
+    :param depth: maximum number of items buffered ahead of the consumer
+    '''
+    buffer: queue.Queue[Tuple[object, Optional[BaseException]]] = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for item in source:
+                if not _put(buffer, (item, None), stop):
+                    return
+            _put(buffer, (_DONE, None), stop)
+        except BaseException as err:
+            _put(buffer, (_DONE, err), stop)
+        finally:
+            close = getattr(source, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, name="prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, err = buffer.get()
+            if item is _DONE:
+                if err is not None:
+                    raise err
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+async def async_prefetch_iter(source: AsyncIterator[T], depth: int) -> AsyncIterator[T]:
+    '''
+    asyncio counterpart of prefetch_iter: a background task reads *source* up to *depth* items ahead.
+    '''
+    buffer: asyncio.Queue[Tuple[object, Optional[BaseException]]] = asyncio.Queue(maxsize=depth)
+
+    async def produce() -> None:
+        try:
+            async for item in source:
+                await buffer.put((item, None))
+            await buffer.put((_DONE, None))
+        except Exception as err:
+            await buffer.put((_DONE, err))
+
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            item, err = await buffer.get()
+            if item is _DONE:
+                if err is not None:
+                    raise err
+                return
+            yield item
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,145 @@
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any, Dict, Hashable, Optional, Pattern
+
+# string literals are kept verbatim; everything else in a SOQL query is case-insensitive
+LITERAL_RE: Pattern[str] = re.compile(r"('(?:\\.|[^'\\])*')")
+WHITESPACE_RE: Pattern[str] = re.compile(r"\s+")
+FROM_OBJECT_RE: Pattern[str] = re.compile(r"\bfrom\s+(\w+)")
+
+
+def normalize_query(query: str) -> str:
+    '''
+    Canonical form of a SOQL query used as cache key: whitespace collapsed and
+    everything outside string literals lower-cased.
+    '''
+    parts = LITERAL_RE.split(query.strip())
+    return "".join(part if index % 2 else WHITESPACE_RE.sub(" ", part).lower()
+                   for index, part in enumerate(parts))
+
+
+def json_default(value: Any) -> Any:
+    '''
+    json.dumps default for cached results: dataclasses (including __slots__ records, which have
+    no __dict__) by their fields, other objects by their __dict__, anything else as str.
+    '''
+    if is_dataclass(value) and not isinstance(value, type):
+        return {field.name: getattr(value, field.name) for field in fields(value)}
+    return getattr(value, "__dict__", str(value))
+
+
+def query_objects(normalized_query: str) -> frozenset[str]:
+    '''
+    Lower-cased names following FROM in a normalized query, including sub-selects
+    (which name child relationships such as "opportunities").
+    '''
+    return frozenset(FROM_OBJECT_RE.findall(LITERAL_RE.sub("''", normalized_query)))
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    expires_at: float
+    size: int
+    objects: frozenset[str]
+
+
+class QueryCache:
+    '''
+        Bounded in-process cache of query results with a per-entry TTL and LRU eviction
+        by entry count and approximate byte size. Thread-safe, shared by the sync and
+        async query modules of a session.
+    '''
+    # whether calls do I/O (SharedQueryCache), so async callers should run them on a worker thread
+    blocking = False
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 256, max_bytes: int = 16 * 1024 * 1024):
+        '''
+        :param ttl: seconds an entry is served before it is refetched
+        :param max_entries: evict least recently used entries beyond this many
+        :param max_bytes: evict least recently used entries once their JSON size exceeds this
+        '''
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def estimate_size(value: Any) -> int:
+        return len(json.dumps(value, default=json_default))
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, key: Hashable, value: Any, objects: frozenset[str], size: Optional[int] = None) -> None:
+        '''
+            Store *value*; results larger than max_bytes are not cached.
+            :param objects: lower-cased object names the value was read from, for invalidate_object
+        '''
+        size = self.estimate_size(value) if size is None else size
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CacheEntry(value, time.monotonic() + self.ttl, size, objects)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_object(self, object_name: str) -> int:
+        '''
+            Drop every entry read from *object_name* (or from a child relationship named after it,
+            e.g. "Opportunities" for Opportunity).
+            :return: number of entries dropped
+        '''
+        name = object_name.lower()
+        with self._lock:
+            stale = [key for key, entry in self._entries.items()
+                     if any(obj.startswith(name) for obj in entry.objects)]
+            for key in stale:
+                self._remove(key)
+            self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,161 @@
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Pattern, Tuple
+
+from salesforce_mcp.utils.query_cache import LITERAL_RE, QueryCache, normalize_query
+
+NUMBER_RE: Pattern[str] = re.compile(r"\b\d+(\.\d+)?\b")
+HAS_LIMIT_RE: Pattern[str] = re.compile(r"\bLIMIT\s+\d+\b", re.IGNORECASE)
+# a LIMIT goes before these clauses
+LIMIT_TAIL_RE: Pattern[str] = re.compile(r"\s+(OFFSET|FOR\s+(VIEW|REFERENCE|UPDATE))\b.*$", re.IGNORECASE | re.DOTALL)
+# a LIMIT would change what these return (one aggregate row, not the first rows of a scan)
+AGGREGATE_RE: Pattern[str] = re.compile(
+    r"\bGROUP\s+BY\b|\b(COUNT|COUNT_DISTINCT|SUM|AVG|MIN|MAX)\s*\(", re.IGNORECASE)
+GUARD_ACTIONS = ("warn", "limit", "refuse")
+
+
+def query_shape(query: str) -> str:
+    '''
+    Normalized query with its string and number literals replaced by "?", so queries that only
+    differ in the values they filter on share one cached plan.
+    '''
+    parts = LITERAL_RE.split(normalize_query(query))
+    return "".join("?" if index % 2 else NUMBER_RE.sub("?", part) for index, part in enumerate(parts))
+
+
+def _outer_query(query: str) -> str:
+    # the query without its literals and the contents of parentheses (sub-selects, function arguments),
+    # so a LIMIT or aggregate inside a sub-select is not taken for one of the outer query
+    kept = []
+    depth = 0
+    for index, part in enumerate(LITERAL_RE.split(query)):
+        if index % 2:
+            continue
+        for char in part:
+            if char == ")":
+                depth = max(depth - 1, 0)
+            if depth == 0:
+                kept.append(char)
+            if char == "(":
+                depth += 1
+    return "".join(kept)
+
+
+def add_limit(query: str, limit: int) -> str:
+    '''
+    *query* with ``LIMIT <limit>`` added in front of any OFFSET / FOR clause.
+    '''
+    query = query.rstrip()
+    match = LIMIT_TAIL_RE.search(query)
+    position = match.start() if match else len(query)
+    return f"{query[:position].rstrip()} LIMIT {limit}{query[position:]}"
+
+
+@dataclass
+class QueryPlan:
+    '''
+        One plan of a ``/query?explain=`` response. Salesforce lists the plans by ascending
+        relativeCost; the first one is the plan the query optimizer will use.
+    '''
+    leadingOperationType: str
+    relativeCost: float
+    sobjectType: Optional[str] = None
+    cardinality: Optional[int] = None
+    sobjectCardinality: Optional[int] = None
+    fields: List[str] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, plan: Dict[str, Any]) -> "QueryPlan":
+        return cls(leadingOperationType=plan.get("leadingOperationType", ""),
+                   relativeCost=float(plan.get("relativeCost", 0.0)),
+                   sobjectType=plan.get("sobjectType"),
+                   cardinality=plan.get("cardinality"),
+                   sobjectCardinality=plan.get("sobjectCardinality"),
+                   fields=list(plan.get("fields") or []),
+                   notes=[note.get("description", "") for note in plan.get("notes") or []])
+
+    @property
+    def is_table_scan(self) -> bool:
+        return self.leadingOperationType == "TableScan"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"leadingOperationType": self.leadingOperationType, "relativeCost": self.relativeCost,
+                "sobjectType": self.sobjectType, "cardinality": self.cardinality,
+                "sobjectCardinality": self.sobjectCardinality, "notes": self.notes}
+
+
+class NonSelectiveQueryError(ValueError):
+    '''
+        Raised instead of running a query whose leading plan is a costly full table scan.
+    '''
+    def __init__(self, query: str, plan: QueryPlan):
+        self.query = query
+        self.plan = plan
+        super().__init__(
+            f"Query refused: it would scan every {plan.sobjectType or 'record'} row "
+            f"(TableScan, relative cost {plan.relativeCost:g}). Filter on an indexed field (Id, Name, "
+            f"a lookup, an external ID, CreatedDate, SystemModstamp), avoid leading-wildcard LIKE "
+            f"and negative filters, or add a LIMIT.")
+
+
+class SelectivityGuard:
+    '''
+        Checks queries against their Salesforce query plan (``/query?explain=``) before they run.
+        When the leading plan is a TableScan costing more than max_cost (Salesforce deems a query
+        selective below 1), the query is run with a warning, run with a LIMIT added, or refused.
+        Plans are cached per org and query shape, so the explain call is paid once per shape.
+    '''
+
+    def __init__(self, action: str = "warn", max_cost: float = 1.0, limit: int = 2000,
+                 plan_ttl: float = 3600.0, max_plans: int = 512):
+        '''
+        :param action: "warn", "limit" (add LIMIT *limit* to queries that have none, warn otherwise) or "refuse"
+        :param max_cost: relativeCost above which a leading TableScan is flagged
+        :param limit: LIMIT added in "limit" mode
+        :param plan_ttl: seconds a plan is reused (plans change as the org's data grows)
+        :param max_plans: plans kept, least recently used evicted first
+        '''
+        if action not in GUARD_ACTIONS:
+            raise ValueError(f"Unknown selectivity guard action {action!r}, expected one of {GUARD_ACTIONS}")
+        self.action = action
+        self.max_cost = max_cost
+        self.limit = limit
+        self.plans = QueryCache(ttl=plan_ttl, max_entries=max_plans)
+
+    @staticmethod
+    def plan_key(org: str, query: str) -> Hashable:
+        return org, query_shape(query)
+
+    def cached_plan(self, key: Hashable) -> Optional[List[QueryPlan]]:
+        return self.plans.get(key)
+
+    def store_plan(self, key: Hashable, plans: List[QueryPlan]) -> List[QueryPlan]:
+        self.plans.put(key, plans, frozenset())
+        return plans
+
+    def is_costly(self, plan: QueryPlan) -> bool:
+        return plan.is_table_scan and plan.relativeCost > self.max_cost
+
+    def review(self, query: str, plans: List[QueryPlan]) -> Tuple[str, Optional[Dict[str, Any]]]:
+        '''
+            Apply the guard to *query* given its plans.
+            :return: the query to run (with a LIMIT added in "limit" mode) and a report of the
+                     leading plan and the action taken, or None when the query is selective
+            :raises NonSelectiveQueryError: in "refuse" mode, for a costly table scan
+        '''
+        if not plans or not self.is_costly(plans[0]):
+            return query, None
+        plan = plans[0]
+        if self.action == "refuse":
+            raise NonSelectiveQueryError(query, plan)
+        report = {"plan": plan.to_dict(), "action": "warned",
+                  "warning": f"Non-selective query: full scan of {plan.sobjectType or 'the object'} "
+                             f"(relative cost {plan.relativeCost:g}); filter on an indexed field to speed it up."}
+        outer = _outer_query(query)
+        if self.action == "limit" and not HAS_LIMIT_RE.search(outer) and not AGGREGATE_RE.search(outer):
+            query = add_limit(query, self.limit)
+            report.update(action="limited", query=query)
+        logging.warning(f"{report['warning']} Query: {query}")
+        return query, report
@@ -0,0 +1,91 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class CachedRecord:
+    body: Dict[str, Any]
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class RecordCache:
+    '''
+        LRU cache of sObject rows keyed by Id, holding the ETag / Last-Modified validators of each
+        row so later gets can be sent as conditional requests and a 304 answered from memory.
+    '''
+
+    def __init__(self, max_entries: int = 1024):
+        '''
+        :param max_entries: evict least recently used rows beyond this many
+        '''
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedRecord] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def lookup(self, record_id: str) -> Optional[CachedRecord]:
+        with self._lock:
+            entry = self._entries.get(record_id)
+            if entry is not None:
+                self._entries.move_to_end(record_id)
+            return entry
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CachedRecord]) -> Dict[str, str]:
+        '''
+            If-None-Match / If-Modified-Since headers revalidating *entry* (empty when it is not cached).
+        '''
+        headers: Dict[str, str] = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def apply(self, record_id: str, entry: Optional[CachedRecord], response) -> Dict[str, Any]:
+        '''
+            Resolve a (conditional) get: serve the cached row on 304, otherwise store the new one.
+            :return: a copy of the row
+        '''
+        if response.status_code == 304 and entry is not None:
+            with self._lock:
+                self.hits += 1
+            return dict(entry.body)
+        body = response.json()
+        entry = CachedRecord(body, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        with self._lock:
+            self.misses += 1
+            if entry.etag or entry.last_modified:
+                self._entries[record_id] = entry
+                self._entries.move_to_end(record_id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return dict(body)
+
+    def invalidate(self, record_id: str) -> None:
+        with self._lock:
+            if self._entries.pop(record_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,83 @@
+import random
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+IDEMPOTENT_METHODS = frozenset({"get", "head", "options", "put", "patch", "delete"})
+
+
+def limit_exceeded_error(response) -> Optional[str]:
+    '''
+    Message of a REQUEST_LIMIT_EXCEEDED error response (403), or None for any other response.
+    '''
+    if response.status_code != 403:
+        return None
+    try:
+        errors = response.json()
+    except ValueError:
+        return None
+    if isinstance(errors, dict):
+        errors = [errors]
+    for err in errors if isinstance(errors, list) else []:
+        if isinstance(err, dict) and err.get("errorCode") == "REQUEST_LIMIT_EXCEEDED":
+            return str(err.get("message", ""))
+    return None
+
+
+def retry_after_seconds(value: Any) -> Optional[float]:
+    '''
+    Parse a Retry-After header given either in seconds or as an HTTP date.
+    '''
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    '''
+        When and how long to wait before resending a failed request.
+
+        GET/PUT/PATCH/DELETE are retried on transient failures: 429/502/503/504, connection
+        errors and timeouts, and REQUEST_LIMIT_EXCEEDED for concurrent-request limits (an
+        exhausted daily allocation is never retried). POST is not idempotent and is only
+        retried when Salesforce cannot have acted on it: the connection was never established
+        or the request was rejected with REQUEST_LIMIT_EXCEEDED.
+        Waits grow exponentially from base_delay with full jitter, capped at max_delay, and a
+        Retry-After header is honoured.
+    '''
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    retry_statuses: frozenset[int] = field(default_factory=lambda: frozenset({429, 502, 503, 504}))
+
+    def retry_response(self, method: str, response, attempt: int) -> bool:
+        if attempt >= self.max_attempts:
+            return False
+        limit_message = limit_exceeded_error(response)
+        if limit_message is not None:
+            # "TotalRequests Limit exceeded" means the daily allocation is gone
+            return "TotalRequests" not in limit_message
+        return method.lower() in IDEMPOTENT_METHODS and response.status_code in self.retry_statuses
+
+    def retry_error(self, method: str, attempt: int, request_not_sent: bool) -> bool:
+        if attempt >= self.max_attempts:
+            return False
+        return request_not_sent or method.lower() in IDEMPOTENT_METHODS
+
+    def delay(self, attempt: int, retry_after: Any = None) -> float:
+        '''
+            Seconds to wait before attempt number *attempt* + 1.
+        '''
+        server_delay = retry_after_seconds(retry_after)
+        if server_delay is not None:
+            return min(server_delay, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
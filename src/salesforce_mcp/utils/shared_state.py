@@ -0,0 +1,344 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from salesforce_mcp.utils.query_cache import QueryCache
+
+# seconds a worker may hold the token refresh lease before another worker takes over
+TOKEN_REFRESH_LEASE = 30.0
+# seconds between checks while another worker refreshes the token
+TOKEN_WAIT_INTERVAL = 0.05
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    key TEXT PRIMARY KEY, token TEXT, expires_at REAL NOT NULL DEFAULT 0, refreshing_until REAL NOT NULL DEFAULT 0);
+CREATE TABLE IF NOT EXISTS describes (
+    key TEXT PRIMARY KEY, describe TEXT NOT NULL, last_modified TEXT, checked_at REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS queries (
+    key TEXT PRIMARY KEY, value TEXT NOT NULL, objects TEXT NOT NULL, size INTEGER NOT NULL,
+    expires_at REAL NOT NULL, stored_at REAL NOT NULL);
+"""
+
+
+def credentials_key(sf_session) -> str:
+    '''
+    Stable key of a session's org and user, without the secrets, for the shared tables.
+    '''
+    identity = "\0".join((sf_session.domain, sf_session.client_id, sf_session.username))
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+def _record_class(name: str) -> type:
+    '''
+    Dataclass named "module:qualname", looked up among the modules already imported: a stored
+    result never makes this process import or run code it has not loaded itself.
+    '''
+    module_name, _, qualname = name.partition(":")
+    value: Any = sys.modules.get(module_name)
+    for attribute in qualname.split("."):
+        value = getattr(value, attribute, None)
+    if not isinstance(value, type) or not is_dataclass(value):
+        raise LookupError(f"No record dataclass {name!r}")
+    return value
+
+
+def _encode_value(value: Any) -> Any:
+    if is_dataclass(value) and not isinstance(value, type):
+        cls = type(value)
+        name = f"{cls.__module__}:{cls.__qualname__}"
+        try:
+            found = _record_class(name)
+        except LookupError:
+            found = None
+        if found is not cls:
+            # e.g. defined inside a function: it could not be rebuilt on read
+            raise TypeError(f"{name} cannot be cached")
+        return {"__dataclass__": name, "fields": {field.name: getattr(value, field.name) for field in fields(value)}}
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    raise TypeError(f"{type(value).__name__} cannot be cached")
+
+
+def _decode_value(value: Dict[str, Any]) -> Any:
+    if "__dataclass__" in value:
+        cls = _record_class(value["__dataclass__"])
+        names = {field.name for field in fields(cls)}
+        if set(value["fields"]) != names:
+            raise LookupError(f"Stored fields do not match {cls.__qualname__}")
+        # set field by field: no __init__ / __post_init__ runs, and slotted and frozen classes work
+        record = cls.__new__(cls)
+        for name, field_value in value["fields"].items():
+            object.__setattr__(record, name, field_value)
+        return record
+    if "__datetime__" in value:
+        return datetime.fromisoformat(value["__datetime__"])
+    if "__date__" in value:
+        return date.fromisoformat(value["__date__"])
+    return value
+
+
+def dump_result(value: Any) -> str:
+    '''
+    JSON text of a cached query result: dicts, lists and scalars as they are, dataclasses (e.g.
+    SoqlResult and its records) and dates tagged so load_result rebuilds them.
+    :raises TypeError: for values it cannot represent
+    '''
+    return json.dumps(value, default=_encode_value, separators=(",", ":"))
+
+
+def load_result(data: str) -> Any:
+    '''
+    Inverse of dump_result. Only rebuilds dataclasses of modules this process already imported.
+    :raises ValueError: for data that is not a stored result
+    :raises LookupError: for records of a class this process has not imported
+    '''
+    return json.loads(data, object_hook=_decode_value)
+
+
+class SharedStateStore:
+    '''
+        SQLite file (WAL mode) through which the worker processes of one server share OAuth tokens,
+        describe metadata and query results, so adding workers does not multiply token requests,
+        describe calls or cache misses.
+
+        Times are wall-clock (time.time()) since they are compared across processes. Each process
+        and thread opens its own connection on first use, so a store created before the workers
+        are started can be handed to them, whether they are forked or (forkserver, spawn) receive
+        it pickled. The file holds access tokens and is created readable by its owner only.
+    '''
+
+    def __init__(self, path: str, timeout: float = 5.0):
+        '''
+        :param path: database file, created with its directory when missing
+        :param timeout: seconds a statement waits for another process's write lock
+        '''
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        os.close(os.open(path, os.O_CREAT | os.O_RDWR, 0o600))
+        connection = self._connect()
+        try:
+            connection.executescript(SCHEMA)
+        finally:
+            connection.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"path": self.path, "timeout": self.timeout}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.path = state["path"]
+        self.timeout = state["timeout"]
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # connections must not cross a fork
+        if getattr(self._local, "pid", None) != os.getpid():
+            self._local.connection = self._connect()
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    # ---- OAuth tokens ----
+
+    def load_token(self, key: str) -> Optional[Tuple[str, float]]:
+        '''
+            (token, wall-clock expiry) stored for *key*, if any.
+        '''
+        row = self.connection.execute("SELECT token, expires_at FROM tokens WHERE key = ? AND token IS NOT NULL",
+                                      (key,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def store_token(self, key: str, token: str, expires_at: float) -> None:
+        self.connection.execute(
+            "INSERT INTO tokens (key, token, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET token = excluded.token, expires_at = excluded.expires_at",
+            (key, token, expires_at))
+
+    def drop_token(self, key: str, token: str) -> None:
+        '''
+            Forget *token* (rejected by Salesforce) unless another worker already replaced it.
+        '''
+        self.connection.execute("UPDATE tokens SET token = NULL, expires_at = 0 WHERE key = ? AND token = ?",
+                                (key, token))
+
+    def claim_token_refresh(self, key: str, lease: float = TOKEN_REFRESH_LEASE) -> bool:
+        '''
+            Take the right to fetch a new token for *key*; False while another worker holds it.
+            A lease left by a worker that died expires after *lease* seconds.
+        '''
+        now = time.time()
+        self.connection.execute("INSERT OR IGNORE INTO tokens (key) VALUES (?)", (key,))
+        cursor = self.connection.execute(
+            "UPDATE tokens SET refreshing_until = ? WHERE key = ? AND refreshing_until < ?", (now + lease, key, now))
+        return cursor.rowcount == 1
+
+    def release_token_refresh(self, key: str) -> None:
+        self.connection.execute("UPDATE tokens SET refreshing_until = 0 WHERE key = ?", (key,))
+
+    # ---- describe metadata ----
+
+    def load_describe(self, key: str) -> Optional[Tuple[str, Optional[str], float]]:
+        '''
+            (describe JSON, Last-Modified, wall-clock time of the last fetch or revalidation) of *key*.
+        '''
+        return self.connection.execute(
+            "SELECT describe, last_modified, checked_at FROM describes WHERE key = ?", (key,)).fetchone()
+
+    def store_describe(self, key: str, describe: str, last_modified: Optional[str], checked_at: float) -> None:
+        self.connection.execute("INSERT OR REPLACE INTO describes VALUES (?, ?, ?, ?)",
+                                (key, describe, last_modified, checked_at))
+
+    # ---- query results ----
+
+    def load_query(self, key: str, now: float) -> Optional[str]:
+        row = self.connection.execute("SELECT value FROM queries WHERE key = ? AND expires_at > ?",
+                                      (key, now)).fetchone()
+        return row[0] if row else None
+
+    def store_query(self, key: str, value: str, objects: frozenset[str], size: int, expires_at: float,
+                    max_entries: int, max_bytes: int) -> int:
+        '''
+            Store one result and evict the oldest results beyond the bounds.
+            :return: number of results evicted
+        '''
+        connection = self.connection
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("DELETE FROM queries WHERE expires_at <= ?", (now,))
+            connection.execute("INSERT OR REPLACE INTO queries VALUES (?, ?, ?, ?, ?, ?)",
+                               (key, value, " ".join(sorted(objects)), size, expires_at, now))
+            evicted = 0
+            while True:
+                count, total = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM queries").fetchone()
+                if count <= max_entries and total <= max_bytes:
+                    break
+                evicted += connection.execute(
+                    "DELETE FROM queries WHERE key = (SELECT key FROM queries ORDER BY stored_at, rowid LIMIT 1)").rowcount
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return evicted
+
+    def query_objects(self, prefix: str) -> List[Tuple[str, str]]:
+        '''
+            (key, space-separated object names) of the results whose key starts with *prefix*.
+        '''
+        return self.connection.execute("SELECT key, objects FROM queries WHERE substr(key, 1, ?) = ?",
+                                       (len(prefix), prefix)).fetchall()
+
+    def delete_queries(self, keys: List[str]) -> int:
+        return self.connection.executemany("DELETE FROM queries WHERE key = ?", [(key,) for key in keys]).rowcount
+
+    def query_totals(self, prefix: str) -> Tuple[int, int]:
+        '''
+            (entries, bytes) of the unexpired results whose key starts with *prefix*.
+        '''
+        return self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM queries WHERE substr(key, 1, ?) = ? AND expires_at > ?",
+            (len(prefix), prefix, time.time())).fetchone()
+
+    def clear_queries(self, prefix: str) -> None:
+        self.connection.execute("DELETE FROM queries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+
+class SharedQueryCache(QueryCache):
+    '''
+        QueryCache kept in a SharedStateStore, so a result fetched by one worker is served to all
+        of them and a write in any worker invalidates it everywhere. Results are stored as JSON
+        (dump_result), never pickled, so whoever can write the file cannot make a worker run code;
+        those that cannot be stored (e.g. records of a class defined inside a function) are not
+        cached. When over its bounds the oldest results are evicted first. hits / misses count
+        this process's lookups.
+
+        Every call is a SQLite statement on a local file; async callers check ``blocking`` and
+        run them off the event loop.
+    '''
+
+    blocking = True
+
+    def __init__(self, store: SharedStateStore, namespace: str, ttl: float = 60.0, max_entries: int = 256,
+                 max_bytes: int = 16 * 1024 * 1024):
+        '''
+        :param namespace: prefix of this session's keys (credentials_key), keeping orgs apart
+        '''
+        super().__init__(ttl, max_entries, max_bytes)
+        self.store = store
+        self.namespace = namespace + ":"
+
+    def _key(self, key: Hashable) -> str:
+        return self.namespace + repr(key)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        data = self.store.load_query(self._key(key), time.time())
+        value = None
+        if data is not None:
+            try:
+                value = load_result(data)
+            except (ValueError, LookupError, TypeError):
+                # written by another version (or not by this server at all): refetched and overwritten
+                value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any, objects: frozenset[str], size: Optional[int] = None) -> None:
+        try:
+            data = dump_result(value)
+        except (TypeError, ValueError):
+            return
+        if len(data) > self.max_bytes:
+            return
+        evicted = self.store.store_query(self._key(key), data, objects, len(data), time.time() + self.ttl,
+                                         self.max_entries, self.max_bytes)
+        with self._lock:
+            self.evictions += evicted
+
+    def invalidate_object(self, object_name: str) -> int:
+        name = object_name.lower()
+        stale = [key for key, objects in self.store.query_objects(self.namespace)
+                 if any(obj.startswith(name) for obj in objects.split())]
+        dropped = self.store.delete_queries(stale) if stale else 0
+        with self._lock:
+            self.invalidations += dropped
+        return dropped
+
+    def clear(self) -> None:
+        self.store.clear_queries(self.namespace)
+
+    def stats(self) -> Dict[str, Any]:
+        entries, size = self.store.query_totals(self.namespace)
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "shared": True,
+                "entries": entries,
+                "bytes": size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
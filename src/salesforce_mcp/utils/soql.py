@@ -1,32 +1,634 @@
 from salesforce_mcp.services.SalesforceSession import SalesforceSession
-from typing import TypeVar, Generic, Dict, Type, Optional
-from dataclasses import dataclass
+from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+from typing import TypeVar, Generic, Dict, Type, Optional, Any, Iterator, AsyncIterator, Pattern, Sequence, Tuple
+from dataclasses import dataclass, replace
+from collections import deque
+from contextlib import aclosing
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote_plus
+import asyncio
+import logging
+import re
+from salesforce_mcp.utils.columnar import ColumnarSoqlResult, ColumnBuilder, EXCLUDED_KEYS
 from salesforce_mcp.utils.dataClassMapper import dict_to_dataclass
+from salesforce_mcp.utils.json_stream import QueryPageDecoder, aiter_page_records, iter_page_records
+from salesforce_mcp.utils.output import shape_records
+from salesforce_mcp.utils.prefetch import prefetch_iter, async_prefetch_iter
+from salesforce_mcp.utils.query_cache import QueryCache, normalize_query, query_objects
+from salesforce_mcp.utils.query_plan import QueryPlan, SelectivityGuard
 T = TypeVar('T')
 
+# nextRecordsUrl is "<query locator>-<offset>", e.g. /services/data/v61.0/query/01gD0000002HU6KIAW-2000
+LOCATOR_RE: Pattern[str] = re.compile(r"^/?(?P<locator>.+/query/[^/?]+)-(?P<offset>\d+)$")
+# queries a plain COUNT() cannot be derived from
+COUNT_UNSAFE_RE: Pattern[str] = re.compile(
+    r"\bGROUP\s+BY\b|\(\s*SELECT\b|\b(COUNT|COUNT_DISTINCT|SUM|AVG|MIN|MAX)\s*\(", re.IGNORECASE)
+FROM_RE: Pattern[str] = re.compile(r"\bFROM\b", re.IGNORECASE)
+QUERY_TAIL_RE: Pattern[str] = re.compile(
+    r"\s+(ORDER\s+BY|LIMIT|OFFSET|FOR\s+(VIEW|REFERENCE|UPDATE))\b.*$", re.IGNORECASE | re.DOTALL)
+LIMIT_RE: Pattern[str] = re.compile(r"\bLIMIT\s+(\d+)\b", re.IGNORECASE)
+# bytes read from a streamed query response at a time
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def to_count_query(query: str) -> Optional[str]:
+    '''
+    Rewrite ``SELECT <fields> FROM ... [ORDER BY/LIMIT/OFFSET]`` as ``SELECT COUNT() FROM ...``.
+    :return: the count query, or None for aggregate/sub-select queries that cannot be counted this way
+    '''
+    if COUNT_UNSAFE_RE.search(query):
+        return None
+    match = FROM_RE.search(query)
+    if match is None:
+        return None
+    return "SELECT COUNT() " + QUERY_TAIL_RE.sub("", query[match.start():]).strip()
+
 @dataclass
 class SoqlResult(Generic[T]):
     totalSize: int
     records: list[T]
+    done: bool = True
+    nextRecordsUrl: Optional[str] = None
+
+    def to_columnar(self, columns: Optional[Sequence[str]] = None,
+                    exclude: Sequence[str] = EXCLUDED_KEYS) -> ColumnarSoqlResult:
+        '''
+            The same result laid out column by column (see ColumnarSoqlResult).
+        '''
+        return ColumnarSoqlResult.from_records(self.records, columns, exclude, totalSize=self.totalSize,
+                                               done=self.done, nextRecordsUrl=self.nextRecordsUrl)
+
+    def to_output(self, fields: Optional[Sequence[str]] = None, strip_attributes: bool = True,
+                  omit_nulls: bool = False, max_records: Optional[int] = None, max_bytes: Optional[int] = None,
+                  tabular: bool = False, columnar: bool = False) -> Dict[str, Any]:
+        '''
+            JSON-ready result trimmed for tool output (see output.shape_records), with totalSize,
+            done and nextRecordsUrl of the query.
+            :param columnar: lay the kept rows out column by column (see ColumnarSoqlResult.to_dict);
+                with omit_nulls, columns that are null in every kept row are left out
+        '''
+        if columnar:
+            if tabular:
+                raise ValueError("columnar and tabular cannot both be set")
+            shaped = shape_records(self.records, fields, strip_attributes, omit_nulls, max_records, max_bytes)
+            table = ColumnarSoqlResult.from_records(shaped["records"], None if omit_nulls else fields, exclude=(),
+                                                    totalSize=self.totalSize, done=self.done,
+                                                    nextRecordsUrl=self.nextRecordsUrl)
+            return {**table.to_dict(), "truncated": shaped["truncated"]}
+        return {
+            "totalSize": self.totalSize,
+            "done": self.done,
+            "nextRecordsUrl": self.nextRecordsUrl,
+            **shape_records(self.records, fields, strip_attributes, omit_nulls, max_records, max_bytes, tabular),
+        }
 
 class SoqlModule:
-    def __init__(self, sf_session: SalesforceSession, api_version = 61.0):
+    def __init__(self, sf_session: SalesforceSession, api_version = 61.0,
+                 prefetch: int = 0, parallel_pages: int = 0, stream: bool = False):
+        '''
+        :param prefetch: number of result pages fetched ahead in the background while the caller
+                         maps the current one (0 walks nextRecordsUrl strictly sequentially)
+        :param parallel_pages: fetch this many later pages concurrently by computing their
+                               query-locator offsets from the first page (0 disables)
+        :param stream: read each page with stream=True and decode its records one at a time as the
+                       body arrives, so no page is ever held as a whole (pages are then walked
+                       sequentially; prefetch and parallel_pages are ignored)
+        '''
         self.sf_session = sf_session
         self.soql_endpoint = f"services/data/v{api_version}/query?q="
+        self.explain_endpoint = f"services/data/v{api_version}/query?explain="
+        self.prefetch = prefetch
+        self.parallel_pages = parallel_pages
+        self.stream = stream
+
+    def _query_path(self, query: str) -> str:
+        encoded_query = quote_plus(query, safe='/')
+        return self.soql_endpoint + encoded_query
+
+    @staticmethod
+    def _next_path(page: Dict[str, Any]) -> Optional[str]:
+        '''
+            Path of the next page (nextRecordsUrl is absolute, e.g. /services/data/v61.0/query/01g...-2000),
+            or None on the last page.
+        '''
+        next_url = page.get('nextRecordsUrl')
+        if page.get('done', True) or not next_url:
+            return None
+        return next_url.lstrip('/')
+
+    @staticmethod
+    def _locator_paths(first_page: Dict[str, Any], max_pages: Optional[int]) -> Optional[list[str]]:
+        '''
+            Paths of every page after *first_page*, derived from its query locator and batch size,
+            or None if the locator cannot be parsed (callers then walk nextRecordsUrl instead).
+        '''
+        next_url = first_page.get('nextRecordsUrl')
+        if first_page.get('done', True) or not next_url:
+            return []
+        match = LOCATOR_RE.match(next_url)
+        if match is None:
+            return None
+        batch_size = int(match.group('offset'))
+        if batch_size <= 0:
+            return None
+        offsets = range(batch_size, first_page.get('totalSize', 0), batch_size)
+        if max_pages is not None:
+            offsets = offsets[:max(max_pages - 1, 0)]
+        return [f"{match.group('locator')}-{offset}" for offset in offsets]
+
+    @staticmethod
+    def _map_row[T](row: Dict[str, Any], t: Optional[Type[T]]) -> T:
+        return dict_to_dataclass(row, t) if t is not None else row
+
+    @classmethod
+    def _to_result[T](cls, query_result: Dict[str, Any], t: Optional[Type[T]]) -> SoqlResult[T]:
+        records = [cls._map_row(row, t) for row in query_result.get('records', [])]
+        return SoqlResult(
+            records=records,
+            totalSize=query_result.get('totalSize', 0),
+            done=query_result.get('done', True),
+            nextRecordsUrl=query_result.get('nextRecordsUrl'),
+        )
+
+    @property
+    def query_cache(self) -> Optional[QueryCache]:
+        '''
+            Result cache of the session (None when query caching is off).
+        '''
+        return getattr(self.sf_session, "query_cache", None)
+
+    def _cache_key(self, query: str, t: Optional[Type[T]], fetch_all: bool,
+                   max_records: Optional[int], max_pages: Optional[int]) -> tuple:
+        return self.soql_endpoint, normalize_query(query), t, fetch_all, max_records, max_pages
+
+    def _cached[T](self, key: tuple) -> Optional[SoqlResult[T]]:
+        result = self.query_cache.get(key)
+        return replace(result, records=list(result.records)) if result is not None else None
 
-    def execute_soql[T](self,query: str, t: Optional[Type[T]]=None) -> SoqlResult[T]:
+    def _store[T](self, key: tuple, result: SoqlResult[T]) -> SoqlResult[T]:
+        self.query_cache.put(key, replace(result, records=list(result.records)), query_objects(key[1]))
+        return result
+
+    @staticmethod
+    def _collect[T](pages: list[Dict[str, Any]], records: list[T], max_records: Optional[int]) -> SoqlResult[T]:
+        last_page = pages[-1] if pages else {}
+        truncated = max_records is not None and len(records) > max_records
+        return SoqlResult(
+            records=records[:max_records] if truncated else records,
+            totalSize=last_page.get('totalSize', 0),
+            done=last_page.get('done', True) and not truncated,
+            nextRecordsUrl=last_page.get('nextRecordsUrl'),
+        )
+
+    def execute_soql[T](self,query: str, t: Optional[Type[T]]=None,
+                        fetch_all: bool = False,
+                        max_records: Optional[int] = None,
+                        max_pages: Optional[int] = None,
+                        cache: bool = True) -> SoqlResult[T]:
+        '''
+            Run a query and return the first page of results.
+            :param fetch_all: follow nextRecordsUrl and return every page (bounded by max_records / max_pages)
+            :param max_records: stop once this many records have been collected
+            :param max_pages: stop after this many pages
+            :param cache: serve and store the result through the session's query cache, if it has one
+            :return: SoqlResult; done is False when more records remain on the server
+        '''
+        if cache and self.query_cache is not None:
+            key = self._cache_key(query, t, fetch_all, max_records, max_pages)
+            cached = self._cached(key)
+            if cached is not None:
+                return cached
+            return self._store(key, self.execute_soql(query, t, fetch_all, max_records, max_pages, cache=False))
         try:
-            encoded_query = quote_plus(query, safe='/')
-            full_endpoint = self.soql_endpoint + encoded_query
-            query_result: Dict[str,str] = self.sf_session.get(full_endpoint)
-            records = [
-                dict_to_dataclass(row, t) if t is not None else row for row in query_result.get('records', [])
-            ]
-            return SoqlResult(
-                records=records,
-                totalSize=query_result.get('totalSize', 0),
-            )
+            if self.stream:
+                return self._execute_streamed(query, t, max_pages if fetch_all else 1, max_records)
+            if not fetch_all:
+                query_result: Dict[str,str] = self.sf_session.get(self._query_path(query))
+                result = self._to_result(query_result, t)
+                if max_records is not None and len(result.records) > max_records:
+                    result.records = result.records[:max_records]
+                    result.done = False
+                return result
+            pages: list[Dict[str, Any]] = []
+            records: list[T] = []
+            for page in self.iter_soql_pages(query, max_pages=max_pages):
+                pages.append({k: v for k, v in page.items() if k != 'records'})
+                records.extend(self._map_row(row, t) for row in page.get('records', []))
+                if max_records is not None and len(records) >= max_records:
+                    break
+            return self._collect(pages, records, max_records)
         except Exception as e:
             raise e
 
+    def _execute_streamed[T](self, query: str, t: Optional[Type[T]],
+                             max_pages: Optional[int], max_records: Optional[int]) -> SoqlResult[T]:
+        pages: list[Dict[str, Any]] = []
+        records: list[T] = []
+        for fields, rows in self._iter_streamed_pages(self._query_path(query), max_pages):
+            pages.append(fields)
+            for row in rows:
+                # one record past max_records tells _collect that more remain; the rest of the
+                # page is still read so its nextRecordsUrl is known
+                if max_records is None or len(records) <= max_records:
+                    records.append(self._map_row(row, t))
+            if max_records is not None and len(records) > max_records:
+                break
+        return self._collect(pages, records, max_records)
+
+    def _cached_count(self, key: tuple) -> Optional[int]:
+        return self.query_cache.get(key)
+
+    def _store_count(self, key: tuple, total: int) -> int:
+        self.query_cache.put(key, total, query_objects(key[1]))
+        return total
+
+    def count_records(self, query: str, cache: bool = True) -> Optional[int]:
+        '''
+            Cheap size pre-check: run the COUNT() form of *query* (capped by its LIMIT).
+            :param cache: serve and store the count through the session's query cache, if it has one;
+                it expires and is invalidated by writes like the query results themselves
+            :return: number of records the query would return, or None if it cannot be counted
+        '''
+        count_query = to_count_query(query)
+        if count_query is None:
+            return None
+        if cache and self.query_cache is not None:
+            key = self._cache_key(count_query, int, False, None, None)
+            total = self._cached_count(key)
+            if total is None:
+                total = self._store_count(key, self.sf_session.get(self._query_path(count_query)).get('totalSize', 0))
+        else:
+            total = self.sf_session.get(self._query_path(count_query)).get('totalSize', 0)
+        limit = LIMIT_RE.search(query)
+        return min(total, int(limit.group(1))) if limit else total
+
+    def _explain_path(self, query: str) -> str:
+        return self.explain_endpoint + quote_plus(query, safe='/')
+
+    def explain(self, query: str) -> list[QueryPlan]:
+        '''
+            Query plans Salesforce would consider for *query*, cheapest (the one it uses) first.
+            The query itself is not run.
+        '''
+        return [QueryPlan.from_dict(plan) for plan in self.sf_session.get(self._explain_path(query)).get('plans', [])]
+
+    def guard_query(self, query: str, guard: SelectivityGuard) -> Tuple[str, Optional[Dict[str, Any]]]:
+        '''
+            Check *query* against its (cached) plan before running it; see SelectivityGuard.review.
+            A failed explain call lets the query through unchecked.
+        '''
+        key = guard.plan_key(self.sf_session.url, query)
+        plans = guard.cached_plan(key)
+        if plans is None:
+            try:
+                plans = guard.store_plan(key, self.explain(query))
+            except Exception as err:
+                logging.warning(f"Could not explain query, running it unchecked: {err}")
+                return query, None
+        return guard.review(query, plans)
+
+    def iter_soql_pages(self, query: str, max_pages: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        '''
+            Lazily yield raw result pages.
+            Without prefetch/parallel_pages the next page is requested only when the caller asks for it;
+            otherwise at most prefetch + parallel_pages pages are buffered ahead of the caller.
+        '''
+        if self.parallel_pages > 0:
+            yield from self._iter_pages_parallel(query, max_pages)
+        elif self.prefetch > 0:
+            yield from prefetch_iter(self._iter_pages_sequential(self._query_path(query), max_pages), self.prefetch)
+        else:
+            yield from self._iter_pages_sequential(self._query_path(query), max_pages)
+
+    def _iter_pages_sequential(self, path: Optional[str], max_pages: Optional[int]) -> Iterator[Dict[str, Any]]:
+        fetched = 0
+        while path is not None and (max_pages is None or fetched < max_pages):
+            page = self.sf_session.get(path)
+            fetched += 1
+            yield page
+            path = self._next_path(page)
+
+    def _iter_streamed_pages(self, path: Optional[str],
+                             max_pages: Optional[int]) -> Iterator[Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]]:
+        '''
+            Yield (fields, records) per page, reading each response with stream=True: records are
+            decoded one at a time as the body arrives, and fields (totalSize, done, nextRecordsUrl)
+            is complete once they have been consumed.
+        '''
+        fetched = 0
+        while path is not None and (max_pages is None or fetched < max_pages):
+            response = self.sf_session.request("get", path, stream=True)
+            decoder = QueryPageDecoder()
+            try:
+                records = iter_page_records(response.iter_content(STREAM_CHUNK_SIZE), decoder)
+                fetched += 1
+                yield decoder.fields, records
+                # reach the end of the body even if the caller skipped records
+                for _ in records:
+                    pass
+            finally:
+                response.close()
+            path = self._next_path(decoder.fields)
+
+    def _iter_page_rows(self, query: str,
+                        max_pages: Optional[int]) -> Iterator[Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]]:
+        '''
+            (fields, records) per page, streamed or not.
+        '''
+        if self.stream:
+            yield from self._iter_streamed_pages(self._query_path(query), max_pages)
+        else:
+            for page in self.iter_soql_pages(query, max_pages=max_pages):
+                yield {k: v for k, v in page.items() if k != 'records'}, iter(page.get('records', []))
+
+    def _iter_rows(self, query: str, max_pages: Optional[int]) -> Iterator[Dict[str, Any]]:
+        for _, records in self._iter_page_rows(query, max_pages):
+            yield from records
+
+    def execute_soql_columnar(self, query: str, fetch_all: bool = False,
+                              max_records: Optional[int] = None,
+                              max_pages: Optional[int] = None,
+                              columns: Optional[Sequence[str]] = None,
+                              exclude: Sequence[str] = EXCLUDED_KEYS) -> ColumnarSoqlResult:
+        '''
+            Like execute_soql, but rows go straight into per-field columns (typed arrays for numeric
+            fields) instead of one object each, for large results that are scanned or aggregated.
+            The query cache is not used.
+            :param columns: keep only these fields (default: every field returned, except *exclude*)
+        '''
+        builder = ColumnBuilder(columns, exclude)
+        pages: list[Dict[str, Any]] = []
+        truncated = False
+        for fields, rows in self._iter_page_rows(query, max_pages if fetch_all else 1):
+            pages.append(fields)
+            for row in rows:
+                if max_records is not None and len(builder) >= max_records:
+                    truncated = True
+                else:
+                    builder.append(row)
+            if truncated:
+                break
+        return self._build_columns(builder, pages, truncated)
+
+    @staticmethod
+    def _build_columns(builder: ColumnBuilder, pages: list[Dict[str, Any]], truncated: bool) -> ColumnarSoqlResult:
+        last_page = pages[-1] if pages else {}
+        return builder.build(totalSize=last_page.get('totalSize', 0),
+                             done=last_page.get('done', True) and not truncated,
+                             nextRecordsUrl=last_page.get('nextRecordsUrl'))
+
+    def _iter_pages_parallel(self, query: str, max_pages: Optional[int]) -> Iterator[Dict[str, Any]]:
+        if max_pages is not None and max_pages <= 0:
+            return
+        first_page = self.sf_session.get(self._query_path(query))
+        yield first_page
+        paths = self._locator_paths(first_page, max_pages)
+        if paths is None:
+            remaining = None if max_pages is None else max_pages - 1
+            yield from self._iter_pages_sequential(self._next_path(first_page), remaining)
+            return
+        window_size = self.parallel_pages + max(self.prefetch, 1)
+        pool = ThreadPoolExecutor(max_workers=self.parallel_pages, thread_name_prefix="soql-page")
+        try:
+            pending = iter(paths)
+            window = deque(pool.submit(self.sf_session.get, path) for _, path in zip(range(window_size), pending))
+            while window:
+                page = window.popleft().result()
+                next_path = next(pending, None)
+                if next_path is not None:
+                    window.append(pool.submit(self.sf_session.get, next_path))
+                yield page
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def iter_soql[T](self, query: str, t: Optional[Type[T]] = None,
+                     max_records: Optional[int] = None,
+                     max_pages: Optional[int] = None) -> Iterator[T]:
+        '''
+            Stream every record of a query, walking nextRecordsUrl page by page.
+            Only one page is held in memory at a time (one record with stream=True).
+            :param max_records: stop after yielding this many records
+            :param max_pages: stop after this many pages
+        '''
+        if max_records is not None and max_records <= 0:
+            return
+        yielded = 0
+        for row in self._iter_rows(query, max_pages):
+            yield self._map_row(row, t)
+            yielded += 1
+            if max_records is not None and yielded >= max_records:
+                return
+
+
+async def _aiter[T](items: list[T]) -> AsyncIterator[T]:
+    for item in items:
+        yield item
+
+
+class AsyncSoqlModule(SoqlModule):
+    '''
+        SoqlModule running on an AsyncSalesforceSession.
+    '''
+    def __init__(self, sf_session: AsyncSalesforceSession, api_version = 61.0,
+                 prefetch: int = 0, parallel_pages: int = 0, stream: bool = False):
+        super().__init__(sf_session, api_version, prefetch=prefetch, parallel_pages=parallel_pages, stream=stream)
+
+    async def _off_loop(self, function, *args):
+        # a shared (SQLite) query cache is read and written on a worker thread, not on the event loop
+        if self.query_cache.blocking:
+            return await asyncio.to_thread(function, *args)
+        return function(*args)
+
+    async def execute_soql[T](self,query: str, t: Optional[Type[T]]=None,
+                              fetch_all: bool = False,
+                              max_records: Optional[int] = None,
+                              max_pages: Optional[int] = None,
+                              cache: bool = True) -> SoqlResult[T]:
+        if cache and self.query_cache is not None:
+            key = self._cache_key(query, t, fetch_all, max_records, max_pages)
+            cached = await self._off_loop(self._cached, key)
+            if cached is not None:
+                return cached
+            result = await self.execute_soql(query, t, fetch_all, max_records, max_pages, cache=False)
+            return await self._off_loop(self._store, key, result)
+        if self.stream:
+            return await self._execute_streamed(query, t, max_pages if fetch_all else 1, max_records)
+        if not fetch_all:
+            query_result: Dict[str,str] = await self.sf_session.get(self._query_path(query))
+            result = self._to_result(query_result, t)
+            if max_records is not None and len(result.records) > max_records:
+                result.records = result.records[:max_records]
+                result.done = False
+            return result
+        pages: list[Dict[str, Any]] = []
+        records: list[T] = []
+        # closing the page iterator on break cancels its prefetch and parallel-page tasks
+        async with aclosing(self.iter_soql_pages(query, max_pages=max_pages)) as query_pages:
+            async for page in query_pages:
+                pages.append({k: v for k, v in page.items() if k != 'records'})
+                records.extend(self._map_row(row, t) for row in page.get('records', []))
+                if max_records is not None and len(records) >= max_records:
+                    break
+        return self._collect(pages, records, max_records)
+
+    async def _execute_streamed[T](self, query: str, t: Optional[Type[T]],
+                                   max_pages: Optional[int], max_records: Optional[int]) -> SoqlResult[T]:
+        pages: list[Dict[str, Any]] = []
+        records: list[T] = []
+        async with aclosing(self._iter_streamed_pages(self._query_path(query), max_pages)) as streamed_pages:
+            async for fields, rows in streamed_pages:
+                pages.append(fields)
+                async for row in rows:
+                    if max_records is None or len(records) <= max_records:
+                        records.append(self._map_row(row, t))
+                if max_records is not None and len(records) > max_records:
+                    break
+        return self._collect(pages, records, max_records)
+
+    async def count_records(self, query: str, cache: bool = True) -> Optional[int]:
+        count_query = to_count_query(query)
+        if count_query is None:
+            return None
+        if cache and self.query_cache is not None:
+            key = self._cache_key(count_query, int, False, None, None)
+            total = await self._off_loop(self._cached_count, key)
+            if total is None:
+                total = (await self.sf_session.get(self._query_path(count_query))).get('totalSize', 0)
+                await self._off_loop(self._store_count, key, total)
+        else:
+            total = (await self.sf_session.get(self._query_path(count_query))).get('totalSize', 0)
+        limit = LIMIT_RE.search(query)
+        return min(total, int(limit.group(1))) if limit else total
+
+    async def explain(self, query: str) -> list[QueryPlan]:
+        page = await self.sf_session.get(self._explain_path(query))
+        return [QueryPlan.from_dict(plan) for plan in page.get('plans', [])]
+
+    async def guard_query(self, query: str, guard: SelectivityGuard) -> Tuple[str, Optional[Dict[str, Any]]]:
+        key = guard.plan_key(self.sf_session.url, query)
+        plans = guard.cached_plan(key)
+        if plans is None:
+            try:
+                plans = guard.store_plan(key, await self.explain(query))
+            except Exception as err:
+                logging.warning(f"Could not explain query, running it unchecked: {err}")
+                return query, None
+        return guard.review(query, plans)
+
+    async def iter_soql_pages(self, query: str, max_pages: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        if self.parallel_pages > 0:
+            pages = self._iter_pages_parallel(query, max_pages)
+        elif self.prefetch > 0:
+            pages = async_prefetch_iter(self._iter_pages_sequential(self._query_path(query), max_pages), self.prefetch)
+        else:
+            pages = self._iter_pages_sequential(self._query_path(query), max_pages)
+        async with aclosing(pages):
+            async for page in pages:
+                yield page
+
+    async def _iter_pages_sequential(self, path: Optional[str], max_pages: Optional[int]) -> AsyncIterator[Dict[str, Any]]:
+        fetched = 0
+        while path is not None and (max_pages is None or fetched < max_pages):
+            page = await self.sf_session.get(path)
+            fetched += 1
+            yield page
+            path = self._next_path(page)
+
+    async def _iter_streamed_pages(self, path: Optional[str],
+                                   max_pages: Optional[int]) -> AsyncIterator[Tuple[Dict[str, Any], AsyncIterator[Dict[str, Any]]]]:
+        fetched = 0
+        while path is not None and (max_pages is None or fetched < max_pages):
+            response = await self.sf_session.request("get", path, stream=True)
+            decoder = QueryPageDecoder()
+            try:
+                records = aiter_page_records(response.aiter_bytes(STREAM_CHUNK_SIZE), decoder)
+                fetched += 1
+                yield decoder.fields, records
+                async for _ in records:
+                    pass
+            finally:
+                await response.aclose()
+            path = self._next_path(decoder.fields)
+
+    async def _iter_page_rows(self, query: str,
+                              max_pages: Optional[int]) -> AsyncIterator[Tuple[Dict[str, Any], AsyncIterator[Dict[str, Any]]]]:
+        if self.stream:
+            async with aclosing(self._iter_streamed_pages(self._query_path(query), max_pages)) as streamed_pages:
+                async for fields, records in streamed_pages:
+                    yield fields, records
+        else:
+            async with aclosing(self.iter_soql_pages(query, max_pages=max_pages)) as query_pages:
+                async for page in query_pages:
+                    yield {k: v for k, v in page.items() if k != 'records'}, _aiter(page.get('records', []))
+
+    async def _iter_rows(self, query: str, max_pages: Optional[int]) -> AsyncIterator[Dict[str, Any]]:
+        async with aclosing(self._iter_page_rows(query, max_pages)) as pages:
+            async for _, records in pages:
+                async for row in records:
+                    yield row
+
+    async def execute_soql_columnar(self, query: str, fetch_all: bool = False,
+                                    max_records: Optional[int] = None,
+                                    max_pages: Optional[int] = None,
+                                    columns: Optional[Sequence[str]] = None,
+                                    exclude: Sequence[str] = EXCLUDED_KEYS) -> ColumnarSoqlResult:
+        builder = ColumnBuilder(columns, exclude)
+        pages: list[Dict[str, Any]] = []
+        truncated = False
+        async with aclosing(self._iter_page_rows(query, max_pages if fetch_all else 1)) as page_rows:
+            async for fields, rows in page_rows:
+                pages.append(fields)
+                async for row in rows:
+                    if max_records is not None and len(builder) >= max_records:
+                        truncated = True
+                    else:
+                        builder.append(row)
+                if truncated:
+                    break
+        return self._build_columns(builder, pages, truncated)
+
+    async def _iter_pages_parallel(self, query: str, max_pages: Optional[int]) -> AsyncIterator[Dict[str, Any]]:
+        if max_pages is not None and max_pages <= 0:
+            return
+        first_page = await self.sf_session.get(self._query_path(query))
+        yield first_page
+        paths = self._locator_paths(first_page, max_pages)
+        if paths is None:
+            remaining = None if max_pages is None else max_pages - 1
+            async for page in self._iter_pages_sequential(self._next_path(first_page), remaining):
+                yield page
+            return
+        window_size = self.parallel_pages + max(self.prefetch, 1)
+        # the window buffers pages ahead of the consumer; like the sync thread pool, only parallel_pages
+        # of them are being fetched at any time
+        slots = asyncio.Semaphore(self.parallel_pages)
+
+        async def fetch(path: str) -> Dict[str, Any]:
+            async with slots:
+                return await self.sf_session.get(path)
+
+        pending = iter(paths)
+        window = deque(asyncio.create_task(fetch(path)) for _, path in zip(range(window_size), pending))
+        try:
+            while window:
+                page = await window.popleft()
+                next_path = next(pending, None)
+                if next_path is not None:
+                    window.append(asyncio.create_task(fetch(next_path)))
+                yield page
+        finally:
+            for task in window:
+                task.cancel()
+
+    async def iter_soql[T](self, query: str, t: Optional[Type[T]] = None,
+                           max_records: Optional[int] = None,
+                           max_pages: Optional[int] = None) -> AsyncIterator[T]:
+        if max_records is not None and max_records <= 0:
+            return
+        yielded = 0
+        async with aclosing(self._iter_rows(query, max_pages)) as rows:
+            async for row in rows:
+                yield self._map_row(row, t)
+                yielded += 1
+                if max_records is not None and yielded >= max_records:
+                    return
@@ -0,0 +1,47 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from salesforce_mcp.utils.metrics import STARTUP_SECONDS, MetricsRegistry
+
+
+class StartupReport:
+    '''
+        Seconds from the start of the server's imports to each startup phase: imports done, server
+        ready (transport up), session pre-warmed, first tool call finished. Each phase is recorded
+        once, logged, and exported as salesforce_mcp_startup_seconds{phase=...}, so cold-start
+        regressions show up in the metrics of every spawned server.
+    '''
+
+    def __init__(self, started: float, metrics: Optional[MetricsRegistry] = None):
+        '''
+        :param started: time.perf_counter() taken before the first import
+        :param metrics: registry the phases are exported to
+        '''
+        self.started = started
+        self.metrics = metrics
+        self.phases: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, phase: str) -> Optional[float]:
+        '''
+            Record *phase* as reached now, unless it already was.
+            :return: seconds since started, or None when the phase was recorded before
+        '''
+        if phase in self.phases:
+            return None
+        with self._lock:
+            if phase in self.phases:
+                return None
+            seconds = self.phases[phase] = time.perf_counter() - self.started
+        if self.metrics is not None:
+            self.metrics.set(STARTUP_SECONDS, seconds, phase=phase)
+        logging.info(f"Startup: {phase} after {seconds * 1000:.0f} ms")
+        return seconds
+
+    def report(self) -> Dict[str, float]:
+        '''
+            Milliseconds to each phase reached so far.
+        '''
+        return {phase: round(seconds * 1000, 1) for phase, seconds in self.phases.items()}
@@ -0,0 +1,151 @@
+import contextlib
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, Optional, Pattern, Tuple
+from urllib.parse import urlsplit
+
+from salesforce_mcp.utils.limits import parse_limit_info
+
+# name of the MCP tool a request is made for; set by the server around each tool call
+current_tool: ContextVar[Optional[str]] = ContextVar("current_tool", default=None)
+
+VERSION_PREFIX_RE: Pattern[str] = re.compile(r"^/?services/data/v[\d.]+/")
+RECORD_ID_RE: Pattern[str] = re.compile(r"^(?=.*\d)[a-zA-Z0-9]{15}([a-zA-Z0-9]{3})?$")
+QUERY_LOCATOR_RE: Pattern[str] = re.compile(r"^[a-zA-Z0-9]{15,18}-\d+$")
+# usage samples must span this many seconds before a burn rate is extrapolated from them
+BURN_RATE_MIN_SPAN = 60.0
+
+
+@contextlib.contextmanager
+def tool_context(tool_name: str) -> Iterator[None]:
+    '''
+    Attribute every request made inside the block (including tasks and threads started from it) to *tool_name*.
+    '''
+    token = current_tool.set(tool_name)
+    try:
+        yield
+    finally:
+        current_tool.reset(token)
+
+
+def endpoint_template(url: str) -> str:
+    '''
+    Group a request URL by endpoint: API version and query string dropped,
+    record Ids and query locators replaced by placeholders, e.g. "sobjects/Lead/{id}".
+    '''
+    path = VERSION_PREFIX_RE.sub("", urlsplit(url).path.lstrip("/"))
+    segments = []
+    for segment in path.split("/"):
+        if QUERY_LOCATOR_RE.match(segment):
+            segment = "{locator}"
+        elif RECORD_ID_RE.match(segment):
+            segment = "{id}"
+        segments.append(segment)
+    return "/".join(segments)
+
+
+class ApiTelemetry:
+    '''
+        Records API consumption of one or more sessions: the daily usage reported in
+        Sforce-Limit-Info on every response, the latest /limits sample, and call counts
+        per tool, endpoint and status, in total and over a rolling window.
+    '''
+
+    def __init__(self, window: float = 3600.0, max_events: int = 100_000):
+        '''
+        :param window: seconds covered by the rolling counts and the burn rate
+        :param max_events: bound on the calls remembered for the rolling window
+        '''
+        self.window = window
+        self.started_at = time.time()
+        self._events: Deque[Tuple[float, str, str, str]] = deque(maxlen=max_events)
+        self._usage_samples: Deque[Tuple[float, int]] = deque(maxlen=max_events)
+        self.api_used: Optional[int] = None
+        self.api_allowed: Optional[int] = None
+        self.usage_reported_at: Optional[float] = None
+        self.limits: Dict[str, Any] = {}
+        self.limits_sampled_at: Optional[float] = None
+        self.calls_by_tool: Counter = Counter()
+        self.calls_by_endpoint: Counter = Counter()
+        self.calls_by_status: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, method: str, url: str, status: Any, headers: Any = None) -> None:
+        '''
+            Count one call; *status* is the HTTP status code or an error name for failed calls.
+        '''
+        now = time.time()
+        tool = current_tool.get() or "-"
+        endpoint = f"{method.upper()} {endpoint_template(url)}"
+        limit_info = parse_limit_info(headers.get("Sforce-Limit-Info")) if headers is not None else None
+        with self._lock:
+            self._events.append((now, tool, endpoint, str(status)))
+            self.calls_by_tool[tool] += 1
+            self.calls_by_endpoint[endpoint] += 1
+            self.calls_by_status[str(status)] += 1
+            if limit_info is not None:
+                self.api_used, self.api_allowed = limit_info
+                self.usage_reported_at = now
+                self._usage_samples.append((now, self.api_used))
+
+    def record_limits(self, limits: Dict[str, Any]) -> None:
+        '''
+            Store a /services/data/vXX.X/limits sample.
+        '''
+        with self._lock:
+            self.limits = limits
+            self.limits_sampled_at = time.time()
+            daily = limits.get("DailyApiRequests")
+            if isinstance(daily, dict) and "Max" in daily and "Remaining" in daily:
+                self.api_allowed = daily["Max"]
+                self.api_used = daily["Max"] - daily["Remaining"]
+                self.usage_reported_at = self.limits_sampled_at
+                self._usage_samples.append((self.limits_sampled_at, self.api_used))
+
+    def _burn_rate(self, since: float) -> Optional[float]:
+        samples = [sample for sample in self._usage_samples if sample[0] >= since]
+        if len(samples) < 2 or samples[-1][0] - samples[0][0] < BURN_RATE_MIN_SPAN:
+            return None
+        (first_at, first_used), (last_at, last_used) = samples[0], samples[-1]
+        # the counter restarts with the daily allocation; ignore a drop
+        return max(0, last_used - first_used) / (last_at - first_at) * 3600
+
+    def snapshot(self) -> Dict[str, Any]:
+        '''
+            Current headroom, burn rate and call counts, as a JSON-serialisable dict.
+        '''
+        now = time.time()
+        since = now - self.window
+        with self._lock:
+            recent = [event for event in self._events if event[0] >= since]
+            remaining = None if self.api_used is None else self.api_allowed - self.api_used
+            burn_rate = self._burn_rate(since)
+            return {
+                "api_usage": {
+                    "used": self.api_used,
+                    "allowed": self.api_allowed,
+                    "remaining": remaining,
+                    "fraction_used": self.api_used / self.api_allowed if self.api_allowed else None,
+                    "reported_seconds_ago": None if self.usage_reported_at is None else round(now - self.usage_reported_at, 1),
+                    "burn_rate_per_hour": burn_rate,
+                    "hours_to_exhaustion": remaining / burn_rate if burn_rate and remaining is not None else None,
+                },
+                "window_seconds": self.window,
+                "window": {
+                    "calls": len(recent),
+                    "by_tool": dict(Counter(event[1] for event in recent)),
+                    "by_endpoint": dict(Counter(event[2] for event in recent)),
+                    "by_status": dict(Counter(event[3] for event in recent)),
+                },
+                "since_start": {
+                    "seconds": round(now - self.started_at, 1),
+                    "by_tool": dict(self.calls_by_tool),
+                    "by_endpoint": dict(self.calls_by_endpoint),
+                    "by_status": dict(self.calls_by_status),
+                },
+                "limits": self.limits,
+                "limits_sampled_seconds_ago": None if self.limits_sampled_at is None else round(now - self.limits_sampled_at, 1),
+            }
@@ -0,0 +1,17 @@
+import pytest
+import requests
+
+
+@pytest.fixture
+def make_response(mocker):
+    '''
+    Factory for mocked Salesforce HTTP responses: make_response(status_code, body, headers).
+    raise_for_status raises requests.HTTPError for error statuses, as the real response does.
+    '''
+    def make(status_code=200, body=None, headers=None):
+        response = mocker.Mock(status_code=status_code, headers=headers or {})
+        response.json.return_value = body
+        if status_code >= 400:
+            response.raise_for_status.side_effect = requests.HTTPError(f"{status_code}")
+        return response
+    return make
@@ -0,0 +1,98 @@
+import asyncio
+from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+import pytest
+
+
+class TestAsyncSalesforceSession:
+    def setup_method(self):
+        self.session = AsyncSalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass"
+        )
+
+    def _token_response(self, mocker, token="fake-token"):
+        mock_token_response = mocker.Mock()
+        mock_token_response.status_code = 200
+        mock_token_response.json.return_value = {"access_token": token}
+        return mock_token_response
+
+    def test_invalid_domain(self):
+        with pytest.raises(ValueError):
+            AsyncSalesforceSession(
+                domain="https://bigthink.my.salesforce.com",
+                client_id="dummy",
+                client_secret="dummy",
+                username="user",
+                password="pass")
+
+    def test_get_method_caches_token(self, mocker):
+        mock_post = mocker.patch.object(self.session.client, "post", new_callable=mocker.AsyncMock,
+                                        return_value=self._token_response(mocker))
+        mock_get_response = mocker.Mock()
+        mock_get_response.status_code = 200
+        mock_get_response.json.return_value = {"mock_field": "mock_response"}
+        mock_get = mocker.patch.object(self.session.client, "get", new_callable=mocker.AsyncMock,
+                                       return_value=mock_get_response)
+
+        async def run():
+            await self.session.get("sobject/lead/1")
+            return await self.session.get("sobject/lead/2")
+
+        result = asyncio.run(run())
+
+        assert result["mock_field"] == "mock_response"
+        assert mock_post.call_count == 1
+        assert mock_get.call_count == 2
+        assert "https://bigthink.my.salesforce.com/sobject/lead/2" in mock_get.call_args[0][0]
+        assert mock_get.call_args[1]["headers"]["Authorization"] == "Bearer fake-token"
+
+    def test_concurrent_calls_share_one_refresh(self, mocker):
+        token_response = self._token_response(mocker)
+
+        async def slow_post(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return token_response
+
+        mock_post = mocker.patch.object(self.session.client, "post", side_effect=slow_post)
+
+        async def run():
+            return await asyncio.gather(*(self.session.get_token() for _ in range(8)))
+
+        tokens = asyncio.run(run())
+
+        assert mock_post.call_count == 1
+        assert tokens == ["fake-token"] * 8
+
+    def test_retries_once_on_invalid_session(self, mocker):
+        mock_post = mocker.patch.object(self.session.client, "post", new_callable=mocker.AsyncMock,
+                                        side_effect=[self._token_response(mocker, "stale-token"),
+                                                     self._token_response(mocker, "fresh-token")])
+        expired_response = mocker.Mock()
+        expired_response.status_code = 401
+        expired_response.json.return_value = [{"message": "Session expired or invalid", "errorCode": "INVALID_SESSION_ID"}]
+        ok_response = mocker.Mock()
+        ok_response.status_code = 204
+        mock_patch = mocker.patch.object(self.session.client, "patch", new_callable=mocker.AsyncMock,
+                                         side_effect=[expired_response, ok_response])
+
+        result = asyncio.run(self.session.update("sobject/lead/", id="mock_id", body={"Company": "Test"}))
+
+        assert result == {"success": True}
+        assert mock_post.call_count == 2
+        assert mock_patch.call_count == 2
+        assert mock_patch.call_args[1]["headers"]["Authorization"] == "Bearer fresh-token"
+
+    def test_http2_is_opt_in(self, mocker):
+        mock_client = mocker.patch("salesforce_mcp.services.AsyncSalesforceSession.httpx.AsyncClient")
+        AsyncSalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass",
+            http2=True)
+
+        assert mock_client.call_args.kwargs["http2"] is True
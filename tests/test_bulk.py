@@ -0,0 +1,147 @@
+from salesforce_mcp.services.SalesforceSession import SalesforceSession
+from salesforce_mcp.utils.bulk import BulkQueryModule, BulkIngestModule, BulkJobError, records_to_csv_chunks
+from salesforce_mcp.objects.LeadObject import LeadObject
+from salesforce_mcp.types.LeadRecord import LeadRecord
+from salesforce_mcp.utils.soql import to_count_query
+from dataclasses import dataclass
+from typing import Optional
+import io
+import pytest
+
+
+@dataclass
+class Lead:
+    Id: str
+    LastName: Optional[str] = None
+    Company: Optional[str] = None
+
+
+class TestBulkQuery:
+    def setup_method(self):
+        self.session = SalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass"
+        )
+        self.bulk = BulkQueryModule(self.session, page_size=2, poll_interval=0)
+
+    def _result_page(self, mocker, body: bytes, locator: str, count: int):
+        response = mocker.Mock()
+        response.raw = io.BytesIO(body)
+        response.iter_content.return_value = [body]
+        response.headers = {"Sforce-Locator": locator, "Sforce-NumberOfRecords": str(count)}
+        return response
+
+    def _mock_job(self, mocker):
+        mocker.patch.object(self.session, "create", return_value={"id": "750xx", "state": "UploadComplete"})
+        mocker.patch.object(self.session, "get", side_effect=[
+            {"id": "750xx", "state": "InProgress"},
+            {"id": "750xx", "state": "JobComplete"},
+        ])
+        return mocker.patch.object(self.session, "request", side_effect=[
+            self._result_page(mocker, b'"Id","LastName","Company"\n"1","a","A"\n"2","b",""\n', "loc-2", 2),
+            self._result_page(mocker, b'"Id","LastName","Company"\n"3","c","C"\n', "null", 1),
+        ])
+
+    def test_iter_rows_follows_locator(self, mocker):
+        mock_request = self._mock_job(mocker)
+
+        rows = list(self.bulk.iter_rows("SELECT Id, LastName, Company FROM Lead", Lead))
+
+        assert [row.Id for row in rows] == ["1", "2", "3"]
+        assert rows[1].Company is None
+        assert mock_request.call_count == 2
+        assert mock_request.call_args_list[1][1]["params"] == {"maxRecords": 2, "locator": "loc-2"}
+        assert self.session.create.call_args[0][1]["operation"] == "query"
+
+    def test_download_writes_single_header(self, mocker, tmp_path):
+        self._mock_job(mocker)
+        path = tmp_path / "leads.csv"
+
+        written = self.bulk.download("SELECT Id, LastName, Company FROM Lead", str(path))
+
+        assert written == 3
+        assert path.read_text().splitlines() == [
+            '"Id","LastName","Company"', '"1","a","A"', '"2","b",""', '"3","c","C"']
+
+    def test_failed_job_raises(self, mocker):
+        mocker.patch.object(self.session, "create", return_value={"id": "750xx", "state": "UploadComplete"})
+        mocker.patch.object(self.session, "get", return_value={"id": "750xx", "state": "Failed", "errorMessage": "bad"})
+
+        with pytest.raises(BulkJobError):
+            list(self.bulk.iter_rows("SELECT Id FROM Lead"))
+
+    def test_to_count_query(self):
+        assert to_count_query("SELECT Id, Name FROM Lead WHERE Status = 'Open' ORDER BY Name LIMIT 10") \
+            == "SELECT COUNT() FROM Lead WHERE Status = 'Open'"
+        assert to_count_query("SELECT Status, COUNT(Id) FROM Lead GROUP BY Status") is None
+        assert to_count_query("SELECT Id, (SELECT Id FROM Contacts) FROM Account") is None
+
+
+class TestBulkIngest:
+    def setup_method(self):
+        self.session = SalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass"
+        )
+        self.ingest = BulkIngestModule(self.session, poll_interval=0)
+
+    def test_records_to_csv_chunks(self):
+        records = [{"LastName": "a", "Company": "A, Inc"}, {"LastName": "b", "IsConverted": True}, {"LastName": "c"}]
+
+        chunks = list(records_to_csv_chunks(records, max_chunk_bytes=50))
+
+        assert len(chunks) == 2
+        assert all(chunk.startswith(b"LastName,Company,IsConverted\n") for chunk in chunks)
+        assert b'a,"A, Inc",\n' in chunks[0]
+        assert b"b,,true\n" in b"".join(chunks)
+
+    def test_upsert_requires_external_id(self):
+        with pytest.raises(ValueError):
+            self.ingest.create_job("Lead", "upsert")
+
+    def test_run_job(self, mocker):
+        mock_create = mocker.patch.object(self.session, "create", return_value={"id": "750xx", "state": "Open"})
+        mock_update = mocker.patch.object(self.session, "update", return_value={"id": "750xx", "state": "UploadComplete"})
+        mocker.patch.object(self.session, "get", return_value={"id": "750xx", "state": "JobComplete"})
+        upload_response = mocker.Mock()
+        success_response = mocker.Mock(text="sf__Id,sf__Created,LastName\n00Q1,true,a\n")
+        failed_response = mocker.Mock(text="sf__Id,sf__Error,LastName\n,REQUIRED_FIELD_MISSING:Company,b\n")
+        unprocessed_response = mocker.Mock(text="LastName\n")
+        mock_request = mocker.patch.object(self.session, "request", side_effect=[
+            upload_response, success_response, failed_response, unprocessed_response])
+
+        results = self.ingest.run("Lead", "insert", [{"LastName": "a"}, {"LastName": "b"}])
+
+        assert len(results) == 1
+        assert results[0].successful_results == [{"sf__Id": "00Q1", "sf__Created": "true", "LastName": "a"}]
+        assert results[0].failed_results[0]["sf__Error"] == "REQUIRED_FIELD_MISSING:Company"
+        assert results[0].unprocessed_records == []
+        assert mock_create.call_args[0][1]["object"] == "Lead"
+        assert mock_request.call_args_list[0][0][0] == "put"
+        assert mock_request.call_args_list[0][1]["data"] == b"LastName\na\nb\n"
+        assert mock_update.call_args[1]["body"] == {"state": "UploadComplete"}
+
+    def test_lead_object_bulk_delete(self, mocker):
+        mock_run = mocker.patch.object(BulkIngestModule, "run", return_value=[])
+        lead_object = LeadObject(self.session)
+
+        lead_object.bulk_delete(["00Q1", "00Q2"], hard=True)
+
+        object_name, operation, rows, _ = mock_run.call_args[0]
+        assert (object_name, operation) == ("Lead", "hardDelete")
+        assert list(rows) == [{"Id": "00Q1"}, {"Id": "00Q2"}]
+
+    def test_lead_object_bulk_insert_maps_records(self, mocker):
+        mock_run = mocker.patch.object(BulkIngestModule, "run", return_value=[])
+        lead_object = LeadObject(self.session)
+
+        lead_object.bulk_operation("insert", [LeadRecord(LastName="Weiss", Company="Test", custom_fields={"Foo__c": 1})])
+
+        rows = list(mock_run.call_args[0][2])
+        assert rows == [{"LastName": "Weiss", "Company": "Test", "Foo__c": 1}]
@@ -0,0 +1,110 @@
+import math
+from array import array
+
+import pytest
+
+from salesforce_mcp.services.SalesforceSession import SalesforceSession
+from salesforce_mcp.types.LeadRecord import LeadRecord, SlottedLeadRecord
+from salesforce_mcp.types.OpportunityRecord import OpportunityRecord, SlottedOpportunityRecord
+from salesforce_mcp.utils.columnar import ColumnarSoqlResult, compact_column
+from salesforce_mcp.utils.soql import SoqlModule, SoqlResult
+
+ROWS = [
+    {"attributes": {"type": "Opportunity"}, "Id": "0061", "Name": "A", "Amount": 1500.0, "Probability": 10, "FiscalYear": 2026},
+    {"attributes": {"type": "Opportunity"}, "Id": "0062", "Name": "B", "Amount": None, "Probability": 90.5, "FiscalYear": 2026},
+    {"attributes": {"type": "Opportunity"}, "Id": "0063", "Name": "C", "Amount": 20, "Probability": 50, "FiscalYear": 2027,
+     "NextStep": "Call"},
+]
+
+
+class TestSlottedRecords:
+    def test_no_instance_dict(self):
+        record = SlottedOpportunityRecord(Name="Deal", Amount=10.0)
+
+        assert not hasattr(record, "__dict__")
+        assert record.custom_fields is None
+        with pytest.raises(AttributeError):
+            record.NotAField = 1
+
+    def test_same_fields_as_plain_record(self):
+        assert list(SlottedLeadRecord.__dataclass_fields__) == list(LeadRecord.__dataclass_fields__)
+        assert list(SlottedOpportunityRecord.__dataclass_fields__) == list(OpportunityRecord.__dataclass_fields__)
+
+    def test_payload(self):
+        record = SlottedLeadRecord(LastName="Doe", Company="Acme", custom_fields={"Score__c": 3})
+
+        assert record.to_salesforce_payload() == {"LastName": "Doe", "Company": "Acme", "Score__c": 3}
+        assert LeadRecord(LastName="Doe", Company="Acme").to_salesforce_payload() == {"LastName": "Doe", "Company": "Acme"}
+
+
+class TestColumnar:
+    def test_compact_column(self):
+        assert compact_column([1, 2, 3]).typecode == "q"
+        floats = compact_column([1, 2.5, None])
+        assert floats.typecode == "d" and math.isnan(floats[2])
+        assert compact_column(["a", None]) == ["a", None]
+        assert compact_column([True, False]) == [True, False]
+        assert compact_column([1, None]) == [1, None]
+
+    def test_from_records(self):
+        result = ColumnarSoqlResult.from_records(ROWS, totalSize=10, done=False)
+
+        assert list(result.columns) == ["Id", "Name", "Amount", "Probability", "FiscalYear", "NextStep"]
+        assert isinstance(result.column("Amount"), array)
+        assert result.column("FiscalYear") == array("q", [2026, 2026, 2027])
+        assert result.column("NextStep") == [None, None, "Call"]
+        assert result.row(1) == {"Id": "0062", "Name": "B", "Amount": None, "Probability": 90.5,
+                                 "FiscalYear": 2026, "NextStep": None}
+        assert (len(result), result.totalSize, result.done) == (3, 10, False)
+
+    def test_selected_columns(self):
+        result = ColumnarSoqlResult.from_records(ROWS, columns=["Id", "Amount"])
+
+        assert list(result.columns) == ["Id", "Amount"]
+
+    def test_to_dict_and_records(self):
+        result = SoqlResult(totalSize=3, records=ROWS).to_columnar()
+
+        assert result.to_dict()["columns"]["Amount"] == [1500.0, None, 20.0]
+        records = result.to_records(SlottedOpportunityRecord)
+        assert [record.Name for record in records] == ["A", "B", "C"]
+        assert records[1].Amount is None
+
+    def test_from_dataclass_records(self):
+        records = [OpportunityRecord(Name="A", Amount=1.0, custom_fields={"Region__c": "EU"})]
+
+        result = ColumnarSoqlResult.from_records(records)
+
+        assert result.column("Region__c") == ["EU"]
+        assert result.column("Amount") == array("d", [1.0])
+
+
+class TestExecuteSoqlColumnar:
+    def setup_method(self):
+        self.session = SalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass")
+        self.pages = [
+            {"totalSize": 3, "done": False, "nextRecordsUrl": "/services/data/v61.0/query/01gxx-2", "records": ROWS[:2]},
+            {"totalSize": 3, "done": True, "records": ROWS[2:]},
+        ]
+
+    def test_fetch_all(self, mocker):
+        mocker.patch.object(self.session, "get", side_effect=self.pages)
+
+        result = SoqlModule(self.session).execute_soql_columnar("SELECT Id FROM Opportunity", fetch_all=True)
+
+        assert result.column("Id") == ["0061", "0062", "0063"]
+        assert (result.totalSize, result.done) == (3, True)
+
+    def test_first_page_capped(self, mocker):
+        mocker.patch.object(self.session, "get", side_effect=self.pages)
+
+        result = SoqlModule(self.session).execute_soql_columnar("SELECT Id FROM Opportunity", max_records=1)
+
+        assert result.column("Id") == ["0061"]
+        assert result.done is False
+        assert result.nextRecordsUrl == "/services/data/v61.0/query/01gxx-2"
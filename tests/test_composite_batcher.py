@@ -0,0 +1,211 @@
+import asyncio
+import threading
+
+import pytest
+import requests
+
+from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+from salesforce_mcp.services.CompositeBatcher import CompositeSubrequestError
+from salesforce_mcp.services.SalesforceSession import SalesforceSession
+from salesforce_mcp.utils.retry import RetryPolicy
+
+LEAD_PATH = "services/data/v61.0/sobjects/Lead/"
+
+
+def composite_response(make_response, body):
+    return make_response(200, {"compositeResponse": [
+        {"body": {"Id": sub["url"].rsplit("/", 1)[-1]} if sub["method"] == "GET" else None,
+         "httpHeaders": {}, "httpStatusCode": 200 if sub["method"] == "GET" else 204,
+         "referenceId": sub["referenceId"]}
+        for sub in body["compositeRequest"]
+    ]})
+
+
+class TestCompositeBatcher:
+    def setup_method(self):
+        self.session = SalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass",
+            batch_window=0.05)
+
+    def test_disabled_by_default(self):
+        session = SalesforceSession(domain="bigthink.my.salesforce.com", client_id="dummy",
+                                    client_secret="dummy", username="user", password="pass")
+        assert session.batcher is None
+
+    def test_concurrent_calls_share_one_composite_request(self, mocker, make_response):
+        mock_request = mocker.patch.object(self.session, "_request",
+                                           side_effect=lambda method, url, json, **kwargs:
+                                           composite_response(make_response, json))
+        results = {}
+
+        def call(index):
+            if index % 2:
+                results[index] = self.session.update(LEAD_PATH, f"00Q{index}", {"Status": "Open"})
+            else:
+                results[index] = self.session.get(f"{LEAD_PATH}00Q{index}")
+
+        threads = [threading.Thread(target=call, args=(index,)) for index in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        mock_request.assert_called_once()
+        method, url = mock_request.call_args.args
+        assert (method, url) == ("post", "https://bigthink.my.salesforce.com/services/data/v61.0/composite")
+        assert len(mock_request.call_args.kwargs["json"]["compositeRequest"]) == 10
+        assert results[0] == {"Id": "00Q0"}
+        assert results[1] == {"success": True}
+
+    def test_full_batch_is_sent_without_waiting(self, mocker, make_response):
+        self.session.batcher.window = 10
+        self.session.batcher.max_subrequests = 2
+        mock_request = mocker.patch.object(self.session, "_request",
+                                           side_effect=lambda method, url, json, **kwargs:
+                                           composite_response(make_response, json))
+        threads = [threading.Thread(target=self.session.get, args=(f"{LEAD_PATH}00Q{index}",)) for index in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=2)
+
+        assert not any(thread.is_alive() for thread in threads)
+        mock_request.assert_called_once()
+
+    def test_single_call_skips_composite_envelope(self, mocker):
+        response = mocker.Mock(status_code=200, content=b"{}")
+        response.json.return_value = {"Id": "00Q1"}
+        mock_request = mocker.patch.object(self.session, "_request", return_value=response)
+
+        assert self.session.get(f"{LEAD_PATH}00Q1") == {"Id": "00Q1"}
+        mock_request.assert_called_once_with("get", "https://bigthink.my.salesforce.com/" + LEAD_PATH + "00Q1")
+
+    def test_subrequest_error_reaches_its_caller(self, mocker):
+        def respond(method, url, json, **kwargs):
+            response = mocker.Mock()
+            response.json.return_value = {"compositeResponse": [
+                {"body": {"Id": "00Q0"}, "httpHeaders": {}, "httpStatusCode": 200, "referenceId": "r0"},
+                {"body": [{"errorCode": "NOT_FOUND"}], "httpHeaders": {}, "httpStatusCode": 404, "referenceId": "r1"},
+            ]}
+            return response
+
+        mocker.patch.object(self.session, "_request", side_effect=respond)
+        outcomes = {}
+
+        def call(record_id):
+            try:
+                outcomes[record_id] = self.session.get(LEAD_PATH + record_id)
+            except CompositeSubrequestError as err:
+                outcomes[record_id] = err
+
+        first = threading.Thread(target=call, args=("00Q0",))
+        first.start()
+        second = threading.Thread(target=call, args=("00Q1",))
+        second.start()
+        first.join()
+        second.join()
+
+        assert outcomes["00Q0"] == {"Id": "00Q0"}
+        assert outcomes["00Q1"].status_code == 404
+        assert outcomes["00Q1"].errors == [{"errorCode": "NOT_FOUND"}]
+
+    def _run_batch(self, session, calls):
+        outcomes = {}
+
+        def call(index, method):
+            try:
+                outcomes[index] = method()
+            except Exception as err:
+                outcomes[index] = err
+
+        threads = [threading.Thread(target=call, args=(index, method)) for index, method in enumerate(calls)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def _retrying_session(self, mocker, make_response, batch_body):
+        session = SalesforceSession(domain="bigthink.my.salesforce.com", client_id="dummy", client_secret="dummy",
+                                    username="user", password="pass", batch_window=0.05, batch_max_size=2,
+                                    retry_policy=RetryPolicy(base_delay=0))
+        mock_send = mocker.patch.object(session, "_send_authenticated", side_effect=[
+            make_response(503), composite_response(make_response, batch_body)])
+        return session, mock_send
+
+    def test_composite_of_reads_is_retried(self, mocker, make_response):
+        body = {"compositeRequest": [{"method": "GET", "url": f"/{LEAD_PATH}00Q{index}", "referenceId": f"r{index}"}
+                                     for index in range(2)]}
+        session, mock_send = self._retrying_session(mocker, make_response, body)
+
+        outcomes = self._run_batch(session, [lambda: session.get(f"{LEAD_PATH}00Q0"),
+                                             lambda: session.get(f"{LEAD_PATH}00Q1")])
+
+        assert mock_send.call_count == 2
+        assert sorted(outcome["Id"] for outcome in outcomes.values()) == ["00Q0", "00Q1"]
+
+    def test_composite_with_creates_is_not_retried(self, mocker, make_response):
+        session, mock_send = self._retrying_session(mocker, make_response, {"compositeRequest": []})
+
+        outcomes = self._run_batch(session, [lambda: session.get(f"{LEAD_PATH}00Q0"),
+                                             lambda: session.create(LEAD_PATH, {"LastName": "Weiss"})])
+
+        assert mock_send.call_count == 1
+        assert all(isinstance(outcome, requests.HTTPError) for outcome in outcomes.values())
+
+    def test_non_batchable_paths_go_direct(self, mocker):
+        response = mocker.Mock()
+        response.json.return_value = {"state": "JobComplete"}
+        mock_request = mocker.patch.object(self.session, "_request", return_value=response)
+
+        self.session.get("services/data/v61.0/jobs/query/750x")
+
+        mock_request.assert_called_once_with("get", "https://bigthink.my.salesforce.com/services/data/v61.0/jobs/query/750x")
+
+    def test_async_calls_share_one_composite_request(self, mocker, make_response):
+        session = AsyncSalesforceSession(domain="bigthink.my.salesforce.com", client_id="dummy",
+                                         client_secret="dummy", username="user", password="pass",
+                                         batch_window=0.01)
+
+        async def respond(method, url, json, **kwargs):
+            return composite_response(make_response, json)
+
+        mock_request = mocker.patch.object(session, "_request", side_effect=respond)
+
+        async def run():
+            return await asyncio.gather(*(session.get(f"{LEAD_PATH}00Q{index}") for index in range(30)))
+
+        results = asyncio.run(run())
+
+        assert results[29] == {"Id": "00Q29"}
+        # 25 subrequests per composite request
+        assert mock_request.await_count == 2
+
+    def test_async_query_limit_per_batch(self, mocker, make_response):
+        session = AsyncSalesforceSession(domain="bigthink.my.salesforce.com", client_id="dummy",
+                                         client_secret="dummy", username="user", password="pass",
+                                         batch_window=0.01)
+        batches = []
+
+        async def respond(method, url, json, **kwargs):
+            batches.append(len(json["compositeRequest"]))
+            return composite_response(make_response, json)
+
+        mocker.patch.object(session, "_request", side_effect=respond)
+
+        async def run():
+            await asyncio.gather(*(session.get(f"services/data/v61.0/query?q=SELECT+Id+FROM+Lead+LIMIT+{index}")
+                                   for index in range(7)))
+
+        asyncio.run(run())
+
+        assert batches == [5, 2]
+
+    def test_rejects_oversized_batches(self):
+        with pytest.raises(ValueError):
+            SalesforceSession(domain="bigthink.my.salesforce.com", client_id="dummy", client_secret="dummy",
+                              username="user", password="pass", batch_window=0.01, batch_max_size=30)
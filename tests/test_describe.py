@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from salesforce_mcp.objects.LeadObject import LeadObject, AsyncLeadObject
+from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+from salesforce_mcp.services.SalesforceSession import SalesforceSession
+from salesforce_mcp.types.LeadRecord import LeadRecord
+from salesforce_mcp.utils.describe import RecordValidationError, validate_payload
+
+LEAD_DESCRIBE = {
+    "name": "Lead",
+    "fields": [
+        {"name": "Id", "type": "id", "createable": False, "updateable": False, "nillable": False},
+        {"name": "LastName", "type": "string", "length": 80, "createable": True, "updateable": True, "nillable": False},
+        {"name": "Company", "type": "string", "length": 255, "createable": True, "updateable": True, "nillable": False},
+        {"name": "NumberOfEmployees", "type": "int", "createable": True, "updateable": True, "nillable": True},
+        {"name": "IsConverted", "type": "boolean", "createable": True, "updateable": False, "nillable": False,
+         "defaultedOnCreate": True},
+        {"name": "Rating__c", "type": "picklist", "length": 40, "createable": True, "updateable": True, "nillable": True,
+         "restrictedPicklist": True, "picklistValues": [{"value": "Hot", "active": True}, {"value": "Cold", "active": False}]},
+    ],
+}
+
+
+def describe_response(make_response, status_code=200, last_modified="Mon, 01 Jan 2024 00:00:00 GMT"):
+    return make_response(status_code, LEAD_DESCRIBE, {"Last-Modified": last_modified})
+
+
+class TestDescribe:
+    def setup_method(self):
+        self.session = SalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass",
+            validate_writes=True)
+
+    def test_valid_payload(self):
+        validate_payload({"LastName": "Weiss", "Company": "Big Think", "rating__c": "Hot"}, LEAD_DESCRIBE)
+
+    def test_collects_every_error(self):
+        with pytest.raises(RecordValidationError) as err:
+            validate_payload({"LastName": "x" * 81, "NumberOfEmployees": "ten", "Rating__c": "Cold",
+                              "Unknown__c": 1}, LEAD_DESCRIBE)
+
+        assert err.value.errors == [
+            "LastName is 81 characters long, maximum is 80",
+            "NumberOfEmployees expects int, got str",
+            "Rating__c does not allow the value 'Cold'",
+            "No such field Unknown__c",
+            "Missing required field Company",
+        ]
+
+    def test_update_checks_updateable_and_skips_required(self):
+        validate_payload({"Company": "Big Think"}, LEAD_DESCRIBE, "update")
+        with pytest.raises(RecordValidationError, match="IsConverted is not updateable"):
+            validate_payload({"IsConverted": True}, LEAD_DESCRIBE, "update")
+
+    def test_fetched_record_can_be_updated(self, mocker, make_response):
+        mocker.patch.object(self.session, "get", return_value={
+            "attributes": {"type": "Lead", "url": "/services/data/v61.0/sobjects/Lead/00Q1"},
+            "Id": "00Q1", "LastName": "Weiss", "Company": "Big Think", "Rating__c": "Hot",
+            "CreatedDate": "2026-01-31T09:30:00.000+0000", "LastModifiedDate": "2026-02-01T10:00:00.000+0000",
+            "SystemModstamp": "2026-02-01T10:00:00.000+0000", "IsDeleted": False, "CreatedById": "0051",
+        })
+        mocker.patch.object(self.session, "request", return_value=describe_response(make_response))
+        mock_update = mocker.patch.object(self.session, "update")
+        lead_object = LeadObject(self.session)
+
+        record = lead_object.get("00Q1")
+        record.Company = "Big Think Inc"
+        lead_object.update("00Q1", record)
+
+        assert mock_update.call_args.kwargs["body"] == {
+            "LastName": "Weiss", "Company": "Big Think Inc", "Id": "00Q1", "Rating__c": "Hot"}
+
+    def test_invalid_record_is_not_sent(self, mocker, make_response):
+        mocker.patch.object(self.session, "request", return_value=describe_response(make_response))
+        mock_create = mocker.patch.object(self.session, "create")
+
+        with pytest.raises(RecordValidationError):
+            LeadObject(self.session).create(LeadRecord(LastName="Weiss", custom_fields={"Typo__c": "x"}))
+
+        mock_create.assert_not_called()
+
+    def test_describe_is_fetched_once(self, mocker, make_response):
+        mock_request = mocker.patch.object(self.session, "request", return_value=describe_response(make_response))
+        mocker.patch.object(self.session, "create", return_value={"id": "00Q1", "success": True, "errors": []})
+        lead_object = LeadObject(self.session)
+
+        lead_object.create(LeadRecord(LastName="Weiss", Company="Big Think"))
+        lead_object.create(LeadRecord(LastName="Tal", Company="Big Think"))
+
+        mock_request.assert_called_once_with("get", "services/data/v61.0/sobjects/Lead/describe", headers={})
+
+    def test_disk_cache_is_revalidated_with_if_modified_since(self, mocker, make_response, tmp_path):
+        session = SalesforceSession(domain="bigthink.my.salesforce.com", client_id="dummy", client_secret="dummy",
+                                    username="user", password="pass", describe_cache_dir=str(tmp_path))
+        mocker.patch.object(session, "request", return_value=describe_response(make_response))
+        session.describe_cache.describe("Lead")
+        assert (tmp_path / "bigthink.my.salesforce.com" / "v61.0" / "Lead.json").exists()
+
+        restarted = SalesforceSession(domain="bigthink.my.salesforce.com", client_id="dummy", client_secret="dummy",
+                                      username="user", password="pass", describe_cache_dir=str(tmp_path))
+        not_modified = mocker.Mock(status_code=304, headers={})
+        mock_request = mocker.patch.object(restarted, "request", return_value=not_modified)
+
+        assert restarted.describe_cache.describe("Lead") == LEAD_DESCRIBE
+        assert restarted.describe_cache.describe("Lead") == LEAD_DESCRIBE
+
+        mock_request.assert_called_once_with("get", "services/data/v61.0/sobjects/Lead/describe",
+                                             headers={"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        assert restarted.describe_cache.not_modified == 1
+
+    def test_async_invalid_record_is_not_sent(self, mocker, make_response):
+        session = AsyncSalesforceSession(domain="bigthink.my.salesforce.com", client_id="dummy",
+                                         client_secret="dummy", username="user", password="pass",
+                                         validate_writes=True)
+        mocker.patch.object(session, "request", new_callable=mocker.AsyncMock,
+                            return_value=describe_response(make_response))
+        mock_update = mocker.patch.object(session, "update", new_callable=mocker.AsyncMock)
+
+        with pytest.raises(RecordValidationError):
+            asyncio.run(AsyncLeadObject(session).update("00Q1", LeadRecord(NumberOfEmployees="ten")))
+
+        mock_update.assert_not_awaited()
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from salesforce_mcp.utils.json_stream import QueryPageDecoder, iter_page_records
+
+PAGE = {
+    "totalSize": 3,
+    "done": False,
+    "nextRecordsUrl": "/services/data/v61.0/query/01gxx-2000",
+    "records": [
+        {"attributes": {"type": "Lead"}, "Id": "1", "LastName": "Müller \"Mo\"", "NumberOfEmployees": 12345},
+        {"Id": "2", "AnnualRevenue": -1.5e3, "Contacts": {"records": [{"Id": "3"}]}},
+        {},
+    ],
+}
+
+
+def chunked(body: bytes, size: int):
+    return [body[start:start + size] for start in range(0, len(body), size)]
+
+
+class TestQueryPageDecoder:
+    @pytest.mark.parametrize("size", [1, 2, 5, 64, 100_000])
+    def test_records_and_fields_across_chunk_boundaries(self, size):
+        decoder = QueryPageDecoder()
+        body = json.dumps(PAGE, ensure_ascii=False, indent=1).encode()
+
+        records = list(iter_page_records(chunked(body, size), decoder))
+
+        assert records == PAGE["records"]
+        assert decoder.fields == {"totalSize": 3, "done": False, "nextRecordsUrl": "/services/data/v61.0/query/01gxx-2000"}
+
+    def test_records_returned_as_soon_as_complete(self):
+        decoder = QueryPageDecoder()
+
+        assert decoder.feed('{"totalSize": 2, "records": [{"Id": "1"}, {"Id"') == [{"Id": "1"}]
+        assert decoder.feed(': "2"}]') == [{"Id": "2"}]
+        assert decoder.feed(', "done": true}') == []
+        assert decoder.close() == []
+        assert decoder.fields == {"totalSize": 2, "done": True}
+
+    def test_number_split_across_chunks(self):
+        decoder = QueryPageDecoder()
+
+        decoder.feed('{"totalSize": 12')
+        decoder.feed('34, "records": []}')
+        decoder.close()
+
+        assert decoder.fields["totalSize"] == 1234
+
+    def test_empty_page(self):
+        decoder = QueryPageDecoder()
+
+        assert list(iter_page_records([b'{"totalSize": 0, "done": true, "records": []}'], decoder)) == []
+        assert decoder.fields == {"totalSize": 0, "done": True}
+
+    def test_truncated_body(self):
+        body = json.dumps(PAGE).encode()
+
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_page_records([body[:-10]], QueryPageDecoder()))
+
+    def test_invalid_body(self):
+        with pytest.raises(json.JSONDecodeError):
+            QueryPageDecoder().feed("[1, 2]")
+
+    def test_record_spanning_many_chunks_is_decoded_once(self, mocker):
+        record = {"Id": "1", "Description": "x\\\"{[" * 2000, "Contacts": {"records": [{"Id": "2"}] * 200}}
+        body = json.dumps({"totalSize": 1, "records": [record, {"Id": "3"}], "done": True}).encode()
+        decoder = QueryPageDecoder()
+        raw_decode = mocker.spy(decoder._decoder, "raw_decode")
+
+        records = list(iter_page_records(chunked(body, 64), decoder))
+
+        assert records == [record, {"Id": "3"}]
+        assert len(body) > 200 * 64
+        # two attempts on the partial record and one once it is complete, not one per chunk
+        assert raw_decode.call_count < 20
+
+    def test_invalid_record_raises_once_complete(self):
+        decoder = QueryPageDecoder()
+
+        assert decoder.feed('{"records": [{"Id" "1"') == []
+        with pytest.raises(json.JSONDecodeError):
+            decoder.feed('}')
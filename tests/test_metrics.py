@@ -0,0 +1,152 @@
+import asyncio
+
+import httpx
+import pytest
+import requests
+
+from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+from salesforce_mcp.services.SalesforceSession import SalesforceSession
+from salesforce_mcp.utils.metrics import (HTTP_DURATION, HTTP_IN_FLIGHT, HTTP_REQUESTS, HTTP_RESPONSE_BYTES,
+                                          SESSION_DURATION, SESSION_ERRORS, STARTUP_SECONDS, MetricsRegistry)
+from salesforce_mcp.utils.startup import StartupReport
+from salesforce_mcp.utils.telemetry import tool_context
+
+URL = "https://bigthink.my.salesforce.com/services/data/v61.0/sobjects/Lead/00Q5g00000AbCdEFGH"
+
+
+class TestMetricsRegistry:
+    def test_histogram_rendered_cumulatively(self):
+        metrics = MetricsRegistry(buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            metrics.observe("latency_seconds", value, tool="run_soql")
+
+        text = metrics.render()
+
+        assert 'latency_seconds_bucket{tool="run_soql",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{tool="run_soql",le="1"} 2' in text
+        assert 'latency_seconds_bucket{tool="run_soql",le="+Inf"} 3' in text
+        assert 'latency_seconds_sum{tool="run_soql"} 5.55' in text
+        assert 'latency_seconds_count{tool="run_soql"} 3' in text
+        assert "# TYPE latency_seconds histogram" in text
+
+    def test_counters_and_gauges(self):
+        metrics = MetricsRegistry()
+        metrics.inc(HTTP_REQUESTS, method="GET", status=200)
+        metrics.inc(HTTP_REQUESTS, method="GET", status=200)
+        metrics.add(HTTP_IN_FLIGHT, 1)
+
+        text = metrics.render()
+
+        assert f'{HTTP_REQUESTS}{{method="GET",status="200"}} 2' in text
+        assert f"# TYPE {HTTP_IN_FLIGHT} gauge" in text
+        assert f"{HTTP_IN_FLIGHT} 1" in text
+
+    def test_startup_phases_recorded_once(self, mocker):
+        clock = mocker.patch("salesforce_mcp.utils.startup.time.perf_counter", return_value=10.5)
+        metrics = MetricsRegistry()
+        startup = StartupReport(10.0, metrics)
+
+        assert startup.mark("imports") == 0.5
+        clock.return_value = 11.0
+        assert startup.mark("imports") is None
+        assert startup.mark("first_tool_call") == 1.0
+
+        assert startup.report() == {"imports": 500.0, "first_tool_call": 1000.0}
+        assert metrics.value(STARTUP_SECONDS, phase="imports") == 0.5
+        assert f"# TYPE {STARTUP_SECONDS} gauge" in metrics.render()
+
+    def test_label_values_escaped(self):
+        metrics = MetricsRegistry()
+        metrics.inc("errors_total", error='say "hi"\n')
+
+        assert 'errors_total{error="say \\"hi\\"\\n"} 1' in metrics.render()
+
+    def test_timed_counts_errors(self):
+        metrics = MetricsRegistry()
+        with pytest.raises(KeyError):
+            with metrics.timed("d", "e", "g", tool="t"):
+                raise KeyError("x")
+
+        assert metrics.value("d", tool="t") == 1
+        assert metrics.value("e", tool="t", error="KeyError") == 1
+        assert metrics.value("g", tool="t") == 0
+
+    def test_timed_does_not_count_cancellation(self):
+        metrics = MetricsRegistry()
+        with pytest.raises(asyncio.CancelledError):
+            with metrics.timed("d", "e", "g", tool="t"):
+                raise asyncio.CancelledError()
+
+        assert metrics.value("d", tool="t") == 1
+        assert metrics.value("e", tool="t", error="CancelledError") is None
+        assert metrics.value("g", tool="t") == 0
+
+    def test_write(self, tmp_path):
+        metrics = MetricsRegistry()
+        metrics.inc(HTTP_REQUESTS, status=200)
+        path = tmp_path / "metrics" / "salesforce_mcp.prom"
+
+        metrics.write(str(path))
+
+        assert path.read_text() == metrics.render()
+
+
+class TestSessionMetrics:
+    def setup_method(self):
+        self.session = SalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass")
+
+    def test_http_call_and_auth_recorded_separately(self, mocker):
+        token_response = mocker.Mock(status_code=200)
+        token_response.json.return_value = {"access_token": "token"}
+        mocker.patch.object(self.session.session, "post", return_value=token_response)
+        get_response = mocker.Mock(status_code=200, headers={"Content-Length": "42"}, content=b"{}")
+        get_response.json.return_value = {"Id": "00Q5g00000AbCdEFGH"}
+        mocker.patch.object(self.session.session, "get", return_value=get_response)
+
+        with tool_context("run_lead_operation"):
+            self.session.get("sobjects/Lead/00Q5g00000AbCdEFGH")
+
+        metrics = self.session.metrics
+        labels = {"method": "GET", "endpoint": "sobjects/Lead/{id}"}
+        assert metrics.value(SESSION_DURATION, method="authenticate") == 1
+        assert metrics.value(SESSION_DURATION, method="get") == 1
+        assert metrics.value(HTTP_DURATION, **labels) == 1
+        assert metrics.value(HTTP_REQUESTS, status=200, tool="run_lead_operation", **labels) == 1
+        assert metrics.value(HTTP_RESPONSE_BYTES, tool="run_lead_operation", **labels) == 42
+        assert metrics.value(HTTP_IN_FLIGHT) == 0
+
+    def test_transport_error_counted(self, mocker):
+        mocker.patch("salesforce_mcp.services.SalesforceSession.time.sleep")
+        mocker.patch.object(self.session, "get_token", return_value="token")
+        mocker.patch.object(self.session.session, "delete", side_effect=requests.ConnectionError("reset"))
+
+        with pytest.raises(requests.ConnectionError):
+            self.session.delete("sobjects/Lead/00Q5g00000AbCdEFGH")
+
+        metrics = self.session.metrics
+        assert metrics.value(HTTP_REQUESTS, method="DELETE", endpoint="sobjects/Lead/{id}",
+                             status="ConnectionError", tool="-") == 4
+        assert metrics.value(SESSION_ERRORS, method="delete", error="ConnectionError") == 1
+
+    def test_async_session(self, mocker):
+        metrics = MetricsRegistry()
+        session = AsyncSalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass",
+            metrics=metrics)
+        mocker.patch.object(session, "get_token", mocker.AsyncMock(return_value="token"))
+        response = httpx.Response(200, json={"Id": "00Q5g00000AbCdEFGH"}, request=httpx.Request("GET", URL))
+        mocker.patch.object(session.client, "get", mocker.AsyncMock(return_value=response))
+
+        asyncio.run(session.get("sobjects/Lead/00Q5g00000AbCdEFGH"))
+
+        assert metrics.value(SESSION_DURATION, method="get") == 1
+        assert metrics.value(HTTP_RESPONSE_BYTES, method="GET", endpoint="sobjects/Lead/{id}", tool="-") == len(response.content)
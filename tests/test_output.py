@@ -0,0 +1,109 @@
+import json
+
+from salesforce_mcp.types.LeadRecord import LeadRecord
+from salesforce_mcp.utils.output import shape_records, shape_row
+from salesforce_mcp.utils.soql import SoqlResult
+
+ROWS = [
+    {"attributes": {"type": "Opportunity", "url": "/services/data/v61.0/sobjects/Opportunity/0061"},
+     "Id": "0061", "Name": "A", "Amount": 1500.0, "NextStep": None,
+     "Account": {"attributes": {"type": "Account"}, "Name": "Acme"}},
+    {"attributes": {"type": "Opportunity"}, "Id": "0062", "Name": "B", "Amount": None, "NextStep": "Call",
+     "Account": None},
+    {"attributes": {"type": "Opportunity"}, "Id": "0063", "Name": "C", "Amount": 20.0, "NextStep": None,
+     "Account": {"attributes": {"type": "Account"}, "Name": "Globex"}},
+]
+
+
+class TestShapeRow:
+    def test_attributes_stripped_recursively(self):
+        row = shape_row(ROWS[0])
+
+        assert "attributes" not in row
+        assert row["Account"] == {"Name": "Acme"}
+
+    def test_projection_with_relationship_path(self):
+        assert shape_row(ROWS[0], ["Name", "Account.Name"]) == {"Name": "A", "Account.Name": "Acme"}
+        assert shape_row(ROWS[1], ["Name", "Account.Name"]) == {"Name": "B", "Account.Name": None}
+
+    def test_omit_nulls(self):
+        assert shape_row(ROWS[1], omit_nulls=True) == {"Id": "0062", "Name": "B", "NextStep": "Call"}
+
+    def test_keep_attributes(self):
+        assert shape_row(ROWS[1], ["attributes"], strip_attributes=False) == {"attributes": {"type": "Opportunity"}}
+
+    def test_record_dataclass(self):
+        row = shape_row(LeadRecord(LastName="Lovelace", custom_fields={"Region__c": "EMEA"}), omit_nulls=True)
+
+        assert row == {"LastName": "Lovelace", "Region__c": "EMEA"}
+
+
+class TestShapeRecords:
+    def test_record_budget(self):
+        output = shape_records(ROWS, max_records=2)
+
+        assert output["size"] == 2
+        assert output["truncated"] == 1
+        assert [row["Id"] for row in output["records"]] == ["0061", "0062"]
+
+    def test_byte_budget_keeps_a_prefix(self):
+        first = len(json.dumps(shape_row(ROWS[0]), separators=(",", ":"))) + 1
+        output = shape_records(ROWS, max_bytes=first + 10)
+
+        assert output["size"] == 1
+        assert output["truncated"] == 2
+        assert len(json.dumps(output["records"], separators=(",", ":"))) <= first + 10
+
+    def test_tabular(self):
+        output = shape_records(ROWS, fields=["Id", "Amount", "Account.Name"], tabular=True)
+
+        assert output["fields"] == ["Id", "Amount", "Account.Name"]
+        assert output["rows"] == [["0061", 1500.0, "Acme"], ["0062", None, None], ["0063", 20.0, "Globex"]]
+        assert "records" not in output
+
+    def test_tabular_header_collects_keys(self):
+        output = shape_records([{"Id": "1"}, {"Id": "2", "Name": "B"}], tabular=True)
+
+        assert output["fields"] == ["Id", "Name"]
+        assert output["rows"] == [["1", None], ["2", "B"]]
+
+    def test_no_budget(self):
+        output = shape_records(ROWS)
+
+        assert output["size"] == 3
+        assert output["truncated"] == 0
+
+
+class TestSoqlResultOutput:
+    def test_envelope(self):
+        result = SoqlResult(totalSize=4100, records=ROWS, done=False,
+                            nextRecordsUrl="/services/data/v61.0/query/01gD0000002HU6KIAW-2000")
+
+        output = result.to_output(fields=["Id"], max_records=1)
+
+        assert output == {
+            "totalSize": 4100,
+            "done": False,
+            "nextRecordsUrl": "/services/data/v61.0/query/01gD0000002HU6KIAW-2000",
+            "size": 1,
+            "truncated": 2,
+            "records": [{"Id": "0061"}],
+        }
+
+    def test_columnar_is_shaped_and_budgeted(self):
+        result = SoqlResult(totalSize=3, records=ROWS)
+
+        output = result.to_output(fields=["Id", "NextStep", "Account.Name"], omit_nulls=True, columnar=True)
+        assert output["columns"] == {"Id": ["0061", "0062", "0063"], "NextStep": [None, "Call", None],
+                                     "Account.Name": ["Acme", None, "Globex"]}
+        assert list(result.to_output(fields=["Id", "Type"], omit_nulls=True, columnar=True)["columns"]) == ["Id"]
+
+        output = result.to_output(columnar=True)
+        assert "attributes" not in output["columns"]
+        assert output["columns"]["Account"][0] == {"Name": "Acme"}
+        assert "attributes" in result.to_output(strip_attributes=False, columnar=True)["columns"]
+
+        budget = len(json.dumps(shape_row(ROWS[0]), separators=(",", ":"))) + 1
+        output = result.to_output(max_bytes=budget, columnar=True)
+        assert (output["size"], output["truncated"]) == (1, 2)
+        assert output["columns"]["Id"] == ["0061"]
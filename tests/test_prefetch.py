@@ -0,0 +1,37 @@
+from salesforce_mcp.utils.prefetch import prefetch_iter
+import threading
+import pytest
+
+
+class TestPrefetch:
+    def test_yields_items_in_order(self):
+        assert list(prefetch_iter(iter(range(10)), depth=3)) == list(range(10))
+
+    def test_reraises_source_errors(self):
+        def source():
+            yield 1
+            raise RuntimeError("boom")
+
+        iterator = prefetch_iter(source(), depth=2)
+        assert next(iterator) == 1
+        with pytest.raises(RuntimeError):
+            next(iterator)
+
+    def test_buffer_is_bounded(self):
+        produced = []
+        blocked = threading.Event()
+
+        def source():
+            for i in range(100):
+                produced.append(i)
+                if i == 3:
+                    # one item consumed and two buffered: the producer now waits for room with item 3
+                    blocked.set()
+                yield i
+
+        iterator = prefetch_iter(source(), depth=2)
+        assert next(iterator) == 0
+        assert blocked.wait(5)
+        # item 4 can only be read once the consumer frees a slot
+        assert produced == [0, 1, 2, 3]
+        assert list(iterator) == list(range(1, 100))
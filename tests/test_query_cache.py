@@ -0,0 +1,154 @@
+import asyncio
+
+from salesforce_mcp.objects.LeadObject import LeadObject
+from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+from salesforce_mcp.services.SalesforceSession import SalesforceSession
+from salesforce_mcp.utils.query_cache import QueryCache, normalize_query, query_objects
+from salesforce_mcp.types.LeadRecord import LeadRecord, SlottedLeadRecord
+from salesforce_mcp.utils.soql import SoqlModule, AsyncSoqlModule, SoqlResult
+
+PAGE = {"totalSize": 1, "done": True, "records": [{"Id": "00Q1", "LastName": "Weiss"}]}
+
+
+class TestQueryCache:
+    def setup_method(self):
+        self.session = SalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass",
+            query_cache_ttl=60)
+
+    def test_normalize_query(self):
+        assert normalize_query("SELECT  Id\n FROM Lead WHERE Name = 'Big  Think'") == \
+            normalize_query("select id from LEAD where name = 'Big  Think'")
+        assert normalize_query("SELECT Id FROM Lead WHERE Name = 'A'") != \
+            normalize_query("SELECT Id FROM Lead WHERE Name = 'a'")
+
+    def test_query_objects(self):
+        query = normalize_query("SELECT Id, (SELECT Id FROM Opportunities) FROM Account WHERE Name = 'from lead'")
+        assert query_objects(query) == {"opportunities", "account"}
+
+    def test_ttl_expiry(self, mocker):
+        clock = mocker.patch("salesforce_mcp.utils.query_cache.time.monotonic", return_value=100.0)
+        cache = QueryCache(ttl=10)
+        cache.put("q", [1], frozenset({"lead"}))
+        assert cache.get("q") == [1]
+        clock.return_value = 111.0
+        assert cache.get("q") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction_by_entries_and_bytes(self):
+        cache = QueryCache(max_entries=2)
+        cache.put("a", 1, frozenset())
+        cache.put("b", 2, frozenset())
+        cache.get("a")
+        cache.put("c", 3, frozenset())
+        assert cache.get("b") is None and cache.get("a") == 1
+
+        cache = QueryCache(max_bytes=10)
+        cache.put("a", "x", frozenset(), size=6)
+        cache.put("b", "y", frozenset(), size=6)
+        cache.put("too_big", "z", frozenset(), size=11)
+        assert cache.get("a") is None and cache.get("b") == "y" and cache.get("too_big") is None
+        assert cache.stats()["evictions"] == 1
+
+    def test_size_of_slotted_records_counts_every_field(self):
+        slotted = SlottedLeadRecord(LastName="Weiss", Company="Big Think", custom_fields={"Notes__c": "x" * 500})
+        plain = LeadRecord(LastName="Weiss", Company="Big Think", custom_fields={"Notes__c": "x" * 500})
+        assert not hasattr(slotted, "__dict__")
+
+        size = QueryCache.estimate_size(SoqlResult(totalSize=1, records=[slotted]))
+        assert size > 500
+        assert size == QueryCache.estimate_size(SoqlResult(totalSize=1, records=[plain]))
+
+    def test_repeated_query_is_served_from_cache(self, mocker):
+        mock_get = mocker.patch.object(self.session, "get", return_value=PAGE)
+        soql = SoqlModule(self.session)
+
+        first = soql.execute_soql("SELECT Id, LastName FROM Lead")
+        second = soql.execute_soql("select id,  lastname from lead")
+        first.records.clear()
+        third = soql.execute_soql("SELECT Id, LastName FROM Lead")
+
+        mock_get.assert_called_once()
+        assert second.records == PAGE["records"]
+        assert third.records == PAGE["records"]
+        stats = self.session.query_cache.stats()
+        assert (stats["hits"], stats["misses"]) == (2, 1)
+
+    def test_cache_false_bypasses_cache(self, mocker):
+        mock_get = mocker.patch.object(self.session, "get", return_value=PAGE)
+        soql = SoqlModule(self.session)
+
+        soql.execute_soql("SELECT Id FROM Lead")
+        soql.execute_soql("SELECT Id FROM Lead", cache=False)
+
+        assert mock_get.call_count == 2
+
+    def test_lead_write_invalidates_lead_queries(self, mocker):
+        mock_get = mocker.patch.object(self.session, "get", return_value=PAGE)
+        mocker.patch.object(self.session, "delete", return_value={"success": True})
+        soql = SoqlModule(self.session)
+        soql.execute_soql("SELECT Id FROM Lead")
+        soql.execute_soql("SELECT Id FROM Opportunity")
+
+        LeadObject(self.session).delete("00Q1")
+        soql.execute_soql("SELECT Id FROM Lead")
+        soql.execute_soql("SELECT Id FROM Opportunity")
+
+        assert mock_get.call_count == 3
+        assert self.session.query_cache.stats()["invalidations"] == 1
+
+    def test_record_count_is_cached_and_invalidated_with_results(self, mocker):
+        mock_get = mocker.patch.object(self.session, "get", return_value={"totalSize": 42, "done": True, "records": []})
+        mocker.patch.object(self.session, "delete", return_value={"success": True})
+        soql = SoqlModule(self.session)
+
+        assert soql.count_records("SELECT Id FROM Lead") == 42
+        assert soql.count_records("select id from lead LIMIT 10") == 10
+        assert soql.count_records("SELECT Id FROM Lead") == 42
+        mock_get.assert_called_once()
+        assert soql.count_records("SELECT Id FROM Lead", cache=False) == 42
+        assert mock_get.call_count == 2
+
+        LeadObject(self.session).delete("00Q1")
+        soql.count_records("SELECT Id FROM Lead")
+        assert mock_get.call_count == 3
+
+    def test_disabled_by_default(self):
+        session = SalesforceSession(domain="bigthink.my.salesforce.com", client_id="dummy",
+                                    client_secret="dummy", username="user", password="pass")
+        assert session.query_cache is None
+
+    def test_async_repeated_query_is_served_from_cache(self, mocker):
+        session = AsyncSalesforceSession(domain="bigthink.my.salesforce.com", client_id="dummy",
+                                         client_secret="dummy", username="user", password="pass",
+                                         query_cache_ttl=60)
+        mock_get = mocker.patch.object(session, "get", new_callable=mocker.AsyncMock, return_value=PAGE)
+        soql = AsyncSoqlModule(session)
+
+        async def run():
+            await soql.execute_soql("SELECT Id FROM Lead")
+            return await soql.execute_soql("SELECT Id FROM Lead")
+
+        result = asyncio.run(run())
+
+        assert result.records == PAGE["records"]
+        mock_get.assert_awaited_once()
+
+    def test_async_record_count_is_cached(self, mocker):
+        session = AsyncSalesforceSession(domain="bigthink.my.salesforce.com", client_id="dummy",
+                                         client_secret="dummy", username="user", password="pass",
+                                         query_cache_ttl=60)
+        mock_get = mocker.patch.object(session, "get", new_callable=mocker.AsyncMock,
+                                       return_value={"totalSize": 42, "done": True, "records": []})
+        soql = AsyncSoqlModule(session)
+
+        async def run():
+            await soql.count_records("SELECT Id FROM Lead")
+            return await soql.count_records("SELECT Id FROM Lead")
+
+        assert asyncio.run(run()) == 42
+        mock_get.assert_awaited_once()
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+from salesforce_mcp.services.SalesforceSession import SalesforceSession
+from salesforce_mcp.utils.query_plan import NonSelectiveQueryError, SelectivityGuard, add_limit, query_shape
+from salesforce_mcp.utils.soql import AsyncSoqlModule, SoqlModule
+
+TABLE_SCAN = {"plans": [
+    {"cardinality": 90000, "fields": [], "leadingOperationType": "TableScan", "relativeCost": 2.8,
+     "sobjectCardinality": 100000, "sobjectType": "Lead",
+     "notes": [{"description": "Not considering filter for optimization because unindexed",
+                "fields": ["Company"], "tableEnumOrId": "Lead"}]},
+]}
+INDEX_SEEK = {"plans": [
+    {"cardinality": 1, "fields": ["Id"], "leadingOperationType": "Index", "relativeCost": 0.0001,
+     "sobjectCardinality": 100000, "sobjectType": "Lead", "notes": []},
+    {"cardinality": 90000, "fields": [], "leadingOperationType": "TableScan", "relativeCost": 2.8,
+     "sobjectCardinality": 100000, "sobjectType": "Lead", "notes": []},
+]}
+SCAN_QUERY = "SELECT Id FROM Lead WHERE Company LIKE '%think%'"
+
+
+class TestQueryPlan:
+    def setup_method(self):
+        self.session = SalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass")
+
+    def test_query_shape_ignores_literals(self):
+        assert query_shape("SELECT Id FROM Lead WHERE Company = 'Big Think' LIMIT 10") == \
+            query_shape("select id from lead where company = 'Other'  limit 200")
+        assert query_shape("SELECT Id FROM Lead WHERE Custom_1__c = 5") == "select id from lead where custom_1__c = ?"
+
+    def test_add_limit(self):
+        assert add_limit("SELECT Id FROM Lead ", 100) == "SELECT Id FROM Lead LIMIT 100"
+        assert add_limit("SELECT Id FROM Lead ORDER BY Name OFFSET 10 FOR VIEW", 5) == \
+            "SELECT Id FROM Lead ORDER BY Name LIMIT 5 OFFSET 10 FOR VIEW"
+
+    def test_selective_query_passes(self, mocker):
+        mocker.patch.object(self.session, "get", return_value=INDEX_SEEK)
+        guard = SelectivityGuard(action="refuse")
+
+        assert SoqlModule(self.session).guard_query("SELECT Id FROM Lead WHERE Id = '00Q1'", guard) == \
+            ("SELECT Id FROM Lead WHERE Id = '00Q1'", None)
+
+    def test_warn(self, mocker):
+        mock_get = mocker.patch.object(self.session, "get", return_value=TABLE_SCAN)
+
+        query, report = SoqlModule(self.session).guard_query(SCAN_QUERY, SelectivityGuard(action="warn"))
+
+        assert query == SCAN_QUERY
+        assert report["action"] == "warned"
+        assert report["plan"]["leadingOperationType"] == "TableScan"
+        assert report["plan"]["notes"] == ["Not considering filter for optimization because unindexed"]
+        assert mock_get.call_args.args[0].startswith("services/data/v61.0/query?explain=SELECT+Id+FROM+Lead")
+
+    def test_limit_is_added_unless_present(self, mocker):
+        mocker.patch.object(self.session, "get", return_value=TABLE_SCAN)
+        guard = SelectivityGuard(action="limit", limit=500)
+        soql = SoqlModule(self.session)
+
+        query, report = soql.guard_query(SCAN_QUERY, guard)
+        assert query == SCAN_QUERY + " LIMIT 500"
+        assert report["action"] == "limited"
+        assert soql.guard_query(SCAN_QUERY + " LIMIT 10", guard)[1]["action"] == "warned"
+        assert soql.guard_query("SELECT COUNT() FROM Lead", guard)[0] == "SELECT COUNT() FROM Lead"
+
+        sub_select = "SELECT Id, (SELECT Id FROM Contacts LIMIT 5) FROM Account WHERE Name LIKE '%Think%'"
+        assert soql.guard_query(sub_select, guard)[0] == sub_select + " LIMIT 500"
+        semi_join = "SELECT Id FROM Lead WHERE OwnerId IN (SELECT Id FROM User WHERE Name = 'LIMIT 1')"
+        assert soql.guard_query(semi_join, guard)[0] == semi_join + " LIMIT 500"
+
+    def test_refuse(self, mocker):
+        mocker.patch.object(self.session, "get", return_value=TABLE_SCAN)
+
+        with pytest.raises(NonSelectiveQueryError, match="relative cost 2.8"):
+            SoqlModule(self.session).guard_query(SCAN_QUERY, SelectivityGuard(action="refuse"))
+
+    def test_cost_threshold(self, mocker):
+        mocker.patch.object(self.session, "get", return_value=TABLE_SCAN)
+
+        assert SoqlModule(self.session).guard_query(SCAN_QUERY, SelectivityGuard(max_cost=3.0))[1] is None
+
+    def test_plan_is_cached_per_shape(self, mocker):
+        mock_get = mocker.patch.object(self.session, "get", return_value=TABLE_SCAN)
+        guard = SelectivityGuard()
+        soql = SoqlModule(self.session)
+
+        soql.guard_query(SCAN_QUERY, guard)
+        soql.guard_query("select id from lead where company like '%other%'", guard)
+
+        mock_get.assert_called_once()
+
+    def test_failed_explain_runs_query_unchecked(self, mocker):
+        mocker.patch.object(self.session, "get", side_effect=RuntimeError("MALFORMED_QUERY"))
+
+        assert SoqlModule(self.session).guard_query(SCAN_QUERY, SelectivityGuard(action="refuse")) == \
+            (SCAN_QUERY, None)
+
+    def test_unknown_action(self):
+        with pytest.raises(ValueError):
+            SelectivityGuard(action="block")
+
+    def test_async_guard_query(self, mocker):
+        session = AsyncSalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass")
+        mocker.patch.object(session, "get", new_callable=mocker.AsyncMock, return_value=TABLE_SCAN)
+
+        query, report = asyncio.run(AsyncSoqlModule(session).guard_query(SCAN_QUERY, SelectivityGuard(action="limit")))
+
+        assert query == SCAN_QUERY + " LIMIT 2000"
+        assert report["plan"]["relativeCost"] == 2.8
@@ -0,0 +1,86 @@
+import asyncio
+
+from salesforce_mcp.objects.LeadObject import LeadObject, AsyncLeadObject
+from salesforce_mcp.objects.OpportunityObject import OpportunityObject
+from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+from salesforce_mcp.services.SalesforceSession import SalesforceSession
+from salesforce_mcp.types.LeadRecord import LeadRecord
+from salesforce_mcp.utils.record_cache import RecordCache
+
+LEAD = {"Id": "00Q1", "LastName": "Weiss", "Company": "Big Think"}
+LEAD_PATH = "services/data/v61.0/sobjects/Lead/00Q1"
+
+
+def record_response(make_response, status_code=200, etag='"v1"'):
+    return make_response(status_code, dict(LEAD), {"ETag": etag, "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+
+class TestRecordCache:
+    def setup_method(self):
+        self.session = SalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass")
+        self.lead_object = LeadObject(self.session, record_cache_size=10)
+
+    def test_second_get_is_conditional_and_served_on_304(self, mocker, make_response):
+        mock_request = mocker.patch.object(self.session, "request",
+                                           side_effect=[record_response(make_response),
+                                                        record_response(make_response, 304)])
+
+        first = self.lead_object.get("00Q1")
+        second = self.lead_object.get("00Q1")
+
+        assert first == second == LeadRecord(**LEAD)
+        assert mock_request.call_args_list[0].kwargs["headers"] == {}
+        assert mock_request.call_args_list[1].kwargs["headers"] == {
+            "If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+        assert self.lead_object.record_cache.stats()["hits"] == 1
+
+    def test_update_and_delete_invalidate(self, mocker, make_response):
+        mock_request = mocker.patch.object(self.session, "request", return_value=record_response(make_response))
+        mocker.patch.object(self.session, "update", return_value={"success": True})
+        mocker.patch.object(self.session, "delete", return_value={"success": True})
+
+        self.lead_object.get("00Q1")
+        self.lead_object.update("00Q1", LeadRecord(Company="Big Think"))
+        self.lead_object.get("00Q1")
+        self.lead_object.delete("00Q1")
+
+        assert mock_request.call_args_list[1].kwargs["headers"] == {}
+        stats = self.lead_object.record_cache.stats()
+        assert (stats["entries"], stats["invalidations"], stats["misses"]) == (0, 2, 2)
+
+    def test_lru_bound(self, mocker, make_response):
+        cache = RecordCache(max_entries=2)
+        for record_id in ("a", "b", "a", "c"):
+            cache.apply(record_id, cache.lookup(record_id), record_response(make_response))
+
+        assert cache.lookup("b") is None
+        assert cache.lookup("a") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_disabled_by_default(self, mocker):
+        mock_get = mocker.patch.object(self.session, "get", return_value={"Id": "006x", "Name": "Deal"})
+
+        OpportunityObject(self.session).get("006x")
+
+        mock_get.assert_called_once_with("services/data/v61.0/sobjects/Opportunity/006x")
+
+    def test_async_get_uses_conditional_requests(self, mocker, make_response):
+        session = AsyncSalesforceSession(domain="bigthink.my.salesforce.com", client_id="dummy",
+                                         client_secret="dummy", username="user", password="pass")
+        mock_request = mocker.patch.object(session, "request", new_callable=mocker.AsyncMock,
+                                           side_effect=[record_response(make_response),
+                                                        record_response(make_response, 304)])
+        lead_object = AsyncLeadObject(session, record_cache_size=10)
+
+        async def run():
+            await lead_object.get("00Q1")
+            return await lead_object.get("00Q1")
+
+        assert asyncio.run(run()).LastName == "Weiss"
+        mock_request.assert_awaited_with("get", LEAD_PATH, headers={
+            "If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"})
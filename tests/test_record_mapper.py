@@ -0,0 +1,98 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from salesforce_mcp.objects.LeadObject import LeadObject
+from salesforce_mcp.services.SalesforceSession import SalesforceSession
+from salesforce_mcp.types.LeadRecord import LeadRecord
+from salesforce_mcp.types.OpportunityRecord import OpportunityRecord
+from salesforce_mcp.types.SFRecord import SFRecord
+from salesforce_mcp.utils.dataClassMapper import dict_to_dataclass, mapper_for
+
+
+@dataclass
+class InvoiceRecord(SFRecord):
+    Id: Optional[str] = None
+    IssuedOn: Optional[date] = None
+    PaidAt: Optional[datetime] = None
+    Total: Optional[float] = None
+    Reference: Optional[str] = field(default=None, metadata={"sf_name": "Reference__c"})
+
+
+class TestRecordMapper:
+    def test_custom_fields_kept_and_other_unknown_keys_dropped(self):
+        record = dict_to_dataclass({
+            "attributes": {"type": "Lead", "url": "/services/data/v61.0/sobjects/Lead/00Q5g00000AbCdEFGH"},
+            "Id": "00Q5g00000AbCdEFGH",
+            "LastName": "Lovelace",
+            "Region__c": "EMEA",
+            "CreatedDate": "2026-01-31T09:30:00.000+0000",
+            "IsDeleted": False,
+        }, LeadRecord)
+
+        assert record.Id == "00Q5g00000AbCdEFGH"
+        assert record.LastName == "Lovelace"
+        assert record.custom_fields == {"Region__c": "EMEA"}
+
+    def test_bulk_strings_converted(self):
+        record = dict_to_dataclass({
+            "Amount": "1250.5",
+            "FiscalYear": "2026",
+            "IsClosed": "false",
+            "IsWon": "",
+            "Probability": "n/a",
+        }, OpportunityRecord)
+
+        assert record.Amount == 1250.5
+        assert record.FiscalYear == 2026
+        assert record.IsClosed is False
+        assert record.IsWon is None
+        # unparseable values are kept as they came
+        assert record.Probability == "n/a"
+
+    def test_dates_and_renamed_fields(self):
+        record = dict_to_dataclass({
+            "IssuedOn": "2026-01-31",
+            "PaidAt": "2026-02-01T09:30:00.000+0000",
+            "Total": 12,
+            "Reference__c": "INV-7",
+        }, InvoiceRecord)
+
+        assert record.IssuedOn == date(2026, 1, 31)
+        assert record.PaidAt == datetime(2026, 2, 1, 9, 30, tzinfo=timezone.utc)
+        assert record.Total == 12.0 and isinstance(record.Total, float)
+        assert record.Reference == "INV-7"
+        assert record.custom_fields == {}
+
+    def test_encode(self):
+        record = InvoiceRecord(Id="a01", Reference="INV-7", custom_fields={"Notes__c": "late"})
+
+        assert record.to_salesforce_payload() == {"Id": "a01", "Reference__c": "INV-7", "Notes__c": "late"}
+
+    def test_mapper_cached(self):
+        assert mapper_for(LeadRecord) is mapper_for(LeadRecord)
+        assert mapper_for(LeadRecord) is not mapper_for(OpportunityRecord)
+
+
+class TestLeadGet:
+    def setup_method(self):
+        self.session = SalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass")
+
+    def test_get_with_attributes(self, mocker):
+        mocker.patch.object(self.session, "get", return_value={
+            "attributes": {"type": "Lead", "url": "/services/data/v61.0/sobjects/Lead/00Q5g00000AbCdEFGH"},
+            "Id": "00Q5g00000AbCdEFGH",
+            "LastName": "Lovelace",
+            "AnnualRevenue": 1000000,
+        })
+
+        record = LeadObject(self.session).get("00Q5g00000AbCdEFGH")
+
+        assert record.LastName == "Lovelace"
+        assert record.AnnualRevenue == 1000000.0
+        assert record.custom_fields == {}
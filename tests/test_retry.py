@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+from salesforce_mcp.services.SalesforceSession import SalesforceSession
+from salesforce_mcp.utils.limits import ApiUsageLimiter, parse_limit_info
+from salesforce_mcp.utils.retry import RetryPolicy
+
+URL = "https://bigthink.my.salesforce.com/services/data/v61.0/sobjects/Lead/00Q1"
+
+
+def limit_exceeded(make_response, message):
+    return make_response(403, [{"errorCode": "REQUEST_LIMIT_EXCEEDED", "message": message}])
+
+
+class TestRetry:
+    def setup_method(self):
+        self.session = SalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass")
+
+    def test_get_retried_on_503(self, mocker, make_response):
+        sleep = mocker.patch("salesforce_mcp.services.SalesforceSession.time.sleep")
+        ok = make_response(200, {"Id": "00Q1"})
+        mock_send = mocker.patch.object(self.session, "_send_authenticated",
+                                        side_effect=[make_response(503), ok])
+
+        assert self.session._request("get", URL) is ok
+        assert mock_send.call_count == 2
+        sleep.assert_called_once()
+
+    def test_retry_after_is_honoured(self, mocker, make_response):
+        sleep = mocker.patch("salesforce_mcp.services.SalesforceSession.time.sleep")
+        mocker.patch.object(self.session, "_send_authenticated",
+                            side_effect=[make_response(503, headers={"Retry-After": "2"}),
+                                         make_response(200)])
+
+        self.session._request("get", URL)
+
+        sleep.assert_called_once_with(2.0)
+
+    def test_gives_up_after_max_attempts(self, mocker, make_response):
+        mocker.patch("salesforce_mcp.services.SalesforceSession.time.sleep")
+        mock_send = mocker.patch.object(self.session, "_send_authenticated", return_value=make_response(503))
+
+        with pytest.raises(requests.HTTPError):
+            self.session._request("delete", URL)
+        assert mock_send.call_count == RetryPolicy().max_attempts
+
+    def test_post_not_retried_on_503(self, mocker, make_response):
+        mock_send = mocker.patch.object(self.session, "_send_authenticated", return_value=make_response(503))
+
+        with pytest.raises(requests.HTTPError):
+            self.session._request("post", URL)
+        mock_send.assert_called_once()
+
+    def test_post_retried_when_rejected_by_concurrent_limit(self, mocker, make_response):
+        mocker.patch("salesforce_mcp.services.SalesforceSession.time.sleep")
+        mock_send = mocker.patch.object(
+            self.session, "_send_authenticated",
+            side_effect=[limit_exceeded(make_response, "ConcurrentPerOrgLongTxn Limit exceeded"), make_response(201)])
+
+        self.session._request("post", URL)
+
+        assert mock_send.call_count == 2
+
+    def test_daily_limit_is_not_retried(self, mocker, make_response):
+        mock_send = mocker.patch.object(self.session, "_send_authenticated",
+                                        return_value=limit_exceeded(make_response, "TotalRequests Limit exceeded."))
+
+        with pytest.raises(requests.HTTPError):
+            self.session._request("get", URL)
+        mock_send.assert_called_once()
+
+    def test_connection_errors(self, mocker, make_response):
+        mocker.patch("salesforce_mcp.services.SalesforceSession.time.sleep")
+        reset = requests.ConnectionError(ConnectionResetError("reset"))
+        refused = requests.ConnectionError(MaxRetryError(None, URL, NewConnectionError(None, "refused")))
+
+        mock_send = mocker.patch.object(self.session, "_send_authenticated", side_effect=[reset, make_response(200)])
+        self.session._request("patch", URL)
+        assert mock_send.call_count == 2
+
+        mock_send = mocker.patch.object(self.session, "_send_authenticated", side_effect=[reset])
+        with pytest.raises(requests.ConnectionError):
+            self.session._request("post", URL)
+
+        mock_send = mocker.patch.object(self.session, "_send_authenticated", side_effect=[refused, make_response(201)])
+        self.session._request("post", URL)
+        assert mock_send.call_count == 2
+
+    def test_async_post_retried_on_connect_error(self, mocker, make_response):
+        session = AsyncSalesforceSession(domain="bigthink.my.salesforce.com", client_id="dummy",
+                                         client_secret="dummy", username="user", password="pass",
+                                         retry_policy=RetryPolicy(base_delay=0))
+        ok = make_response(201)
+        mock_send = mocker.patch.object(session, "_send_authenticated", new_callable=mocker.AsyncMock,
+                                        side_effect=[httpx.ConnectError("refused"), ok])
+
+        assert asyncio.run(session._request("post", URL)) is ok
+        assert mock_send.await_count == 2
+
+
+class TestApiUsageLimiter:
+    def test_parse_limit_info(self):
+        assert parse_limit_info("api-usage=18/5000") == (18, 5000)
+        assert parse_limit_info("per-app-api-usage=1/10(appName=x), api-usage=2/10") == (2, 10)
+        assert parse_limit_info(None) is None
+
+    def test_concurrency_follows_usage(self):
+        limiter = ApiUsageLimiter(max_concurrency=10, soft_limit=0.8, hard_limit=0.9)
+        limiter.observe({"Sforce-Limit-Info": "api-usage=100/1000"})
+        assert limiter.concurrency == 10
+        limiter.observe({"Sforce-Limit-Info": "api-usage=850/1000"})
+        assert 1 < limiter.concurrency < 10
+        limiter.observe({"Sforce-Limit-Info": "api-usage=950/1000"})
+        assert limiter.concurrency == 1
+
+    def test_slots_are_limited(self):
+        limiter = ApiUsageLimiter(max_concurrency=2)
+        limiter.observe({"Sforce-Limit-Info": "api-usage=999/1000"})
+        limiter.hard_interval = 0
+        peak = []
+        lock = threading.Lock()
+
+        def work():
+            with limiter.slot():
+                with lock:
+                    peak.append(limiter.in_flight)
+                time.sleep(0.01)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert max(peak) == 1
+
+    def test_pacing_past_hard_limit(self, mocker):
+        sleep = mocker.patch("salesforce_mcp.utils.limits.time.sleep")
+        limiter = ApiUsageLimiter(hard_interval=1.0)
+        limiter.observe({"Sforce-Limit-Info": "api-usage=990/1000"})
+
+        with limiter.slot():
+            pass
+        with limiter.slot():
+            pass
+
+        sleep.assert_called_once()
+        assert 0 < sleep.call_args.args[0] <= 1.0
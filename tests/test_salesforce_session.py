@@ -134,3 +134,85 @@ class TestSalesforceSession:
         called_patch_url = self.session.session.patch.call_args[0][0]
         assert "https://bigthink.my.salesforce.com/sobject/lead/mock_id" in called_patch_url
 
+    def test_token_is_cached_between_calls(self, mocker):
+        mock_token_response = mocker.Mock()
+        mock_token_response.status_code = 200
+        mock_token_response.json.return_value = {"access_token": "fake-token"}
+        mock_post = mocker.patch.object(self.session.session, "post", return_value=mock_token_response)
+
+        mock_get_response = mocker.Mock()
+        mock_get_response.status_code = 200
+        mock_get_response.json.return_value = {"mock_field": "mock_response"}
+        mock_get = mocker.patch.object(self.session.session, "get", return_value=mock_get_response)
+
+        self.session.get("sobject/lead/1")
+        self.session.get("sobject/lead/2")
+
+        assert mock_post.call_count == 1
+        assert mock_get.call_count == 2
+        assert mock_get.call_args[1]["headers"]["Authorization"] == "Bearer fake-token"
+
+    def test_token_refreshed_before_expiry(self, mocker):
+        first = mocker.Mock()
+        first.status_code = 200
+        first.json.return_value = {"access_token": "token-1", "expires_in": 120}
+        second = mocker.Mock()
+        second.status_code = 200
+        second.json.return_value = {"access_token": "token-2", "expires_in": 120}
+        mocker.patch.object(self.session.session, "post", side_effect=[first, second])
+        monotonic = mocker.patch("salesforce_mcp.services.SalesforceSession.time.monotonic", return_value=1000.0)
+
+        assert self.session.get_token() == "token-1"
+        # still outside the refresh margin
+        monotonic.return_value = 1050.0
+        assert self.session.get_token() == "token-1"
+        # within refresh_margin (60s) of expiry
+        monotonic.return_value = 1070.0
+        assert self.session.get_token() == "token-2"
+
+    def test_retries_once_on_invalid_session(self, mocker):
+        first = mocker.Mock()
+        first.status_code = 200
+        first.json.return_value = {"access_token": "stale-token"}
+        second = mocker.Mock()
+        second.status_code = 200
+        second.json.return_value = {"access_token": "fresh-token"}
+        mock_post = mocker.patch.object(self.session.session, "post", side_effect=[first, second])
+
+        expired_response = mocker.Mock()
+        expired_response.status_code = 401
+        expired_response.json.return_value = [{"message": "Session expired or invalid", "errorCode": "INVALID_SESSION_ID"}]
+        ok_response = mocker.Mock()
+        ok_response.status_code = 200
+        ok_response.json.return_value = {"Id": "mock_id"}
+        mock_get = mocker.patch.object(self.session.session, "get", side_effect=[expired_response, ok_response])
+
+        result = self.session.get("sobject/lead/mock_id")
+
+        assert result["Id"] == "mock_id"
+        assert mock_post.call_count == 2
+        assert mock_get.call_count == 2
+        assert mock_get.call_args[1]["headers"]["Authorization"] == "Bearer fresh-token"
+
+    def test_concurrent_callers_share_one_refresh(self, mocker):
+        import threading
+        import time
+
+        mock_token_response = mocker.Mock()
+        mock_token_response.status_code = 200
+        mock_token_response.json.return_value = {"access_token": "fake-token"}
+
+        def slow_post(*args, **kwargs):
+            time.sleep(0.05)
+            return mock_token_response
+
+        mock_post = mocker.patch.object(self.session.session, "post", side_effect=slow_post)
+        tokens = []
+        threads = [threading.Thread(target=lambda: tokens.append(self.session.get_token())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert mock_post.call_count == 1
+        assert tokens == ["fake-token"] * 8
@@ -0,0 +1,46 @@
+from salesforce_mcp.services.SessionRegistry import SessionRegistry
+from salesforce_mcp.utils.credentials import Credentials
+import pytest
+
+
+class TestSessionRegistry:
+    def setup_method(self):
+        self.registry = SessionRegistry(pool_connections=2, pool_maxsize=4)
+        self.credentials = Credentials(
+            url="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass")
+
+    def test_same_credentials_share_session(self):
+        first = self.registry.get(self.credentials)
+        second = self.registry.get(Credentials(**vars(self.credentials)))
+        assert first is second
+
+    def test_different_credentials_get_own_session(self):
+        other = Credentials(
+            url="bigthink--devbox.sandbox.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass")
+        assert self.registry.get(self.credentials) is not self.registry.get(other)
+
+    def test_pool_size_applied_to_adapter(self):
+        session = self.registry.get(self.credentials)
+        adapter = session.session.get_adapter("https://bigthink.my.salesforce.com/")
+        assert adapter._pool_connections == 2
+        assert adapter._pool_maxsize == 4
+
+    def test_warm_authenticates_once(self, mocker):
+        mock_token_response = mocker.Mock()
+        mock_token_response.status_code = 200
+        mock_token_response.json.return_value = {"access_token": "fake-token"}
+        session = self.registry.get(self.credentials)
+        mock_post = mocker.patch.object(session.session, "post", return_value=mock_token_response)
+
+        self.registry.get(self.credentials, warm=True)
+        self.registry.get(self.credentials, warm=True)
+
+        assert mock_post.call_count == 1
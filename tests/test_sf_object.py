@@ -90,7 +90,76 @@ class TestSfObject:
         mock_post.assert_called_once()
         mock_delete.assert_called_once()
 
+    def test_async_get(self, mocker):
+        import asyncio
+        from salesforce_mcp.objects.LeadObject import AsyncLeadObject
+        from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+
+        session = AsyncSalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass")
+        mock_get = mocker.patch.object(session, "get", new_callable=mocker.AsyncMock,
+                                       return_value={"Id": "mock_id", "LastName": "Weiss", "Company": "Test Company"})
+
+        result = asyncio.run(AsyncLeadObject(session).get("mock_id"))
 
-
-
-
+        assert isinstance(result, LeadRecord)
+        assert result.Id == "mock_id"
+        mock_get.assert_awaited_once_with("services/data/v61.0/sobjects/Lead/mock_id")
+
+    def test_create_many_chunks_at_200(self, mocker):
+        def respond(method, path, json=None, **kwargs):
+            response = mocker.Mock()
+            response.json.return_value = [{"id": f"00Q{i}", "success": True, "errors": []} for i in range(len(json["records"]))]
+            return response
+
+        mock_request = mocker.patch.object(self.session, "request", side_effect=respond)
+
+        records = [LeadRecord(LastName=f"Weiss {i}", Company="Test Company") for i in range(450)]
+        results = self.lead_object.create_many(records, all_or_none=True)
+
+        assert len(results) == 450
+        assert all(result.success for result in results)
+        assert mock_request.call_count == 3
+        method, path = mock_request.call_args_list[0].args
+        body = mock_request.call_args_list[0].kwargs["json"]
+        assert (method, path) == ("post", "services/data/v61.0/composite/sobjects")
+        assert body["allOrNone"] is True
+        assert len(body["records"]) == 200
+        assert body["records"][0]["attributes"] == {"type": "Lead"}
+        assert len(mock_request.call_args_list[2].kwargs["json"]["records"]) == 50
+
+    def test_delete_many_maps_errors(self, mocker):
+        response = mocker.Mock()
+        response.json.return_value = [
+            {"id": "00Q1", "success": True, "errors": []},
+            {"id": None, "success": False, "errors": [{"statusCode": "ENTITY_IS_DELETED"}]},
+        ]
+        mock_request = mocker.patch.object(self.session, "request", return_value=response)
+
+        results = self.lead_object.delete_many(["00Q1", "00Q2"])
+
+        assert results[0].Id == "00Q1" and results[0].success
+        assert not results[1].success
+        assert results[1].errors[0]["statusCode"] == "ENTITY_IS_DELETED"
+        mock_request.assert_called_once_with("delete", "services/data/v61.0/composite/sobjects",
+                                             params={"ids": "00Q1,00Q2", "allOrNone": "false"})
+
+    def test_get_many(self, mocker):
+        response = mocker.Mock()
+        response.json.return_value = [
+            {"attributes": {"type": "Lead"}, "Id": "00Q1", "LastName": "Weiss", "Company": "Test Company"},
+            None,
+        ]
+        mock_request = mocker.patch.object(self.session, "request", return_value=response)
+
+        results = self.lead_object.get_many(["00Q1", "00Q2"], fields=["Id", "LastName", "Company"])
+
+        assert isinstance(results[0], LeadRecord)
+        assert results[0].LastName == "Weiss"
+        assert results[1] is None
+        mock_request.assert_called_once_with("get", "services/data/v61.0/composite/sobjects/Lead",
+                                             params={"ids": "00Q1,00Q2", "fields": "Id,LastName,Company"})
@@ -0,0 +1,268 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import pickle
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+
+from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+from salesforce_mcp.services.SalesforceSession import SalesforceSession
+from salesforce_mcp.types.LeadRecord import LeadRecord, SlottedLeadRecord
+from salesforce_mcp.utils.shared_state import SharedQueryCache, SharedStateStore, credentials_key
+from salesforce_mcp.utils.soql import SoqlResult
+
+LEAD_DESCRIBE = {"name": "Lead", "fields": [{"name": "LastName", "type": "string", "createable": True}]}
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Exploit:
+    def __reduce__(self):
+        return print, ("unpickled",)
+
+
+def _store_token_in_child(store: SharedStateStore) -> None:
+    store.store_token("key", "child-token", time.time() + 900)
+
+
+def _free_ports(count: int) -> int:
+    while True:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            first = sock.getsockname()[1]
+        try:
+            for port in range(first, first + count):
+                with socket.socket() as sock:
+                    sock.bind(("127.0.0.1", port))
+            return first
+        except OSError:
+            continue
+
+
+class TestSharedState:
+    def setup_method(self):
+        self.store = None
+
+    def make_session(self, tmp_path, session_cls=SalesforceSession, **kwargs):
+        if self.store is None:
+            self.store = SharedStateStore(str(tmp_path / "state.sqlite"))
+        return session_cls(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass",
+            shared_state=self.store,
+            **kwargs)
+
+    def token_response(self, mocker, token="fake-token"):
+        response = mocker.Mock(status_code=200)
+        response.json.return_value = {"access_token": token, "expires_in": 900}
+        return response
+
+    def test_store_is_private(self, tmp_path):
+        SharedStateStore(str(tmp_path / "state" / "state.sqlite"))
+        assert (tmp_path / "state" / "state.sqlite").stat().st_mode & 0o777 == 0o600
+
+    def test_workers_share_one_token(self, mocker, tmp_path):
+        first = self.make_session(tmp_path)
+        second = self.make_session(tmp_path)
+        mock_post = mocker.patch.object(first.session, "post", return_value=self.token_response(mocker))
+        second_post = mocker.patch.object(second.session, "post")
+
+        assert first.get_token() == "fake-token"
+        assert second.get_token() == "fake-token"
+
+        mock_post.assert_called_once()
+        second_post.assert_not_called()
+
+    def test_async_session_adopts_shared_token(self, mocker, tmp_path):
+        first = self.make_session(tmp_path)
+        mocker.patch.object(first.session, "post", return_value=self.token_response(mocker))
+        first.get_token()
+        second = self.make_session(tmp_path, AsyncSalesforceSession)
+        mock_post = mocker.patch.object(second.client, "post", new_callable=mocker.AsyncMock)
+
+        assert asyncio.run(second.get_token()) == "fake-token"
+        mock_post.assert_not_awaited()
+
+    def test_rejected_token_is_dropped_for_every_worker(self, mocker, tmp_path):
+        first = self.make_session(tmp_path)
+        second = self.make_session(tmp_path)
+        mocker.patch.object(first.session, "post", return_value=self.token_response(mocker))
+        mocker.patch.object(second.session, "post", return_value=self.token_response(mocker, "token-2"))
+        first.get_token()
+
+        first.invalidate_token("fake-token")
+
+        assert self.store.load_token(credentials_key(first)) is None
+        assert second.get_token() == "token-2"
+        assert first.get_token() == "token-2"
+
+    def test_async_reauthentication_keeps_sqlite_off_the_loop(self, mocker, tmp_path):
+        session = self.make_session(tmp_path, AsyncSalesforceSession)
+        token_responses = []
+        for token in ("stale-token", "fresh-token"):
+            response = mocker.Mock(status_code=200)
+            response.json.return_value = {"access_token": token, "expires_in": 900}
+            token_responses.append(response)
+        mocker.patch.object(session.client, "post", new_callable=mocker.AsyncMock, side_effect=token_responses)
+        expired_response = mocker.Mock(status_code=401)
+        expired_response.json.return_value = [{"message": "Session expired or invalid", "errorCode": "INVALID_SESSION_ID"}]
+        ok_response = mocker.Mock(status_code=200, headers={})
+        ok_response.json.return_value = {"Id": "00Q1"}
+        mocker.patch.object(session.client, "get", new_callable=mocker.AsyncMock,
+                            side_effect=[expired_response, ok_response])
+        connection = SharedStateStore.connection
+        threads = []
+
+        def tracked_connection(store):
+            threads.append(threading.current_thread())
+            return connection.fget(store)
+
+        mocker.patch.object(SharedStateStore, "connection", property(tracked_connection))
+
+        assert asyncio.run(session.get("sobjects/Lead/00Q1")) == {"Id": "00Q1"}
+        assert threads
+        assert threading.main_thread() not in threads
+        assert self.store.load_token(credentials_key(session))[0] == "fresh-token"
+
+    def test_refresh_lease_is_exclusive(self, tmp_path, mocker):
+        store = SharedStateStore(str(tmp_path / "state.sqlite"))
+        clock = mocker.patch("salesforce_mcp.utils.shared_state.time.time", return_value=1000.0)
+
+        assert store.claim_token_refresh("org", lease=30)
+        assert not store.claim_token_refresh("org", lease=30)
+        # a worker that died holding the lease does not block the others for ever
+        clock.return_value = 1031.0
+        assert store.claim_token_refresh("org", lease=30)
+        store.release_token_refresh("org")
+        assert store.claim_token_refresh("org", lease=30)
+
+    def test_query_results_are_shared_and_invalidated(self, tmp_path):
+        store = SharedStateStore(str(tmp_path / "state.sqlite"))
+        first = SharedQueryCache(store, "org-a")
+        second = SharedQueryCache(store, "org-a")
+        other_org = SharedQueryCache(store, "org-b")
+        first.put("q", {"records": [1]}, frozenset({"lead"}))
+        other_org.put("q", {"records": [2]}, frozenset({"lead"}))
+
+        assert second.get("q") == {"records": [1]}
+        assert second.invalidate_object("Lead") == 1
+        assert first.get("q") is None
+        assert other_org.get("q") == {"records": [2]}
+        assert first.stats()["misses"] == 1
+
+    def test_oldest_query_results_are_evicted(self, tmp_path):
+        store = SharedStateStore(str(tmp_path / "state.sqlite"))
+        cache = SharedQueryCache(store, "org", max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.put(key, key, frozenset({"lead"}))
+
+        assert cache.get("a") is None
+        assert cache.get("c") == "c"
+        assert cache.stats()["entries"] == 2
+        assert cache.stats()["evictions"] == 1
+
+    def test_query_results_are_stored_as_json(self, tmp_path):
+        store = SharedStateStore(str(tmp_path / "state.sqlite"))
+        cache = SharedQueryCache(store, "org")
+        records = [LeadRecord(LastName="Doe", Company="Big Think", custom_fields={"Score__c": 3}),
+                   SlottedLeadRecord(LastName="Roe", Company="Acme")]
+        result = SoqlResult(totalSize=2, done=True, records=records)
+        cache.put("q", result, frozenset({"lead"}))
+        cache.put("dates", {"day": date(2026, 1, 31), "at": datetime(2026, 1, 31, 9, 30, tzinfo=timezone.utc)},
+                  frozenset({"lead"}))
+
+        cached = SharedQueryCache(store, "org").get("q")
+        assert cached == result
+        assert [type(record) for record in cached.records] == [LeadRecord, SlottedLeadRecord]
+        assert cache.get("dates") == {"day": date(2026, 1, 31), "at": datetime(2026, 1, 31, 9, 30, tzinfo=timezone.utc)}
+        json.loads(store.load_query(cache._key("q"), time.time()))
+
+    def test_unreadable_results_are_misses_and_never_run(self, tmp_path, capsys):
+        store = SharedStateStore(str(tmp_path / "state.sqlite"))
+        cache = SharedQueryCache(store, "org")
+        stored = {
+            "pickled": pickle.dumps(Exploit()),
+            "not_a_dataclass": json.dumps({"__dataclass__": "os:system", "fields": {}}),
+            "not_imported": json.dumps({"__dataclass__": "no_such_module:Record", "fields": {}}),
+            "wrong_fields": json.dumps({"__dataclass__": f"{LeadRecord.__module__}:LeadRecord", "fields": {"x": 1}}),
+        }
+        for key, value in stored.items():
+            store.store_query(cache._key(key), value, frozenset(), len(value), time.time() + 60, 10, 1 << 20)
+
+        assert [cache.get(key) for key in stored] == [None] * len(stored)
+        assert cache.stats()["misses"] == len(stored)
+        assert "unpickled" not in capsys.readouterr().out
+
+    def test_results_of_local_classes_are_not_cached(self, tmp_path):
+        @dataclass
+        class LocalRecord:
+            Id: str
+
+        cache = SharedQueryCache(SharedStateStore(str(tmp_path / "state.sqlite")), "org")
+        cache.put("q", [LocalRecord("001")], frozenset())
+
+        assert cache.stats()["entries"] == 0
+
+    def test_store_is_handed_to_forkserver_workers(self, tmp_path):
+        store = SharedStateStore(str(tmp_path / "state.sqlite"))
+        store.load_token("key")
+        child = multiprocessing.get_context("forkserver").Process(target=_store_token_in_child, args=(store,))
+        child.start()
+        child.join(30)
+
+        assert child.exitcode == 0
+        assert store.load_token("key")[0] == "child-token"
+
+    def test_worker_mode_starts_under_forkserver(self, tmp_path):
+        # forkserver is the default start method on Linux from Python 3.14
+        port, metrics_port = _free_ports(1), _free_ports(2)
+        env = dict(os.environ, PYTHONPATH=os.path.join(REPO_ROOT, "src"), URL="bigthink.my.salesforce.com",
+                   CLIENT_ID="id", CLIENT_SECRET="secret", USERNAME="user", PASSWORD="pass",
+                   SF_MCP_TRANSPORT="http", SF_MCP_PORT=str(port), SF_MCP_WORKERS="2",
+                   SF_METRICS_PORT=str(metrics_port), SF_LIMITS_SAMPLE_INTERVAL="0",
+                   SF_SHARED_STATE_PATH=str(tmp_path / "state.sqlite"), SF_DESCRIBE_CACHE_DIR=str(tmp_path))
+        script = ("import multiprocessing; multiprocessing.set_start_method('forkserver'); import main; "
+                  "main.run_server(log_level='warning', show_banner=False)")
+        server = subprocess.Popen([sys.executable, "-c", script], cwd=REPO_ROOT, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        try:
+            deadline = time.monotonic() + 60
+            serving = set()
+            while serving != {0, 1} and server.poll() is None and time.monotonic() < deadline:
+                for worker in {0, 1} - serving:
+                    try:
+                        with urllib.request.urlopen(f"http://127.0.0.1:{metrics_port + worker}/metrics", timeout=1):
+                            serving.add(worker)
+                    except OSError:
+                        time.sleep(0.1)
+            assert serving == {0, 1}, server.stderr.read().decode() if server.poll() is not None else serving
+            socket.create_connection(("127.0.0.1", port), timeout=5).close()
+        finally:
+            server.terminate()
+            server.wait(30)
+
+    def test_session_uses_shared_query_cache(self, tmp_path):
+        session = self.make_session(tmp_path, query_cache_ttl=60)
+        assert isinstance(session.query_cache, SharedQueryCache)
+
+    def test_describe_fetched_by_one_worker_is_used_by_the_others(self, mocker, tmp_path):
+        first = self.make_session(tmp_path)
+        second = self.make_session(tmp_path)
+        response = mocker.Mock(status_code=200, headers={"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        response.json.return_value = LEAD_DESCRIBE
+        mocker.patch.object(first, "request", return_value=response)
+        mock_request = mocker.patch.object(second, "request")
+
+        first.describe_cache.describe("Lead")
+
+        assert second.describe_cache.describe("Lead") == LEAD_DESCRIBE
+        mock_request.assert_not_called()
@@ -1,6 +1,7 @@
 from salesforce_mcp.services.SalesforceSession import SalesforceSession
 from salesforce_mcp.utils.soql import SoqlModule
 from dataclasses import dataclass
+import json
 import pytest
 
 @dataclass()
@@ -81,3 +82,272 @@ class TestSoql:
         self.session.session.get.asset_called_once()
         assert len(soql_result.records) >= 1
         assert soql_result.records[0]["Id"] == "112ss"
+
+    def test_async_execute_soql(self, mocker):
+        import asyncio
+        from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+        from salesforce_mcp.utils.soql import AsyncSoqlModule
+
+        session = AsyncSalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass"
+        )
+        mocker.patch.object(session, "get", new_callable=mocker.AsyncMock, return_value={
+            "totalSize": 1,
+            "records": [{"Id": "112ss", "Company": "Dummy", "LastName": "bar"}]
+        })
+
+        soql_result = asyncio.run(AsyncSoqlModule(session).execute_soql("SELECT Id, Company, LastName FROM Lead", Lead))
+
+        assert soql_result.totalSize == 1
+        assert soql_result.records[0].Id == "112ss"
+        assert "query?q=SELECT+Id" in session.get.call_args[0][0]
+
+    def _pages(self):
+        return [
+            {"totalSize": 5, "done": False, "nextRecordsUrl": "/services/data/v61.0/query/01gxx-2",
+             "records": [{"Id": "1", "Company": "A", "LastName": "a"}, {"Id": "2", "Company": "B", "LastName": "b"}]},
+            {"totalSize": 5, "done": False, "nextRecordsUrl": "/services/data/v61.0/query/01gxx-4",
+             "records": [{"Id": "3", "Company": "C", "LastName": "c"}, {"Id": "4", "Company": "D", "LastName": "d"}]},
+            {"totalSize": 5, "done": True,
+             "records": [{"Id": "5", "Company": "E", "LastName": "e"}]},
+        ]
+
+    def test_iter_soql_follows_next_records_url(self, mocker):
+        mock_get = mocker.patch.object(self.session, "get", side_effect=self._pages())
+
+        records = list(self.soql_instance.iter_soql("SELECT Id, Company, LastName FROM Lead", Lead))
+
+        assert [record.Id for record in records] == ["1", "2", "3", "4", "5"]
+        assert mock_get.call_count == 3
+        assert mock_get.call_args_list[1][0][0] == "services/data/v61.0/query/01gxx-2"
+
+    def test_iter_soql_is_lazy_and_capped(self, mocker):
+        mock_get = mocker.patch.object(self.session, "get", side_effect=self._pages())
+
+        records = list(self.soql_instance.iter_soql("SELECT Id FROM Lead", max_records=2))
+        assert [record["Id"] for record in records] == ["1", "2"]
+        # the second page is never requested
+        assert mock_get.call_count == 1
+
+    def test_execute_soql_fetch_all(self, mocker):
+        mocker.patch.object(self.session, "get", side_effect=self._pages())
+
+        soql_result = self.soql_instance.execute_soql("SELECT Id FROM Lead", fetch_all=True)
+
+        assert [record["Id"] for record in soql_result.records] == ["1", "2", "3", "4", "5"]
+        assert soql_result.done is True
+        assert soql_result.totalSize == 5
+
+    def test_execute_soql_fetch_all_max_pages(self, mocker):
+        mocker.patch.object(self.session, "get", side_effect=self._pages())
+
+        soql_result = self.soql_instance.execute_soql("SELECT Id FROM Lead", fetch_all=True, max_pages=2, max_records=3)
+
+        assert [record["Id"] for record in soql_result.records] == ["1", "2", "3"]
+        assert soql_result.done is False
+        assert soql_result.nextRecordsUrl == "/services/data/v61.0/query/01gxx-4"
+
+    def _pages_by_path(self):
+        pages = self._pages()
+        return {
+            "services/data/v61.0/query?q=SELECT+Id+FROM+Lead": pages[0],
+            "services/data/v61.0/query/01gxx-2": pages[1],
+            "services/data/v61.0/query/01gxx-4": pages[2],
+        }
+
+    def test_iter_soql_prefetch_keeps_order(self, mocker):
+        pages = self._pages_by_path()
+        mocker.patch.object(self.session, "get", side_effect=lambda path: pages[path])
+        soql = SoqlModule(self.session, prefetch=2)
+
+        records = list(soql.iter_soql("SELECT Id FROM Lead"))
+
+        assert [record["Id"] for record in records] == ["1", "2", "3", "4", "5"]
+
+    def test_iter_soql_parallel_pages_uses_locator_offsets(self, mocker):
+        pages = self._pages_by_path()
+        mock_get = mocker.patch.object(self.session, "get", side_effect=lambda path: pages[path])
+        soql = SoqlModule(self.session, parallel_pages=2)
+
+        records = list(soql.iter_soql("SELECT Id FROM Lead"))
+
+        assert [record["Id"] for record in records] == ["1", "2", "3", "4", "5"]
+        assert sorted(call[0][0] for call in mock_get.call_args_list) == sorted(pages)
+
+    def test_async_iter_soql_parallel_pages(self, mocker):
+        import asyncio
+        from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+        from salesforce_mcp.utils.soql import AsyncSoqlModule
+
+        session = AsyncSalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass"
+        )
+        pages = self._pages_by_path()
+
+        async def get(path):
+            return pages[path]
+
+        mocker.patch.object(session, "get", side_effect=get)
+
+        async def run(soql):
+            return [record["Id"] async for record in soql.iter_soql("SELECT Id FROM Lead")]
+
+        assert asyncio.run(run(AsyncSoqlModule(session, parallel_pages=2))) == ["1", "2", "3", "4", "5"]
+        assert asyncio.run(run(AsyncSoqlModule(session, prefetch=1))) == ["1", "2", "3", "4", "5"]
+
+    def test_async_parallel_pages_bounds_concurrent_fetches(self, mocker):
+        import asyncio
+        from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+        from salesforce_mcp.utils.soql import AsyncSoqlModule
+
+        session = AsyncSalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass"
+        )
+        in_flight = []
+        peak = []
+
+        async def get(path):
+            offset = int(path.rsplit("-", 1)[1]) if path.startswith("services/data/v61.0/query/") else 0
+            in_flight.append(path)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(path)
+            return {"totalSize": 20, "done": offset + 2 >= 20,
+                    "nextRecordsUrl": "/services/data/v61.0/query/01gxx-2",
+                    "records": [{"Id": str(offset + 1)}, {"Id": str(offset + 2)}]}
+
+        mocker.patch.object(session, "get", side_effect=get)
+
+        async def run(soql):
+            return [record["Id"] async for record in soql.iter_soql("SELECT Id FROM Lead")]
+
+        assert asyncio.run(run(AsyncSoqlModule(session, parallel_pages=2, prefetch=3))) == \
+            [str(n) for n in range(1, 21)]
+        assert max(peak) == 2
+
+    def test_async_execute_soql_max_records_stops_background_fetches(self, mocker):
+        import asyncio
+        from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+        from salesforce_mcp.utils.soql import AsyncSoqlModule
+
+        session = AsyncSalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass"
+        )
+        pages = self._pages_by_path()
+
+        async def get(path):
+            if path != "services/data/v61.0/query?q=SELECT+Id+FROM+Lead":
+                # later pages never arrive
+                await asyncio.Event().wait()
+            return pages[path]
+
+        mocker.patch.object(session, "get", side_effect=get)
+
+        async def run(soql):
+            result = await soql.execute_soql("SELECT Id FROM Lead", fetch_all=True, max_records=2, cache=False)
+            return result, [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+        for soql in (AsyncSoqlModule(session, parallel_pages=2), AsyncSoqlModule(session, prefetch=2)):
+            result, pending = asyncio.run(run(soql))
+            assert [record["Id"] for record in result.records] == ["1", "2"]
+            assert pending == []
+
+    def _streamed_responses(self, mocker, chunk_size=7):
+        responses = []
+        for page in self._pages():
+            body = json.dumps(page).encode()
+            response = mocker.Mock()
+            response.iter_content.return_value = [body[start:start + chunk_size] for start in range(0, len(body), chunk_size)]
+            responses.append(response)
+        return responses
+
+    def test_iter_soql_stream(self, mocker):
+        responses = self._streamed_responses(mocker)
+        mock_request = mocker.patch.object(self.session, "request", side_effect=responses)
+        soql = SoqlModule(self.session, stream=True)
+
+        records = list(soql.iter_soql("SELECT Id, Company, LastName FROM Lead", Lead))
+
+        assert [record.Id for record in records] == ["1", "2", "3", "4", "5"]
+        assert mock_request.call_args_list[0] == mocker.call(
+            "get", "services/data/v61.0/query?q=SELECT+Id%2C+Company%2C+LastName+FROM+Lead", stream=True)
+        assert mock_request.call_args_list[1][0][1] == "services/data/v61.0/query/01gxx-2"
+        assert all(response.close.called for response in responses)
+
+    def test_iter_soql_stream_stops_early(self, mocker):
+        responses = self._streamed_responses(mocker)
+        mock_request = mocker.patch.object(self.session, "request", side_effect=responses)
+        soql = SoqlModule(self.session, stream=True)
+
+        records = list(soql.iter_soql("SELECT Id FROM Lead", max_records=1))
+
+        assert [record["Id"] for record in records] == ["1"]
+        assert mock_request.call_count == 1
+        responses[0].close.assert_called_once()
+
+    def test_execute_soql_stream(self, mocker):
+        mocker.patch.object(self.session, "request", side_effect=self._streamed_responses(mocker))
+        soql = SoqlModule(self.session, stream=True)
+
+        first_page = soql.execute_soql("SELECT Id FROM Lead")
+        assert [record["Id"] for record in first_page.records] == ["1", "2"]
+        assert first_page.done is False
+        assert first_page.nextRecordsUrl == "/services/data/v61.0/query/01gxx-2"
+
+    def test_execute_soql_stream_fetch_all(self, mocker):
+        mocker.patch.object(self.session, "request", side_effect=self._streamed_responses(mocker))
+        soql = SoqlModule(self.session, stream=True)
+
+        capped = soql.execute_soql("SELECT Id FROM Lead", fetch_all=True, max_records=3)
+        assert [record["Id"] for record in capped.records] == ["1", "2", "3"]
+        assert capped.done is False
+        assert capped.nextRecordsUrl == "/services/data/v61.0/query/01gxx-4"
+
+    def test_async_iter_soql_stream(self, mocker):
+        import asyncio
+        from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+        from salesforce_mcp.utils.soql import AsyncSoqlModule
+
+        session = AsyncSalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass"
+        )
+        bodies = iter([json.dumps(page).encode() for page in self._pages()])
+
+        async def request(method, path, stream=False):
+            body = next(bodies)
+
+            async def aiter_bytes(chunk_size):
+                for start in range(0, len(body), 5):
+                    yield body[start:start + 5]
+
+            response = mocker.Mock(aclose=mocker.AsyncMock())
+            response.aiter_bytes = aiter_bytes
+            return response
+
+        mocker.patch.object(session, "request", side_effect=request)
+
+        async def run(soql):
+            result = await soql.execute_soql("SELECT Id FROM Lead", fetch_all=True)
+            return [record["Id"] for record in result.records], result.done
+
+        assert asyncio.run(run(AsyncSoqlModule(session, stream=True))) == (["1", "2", "3", "4", "5"], True)
@@ -0,0 +1,145 @@
+import asyncio
+
+import httpx
+import requests
+
+from salesforce_mcp.services.AsyncSalesforceSession import AsyncSalesforceSession
+from salesforce_mcp.services.SalesforceSession import SalesforceSession
+from salesforce_mcp.utils.telemetry import ApiTelemetry, endpoint_template, tool_context
+
+URL = "https://bigthink.my.salesforce.com/services/data/v61.0/sobjects/Lead/00Q5g00000AbCdEFGH"
+
+
+class TestEndpointTemplate:
+    def test_record_id_replaced(self):
+        assert endpoint_template(URL) == "sobjects/Lead/{id}"
+
+    def test_query_string_dropped(self):
+        assert endpoint_template("https://x/services/data/v61.0/query?q=SELECT+Id+FROM+Lead") == "query"
+
+    def test_query_locator_replaced(self):
+        assert endpoint_template("services/data/v61.0/query/01gD0000002HU6KIAW-2000") == "query/{locator}"
+
+    def test_object_names_kept(self):
+        assert endpoint_template("services/data/v61.0/sobjects/Opportunity/describe") == "sobjects/Opportunity/describe"
+        assert endpoint_template("services/data/v61.0/composite/sobjects") == "composite/sobjects"
+
+
+class TestApiTelemetry:
+    def test_record_counts_by_tool_endpoint_and_status(self):
+        telemetry = ApiTelemetry()
+        with tool_context("run_soql"):
+            telemetry.record("get", "services/data/v61.0/query?q=x", 200)
+        telemetry.record("delete", URL, 404)
+
+        snapshot = telemetry.snapshot()
+
+        assert snapshot["window"]["calls"] == 2
+        assert snapshot["window"]["by_tool"] == {"run_soql": 1, "-": 1}
+        assert snapshot["since_start"]["by_endpoint"] == {"GET query": 1, "DELETE sobjects/Lead/{id}": 1}
+        assert snapshot["since_start"]["by_status"] == {"200": 1, "404": 1}
+
+    def test_usage_from_limit_info_header(self):
+        telemetry = ApiTelemetry()
+        telemetry.record("get", URL, 200, {"Sforce-Limit-Info": "api-usage=250/1000"})
+
+        usage = telemetry.snapshot()["api_usage"]
+
+        assert usage["used"] == 250
+        assert usage["allowed"] == 1000
+        assert usage["remaining"] == 750
+        assert usage["fraction_used"] == 0.25
+        assert usage["burn_rate_per_hour"] is None
+
+    def test_usage_from_limits_sample(self):
+        telemetry = ApiTelemetry()
+        limits = {"DailyApiRequests": {"Max": 5000, "Remaining": 4000}, "DailyBulkV2QueryJobs": {"Max": 10000, "Remaining": 10000}}
+        telemetry.record_limits(limits)
+
+        snapshot = telemetry.snapshot()
+
+        assert snapshot["api_usage"]["used"] == 1000
+        assert snapshot["api_usage"]["remaining"] == 4000
+        assert snapshot["limits"] == limits
+
+    def test_burn_rate_and_exhaustion(self, mocker):
+        clock = mocker.patch("salesforce_mcp.utils.telemetry.time.time", return_value=1000.0)
+        telemetry = ApiTelemetry()
+        telemetry.record("get", URL, 200, {"Sforce-Limit-Info": "api-usage=100/1000"})
+        clock.return_value = 1000.0 + 360
+        telemetry.record("get", URL, 200, {"Sforce-Limit-Info": "api-usage=200/1000"})
+
+        usage = telemetry.snapshot()["api_usage"]
+
+        assert usage["burn_rate_per_hour"] == 1000
+        assert usage["hours_to_exhaustion"] == 0.8
+
+    def test_old_calls_leave_the_window(self, mocker):
+        clock = mocker.patch("salesforce_mcp.utils.telemetry.time.time", return_value=1000.0)
+        telemetry = ApiTelemetry(window=60)
+        telemetry.record("get", URL, 200)
+        clock.return_value = 1100.0
+        telemetry.record("get", URL, 200)
+
+        snapshot = telemetry.snapshot()
+
+        assert snapshot["window"]["calls"] == 1
+        assert snapshot["since_start"]["by_status"] == {"200": 2}
+
+
+class TestSessionTelemetry:
+    def setup_method(self):
+        self.session = SalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass")
+
+    def test_request_recorded(self, mocker, make_response):
+        mocker.patch.object(self.session, "_send_authenticated",
+                            return_value=make_response(200, {}, {"Sforce-Limit-Info": "api-usage=7/5000"}))
+
+        with tool_context("run_lead_operation"):
+            self.session._request("get", URL)
+
+        snapshot = self.session.telemetry.snapshot()
+        assert snapshot["since_start"]["by_tool"] == {"run_lead_operation": 1}
+        assert snapshot["api_usage"]["used"] == 7
+
+    def test_transport_error_recorded(self, mocker):
+        mocker.patch("salesforce_mcp.services.SalesforceSession.time.sleep")
+        mocker.patch.object(self.session, "_send_authenticated", side_effect=requests.ReadTimeout("slow"))
+
+        try:
+            self.session._request("post", URL)
+        except requests.ReadTimeout:
+            pass
+
+        assert self.session.telemetry.snapshot()["since_start"]["by_status"] == {"ReadTimeout": 1}
+
+    def test_sample_limits(self, mocker, make_response):
+        limits = {"DailyApiRequests": {"Max": 5000, "Remaining": 4990}}
+        request = mocker.patch.object(self.session, "request", return_value=make_response(200, limits))
+
+        assert self.session.sample_limits() == limits
+
+        request.assert_called_once_with("get", "services/data/v61.0/limits")
+        assert self.session.telemetry.snapshot()["api_usage"]["used"] == 10
+
+    def test_shared_telemetry(self, mocker):
+        telemetry = ApiTelemetry()
+        async_session = AsyncSalesforceSession(
+            domain="bigthink.my.salesforce.com",
+            client_id="dummy",
+            client_secret="dummy",
+            username="user",
+            password="pass",
+            telemetry=telemetry)
+        response = httpx.Response(200, json={}, request=httpx.Request("GET", URL))
+        mocker.patch.object(async_session, "_send_authenticated", mocker.AsyncMock(return_value=response))
+
+        with tool_context("run_soql"):
+            asyncio.run(async_session._request("get", URL))
+
+        assert telemetry.snapshot()["since_start"]["by_tool"] == {"run_soql": 1}
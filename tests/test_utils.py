@@ -1,6 +1,10 @@
 from salesforce_mcp.utils.dataClassMapper import dict_to_dataclass
 from salesforce_mcp.utils.soql import SoqlResult
+from salesforce_mcp.utils.lazy import lazy_import
 from dataclasses import is_dataclass
+from types import ModuleType
+import json
+import sys
 import pytest
 
 
@@ -16,4 +20,13 @@ class TestUtils:
         assert mapped_soql_result.totalSize == 12
         pass
 
+    def test_lazy_import_runs_module_on_first_use(self, monkeypatch):
+        monkeypatch.delitem(sys.modules, "wave", raising=False)
+        wave = lazy_import("wave")
+        assert type(wave) is not ModuleType
+        assert wave.WAVE_FORMAT_PCM == 1
+        assert type(wave) is ModuleType
+        assert sys.modules["wave"] is wave
 
+    def test_lazy_import_of_loaded_module(self):
+        assert lazy_import("json") is json